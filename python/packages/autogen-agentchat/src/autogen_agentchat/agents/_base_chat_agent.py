@@ -8,6 +8,7 @@
 from ..messages import (
     BaseAgentEvent,
     BaseChatMessage,
+    CodeExecutionStreamingChunkEvent,
     ModelClientStreamingChunkEvent,
     TextMessage,
 )
@@ -179,8 +180,8 @@ async def run_stream(
                 yield TaskResult(messages=output_messages)
             else:
                 yield message
-                if isinstance(message, ModelClientStreamingChunkEvent):
-                    # Skip the model client streaming chunk events.
+                if isinstance(message, (ModelClientStreamingChunkEvent, CodeExecutionStreamingChunkEvent)):
+                    # Skip the model client and code execution streaming chunk events.
                     continue
                 output_messages.append(message)
 
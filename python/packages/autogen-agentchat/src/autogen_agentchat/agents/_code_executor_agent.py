@@ -9,7 +9,7 @@
 )
 
 from autogen_core import CancellationToken, Component, ComponentModel
-from autogen_core.code_executor import CodeBlock, CodeExecutor, CodeResult
+from autogen_core.code_executor import CodeBlock, CodeExecutor, CodeOutputChunk, CodeResult
 from autogen_core.model_context import (
     ChatCompletionContext,
     UnboundedChatCompletionContext,
@@ -31,6 +31,7 @@
     BaseAgentEvent,
     BaseChatMessage,
     CodeExecutionEvent,
+    CodeExecutionStreamingChunkEvent,
     CodeGenerationEvent,
     HandoffMessage,
     ModelClientStreamingChunkEvent,
@@ -53,6 +54,7 @@ class CodeExecutorAgentConfig(BaseModel):
     sources: List[str] | None = None
     system_message: str | None = None
     model_client_stream: bool = False
+    code_executor_stream: bool = False
     model_context: ComponentModel | None = None
 
 
@@ -100,6 +102,10 @@ class CodeExecutorAgent(BaseChatAgent, Component[CodeExecutorAgentConfig]):
             :meth:`on_messages_stream` and :meth:`BaseChatAgent.run_stream` methods will
             also yield :class:`~autogen_agentchat.messages.ModelClientStreamingChunkEvent`
             messages as the model client produces chunks of response. Defaults to `False`.
+        code_executor_stream (bool, optional): If `True`, the code executor will be used in streaming mode.
+            :meth:`on_messages_stream` and :meth:`BaseChatAgent.run_stream` methods will
+            also yield :class:`~autogen_agentchat.messages.CodeExecutionStreamingChunkEvent`
+            messages as the executed code prints output, before the final result. Defaults to `False`.
         description (str, optional): The description of the agent. If not provided,
             :class:`~autogen_agentchat.agents.CodeExecutorAgent.DEFAULT_AGENT_DESCRIPTION` will be used.
         system_message (str, optional): The system message for the model. If provided, it will be prepended to the messages in the model context when making an inference. Set to `None` to disable.
@@ -341,6 +347,7 @@ def __init__(
         model_client: ChatCompletionClient | None = None,
         model_context: ChatCompletionContext | None = None,
         model_client_stream: bool = False,
+        code_executor_stream: bool = False,
         max_retries_on_error: int = 0,
         description: str | None = None,
         system_message: str | None = DEFAULT_SYSTEM_MESSAGE,
@@ -356,6 +363,7 @@ def __init__(
         self._code_executor = code_executor
         self._sources = sources
         self._model_client_stream = model_client_stream
+        self._code_executor_stream = code_executor_stream
         self._max_retries_on_error = max_retries_on_error
 
         self._model_client = None
@@ -424,7 +432,12 @@ async def on_messages_stream(
                     )
                 )
                 return
-            execution_result = await self.execute_code_block(code_blocks, cancellation_token)
+            async for execution_output in self._execute_code_blocks_stream(code_blocks, 0, cancellation_token):
+                if isinstance(execution_output, CodeResult):
+                    execution_result = execution_output
+                else:
+                    yield execution_output
+            assert execution_result is not None, "No code execution result was produced."
             yield Response(chat_message=TextMessage(content=execution_result.output, source=self.name))
             return
 
@@ -495,7 +508,16 @@ async def on_messages_stream(
             yield inferred_text_message
 
             # Step 8: Execute the extracted code blocks
-            execution_result = await self.execute_code_block(inferred_text_message.code_blocks, cancellation_token)
+            execution_result = None
+            async for execution_output in self._execute_code_blocks_stream(
+                inferred_text_message.code_blocks, nth_try, cancellation_token
+            ):
+                if isinstance(execution_output, CodeResult):
+                    execution_result = execution_output
+                else:
+                    # Streaming chunk event
+                    yield execution_output
+            assert execution_result is not None, "No code execution result was produced."
 
             # Step 9: Update model context with the code execution result
             await model_context.add_message(
@@ -574,7 +596,38 @@ async def execute_code_block(
     ) -> CodeResult:
         # Execute the code blocks.
         result = await self._code_executor.execute_code_blocks(code_blocks, cancellation_token=cancellation_token)
+        return self._format_code_result(result)
+
+    async def _execute_code_blocks_stream(
+        self, code_blocks: List[CodeBlock], retry_attempt: int, cancellation_token: CancellationToken
+    ) -> AsyncGenerator[Union[CodeResult, CodeExecutionStreamingChunkEvent], None]:
+        """
+        Execute the code blocks and yield either streaming chunk events or the final CodeResult.
+        """
+        if not self._code_executor_stream:
+            yield await self.execute_code_block(code_blocks, cancellation_token)
+            return
 
+        result: Optional[CodeResult] = None
+        async for output in self._code_executor.execute_code_blocks_stream(
+            code_blocks, cancellation_token=cancellation_token
+        ):
+            if isinstance(output, CodeOutputChunk):
+                yield CodeExecutionStreamingChunkEvent(
+                    retry_attempt=retry_attempt,
+                    content=output.content,
+                    stream=output.stream,
+                    code_block_index=output.code_block_index,
+                    source=self.name,
+                )
+            else:
+                result = output
+        if result is None:
+            raise RuntimeError("No final code execution result in streaming mode.")
+        yield self._format_code_result(result)
+
+    @staticmethod
+    def _format_code_result(result: CodeResult) -> CodeResult:
         if result.output.strip() == "":
             # No output
             result.output = f"The script ran but produced no output to console. The POSIX exit code was: {result.exit_code}. If you were expecting output, consider revising the script to ensure content is printed to stdout."
@@ -611,6 +664,7 @@ def _to_config(self) -> CodeExecutorAgentConfig:
                 else None
             ),
             model_client_stream=self._model_client_stream,
+            code_executor_stream=self._code_executor_stream,
             model_context=self._model_context.dump_component(),
         )
 
@@ -626,6 +680,7 @@ def _from_config(cls, config: CodeExecutorAgentConfig) -> Self:
             sources=config.sources,
             system_message=config.system_message,
             model_client_stream=config.model_client_stream,
+            code_executor_stream=config.code_executor_stream,
             model_context=ChatCompletionContext.load_component(config.model_context) if config.model_context else None,
         )
 
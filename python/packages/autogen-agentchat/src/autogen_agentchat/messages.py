@@ -465,6 +465,28 @@ def to_text(self) -> str:
         return self.result.output
 
 
+class CodeExecutionStreamingChunkEvent(BaseAgentEvent):
+    """An event signaling a chunk of output printed by a code block while it runs, when the code executor
+    is used in streaming mode."""
+
+    retry_attempt: int
+    "Retry number, 0 means first execution"
+
+    content: str
+    """A chunk of the output of the code block."""
+
+    stream: Literal["stdout", "stderr"]
+    """The stream that the chunk was printed to."""
+
+    code_block_index: int
+    """The index of the code block in the executed code blocks."""
+
+    type: Literal["CodeExecutionStreamingChunkEvent"] = "CodeExecutionStreamingChunkEvent"
+
+    def to_text(self) -> str:
+        return self.content
+
+
 class ToolCallExecutionEvent(BaseAgentEvent):
     """An event signaling the execution of tool calls."""
 
@@ -578,6 +600,7 @@ def __init__(self) -> None:
         self._message_types[ThoughtEvent.__name__] = ThoughtEvent
         self._message_types[SelectSpeakerEvent.__name__] = SelectSpeakerEvent
         self._message_types[CodeGenerationEvent.__name__] = CodeGenerationEvent
+        self._message_types[CodeExecutionStreamingChunkEvent.__name__] = CodeExecutionStreamingChunkEvent
         self._message_types[CodeExecutionEvent.__name__] = CodeExecutionEvent
 
     def is_registered(self, message_type: type[BaseAgentEvent | BaseChatMessage]) -> bool:
@@ -634,7 +657,8 @@ def create(self, data: Mapping[str, Any]) -> BaseAgentEvent | BaseChatMessage:
     | ThoughtEvent
     | SelectSpeakerEvent
     | CodeGenerationEvent
-    | CodeExecutionEvent,
+    | CodeExecutionEvent
+    | CodeExecutionStreamingChunkEvent,
     Field(discriminator="type"),
 ]
 """The union type of all built-in concrete subclasses of :class:`BaseAgentEvent`."""
@@ -664,4 +688,5 @@ def create(self, data: Mapping[str, Any]) -> BaseAgentEvent | BaseChatMessage:
     "MessageFactory",
     "CodeGenerationEvent",
     "CodeExecutionEvent",
+    "CodeExecutionStreamingChunkEvent",
 ]
@@ -1,5 +1,6 @@
 """State management for agents, teams and termination conditions."""
 
+from ._delta import StateDeltaOperation, TeamStateDelta, compact_team_state
 from ._states import (
     AssistantAgentState,
     BaseGroupChatManagerState,
@@ -24,4 +25,7 @@
     "MagenticOneOrchestratorState",
     "TeamState",
     "SocietyOfMindAgentState",
+    "TeamStateDelta",
+    "StateDeltaOperation",
+    "compact_team_state",
 ]
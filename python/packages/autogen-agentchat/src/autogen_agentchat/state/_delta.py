@@ -0,0 +1,111 @@
+import copy
+from typing import Any, Dict, List, Literal, Mapping, Sequence
+
+from pydantic import BaseModel, Field
+
+from ._states import BaseState, TeamState
+
+
+class StateDeltaOperation(BaseModel):
+    """A change to a nested state mapping, addressed by the keys leading to the changed value."""
+
+    op: Literal["set", "append", "delete"]
+    """``set`` replaces or adds the value, ``append`` extends the list with the items in ``value``,
+    and ``delete`` removes the key."""
+
+    path: List[str]
+    """The keys from the root of the state to the changed value."""
+
+    value: Any = None
+
+
+class TeamStateDelta(BaseState):
+    """The changes to a team's state since the previous checkpoint.
+
+    Lists that only grew, such as message threads and model contexts, are recorded as the appended
+    items, and other changed values are recorded in full. Use :func:`compact_team_state` to apply a
+    chain of deltas to a full :class:`TeamState`."""
+
+    sequence: int = Field(default=1)
+    """The position of the delta in its chain, starting at 1 after the base state."""
+
+    operations: List[StateDeltaOperation] = Field(default_factory=list)
+    type: str = Field(default="TeamStateDelta")
+
+    @classmethod
+    def from_states(cls, previous: Mapping[str, Any], current: Mapping[str, Any], sequence: int) -> "TeamStateDelta":
+        """Compute the delta that turns the ``previous`` state into the ``current`` state."""
+        delta = cls(sequence=sequence)
+        delta.add_changes(previous, current)
+        return delta
+
+    def add_changes(self, previous: Any, current: Any, path: Sequence[str] = ()) -> None:
+        """Record the operations that turn the value at ``path`` from ``previous`` into ``current``."""
+        _diff(previous, current, list(path), self.operations)
+
+    def apply(self, state: Dict[str, Any]) -> None:
+        """Apply the delta to a state in place."""
+        for operation in self.operations:
+            *parents, key = operation.path
+            target = state
+            for parent in parents:
+                target = target[parent]
+            if operation.op == "set":
+                target[key] = operation.value
+            elif operation.op == "append":
+                target[key].extend(operation.value)
+            else:
+                del target[key]
+
+
+def compact_team_state(
+    state: Mapping[str, Any], deltas: Sequence[TeamStateDelta | Mapping[str, Any]]
+) -> Mapping[str, Any]:
+    """Apply a chain of deltas to a team state and return the resulting full state.
+
+    The result can be passed to :meth:`~autogen_agentchat.teams.BaseGroupChat.load_state` or stored
+    as the new base of the chain, after which the compacted deltas can be discarded.
+
+    Args:
+        state: The base state, as returned by :meth:`~autogen_agentchat.teams.BaseGroupChat.save_state`,
+            or an empty mapping if the chain starts from the first delta of a team.
+        deltas: The deltas to apply, in order.
+
+    Raises:
+        ValueError: If the deltas are not consecutive.
+    """
+    compacted: Dict[str, Any] = copy.deepcopy(dict(state))
+    previous_sequence: int | None = None
+    for delta in deltas:
+        if not isinstance(delta, TeamStateDelta):
+            delta = TeamStateDelta.model_validate(delta)
+        if previous_sequence is not None and delta.sequence != previous_sequence + 1:
+            raise ValueError(f"Expected the state delta with sequence {previous_sequence + 1}, got {delta.sequence}.")
+        previous_sequence = delta.sequence
+        # Copy the values so the compacted state does not share lists with the deltas.
+        delta.model_copy(deep=True).apply(compacted)
+    return TeamState.model_validate(compacted).model_dump()
+
+
+def _diff(previous: Any, current: Any, path: List[str], operations: List[StateDeltaOperation]) -> None:
+    if isinstance(previous, Mapping) and isinstance(current, Mapping):
+        for key in previous:
+            if key not in current:
+                operations.append(StateDeltaOperation(op="delete", path=[*path, key]))
+        for key, value in current.items():
+            if key in previous:
+                _diff(previous[key], value, [*path, key], operations)
+            else:
+                operations.append(StateDeltaOperation(op="set", path=[*path, key], value=value))
+    elif (
+        isinstance(previous, list)
+        and isinstance(current, list)
+        and len(current) >= len(previous)
+        and current[: len(previous)] == previous
+    ):
+        if len(current) > len(previous):
+            operations.append(StateDeltaOperation(op="append", path=path, value=current[len(previous) :]))
+    elif previous != current:
+        if not path:
+            raise ValueError("The state must be a mapping.")
+        operations.append(StateDeltaOperation(op="set", path=path, value=current))
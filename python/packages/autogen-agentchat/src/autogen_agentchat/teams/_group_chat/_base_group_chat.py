@@ -1,7 +1,8 @@
 import asyncio
+import copy
 import uuid
 from abc import ABC, abstractmethod
-from typing import Any, AsyncGenerator, Callable, Dict, List, Mapping, Sequence
+from typing import Any, AsyncGenerator, Callable, Dict, List, Mapping, Sequence, Set, Tuple
 
 from autogen_core import (
     AgentId,
@@ -12,20 +13,24 @@
     SingleThreadedAgentRuntime,
     TypeSubscription,
 )
+from autogen_core.model_context import ChatCompletionContext, ChatCompletionContextState
+from autogen_core.models import LLMMessage
 from pydantic import BaseModel, ValidationError
 
 from ...base import ChatAgent, TaskResult, Team, TerminationCondition
 from ...messages import (
     BaseAgentEvent,
     BaseChatMessage,
+    CodeExecutionStreamingChunkEvent,
     MessageFactory,
     ModelClientStreamingChunkEvent,
     StopMessage,
     StructuredMessage,
     TextMessage,
 )
-from ...state import TeamState
-from ._chat_agent_container import ChatAgentContainer
+from ...state import StateDeltaOperation, TeamState, TeamStateDelta
+from ._base_group_chat_manager import BaseGroupChatManager
+from ._chat_agent_container import ChatAgentContainer, MessageBufferTracker
 from ._events import (
     GroupChatPause,
     GroupChatReset,
@@ -34,6 +39,8 @@
     GroupChatTermination,
     SerializableException,
 )
+from ._message_thread import MessageThreadLog, MessageThreadRetention, MessageThreadTracker
+from ._output_message_queue import OutputMessageQueue
 from ._sequential_routed_agent import SequentialRoutedAgent
 
 
@@ -42,6 +49,24 @@ class BaseGroupChat(Team, ABC, ComponentBase[BaseModel]):
 
     To implement a group chat team, first create a subclass of :class:`BaseGroupChatManager` and then
     create a subclass of :class:`BaseGroupChat` that uses the group chat manager.
+
+    :class:`~autogen_agentchat.messages.ModelClientStreamingChunkEvent` and
+    :class:`~autogen_agentchat.messages.CodeExecutionStreamingChunkEvent` produced by participants are
+    delivered to :meth:`run_stream` directly rather than through the output topic of the runtime, in order
+    with the participant's other messages. They are not published to the output topic, so subscribers of
+    that topic and intervention handlers of the runtime do not see them. Set ``streaming_chunk_batch_chars`` and/or
+    ``streaming_chunk_batch_interval`` to coalesce consecutive chunks of a participant into one event
+    once the batch reaches that many characters or that many seconds have passed since its first chunk.
+
+    By default the group chat manager keeps every message in its message thread, which is passed to
+    speaker selection and included in the saved state. Set ``message_thread_retention`` to keep only a
+    window of recent messages and drop uninteresting message types. If the policy has a
+    ``spill_directory``, all messages are also appended to an on-disk log available as
+    :attr:`message_thread_log`, so the full history stays retrievable while the saved state stays small.
+
+    Set ``max_concurrent_speakers`` above 1 to let the group chat manager select several speakers at once
+    with :meth:`BaseGroupChatManager.select_speakers` and run them concurrently, at most that many at a
+    time. The next speakers are selected after all of them have responded.
     """
 
     component_type = "team"
@@ -56,11 +81,17 @@ def __init__(
         runtime: AgentRuntime | None = None,
         custom_message_types: List[type[BaseAgentEvent | BaseChatMessage]] | None = None,
         emit_team_events: bool = False,
+        streaming_chunk_batch_chars: int | None = None,
+        streaming_chunk_batch_interval: float | None = None,
+        message_thread_retention: MessageThreadRetention | None = None,
+        max_concurrent_speakers: int = 1,
     ):
         if len(participants) == 0:
             raise ValueError("At least one participant is required.")
         if len(participants) != len(set(participant.name for participant in participants)):
             raise ValueError("The participant names must be unique.")
+        if max_concurrent_speakers < 1:
+            raise ValueError("The maximum number of concurrent speakers must be at least 1.")
         self._participants = participants
         self._base_group_chat_manager_class = group_chat_manager_class
         self._termination_condition = termination_condition
@@ -105,8 +136,9 @@ def __init__(
         self._output_topic_type = f"output_topic_{self._team_id}"
 
         # The queue for collecting the output messages.
-        self._output_message_queue: asyncio.Queue[BaseAgentEvent | BaseChatMessage | GroupChatTermination] = (
-            asyncio.Queue()
+        # Participants put streaming chunks directly into it, optionally coalesced into batches.
+        self._output_message_queue = OutputMessageQueue(
+            chunk_batch_chars=streaming_chunk_batch_chars, chunk_batch_interval=streaming_chunk_batch_interval
         )
 
         # Create a runtime for the team.
@@ -127,6 +159,41 @@ def __init__(
 
         # Flag to track if the team events should be emitted.
         self._emit_team_events = emit_team_events
+        self._streaming_chunk_batch_chars = streaming_chunk_batch_chars
+        self._streaming_chunk_batch_interval = streaming_chunk_batch_interval
+
+        self._max_concurrent_speakers = max_concurrent_speakers
+
+        # The retention policy of the manager's message thread, and the log of all messages if it spills to disk.
+        self._message_thread_retention = message_thread_retention
+        self._message_thread_log: MessageThreadLog | None = None
+        if message_thread_retention is not None and message_thread_retention.spill_directory is not None:
+            self._message_thread_log = MessageThreadLog(
+                message_thread_retention.spill_directory,
+                self._message_factory,
+                segment_max_messages=message_thread_retention.segment_max_messages,
+            )
+
+        # The state of each agent recorded by the previous delta checkpoint, without the message thread of the
+        # manager, and the length of that thread. None until the first checkpoint.
+        self._delta_agent_states: Dict[str, Dict[str, Any]] | None = None
+        self._delta_message_thread_length = 0
+        self._delta_sequence = 0
+        # The agents the team ran or reset since the previous checkpoint, and the count of the messages the
+        # manager appended to its thread since then.
+        self._delta_dirty_agents: Set[str] = set()
+        self._message_thread_tracker = MessageThreadTracker()
+        # The changes to the message buffers of the participants, and the model context of each assistant
+        # agent with the length it had at the previous checkpoint. The deltas of these participants are taken
+        # from the appended entries instead of their saved states.
+        self._message_buffer_trackers = {name: MessageBufferTracker() for name in self._participant_names}
+        self._delta_model_contexts: Dict[str, Tuple[List[LLMMessage], int]] = {}
+
+    @property
+    def message_thread_log(self) -> MessageThreadLog | None:
+        """The on-disk log of all messages in the group chat, if the message thread retention policy
+        has a ``spill_directory``. The log is append-only and is not cleared by :meth:`reset`."""
+        return self._message_thread_log
 
     @abstractmethod
     def _create_group_chat_manager_factory(
@@ -151,7 +218,14 @@ def _create_participant_factory(
         message_factory: MessageFactory,
     ) -> Callable[[], ChatAgentContainer]:
         def _factory() -> ChatAgentContainer:
-            container = ChatAgentContainer(parent_topic_type, output_topic_type, agent, message_factory)
+            container = ChatAgentContainer(
+                parent_topic_type,
+                output_topic_type,
+                agent,
+                message_factory,
+                output_message_queue=self._output_message_queue,
+                message_buffer_tracker=self._message_buffer_trackers.get(agent.name),
+            )
             return container
 
         return _factory
@@ -178,21 +252,31 @@ async def _init(self, runtime: AgentRuntime) -> None:
             await runtime.add_subscription(TypeSubscription(topic_type=self._group_topic_type, agent_type=agent_type))
 
         # Register the group chat manager.
+        manager_factory = self._create_group_chat_manager_factory(
+            name=self._group_chat_manager_name,
+            group_topic_type=self._group_topic_type,
+            output_topic_type=self._output_topic_type,
+            participant_names=self._participant_names,
+            participant_topic_types=self._participant_topic_types,
+            participant_descriptions=self._participant_descriptions,
+            output_message_queue=self._output_message_queue,
+            termination_condition=self._termination_condition,
+            max_turns=self._max_turns,
+            message_factory=self._message_factory,
+        )
+
+        def _factory() -> SequentialRoutedAgent:
+            manager = manager_factory()
+            if isinstance(manager, BaseGroupChatManager):
+                manager.set_message_thread_retention(self._message_thread_retention, self._message_thread_log)
+                manager.set_message_thread_tracker(self._message_thread_tracker)
+                manager.set_max_concurrent_speakers(self._max_concurrent_speakers)
+            return manager
+
         await self._base_group_chat_manager_class.register(
             runtime,
             type=group_chat_manager_agent_type.type,
-            factory=self._create_group_chat_manager_factory(
-                name=self._group_chat_manager_name,
-                group_topic_type=self._group_topic_type,
-                output_topic_type=self._output_topic_type,
-                participant_names=self._participant_names,
-                participant_topic_types=self._participant_topic_types,
-                participant_descriptions=self._participant_descriptions,
-                output_message_queue=self._output_message_queue,
-                termination_condition=self._termination_condition,
-                max_turns=self._max_turns,
-                message_factory=self._message_factory,
-            ),
+            factory=_factory,
         )
         # Add subscriptions for the group chat manager.
         # The group chat manager should be able to receive messages from the its own topic.
@@ -326,7 +410,8 @@ async def run_stream(
 
         .. note::
 
-            If an agent produces :class:`~autogen_agentchat.messages.ModelClientStreamingChunkEvent`,
+            If an agent produces :class:`~autogen_agentchat.messages.ModelClientStreamingChunkEvent`
+            or :class:`~autogen_agentchat.messages.CodeExecutionStreamingChunkEvent`,
             the message will be yielded in the stream but it will not be included in the
             :attr:`~autogen_agentchat.base.TaskResult.messages`.
 
@@ -448,6 +533,10 @@ async def main() -> None:
         if self._is_running:
             raise ValueError("The team is already running, it cannot run again until it is stopped.")
         self._is_running = True
+        # Participants may run on the event loops of other threads, and put their output into the queue.
+        self._output_message_queue.bind_loop(asyncio.get_running_loop())
+        # Every participant receives the messages of the group chat.
+        self._mark_all_agents_dirty()
 
         if self._embedded_runtime:
             # Start the embedded runtime.
@@ -519,8 +608,8 @@ async def stop_runtime() -> None:
                     stop_reason = message.message.content
                     break
                 yield message
-                if isinstance(message, ModelClientStreamingChunkEvent):
-                    # Skip the model client streaming chunk events.
+                if isinstance(message, (ModelClientStreamingChunkEvent, CodeExecutionStreamingChunkEvent)):
+                    # Skip the model client and code execution streaming chunk events.
                     continue
                 output_messages.append(message)
 
@@ -535,8 +624,7 @@ async def stop_runtime() -> None:
                     await shutdown_task
             finally:
                 # Clear the output message queue.
-                while not self._output_message_queue.empty():
-                    self._output_message_queue.get_nowait()
+                self._output_message_queue.clear()
 
                 # Indicate that the team is no longer running.
                 self._is_running = False
@@ -587,6 +675,7 @@ async def main() -> None:
         if self._is_running:
             raise RuntimeError("The group chat is currently running. It must be stopped before it can be reset.")
         self._is_running = True
+        self._mark_all_agents_dirty()
 
         if self._embedded_runtime:
             # Start the runtime.
@@ -612,8 +701,7 @@ async def main() -> None:
                 await self._runtime.stop_when_idle()
 
             # Reset the output message queue.
-            while not self._output_message_queue.empty():
-                self._output_message_queue.get_nowait()
+            self._output_message_queue.clear()
 
             # Indicate that the team is no longer running.
             self._is_running = False
@@ -759,6 +847,149 @@ async def save_state(self) -> Mapping[str, Any]:
         agent_states[self._group_chat_manager_name] = await self._runtime.agent_save_state(agent_id)
         return TeamState(agent_states=agent_states).model_dump()
 
+    async def save_state_delta(self) -> Mapping[str, Any]:
+        """Save the changes to the state of the group chat team since the previous call.
+
+        The result is a :class:`~autogen_agentchat.state.TeamStateDelta` that records the messages
+        appended to message threads, message buffers and model contexts, and the other values that
+        changed, so the size of a checkpoint does not grow with the length of the conversation.
+        The first delta, and the first delta after :meth:`load_state`, is relative to an empty state
+        and to the loaded state respectively.
+
+        Only the agents the team ran or reset since the previous call are saved, and the messages the
+        group chat manager appended to its thread are taken from the end of the thread without comparing
+        it to the previous checkpoint. For :class:`~autogen_agentchat.agents.AssistantAgent` participants,
+        the messages appended to the model context and the message buffer are taken the same way, without
+        saving the participant. Changes made to the agents outside the team are not recorded.
+
+        Use :func:`~autogen_agentchat.state.compact_team_state` to fold a chain of deltas into a full
+        state that can be passed to :meth:`load_state`:
+
+        .. code-block:: python
+
+            from autogen_agentchat.state import compact_team_state
+
+            base: Mapping[str, Any] = {}
+            deltas = []
+            # After every run.
+            deltas.append(await team.save_state_delta())
+            # Periodically, or when recovering.
+            base = compact_team_state(base, deltas)
+            deltas = []
+            await team.load_state(base)
+
+        .. caution::
+
+            Like :meth:`save_state`, this method should be called when the team is not running.
+        """
+        if not self._initialized:
+            await self._init(self._runtime)
+
+        self._delta_sequence += 1
+        if self._delta_agent_states is None:
+            state = await self.save_state()
+            self._set_delta_base(TeamState.model_validate(state).agent_states)
+            return TeamStateDelta.from_states({}, state, sequence=self._delta_sequence).model_dump()
+
+        delta = TeamStateDelta(sequence=self._delta_sequence)
+        agents = zip(
+            [*self._participant_names, self._group_chat_manager_name],
+            [*self._participant_topic_types, self._group_chat_manager_topic_type],
+            strict=True,
+        )
+        for name, agent_type in agents:
+            if name not in self._delta_dirty_agents:
+                continue
+            if name in self._delta_model_contexts:
+                self._add_participant_changes(delta, name, ["agent_states", name])
+                continue
+            agent_state = dict(await self._runtime.agent_save_state(AgentId(type=agent_type, key=self._team_id)))
+            path = ["agent_states", name]
+            message_thread = agent_state.pop("message_thread", None) if name == self._group_chat_manager_name else None
+            delta.add_changes(self._delta_agent_states.get(name), agent_state, path)
+            if isinstance(message_thread, list):
+                self._add_message_thread_changes(delta, message_thread, [*path, "message_thread"])
+                self._delta_message_thread_length = len(message_thread)
+            self._delta_agent_states[name] = copy.deepcopy(agent_state)
+        self._delta_dirty_agents.clear()
+        self._message_thread_tracker.appended = 0
+        return delta.model_dump()
+
+    def _add_message_thread_changes(self, delta: TeamStateDelta, message_thread: List[Any], path: List[str]) -> None:
+        appended = self._message_thread_tracker.appended
+        if len(message_thread) == self._delta_message_thread_length + appended:
+            # The thread only grew since the previous checkpoint.
+            if appended:
+                delta.operations.append(StateDeltaOperation(op="append", path=path, value=message_thread[-appended:]))
+        else:
+            # The thread was cleared, truncated by the retention policy or replaced.
+            delta.operations.append(StateDeltaOperation(op="set", path=path, value=message_thread))
+
+    def _add_participant_changes(self, delta: TeamStateDelta, name: str, path: List[str]) -> None:
+        model_context = self._tracked_model_context(name)
+        assert model_context is not None
+        messages = model_context._messages  # pyright: ignore[reportPrivateUsage]
+        checkpoint_messages, checkpoint_length = self._delta_model_contexts[name]
+        context_path = [*path, "agent_state", "llm_context", "messages"]
+        # The model context replaces its list of messages when it is cleared or loaded.
+        if messages is checkpoint_messages and len(messages) >= checkpoint_length:
+            if len(messages) > checkpoint_length:
+                appended = ChatCompletionContextState(messages=messages[checkpoint_length:]).model_dump()["messages"]
+                delta.operations.append(StateDeltaOperation(op="append", path=context_path, value=appended))
+        else:
+            value = ChatCompletionContextState(messages=messages).model_dump()["messages"]
+            delta.operations.append(StateDeltaOperation(op="set", path=context_path, value=value))
+        self._delta_model_contexts[name] = (messages, len(messages))
+
+        tracker = self._message_buffer_trackers[name]
+        buffer_path = [*path, "message_buffer"]
+        if tracker.replaced:
+            value = [message.dump() for message in tracker.message_buffer]
+            delta.operations.append(StateDeltaOperation(op="set", path=buffer_path, value=value))
+        elif tracker.appended:
+            value = [message.dump() for message in tracker.message_buffer[-tracker.appended :]]
+            delta.operations.append(StateDeltaOperation(op="append", path=buffer_path, value=value))
+        tracker.checkpoint()
+
+    def _tracked_model_context(self, name: str) -> ChatCompletionContext | None:
+        """Return the model context of a participant whose state is its model context and message buffer,
+        or None if the participant's state must be saved to compute its delta."""
+        from ...agents import AssistantAgent
+
+        participant = self._participants[self._participant_names.index(name)]
+        if not isinstance(participant, AssistantAgent) or type(participant).save_state is not AssistantAgent.save_state:
+            return None
+        model_context = participant.model_context
+        if type(model_context).save_state is not ChatCompletionContext.save_state:
+            return None
+        return model_context
+
+    def _set_delta_base(self, agent_states: Mapping[str, Mapping[str, Any]]) -> None:
+        self._delta_agent_states = {}
+        self._delta_message_thread_length = 0
+        self._delta_model_contexts = {}
+        for name in self._participant_names:
+            model_context = self._tracked_model_context(name)
+            if model_context is not None:
+                messages = model_context._messages  # pyright: ignore[reportPrivateUsage]
+                self._delta_model_contexts[name] = (messages, len(messages))
+                self._message_buffer_trackers[name].checkpoint()
+        for name, agent_state in agent_states.items():
+            if name in self._delta_model_contexts:
+                continue
+            base = copy.deepcopy(dict(agent_state))
+            if name == self._group_chat_manager_name:
+                message_thread = base.pop("message_thread", None)
+                if isinstance(message_thread, list):
+                    self._delta_message_thread_length = len(message_thread)
+            self._delta_agent_states[name] = base
+        self._delta_dirty_agents.clear()
+        self._message_thread_tracker.appended = 0
+
+    def _mark_all_agents_dirty(self) -> None:
+        self._delta_dirty_agents.update(self._participant_names)
+        self._delta_dirty_agents.add(self._group_chat_manager_name)
+
     async def load_state(self, state: Mapping[str, Any]) -> None:
         """Load an external state and overwrite the current state of the group chat team.
 
@@ -786,6 +1017,9 @@ async def load_state(self, state: Mapping[str, Any]) -> None:
             if self._group_chat_manager_name not in team_state.agent_states:
                 raise ValueError(f"Agent state for {self._group_chat_manager_name} not found in the saved state.")
             await self._runtime.agent_load_state(agent_id, team_state.agent_states[self._group_chat_manager_name])
+            # Later deltas are relative to the loaded state.
+            self._set_delta_base(team_state.agent_states)
+            self._delta_sequence = 0
 
         except ValidationError as e:
             raise ValueError(
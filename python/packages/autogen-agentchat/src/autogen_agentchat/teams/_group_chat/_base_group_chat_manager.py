@@ -1,6 +1,8 @@
 import asyncio
+import uuid
 from abc import ABC, abstractmethod
-from typing import Any, List, Sequence
+from collections import deque
+from typing import Any, Deque, Dict, List, Sequence
 
 from autogen_core import DefaultTopicId, MessageContext, event, rpc
 
@@ -11,6 +13,7 @@
     GroupChatError,
     GroupChatMessage,
     GroupChatPause,
+    GroupChatRequestCancel,
     GroupChatRequestPublish,
     GroupChatReset,
     GroupChatResume,
@@ -18,6 +21,8 @@
     GroupChatTermination,
     SerializableException,
 )
+from ._message_thread import MessageThreadLog, MessageThreadRetention, MessageThreadTracker
+from ._output_message_queue import OutputMessageQueue
 from ._sequential_routed_agent import SequentialRoutedAgent
 
 
@@ -31,6 +36,14 @@ class BaseGroupChatManager(SequentialRoutedAgent, ABC):
     - For each participant, the agent type must be the same as the topic type.
 
     Without the above conditions, the group chat will not function correctly.
+
+    By default, one speaker is selected with :meth:`select_speaker` and runs at a time.
+    With :meth:`set_max_concurrent_speakers` set above 1, the manager selects speakers with
+    :meth:`select_speakers` instead and runs them concurrently, at most that many at a time.
+    Their responses are added to the message thread as they arrive, and the next speakers are
+    selected once all of them have responded. If the group chat terminates while some of them are
+    still running, their requests are cancelled and their late responses are dropped by the manager
+    and the other participants.
     """
 
     def __init__(
@@ -79,6 +92,35 @@ def __init__(
         self._current_turn = 0
         self._message_factory = message_factory
         self._emit_team_events = emit_team_events
+        self._message_thread_retention: MessageThreadRetention | None = None
+        self._message_thread_log: MessageThreadLog | None = None
+        self._message_thread_tracker: MessageThreadTracker | None = None
+        self._max_concurrent_speakers = 1
+        # Speakers of the current fan-out that have not been requested yet, and the request ids of those
+        # that have not responded yet.
+        self._pending_speakers: Deque[str] = deque()
+        self._active_speakers: Dict[str, str] = {}
+        self._participant_topic_type_to_name = {
+            topic_type: name for name, topic_type in self._participant_name_to_topic_type.items()
+        }
+
+    def set_message_thread_retention(
+        self, retention: MessageThreadRetention | None, log: MessageThreadLog | None = None
+    ) -> None:
+        """Set the retention policy of the message thread and the log that receives every message."""
+        self._message_thread_retention = retention
+        self._message_thread_log = log
+
+    def set_message_thread_tracker(self, tracker: MessageThreadTracker | None) -> None:
+        """Set the tracker that counts the messages appended to the message thread."""
+        self._message_thread_tracker = tracker
+
+    def set_max_concurrent_speakers(self, max_concurrent_speakers: int) -> None:
+        """Set the maximum number of speakers that run concurrently. Above 1, speakers are selected
+        with :meth:`select_speakers`."""
+        if max_concurrent_speakers < 1:
+            raise ValueError("The maximum number of concurrent speakers must be at least 1.")
+        self._max_concurrent_speakers = max_concurrent_speakers
 
     @rpc
     async def handle_start(self, message: GroupChatStart, ctx: MessageContext) -> None:
@@ -97,6 +139,8 @@ async def handle_start(self, message: GroupChatStart, ctx: MessageContext) -> No
 
         # Validate the group state given the start messages
         await self.validate_group_state(message.messages)
+        self._pending_speakers.clear()
+        self._active_speakers.clear()
 
         if message.messages is not None:
             # Log all messages at once
@@ -123,28 +167,36 @@ async def handle_start(self, message: GroupChatStart, ctx: MessageContext) -> No
                 return
 
         # Select a speaker to start/continue the conversation
-        speaker_name_future = asyncio.ensure_future(self.select_speaker(self._message_thread))
-        # Link the select speaker future to the cancellation token.
-        ctx.cancellation_token.link_future(speaker_name_future)
-        speaker_name = await speaker_name_future
-        if speaker_name not in self._participant_name_to_topic_type:
-            raise RuntimeError(f"Speaker {speaker_name} not found in participant names.")
-        await self._log_speaker_selection(speaker_name)
-
-        # Send the message to the next speaker
-        speaker_topic_type = self._participant_name_to_topic_type[speaker_name]
-        await self.publish_message(
-            GroupChatRequestPublish(),
-            topic_id=DefaultTopicId(type=speaker_topic_type),
-            cancellation_token=ctx.cancellation_token,
-        )
+        await self._select_and_request_speakers(ctx)
 
     async def update_message_thread(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> None:
+        if self._message_thread_log is not None:
+            await self._message_thread_log.append(messages)
+        retention = self._message_thread_retention
+        if retention is not None and retention.exclude_types:
+            messages = [message for message in messages if type(message).__name__ not in retention.exclude_types]
         self._message_thread.extend(messages)
+        if self._message_thread_tracker is not None:
+            self._message_thread_tracker.appended += len(messages)
+        if (
+            retention is not None
+            and retention.max_messages is not None
+            and len(self._message_thread) > retention.max_messages
+        ):
+            del self._message_thread[: -retention.max_messages]
 
     @event
     async def handle_agent_response(self, message: GroupChatAgentResponse, ctx: MessageContext) -> None:
         try:
+            if self._max_concurrent_speakers > 1:
+                speaker_name = self._response_speaker_name(message, ctx)
+                request_id = self._active_speakers.get(speaker_name)
+                if request_id is None or (message.request_id is not None and message.request_id != request_id):
+                    # The response of a speaker that was still running when the group chat terminated,
+                    # which must not leak into the message thread of this or the next run.
+                    return
+                del self._active_speakers[speaker_name]
+
             # Append the message to the message thread and construct the delta.
             delta: List[BaseAgentEvent | BaseChatMessage] = []
             if message.agent_response.inner_messages is not None:
@@ -155,10 +207,30 @@ async def handle_agent_response(self, message: GroupChatAgentResponse, ctx: Mess
 
             # Check if the conversation should be terminated.
             if await self._apply_termination_condition(delta, increment_turn_count=True):
+                self._pending_speakers.clear()
+                await self._cancel_active_speakers()
                 # Stop the group chat.
                 return
 
+            if self._pending_speakers or self._active_speakers:
+                # Wait for the other speakers of the fan-out before selecting the next speakers.
+                await self._request_pending_speakers(ctx)
+                return
+
             # Select a speaker to continue the conversation.
+            await self._select_and_request_speakers(ctx)
+        except Exception as e:
+            # Handle the exception and signal termination with an error.
+            self._pending_speakers.clear()
+            await self._cancel_active_speakers()
+            error = SerializableException.from_exception(e)
+            await self._signal_termination_with_error(error)
+            # Raise the exception to the runtime.
+            raise
+
+    async def _select_and_request_speakers(self, ctx: MessageContext) -> None:
+        """Select the next speakers and send them requests to publish."""
+        if self._max_concurrent_speakers == 1:
             speaker_name_future = asyncio.ensure_future(self.select_speaker(self._message_thread))
             # Link the select speaker future to the cancellation token.
             ctx.cancellation_token.link_future(speaker_name_future)
@@ -167,19 +239,56 @@ async def handle_agent_response(self, message: GroupChatAgentResponse, ctx: Mess
                 raise RuntimeError(f"Speaker {speaker_name} not found in participant names.")
             await self._log_speaker_selection(speaker_name)
 
-            # Send the message to the next speakers
+            # Send the message to the next speaker
             speaker_topic_type = self._participant_name_to_topic_type[speaker_name]
             await self.publish_message(
                 GroupChatRequestPublish(),
                 topic_id=DefaultTopicId(type=speaker_topic_type),
                 cancellation_token=ctx.cancellation_token,
             )
-        except Exception as e:
-            # Handle the exception and signal termination with an error.
-            error = SerializableException.from_exception(e)
-            await self._signal_termination_with_error(error)
-            # Raise the exception to the runtime.
-            raise
+            return
+
+        speaker_names_future = asyncio.ensure_future(self.select_speakers(self._message_thread))
+        # Link the select speakers future to the cancellation token.
+        ctx.cancellation_token.link_future(speaker_names_future)
+        speaker_names = list(dict.fromkeys(await speaker_names_future))
+        if not speaker_names:
+            raise RuntimeError("No speakers were selected.")
+        for speaker_name in speaker_names:
+            if speaker_name not in self._participant_name_to_topic_type:
+                raise RuntimeError(f"Speaker {speaker_name} not found in participant names.")
+        await self._log_speaker_selection(speaker_names)
+        self._pending_speakers.extend(speaker_names)
+        await self._request_pending_speakers(ctx)
+
+    async def _request_pending_speakers(self, ctx: MessageContext) -> None:
+        """Send requests to publish to pending speakers, up to the maximum number of concurrent speakers."""
+        while self._pending_speakers and len(self._active_speakers) < self._max_concurrent_speakers:
+            speaker_name = self._pending_speakers.popleft()
+            request_id = uuid.uuid4().hex
+            self._active_speakers[speaker_name] = request_id
+            await self.publish_message(
+                GroupChatRequestPublish(request_id=request_id),
+                topic_id=DefaultTopicId(type=self._participant_name_to_topic_type[speaker_name]),
+                cancellation_token=ctx.cancellation_token,
+            )
+
+    async def _cancel_active_speakers(self) -> None:
+        """Cancel the requests of the speakers that have not responded yet, so that they stop and the
+        other participants drop their responses."""
+        if not self._active_speakers:
+            return
+        request_ids = list(self._active_speakers.values())
+        self._active_speakers.clear()
+        await self.publish_message(
+            GroupChatRequestCancel(request_ids=request_ids),
+            topic_id=DefaultTopicId(type=self._group_topic_type),
+        )
+
+    def _response_speaker_name(self, message: GroupChatAgentResponse, ctx: MessageContext) -> str:
+        if ctx.sender is not None and ctx.sender.type in self._participant_topic_type_to_name:
+            return self._participant_topic_type_to_name[ctx.sender.type]
+        return message.agent_response.chat_message.source
 
     async def _apply_termination_condition(
         self, delta: Sequence[BaseAgentEvent | BaseChatMessage], increment_turn_count: bool = False
@@ -216,9 +325,10 @@ async def _apply_termination_condition(
                 return True
         return False
 
-    async def _log_speaker_selection(self, speaker_name: str) -> None:
-        """Log the selected speaker to the output message queue."""
-        select_msg = SelectSpeakerEvent(content=[speaker_name], source=self._name)
+    async def _log_speaker_selection(self, speaker_name: str | List[str]) -> None:
+        """Log the selected speakers to the output message queue."""
+        speaker_names = [speaker_name] if isinstance(speaker_name, str) else speaker_name
+        select_msg = SelectSpeakerEvent(content=speaker_names, source=self._name)
         if self._emit_team_events:
             await self.publish_message(
                 GroupChatMessage(message=select_msg),
@@ -251,17 +361,29 @@ async def _signal_termination_with_error(self, error: SerializableException) ->
     @event
     async def handle_group_chat_message(self, message: GroupChatMessage, ctx: MessageContext) -> None:
         """Handle a group chat message by appending the content to its output message queue."""
-        await self._output_message_queue.put(message.message)
+        if isinstance(self._output_message_queue, OutputMessageQueue) and message.relay_id is not None:
+            self._output_message_queue.end_relay(message.relay_id, message.message)
+        else:
+            await self._output_message_queue.put(message.message)
+
+    @event
+    async def handle_request_cancel(self, message: GroupChatRequestCancel, ctx: MessageContext) -> None:
+        """Ignore the cancellation notices the manager publishes to the group topic for the participants."""
+        pass
 
     @event
     async def handle_group_chat_error(self, message: GroupChatError, ctx: MessageContext) -> None:
         """Handle a group chat error by logging the error and signaling termination."""
+        self._pending_speakers.clear()
+        await self._cancel_active_speakers()
         await self._signal_termination_with_error(message.error)
 
     @rpc
     async def handle_reset(self, message: GroupChatReset, ctx: MessageContext) -> None:
         """Reset the group chat manager. Calling :meth:`reset` to reset the group chat manager
         and clear the message thread."""
+        self._pending_speakers.clear()
+        self._active_speakers.clear()
         await self.reset()
 
     @rpc
@@ -290,6 +412,11 @@ async def select_speaker(self, thread: List[BaseAgentEvent | BaseChatMessage]) -
         topic type of the selected speaker."""
         ...
 
+    async def select_speakers(self, thread: List[BaseAgentEvent | BaseChatMessage]) -> List[str]:
+        """Select the speakers to run concurrently when the maximum number of concurrent speakers
+        is above 1. By default, a single speaker is selected with :meth:`select_speaker`."""
+        return [await self.select_speaker(thread)]
+
     @abstractmethod
     async def reset(self) -> None:
         """Reset the group chat manager."""
@@ -1,8 +1,16 @@
-from typing import Any, List, Mapping
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, List, Mapping
 
 from autogen_core import DefaultTopicId, MessageContext, event, rpc
 
-from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, MessageFactory
+from autogen_agentchat.messages import (
+    BaseAgentEvent,
+    BaseChatMessage,
+    CodeExecutionStreamingChunkEvent,
+    MessageFactory,
+    ModelClientStreamingChunkEvent,
+)
 
 from ...base import ChatAgent, Response
 from ...state import ChatAgentContainerState
@@ -11,15 +19,32 @@
     GroupChatError,
     GroupChatMessage,
     GroupChatPause,
+    GroupChatRequestCancel,
     GroupChatRequestPublish,
     GroupChatReset,
     GroupChatResume,
     GroupChatStart,
     SerializableException,
 )
+from ._output_message_queue import OutputMessageQueue
 from ._sequential_routed_agent import SequentialRoutedAgent
 
 
+class MessageBufferTracker:
+    """Records the changes a :class:`ChatAgentContainer` makes to its message buffer, so that a state delta
+    can take the appended messages from the end of the buffer instead of saving the container's full state."""
+
+    def __init__(self) -> None:
+        self.message_buffer: List[BaseChatMessage] = []
+        self.appended = 0
+        # Whether the buffer was cleared or replaced since the previous checkpoint.
+        self.replaced = False
+
+    def checkpoint(self) -> None:
+        self.appended = 0
+        self.replaced = False
+
+
 class ChatAgentContainer(SequentialRoutedAgent):
     """A core agent class that delegates message handling to an
     :class:`autogen_agentchat.base.ChatAgent` so that it can be used in a
@@ -31,10 +56,21 @@ class ChatAgentContainer(SequentialRoutedAgent):
         agent (ChatAgent): The agent to delegate message handling to.
         message_factory (MessageFactory): The message factory to use for
             creating messages from JSON data.
+        output_message_queue (OutputMessageQueue | None): The output message queue of the team.
+            If provided, streaming chunks are put directly into it instead of being published
+            to the output topic, so they are not seen by subscribers of the output topic.
+        message_buffer_tracker (MessageBufferTracker | None): Records the changes to the message buffer
+            for the state deltas of the team.
     """
 
     def __init__(
-        self, parent_topic_type: str, output_topic_type: str, agent: ChatAgent, message_factory: MessageFactory
+        self,
+        parent_topic_type: str,
+        output_topic_type: str,
+        agent: ChatAgent,
+        message_factory: MessageFactory,
+        output_message_queue: OutputMessageQueue | None = None,
+        message_buffer_tracker: MessageBufferTracker | None = None,
     ) -> None:
         super().__init__(
             description=agent.description,
@@ -50,6 +86,15 @@ def __init__(
         self._agent = agent
         self._message_buffer: List[BaseChatMessage] = []
         self._message_factory = message_factory
+        self._output_message_queue = output_message_queue
+        self._message_buffer_tracker = message_buffer_tracker
+        if message_buffer_tracker is not None:
+            message_buffer_tracker.message_buffer = self._message_buffer
+        # The running request by request id, the ids of recently cancelled requests, and the buffered
+        # responses to requests by request id, which are removed if the request is cancelled.
+        self._request_tasks: Dict[str, asyncio.Future[Response]] = {}
+        self._cancelled_request_ids: Deque[str] = deque(maxlen=256)
+        self._buffered_responses: Dict[str, BaseChatMessage] = {}
 
     @event
     async def handle_start(self, message: GroupChatStart, ctx: MessageContext) -> None:
@@ -61,38 +106,63 @@ async def handle_start(self, message: GroupChatStart, ctx: MessageContext) -> No
     @event
     async def handle_agent_response(self, message: GroupChatAgentResponse, ctx: MessageContext) -> None:
         """Handle an agent response event by appending the content to the buffer."""
+        if message.request_id is not None:
+            if message.request_id in self._cancelled_request_ids:
+                # A late response to a request the group chat manager cancelled.
+                return
+            self._buffered_responses[message.request_id] = message.agent_response.chat_message
         self._buffer_message(message.agent_response.chat_message)
 
+    @event
+    async def handle_request_cancel(self, message: GroupChatRequestCancel, ctx: MessageContext) -> None:
+        """Handle the cancellation of requests by stopping the agent if it is running one of them, and
+        removing the responses to them from the buffer. This event is not processed sequentially, so it
+        reaches a running request."""
+        self._cancelled_request_ids.extend(message.request_ids)
+        removed = False
+        for request_id in message.request_ids:
+            request_task = self._request_tasks.get(request_id)
+            if request_task is not None:
+                request_task.cancel()
+            response = self._buffered_responses.pop(request_id, None)
+            if response is not None:
+                self._message_buffer[:] = [buffered for buffered in self._message_buffer if buffered is not response]
+                removed = True
+        if removed and self._message_buffer_tracker is not None:
+            self._message_buffer_tracker.appended = 0
+            self._message_buffer_tracker.replaced = True
+
     @rpc
     async def handle_reset(self, message: GroupChatReset, ctx: MessageContext) -> None:
         """Handle a reset event by resetting the agent."""
-        self._message_buffer.clear()
+        self._clear_message_buffer()
         await self._agent.on_reset(ctx.cancellation_token)
 
     @event
     async def handle_request(self, message: GroupChatRequestPublish, ctx: MessageContext) -> None:
         """Handle a content request event by passing the messages in the buffer
         to the delegate agent and publish the response."""
+        if message.request_id is not None and message.request_id in self._cancelled_request_ids:
+            # The request was cancelled before it was processed.
+            return
+        request_task = asyncio.ensure_future(self._run_agent(ctx))
+        if message.request_id is not None:
+            self._request_tasks[message.request_id] = request_task
         try:
-            # Pass the messages in the buffer to the delegate agent.
-            response: Response | None = None
-            async for msg in self._agent.on_messages_stream(self._message_buffer, ctx.cancellation_token):
-                if isinstance(msg, Response):
-                    await self._log_message(msg.chat_message)
-                    response = msg
-                else:
-                    await self._log_message(msg)
-            if response is None:
-                raise ValueError(
-                    "The agent did not produce a final response. Check the agent's on_messages_stream method."
-                )
+            response = await request_task
             # Publish the response to the group chat.
-            self._message_buffer.clear()
+            self._clear_message_buffer()
             await self.publish_message(
-                GroupChatAgentResponse(agent_response=response),
+                GroupChatAgentResponse(agent_response=response, request_id=message.request_id),
                 topic_id=DefaultTopicId(type=self._parent_topic_type),
                 cancellation_token=ctx.cancellation_token,
             )
+        except asyncio.CancelledError:
+            if not request_task.cancelled() or message.request_id not in self._cancelled_request_ids:
+                raise
+            # The group chat manager cancelled the request. The agent has seen the buffered messages,
+            # so they are dropped as they are after a response.
+            self._clear_message_buffer()
         except Exception as e:
             # Publish the error to the group chat.
             error_message = SerializableException.from_exception(e)
@@ -103,19 +173,54 @@ async def handle_request(self, message: GroupChatRequestPublish, ctx: MessageCon
             )
             # Raise the error to the runtime.
             raise
+        finally:
+            if message.request_id is not None:
+                self._request_tasks.pop(message.request_id, None)
+            if self._output_message_queue is not None:
+                self._output_message_queue.flush_chunks(self.id)
+
+    async def _run_agent(self, ctx: MessageContext) -> Response:
+        # Pass the messages in the buffer to the delegate agent.
+        response: Response | None = None
+        async for msg in self._agent.on_messages_stream(self._message_buffer, ctx.cancellation_token):
+            if isinstance(msg, Response):
+                await self._log_message(msg.chat_message)
+                response = msg
+            else:
+                await self._log_message(msg)
+        if response is None:
+            raise ValueError("The agent did not produce a final response. Check the agent's on_messages_stream method.")
+        return response
 
     def _buffer_message(self, message: BaseChatMessage) -> None:
         if not self._message_factory.is_registered(message.__class__):
             raise ValueError(f"Message type {message.__class__} is not registered.")
         # Buffer the message.
         self._message_buffer.append(message)
+        if self._message_buffer_tracker is not None:
+            self._message_buffer_tracker.appended += 1
+
+    def _clear_message_buffer(self) -> None:
+        self._message_buffer.clear()
+        self._buffered_responses.clear()
+        if self._message_buffer_tracker is not None:
+            self._message_buffer_tracker.appended = 0
+            self._message_buffer_tracker.replaced = True
 
     async def _log_message(self, message: BaseAgentEvent | BaseChatMessage) -> None:
         if not self._message_factory.is_registered(message.__class__):
             raise ValueError(f"Message type {message.__class__} is not registered.")
+        relay_id: str | None = None
+        if self._output_message_queue is not None:
+            if isinstance(message, (ModelClientStreamingChunkEvent, CodeExecutionStreamingChunkEvent)):
+                # Streaming chunks bypass the runtime and go directly to the output message queue.
+                self._output_message_queue.put_chunk(self.id, message)
+                return
+            # Chunks emitted after this message are held back until the group chat manager relays it.
+            relay_id = self._output_message_queue.begin_relay(self.id)
         # Log the message.
         await self.publish_message(
-            GroupChatMessage(message=message),
+            GroupChatMessage(message=message, relay_id=relay_id),
             topic_id=DefaultTopicId(type=self._output_topic_type),
         )
 
@@ -142,10 +247,15 @@ async def save_state(self) -> Mapping[str, Any]:
     async def load_state(self, state: Mapping[str, Any]) -> None:
         container_state = ChatAgentContainerState.model_validate(state)
         self._message_buffer = []
+        self._buffered_responses.clear()
         for message_data in container_state.message_buffer:
             message = self._message_factory.create(message_data)
             if isinstance(message, BaseChatMessage):
                 self._message_buffer.append(message)
             else:
                 raise ValueError(f"Invalid message type in message buffer: {type(message)}")
+        if self._message_buffer_tracker is not None:
+            self._message_buffer_tracker.message_buffer = self._message_buffer
+            self._message_buffer_tracker.appended = 0
+            self._message_buffer_tracker.replaced = True
         await self._agent.load_state(container_state.agent_state)
@@ -48,11 +48,23 @@ class GroupChatAgentResponse(BaseModel):
     agent_response: Response
     """The response from an agent."""
 
+    request_id: str | None = None
+    """The id of the :class:`GroupChatRequestPublish` the response answers, if it had one."""
+
 
 class GroupChatRequestPublish(BaseModel):
     """A request to publish a message to a group chat."""
 
-    ...
+    request_id: str | None = None
+    """An id the group chat manager uses to match the response to the request."""
+
+
+class GroupChatRequestCancel(BaseModel):
+    """A notice that the group chat manager no longer expects the responses to some requests,
+    published to the group topic when the group chat terminates while speakers are still running."""
+
+    request_ids: List[str]
+    """The ids of the cancelled requests."""
 
 
 class GroupChatMessage(BaseModel):
@@ -61,6 +73,9 @@ class GroupChatMessage(BaseModel):
     message: BaseAgentEvent | BaseChatMessage
     """The message that was published."""
 
+    relay_id: str | None = None
+    """The id the participant announced the message under in the output message queue of the team, if any."""
+
 
 class GroupChatTermination(BaseModel):
     """A message indicating that a group chat has terminated."""
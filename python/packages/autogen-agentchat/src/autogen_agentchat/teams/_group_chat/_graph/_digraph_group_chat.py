@@ -1,5 +1,6 @@
 import asyncio
-from typing import Any, Callable, Dict, List, Literal, Mapping, Sequence, Set
+import heapq
+from typing import Any, Callable, Dict, FrozenSet, List, Literal, Mapping, Sequence, Set, Tuple
 
 from autogen_core import AgentRuntime, CancellationToken, Component, ComponentModel
 from pydantic import BaseModel
@@ -171,6 +172,89 @@ def graph_validate(self) -> None:
         self._has_cycles = self.has_cycles_with_exit()
 
 
+class _GraphExecutionPlan:
+    """The adjacency of a :class:`DiGraph` compiled once for scheduling, so that each completion of a node
+    only touches its outgoing edges and the parents of their targets."""
+
+    def __init__(self, graph: DiGraph) -> None:
+        parents = graph.get_parents()
+        self.graph = graph
+        self.targets: Dict[str, Tuple[str, ...]] = {
+            name: tuple(edge.target for edge in node.edges) for name, node in graph.nodes.items()
+        }
+        self.conditional: Dict[str, bool] = {
+            name: bool(node.edges) and node.edges[0].condition is not None for name, node in graph.nodes.items()
+        }
+        self.parents: Dict[str, Tuple[str, ...]] = {name: tuple(parent_list) for name, parent_list in parents.items()}
+        self.parent_sets: Dict[str, FrozenSet[str]] = {
+            name: frozenset(parent_list) for name, parent_list in parents.items()
+        }
+        self.activation_any: Dict[str, bool] = {name: node.activation == "any" for name, node in graph.nodes.items()}
+
+
+class _ReadyIndex:
+    """The nodes of a pending execution mapping that are ready to run, ordered like the mapping.
+
+    For each pending node with activation "all", the distinct parents that finished are counted,
+    so readiness is checked in constant time when a parent finishes."""
+
+    def __init__(self, plan: _GraphExecutionPlan, pending: Dict[str, List[str]]) -> None:
+        self.plan = plan
+        self.pending = pending
+        self.order: Dict[str, int] = {name: index for index, name in enumerate(pending)}
+        self.next_order = len(pending)
+        self.finished_parents: Dict[str, Set[str]] = {}
+        self.ready: Set[str] = set()
+        self.heap: List[Tuple[int, str]] = []
+        for name in pending:
+            self.reload(name)
+
+    def inserted(self, name: str) -> None:
+        """Record that a node was added to the end of the pending execution mapping."""
+        self.order[name] = self.next_order
+        self.next_order += 1
+
+    def appended(self, name: str, parent: str) -> None:
+        """Record that a parent was appended to the pending execution list of a node."""
+        if parent in self.plan.parent_sets[name]:
+            self.finished_parents.setdefault(name, set()).add(parent)
+        self.refresh(name)
+
+    def reload(self, name: str) -> None:
+        """Recount the finished parents of a node whose pending execution list was replaced or removed."""
+        if name in self.pending:
+            self.finished_parents[name] = set(self.pending[name]) & self.plan.parent_sets[name]
+        else:
+            self.finished_parents.pop(name, None)
+        self.refresh(name)
+
+    def refresh(self, name: str) -> None:
+        if name not in self.pending:
+            ready = False
+        elif self.plan.activation_any[name]:
+            ready = bool(self.pending[name])
+        else:
+            ready = len(self.finished_parents.get(name, ())) == len(self.plan.parent_sets[name])
+        if ready and name not in self.ready:
+            self.ready.add(name)
+            heapq.heappush(self.heap, (self.order[name], name))
+        elif not ready:
+            self.ready.discard(name)
+
+    def hold(self, name: str) -> None:
+        """Exclude a node from the ready nodes until it is refreshed."""
+        self.ready.discard(name)
+
+    def pop(self) -> str | None:
+        """Remove and return the ready node that comes first in the pending execution mapping."""
+        while self.heap:
+            order, name = heapq.heappop(self.heap)
+            if name in self.ready and self.order.get(name) == order:
+                self.ready.remove(name)
+                return name
+        return None
+
+
 class GraphFlowManagerState(BaseGroupChatManagerState):
     """Tracks active execution state for DAG-based execution."""
 
@@ -230,6 +314,11 @@ def __init__(
         # Start nodes (no parents) are added to this dict at initialization as they are always ready to run.
         self._pending_execution: Dict[str, List[str]] = {node: [] for node in graph.get_start_nodes()}
 
+        # The graph compiled for scheduling, and the ready nodes of _pending_execution. The index is rebuilt
+        # whenever _pending_execution is replaced.
+        self._plan = _GraphExecutionPlan(graph)
+        self._ready_index = _ReadyIndex(self._plan, self._pending_execution)
+
     def _get_valid_target(self, node: DiGraphNode, content: str) -> str:
         """Check if a condition is met in the chat history."""
         for edge in node.edges:
@@ -250,8 +339,9 @@ def _is_node_ready(self, node_name: str) -> bool:
 
     async def _select_speakers(self, thread: List[BaseAgentEvent | BaseChatMessage], many: bool = True) -> List[str]:
         """Select the next set of agents to execute based on DAG constraints."""
+        plan = self._plan
+        index = self._ready_index
         next_speakers: Set[str] = set()
-        source_node: DiGraphNode | None = None
         source: str | None = None
 
         if thread and isinstance(thread[-1], BaseChatMessage):
@@ -269,70 +359,69 @@ async def _select_speakers(self, thread: List[BaseAgentEvent | BaseChatMessage],
                 if self._active_node_count[source] <= 0:
                     self._active_nodes.remove(source)
 
-                source_node = self._graph.nodes[source]
-
-                if source_node.edges:
+                if plan.targets[source]:
                     # Case: conditional edges — only execute if condition is met
-                    target_nodes_names: List[str] = []
-                    if source_node.edges[0].condition is not None:
-                        target_nodes_names = [self._get_valid_target(source_node, content)]
-                        other_nodes = [
-                            edge.target for edge in source_node.edges if edge.target != target_nodes_names[0]
-                        ]
+                    target_nodes_names: Sequence[str]
+                    if plan.conditional[source]:
+                        target_nodes_names = [self._get_valid_target(self._graph.nodes[source], content)]
+                        other_nodes = [target for target in plan.targets[source] if target != target_nodes_names[0]]
                         for other_node in other_nodes:
                             other_active_parents = [
                                 parent
-                                for parent in self._parents[other_node]
+                                for parent in plan.parents[other_node]
                                 if (parent != source and parent in self._active_nodes)
                             ]
                             if not other_active_parents:
                                 self._pending_execution.pop(other_node)
                             else:
+                                if other_node not in self._pending_execution:
+                                    index.inserted(other_node)
                                 self._pending_execution[other_node] = other_active_parents
+                            index.reload(other_node)
 
                     else:
                         # Case: unconditional edges — mark this source as completed for all its children
-                        target_nodes_names = [edge.target for edge in source_node.edges]
+                        target_nodes_names = plan.targets[source]
 
                     for target in target_nodes_names:
                         self._pending_execution[target].append(source)
+                        index.appended(target, source)
             else:
                 # TODO: Check if there are any usecase where the User can decide on the next speaker
                 pass
 
-        # After updating _pending_execution, check which nodes are now unblocked
-        for node_name in list(self._pending_execution):
-            if self._use_default_start and not self._default_start_executed:
+        # After updating _pending_execution, take the nodes that are now unblocked
+        if self._use_default_start and not self._default_start_executed:
+            for node_name in list(self._pending_execution):
                 if node_name == self._graph.default_start_node:
                     next_speakers.add(node_name)
                     self._default_start_executed = True
                     break
-
-            if self._is_node_ready(node_name):
-                next_speakers.add(node_name)
-                node = self._graph.nodes[node_name]
-                if node.activation == "all":
-                    self._pending_execution.pop(node_name)
-                else:
-                    # If activation is any, remove the parent that just finished
-                    if source is not None:
-                        self._pending_execution[node_name] = [
-                            parent for parent in self._pending_execution[node_name] if parent != source
-                        ]
-
-                    # If none of the other parents of this node are active, remove this node from pending execution
-                    node_parents = self._parents[node_name]
-                    if not any(parent in self._active_nodes for parent in node_parents):
-                        self._pending_execution.pop(node_name)
-
+                if self._is_node_ready(node_name):
+                    next_speakers.add(node_name)
+                    self._activate_pending_node(plan, index, node_name, source)
+                    if not many:
+                        break
+        else:
+            while True:
+                ready_node = index.pop()
+                if ready_node is None:
+                    break
+                next_speakers.add(ready_node)
+                self._activate_pending_node(plan, index, ready_node, source)
                 if not many:
                     break
+        # Nodes that stay pending after being selected, e.g. with activation "any", may be ready again next time.
+        for node_name in next_speakers:
+            index.reload(node_name)
 
         # Prepopulate children of next_speakers into _pending_execution
         for node_name in next_speakers:
-            for edge in self._graph.nodes[node_name].edges:
-                if edge.target not in self._pending_execution:
-                    self._pending_execution[edge.target] = []
+            for target in plan.targets[node_name]:
+                if target not in self._pending_execution:
+                    self._pending_execution[target] = []
+                    index.inserted(target)
+                    index.reload(target)
 
         # Mark newly selected speakers as active
         for speaker in next_speakers:
@@ -346,6 +435,24 @@ async def _select_speakers(self, thread: List[BaseAgentEvent | BaseChatMessage],
 
         return list(next_speakers)
 
+    def _activate_pending_node(
+        self, plan: _GraphExecutionPlan, index: _ReadyIndex, node_name: str, source: str | None
+    ) -> None:
+        """Update the pending execution of a ready node that was selected to run."""
+        if not plan.activation_any[node_name]:
+            self._pending_execution.pop(node_name)
+        else:
+            # If activation is any, remove the parent that just finished
+            if source is not None:
+                self._pending_execution[node_name] = [
+                    parent for parent in self._pending_execution[node_name] if parent != source
+                ]
+
+            # If none of the other parents of this node are active, remove this node from pending execution
+            if not any(parent in self._active_nodes for parent in plan.parents[node_name]):
+                self._pending_execution.pop(node_name)
+        index.hold(node_name)
+
     async def select_speakers(self, thread: List[BaseAgentEvent | BaseChatMessage]) -> List[str]:
         return await self._select_speakers(thread)
 
@@ -378,6 +485,7 @@ async def load_state(self, state: Mapping[str, Any]) -> None:
         self._current_turn = state["current_turn"]
         self._active_nodes = set(state["active_nodes"])
         self._pending_execution = state["pending_execution"]
+        self._ready_index = _ReadyIndex(self._plan, self._pending_execution)
         self._active_node_count = state["active_node_count"]
         self._default_start_executed = state.get("default_start_executed", False)
 
@@ -391,6 +499,7 @@ async def reset(self) -> None:
         self._active_nodes = set()
         self._active_node_count = {node: 0 for node in self._graph.nodes}
         self._pending_execution = {node: [] for node in self._start_nodes}
+        self._ready_index = _ReadyIndex(self._plan, self._pending_execution)
         self._default_start_executed = False
 
 
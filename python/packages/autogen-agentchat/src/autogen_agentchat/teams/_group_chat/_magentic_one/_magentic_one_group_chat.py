@@ -12,6 +12,7 @@
 from ....messages import BaseAgentEvent, BaseChatMessage, MessageFactory
 from .._base_group_chat import BaseGroupChat
 from .._events import GroupChatTermination
+from .._message_thread import MessageThreadRetention
 from ._magentic_one_orchestrator import MagenticOneOrchestrator
 from ._prompts import ORCHESTRATOR_FINAL_ANSWER_PROMPT
 
@@ -29,6 +30,9 @@ class MagenticOneGroupChatConfig(BaseModel):
     max_stalls: int
     final_answer_prompt: str
     emit_team_events: bool = False
+    streaming_chunk_batch_chars: int | None = None
+    streaming_chunk_batch_interval: float | None = None
+    message_thread_retention: MessageThreadRetention | None = None
 
 
 class MagenticOneGroupChat(BaseGroupChat, Component[MagenticOneGroupChatConfig]):
@@ -51,6 +55,12 @@ class MagenticOneGroupChat(BaseGroupChat, Component[MagenticOneGroupChatConfig])
             If you are using custom message types or your agents produces custom message types, you need to specify them here.
             Make sure your custom message types are subclasses of :class:`~autogen_agentchat.messages.BaseAgentEvent` or :class:`~autogen_agentchat.messages.BaseChatMessage`.
         emit_team_events (bool, optional): Whether to emit team events through :meth:`BaseGroupChat.run_stream`. Defaults to False.
+        streaming_chunk_batch_chars (int, optional): If set, consecutive streaming chunks from a participant are
+            coalesced into one event once they reach this many characters. Defaults to None.
+        streaming_chunk_batch_interval (float, optional): If set, consecutive streaming chunks from a participant are
+            coalesced into one event emitted at most this many seconds after its first chunk. Defaults to None.
+        message_thread_retention (MessageThreadRetention, optional): The retention policy of the message thread kept by the
+            group chat manager, optionally spilling all messages to an on-disk log. Defaults to None, keeping all messages in memory.
 
     Raises:
         ValueError: In orchestration logic if progress ledger does not have required keys or if next speaker is not valid.
@@ -110,6 +120,9 @@ def __init__(
         final_answer_prompt: str = ORCHESTRATOR_FINAL_ANSWER_PROMPT,
         custom_message_types: List[type[BaseAgentEvent | BaseChatMessage]] | None = None,
         emit_team_events: bool = False,
+        streaming_chunk_batch_chars: int | None = None,
+        streaming_chunk_batch_interval: float | None = None,
+        message_thread_retention: MessageThreadRetention | None = None,
     ):
         super().__init__(
             participants,
@@ -120,6 +133,9 @@ def __init__(
             runtime=runtime,
             custom_message_types=custom_message_types,
             emit_team_events=emit_team_events,
+            streaming_chunk_batch_chars=streaming_chunk_batch_chars,
+            streaming_chunk_batch_interval=streaming_chunk_batch_interval,
+            message_thread_retention=message_thread_retention,
         )
 
         # Validate the participants.
@@ -170,6 +186,9 @@ def _to_config(self) -> MagenticOneGroupChatConfig:
             max_stalls=self._max_stalls,
             final_answer_prompt=self._final_answer_prompt,
             emit_team_events=self._emit_team_events,
+            streaming_chunk_batch_chars=self._streaming_chunk_batch_chars,
+            streaming_chunk_batch_interval=self._streaming_chunk_batch_interval,
+            message_thread_retention=self._message_thread_retention,
         )
 
     @classmethod
@@ -187,4 +206,7 @@ def _from_config(cls, config: MagenticOneGroupChatConfig) -> Self:
             max_stalls=config.max_stalls,
             final_answer_prompt=config.final_answer_prompt,
             emit_team_events=config.emit_team_events,
+            streaming_chunk_batch_chars=config.streaming_chunk_batch_chars,
+            streaming_chunk_batch_interval=config.streaming_chunk_batch_interval,
+            message_thread_retention=config.message_thread_retention,
         )
@@ -0,0 +1,124 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import List, Sequence
+
+from pydantic import BaseModel, Field
+from pydantic_core import to_json
+
+from ...messages import BaseAgentEvent, BaseChatMessage, MessageFactory
+
+
+class MessageThreadRetention(BaseModel):
+    """Policy for the message thread a group chat manager keeps in memory.
+
+    The in-memory thread is what the manager passes to ``select_speaker`` and includes in its saved state.
+    With ``spill_directory`` set, every message is also appended to an on-disk log, so the full history
+    remains available through :class:`MessageThreadLog` while the in-memory thread stays bounded.
+
+    .. note::
+
+        Speaker selection only sees the retained messages. For example, :class:`~autogen_agentchat.teams.Swarm`
+        looks up the last :class:`~autogen_agentchat.messages.HandoffMessage` in the thread, so the window
+        must be large enough to contain it.
+    """
+
+    max_messages: int | None = Field(default=None, gt=0)
+    """Keep only the most recent messages in memory. Defaults to keeping all messages."""
+
+    exclude_types: List[str] = Field(default_factory=list)
+    """Names of message classes (e.g. ``"ToolCallExecutionEvent"``) that are not kept in memory."""
+
+    spill_directory: str | None = None
+    """The directory of an append-only log of all messages. Defaults to no log."""
+
+    segment_max_messages: int = Field(default=1000, gt=0)
+    """The number of messages per log segment file."""
+
+
+class MessageThreadTracker:
+    """Counts the messages a group chat manager appends to its in-memory message thread, so that a state
+    delta can take the appended messages from the end of the thread instead of comparing the whole thread
+    with the previous checkpoint."""
+
+    def __init__(self) -> None:
+        self.appended = 0
+
+
+class MessageThreadLog:
+    """An append-only log of group chat messages stored as JSON lines in segment files.
+
+    Each message is serialized once, when it is appended. Appends from a new instance continue
+    after the messages already in the directory.
+
+    Args:
+        directory (str | Path): The directory of the segment files. It is created if it does not exist.
+        message_factory (MessageFactory): The message factory used to read the messages back.
+        segment_max_messages (int): The number of messages per segment file. Defaults to 1000.
+    """
+
+    def __init__(
+        self, directory: str | Path, message_factory: MessageFactory, segment_max_messages: int = 1000
+    ) -> None:
+        if segment_max_messages < 1:
+            raise ValueError("segment_max_messages must be at least 1.")
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._message_factory = message_factory
+        self._segment_max_messages = segment_max_messages
+        segments = self._segments()
+        if segments:
+            self._segment_index = int(segments[-1].stem.split("-")[1])
+            with segments[-1].open("rb") as f:
+                self._segment_length = sum(1 for _ in f)
+            self._length = (len(segments) - 1) * segment_max_messages + self._segment_length
+        else:
+            self._segment_index = 0
+            self._segment_length = 0
+            self._length = 0
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return self._length
+
+    async def append(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> None:
+        """Append messages to the log. The file I/O runs in a worker thread."""
+        if not messages:
+            return
+        lines = [to_json(message.dump()) + b"\n" for message in messages]
+        async with self._lock:
+            await asyncio.to_thread(self._write, lines)
+
+    def read(self, start: int = 0, stop: int | None = None) -> List[BaseAgentEvent | BaseChatMessage]:
+        """Read the messages with positions in ``[start, stop)`` from the log."""
+        stop = self._length if stop is None else min(stop, self._length)
+        messages: List[BaseAgentEvent | BaseChatMessage] = []
+        if start >= stop:
+            return messages
+        for segment_index in range(start // self._segment_max_messages, (stop - 1) // self._segment_max_messages + 1):
+            offset = segment_index * self._segment_max_messages
+            with self._segment_path(segment_index).open("rb") as f:
+                for position, line in enumerate(f, start=offset):
+                    if position >= stop:
+                        break
+                    if position >= start:
+                        messages.append(self._message_factory.create(json.loads(line)))
+        return messages
+
+    def _write(self, lines: List[bytes]) -> None:
+        while lines:
+            if self._segment_length == self._segment_max_messages:
+                self._segment_index += 1
+                self._segment_length = 0
+            count = min(len(lines), self._segment_max_messages - self._segment_length)
+            with self._segment_path(self._segment_index).open("ab") as f:
+                f.writelines(lines[:count])
+            self._segment_length += count
+            self._length += count
+            lines = lines[count:]
+
+    def _segment_path(self, index: int) -> Path:
+        return self._directory / f"segment-{index:08d}.jsonl"
+
+    def _segments(self) -> List[Path]:
+        return sorted(self._directory.glob("segment-*.jsonl"))
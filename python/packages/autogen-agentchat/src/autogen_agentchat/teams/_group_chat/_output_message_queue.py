@@ -0,0 +1,216 @@
+import asyncio
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+from autogen_core import AgentId
+
+from ...messages import (
+    BaseAgentEvent,
+    BaseChatMessage,
+    CodeExecutionStreamingChunkEvent,
+    ModelClientStreamingChunkEvent,
+)
+from ._events import GroupChatTermination
+
+StreamingChunk = ModelClientStreamingChunkEvent | CodeExecutionStreamingChunkEvent
+"""The streaming chunk events that participants put directly into an :class:`OutputMessageQueue`."""
+
+
+def _can_coalesce(first: StreamingChunk, chunk: StreamingChunk) -> bool:
+    if isinstance(first, CodeExecutionStreamingChunkEvent):
+        return (
+            isinstance(chunk, CodeExecutionStreamingChunkEvent)
+            and chunk.code_block_index == first.code_block_index
+            and chunk.stream == first.stream
+            and chunk.retry_attempt == first.retry_attempt
+        )
+    return isinstance(chunk, ModelClientStreamingChunkEvent)
+
+
+class _PendingRelay:
+    """Marks the position of a message that is still being relayed through the output topic."""
+
+    def __init__(self) -> None:
+        self.message: BaseAgentEvent | BaseChatMessage | None = None
+
+
+class _Lane:
+    def __init__(self) -> None:
+        # Chunks held back behind messages that have not been relayed yet. The head is always a pending relay.
+        self.backlog: Deque[StreamingChunk | _PendingRelay] = deque()
+        # Chunks being coalesced into a single event.
+        self.batch: List[StreamingChunk] = []
+        self.batch_chars = 0
+        self.flush_handle: asyncio.TimerHandle | None = None
+
+
+class OutputMessageQueue(asyncio.Queue[BaseAgentEvent | BaseChatMessage | GroupChatTermination]):
+    """The queue of messages that a group chat emits through :meth:`BaseGroupChat.run_stream`,
+    with a direct channel for :class:`~autogen_agentchat.messages.ModelClientStreamingChunkEvent` and
+    :class:`~autogen_agentchat.messages.CodeExecutionStreamingChunkEvent`.
+
+    Participants put streaming chunks directly into the queue instead of publishing them to the
+    output topic, avoiding a runtime round-trip per token, so subscribers of the output topic and
+    intervention handlers of the runtime do not see the chunks. Other messages are still published
+    to the output topic and relayed into the queue by the group chat manager. A participant announces
+    each message it publishes with :meth:`begin_relay`, which returns the id the manager passes back
+    to :meth:`end_relay`. Chunks from a participant are held back until the messages it published
+    before them have been relayed, so each participant's output keeps its order.
+
+    Consecutive chunks from a participant can be coalesced into a single event by setting
+    ``chunk_batch_chars`` (emit once the batch has this many characters) and/or
+    ``chunk_batch_interval`` (emit at most this many seconds after the first chunk of a batch).
+    Batches are also emitted before the participant's next message. Only chunks of the same type are
+    coalesced, and code execution chunks only with chunks of the same code block, stream and retry.
+
+    The queue may be used from the threads of other event loops, such as the shards of a
+    :class:`~autogen_core.ShardedAgentRuntime`: once :meth:`bind_loop` has been called, calls made
+    from other threads are scheduled on the bound loop.
+    """
+
+    def __init__(self, chunk_batch_chars: int | None = None, chunk_batch_interval: float | None = None) -> None:
+        super().__init__()
+        if chunk_batch_chars is not None and chunk_batch_chars < 1:
+            raise ValueError("chunk_batch_chars must be at least 1.")
+        if chunk_batch_interval is not None and chunk_batch_interval <= 0:
+            raise ValueError("chunk_batch_interval must be positive.")
+        self._chunk_batch_chars = chunk_batch_chars
+        self._chunk_batch_interval = chunk_batch_interval
+        self._lanes: Dict[AgentId, _Lane] = {}
+        # The lane and marker of each message announced by begin_relay, by relay id.
+        self._pending_relays: Dict[str, Tuple[_Lane, _PendingRelay]] = {}
+        self._owner_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def chunk_batch_chars(self) -> int | None:
+        return self._chunk_batch_chars
+
+    @property
+    def chunk_batch_interval(self) -> float | None:
+        return self._chunk_batch_interval
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Set the event loop that reads the queue. Calls made from other threads are scheduled on it."""
+        self._owner_loop = loop
+
+    def put_nowait(self, item: BaseAgentEvent | BaseChatMessage | GroupChatTermination) -> None:
+        self._call_in_owner_loop(super().put_nowait, item)
+
+    def put_chunk(self, sender: AgentId, chunk: StreamingChunk) -> None:
+        """Put a streaming chunk from a participant into the queue, or into its current batch."""
+        self._call_in_owner_loop(self._put_chunk, sender, chunk)
+
+    def flush_chunks(self, sender: AgentId) -> None:
+        """Emit the chunks a participant has batched so far."""
+        self._call_in_owner_loop(self._flush_chunks, sender)
+
+    def begin_relay(self, sender: AgentId) -> str:
+        """Record that a participant is publishing a message to the output topic, and return the relay id
+        to publish with it.
+
+        Chunks the participant emits afterwards are held back until :meth:`end_relay` is called with the id."""
+        relay_id = uuid.uuid4().hex
+        self._call_in_owner_loop(self._begin_relay, sender, relay_id)
+        return relay_id
+
+    def end_relay(self, relay_id: str, message: BaseAgentEvent | BaseChatMessage) -> None:
+        """Put a message relayed from the output topic into the queue and release the chunks held behind it."""
+        self._call_in_owner_loop(self._end_relay, relay_id, message)
+
+    def clear(self) -> None:
+        """Remove all messages from the queue and drop any held or batched chunks."""
+        self._call_in_owner_loop(self._clear)
+
+    def _call_in_owner_loop(self, callback: Callable[..., None], *args: Any) -> None:
+        try:
+            running_loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if self._owner_loop is None or running_loop is self._owner_loop or self._owner_loop.is_closed():
+            callback(*args)
+        else:
+            self._owner_loop.call_soon_threadsafe(callback, *args)
+
+    def _put_chunk(self, sender: AgentId, chunk: StreamingChunk) -> None:
+        if self._chunk_batch_chars is None and self._chunk_batch_interval is None:
+            self._emit(self._lane(sender), chunk)
+            return
+        lane = self._lane(sender)
+        if lane.batch and not _can_coalesce(lane.batch[0], chunk):
+            self._flush_batch(lane)
+        lane.batch.append(chunk)
+        lane.batch_chars += len(chunk.content)
+        if self._chunk_batch_chars is not None and lane.batch_chars >= self._chunk_batch_chars:
+            self._flush_batch(lane)
+        elif self._chunk_batch_interval is not None and lane.flush_handle is None:
+            lane.flush_handle = asyncio.get_running_loop().call_later(
+                self._chunk_batch_interval, self._flush_batch, lane
+            )
+
+    def _flush_chunks(self, sender: AgentId) -> None:
+        lane = self._lanes.get(sender)
+        if lane is not None:
+            self._flush_batch(lane)
+
+    def _begin_relay(self, sender: AgentId, relay_id: str) -> None:
+        lane = self._lane(sender)
+        self._flush_batch(lane)
+        marker = _PendingRelay()
+        lane.backlog.append(marker)
+        self._pending_relays[relay_id] = (lane, marker)
+
+    def _end_relay(self, relay_id: str, message: BaseAgentEvent | BaseChatMessage) -> None:
+        pending = self._pending_relays.pop(relay_id, None)
+        if pending is None:
+            # The message was not announced, so there is nothing to order it against.
+            super().put_nowait(message)
+            return
+        lane, marker = pending
+        marker.message = message
+        # Release the relayed messages and chunks at the head of the lane, up to the first message
+        # that is still being relayed.
+        while lane.backlog:
+            item = lane.backlog[0]
+            if isinstance(item, _PendingRelay):
+                if item.message is None:
+                    break
+                super().put_nowait(item.message)
+            else:
+                super().put_nowait(item)
+            lane.backlog.popleft()
+
+    def _clear(self) -> None:
+        for lane in self._lanes.values():
+            if lane.flush_handle is not None:
+                lane.flush_handle.cancel()
+        self._lanes.clear()
+        self._pending_relays.clear()
+        while not self.empty():
+            self.get_nowait()
+
+    def _lane(self, sender: AgentId) -> _Lane:
+        lane = self._lanes.get(sender)
+        if lane is None:
+            lane = self._lanes[sender] = _Lane()
+        return lane
+
+    def _emit(self, lane: _Lane, chunk: StreamingChunk) -> None:
+        if lane.backlog:
+            lane.backlog.append(chunk)
+        else:
+            super().put_nowait(chunk)
+
+    def _flush_batch(self, lane: _Lane) -> None:
+        if lane.flush_handle is not None:
+            lane.flush_handle.cancel()
+            lane.flush_handle = None
+        if not lane.batch:
+            return
+        if len(lane.batch) == 1:
+            chunk = lane.batch[0]
+        else:
+            chunk = lane.batch[0].model_copy(update={"content": "".join(c.content for c in lane.batch)})
+        lane.batch = []
+        lane.batch_chars = 0
+        self._emit(lane, chunk)
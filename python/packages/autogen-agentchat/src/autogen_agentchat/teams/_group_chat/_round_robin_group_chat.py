@@ -11,6 +11,7 @@
 from ._base_group_chat import BaseGroupChat
 from ._base_group_chat_manager import BaseGroupChatManager
 from ._events import GroupChatTermination
+from ._message_thread import MessageThreadRetention
 
 
 class RoundRobinGroupChatManager(BaseGroupChatManager):
@@ -76,6 +77,17 @@ async def select_speaker(self, thread: List[BaseAgentEvent | BaseChatMessage]) -
         current_speaker = self._participant_names[current_speaker_index]
         return current_speaker
 
+    async def select_speakers(self, thread: List[BaseAgentEvent | BaseChatMessage]) -> List[str]:
+        """Select all participants for one round, in round-robin order starting from the next speaker,
+        and advance the next speaker past the round like :meth:`select_speaker` does."""
+        start = self._next_speaker_index
+        speakers = [
+            self._participant_names[(start + offset) % len(self._participant_names)]
+            for offset in range(len(self._participant_names))
+        ]
+        self._next_speaker_index = (start + len(speakers)) % len(self._participant_names)
+        return speakers
+
 
 class RoundRobinGroupChatConfig(BaseModel):
     """The declarative configuration RoundRobinGroupChat."""
@@ -84,6 +96,10 @@ class RoundRobinGroupChatConfig(BaseModel):
     termination_condition: ComponentModel | None = None
     max_turns: int | None = None
     emit_team_events: bool = False
+    streaming_chunk_batch_chars: int | None = None
+    streaming_chunk_batch_interval: float | None = None
+    message_thread_retention: MessageThreadRetention | None = None
+    max_concurrent_speakers: int = 1
 
 
 class RoundRobinGroupChat(BaseGroupChat, Component[RoundRobinGroupChatConfig]):
@@ -101,6 +117,15 @@ class RoundRobinGroupChat(BaseGroupChat, Component[RoundRobinGroupChatConfig]):
             If you are using custom message types or your agents produces custom message types, you need to specify them here.
             Make sure your custom message types are subclasses of :class:`~autogen_agentchat.messages.BaseAgentEvent` or :class:`~autogen_agentchat.messages.BaseChatMessage`.
         emit_team_events (bool, optional): Whether to emit team events through :meth:`BaseGroupChat.run_stream`. Defaults to False.
+        streaming_chunk_batch_chars (int, optional): If set, consecutive streaming chunks from a participant are
+            coalesced into one event once they reach this many characters. Defaults to None.
+        streaming_chunk_batch_interval (float, optional): If set, consecutive streaming chunks from a participant are
+            coalesced into one event emitted at most this many seconds after its first chunk. Defaults to None.
+        message_thread_retention (MessageThreadRetention, optional): The retention policy of the message thread kept by the
+            group chat manager, optionally spilling all messages to an on-disk log. Defaults to None, keeping all messages in memory.
+        max_concurrent_speakers (int, optional): The maximum number of participants that run concurrently. Above 1,
+            each round runs all participants concurrently, at most this many at a time, and the next round starts
+            after all of them have responded. Defaults to 1, running one participant at a time.
 
     Raises:
         ValueError: If no participants are provided or if participant names are not unique.
@@ -175,6 +200,10 @@ def __init__(
         runtime: AgentRuntime | None = None,
         custom_message_types: List[type[BaseAgentEvent | BaseChatMessage]] | None = None,
         emit_team_events: bool = False,
+        streaming_chunk_batch_chars: int | None = None,
+        streaming_chunk_batch_interval: float | None = None,
+        message_thread_retention: MessageThreadRetention | None = None,
+        max_concurrent_speakers: int = 1,
     ) -> None:
         super().__init__(
             participants,
@@ -185,6 +214,10 @@ def __init__(
             runtime=runtime,
             custom_message_types=custom_message_types,
             emit_team_events=emit_team_events,
+            streaming_chunk_batch_chars=streaming_chunk_batch_chars,
+            streaming_chunk_batch_interval=streaming_chunk_batch_interval,
+            message_thread_retention=message_thread_retention,
+            max_concurrent_speakers=max_concurrent_speakers,
         )
 
     def _create_group_chat_manager_factory(
@@ -225,6 +258,10 @@ def _to_config(self) -> RoundRobinGroupChatConfig:
             termination_condition=termination_condition,
             max_turns=self._max_turns,
             emit_team_events=self._emit_team_events,
+            streaming_chunk_batch_chars=self._streaming_chunk_batch_chars,
+            streaming_chunk_batch_interval=self._streaming_chunk_batch_interval,
+            message_thread_retention=self._message_thread_retention,
+            max_concurrent_speakers=self._max_concurrent_speakers,
         )
 
     @classmethod
@@ -238,4 +275,8 @@ def _from_config(cls, config: RoundRobinGroupChatConfig) -> Self:
             termination_condition=termination_condition,
             max_turns=config.max_turns,
             emit_team_events=config.emit_team_events,
+            streaming_chunk_batch_chars=config.streaming_chunk_batch_chars,
+            streaming_chunk_batch_interval=config.streaming_chunk_batch_interval,
+            message_thread_retention=config.message_thread_retention,
+            max_concurrent_speakers=config.max_concurrent_speakers,
         )
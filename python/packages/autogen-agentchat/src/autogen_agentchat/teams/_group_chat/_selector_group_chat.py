@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import re
+from functools import lru_cache
 from inspect import iscoroutinefunction
 from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Union, cast
 
@@ -36,11 +37,12 @@
 from ._base_group_chat import BaseGroupChat
 from ._base_group_chat_manager import BaseGroupChatManager
 from ._events import GroupChatTermination
+from ._message_thread import MessageThreadRetention
 
 trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
 
-SyncSelectorFunc = Callable[[Sequence[BaseAgentEvent | BaseChatMessage]], str | None]
-AsyncSelectorFunc = Callable[[Sequence[BaseAgentEvent | BaseChatMessage]], Awaitable[str | None]]
+SyncSelectorFunc = Callable[[Sequence[BaseAgentEvent | BaseChatMessage]], str | List[str] | None]
+AsyncSelectorFunc = Callable[[Sequence[BaseAgentEvent | BaseChatMessage]], Awaitable[str | List[str] | None]]
 SelectorFuncType = Union[SyncSelectorFunc | AsyncSelectorFunc]
 
 SyncCandidateFunc = Callable[[Sequence[BaseAgentEvent | BaseChatMessage]], List[str]]
@@ -48,6 +50,79 @@
 CandidateFuncType = Union[SyncCandidateFunc | AsyncCandidateFunc]
 
 
+_NON_WORD = re.compile(r"\W")
+
+
+class _MentionMatcher:
+    """Counts mentions of agent names in a model response with patterns compiled once per set of names.
+
+    A name is mentioned by the name itself, by the name with underscores replaced by spaces, or by the
+    name with escaped underscores, surrounded by non-word characters. When no spelling of a name can
+    overlap a spelling of another name, all names are matched in a single pass with one alternation.
+    Otherwise, each name is matched separately so overlapping mentions are all counted.
+    """
+
+    def __init__(self, agent_names: Sequence[str]) -> None:
+        spellings = {name: list(dict.fromkeys(self._spellings(name))) for name in agent_names}
+        self._name_patterns = [(name, self._compile(spellings[name])) for name in agent_names]
+        self._combined: re.Pattern[str] | None = None
+        if not self._can_overlap(spellings):
+            self._spelling_to_name = {spelling: name for name in agent_names for spelling in spellings[name]}
+            self._combined = self._compile([spelling for name in agent_names for spelling in spellings[name]])
+
+    def count(self, message_content: str) -> Dict[str, int]:
+        # Pad the message to help with matching
+        padded = f" {message_content} "
+        mentions: Dict[str, int] = dict()
+        if self._combined is not None:
+            for spelling in self._combined.findall(padded):
+                name = self._spelling_to_name[spelling]
+                mentions[name] = mentions.get(name, 0) + 1
+            return mentions
+        for name, pattern in self._name_patterns:
+            count = len(pattern.findall(padded))
+            if count > 0:
+                mentions[name] = count
+        return mentions
+
+    @staticmethod
+    def _spellings(name: str) -> List[str]:
+        return [name, name.replace("_", " "), name.replace("_", r"\_")]
+
+    @staticmethod
+    def _compile(spellings: List[str]) -> re.Pattern[str]:
+        return re.compile(r"(?<=\W)(" + "|".join(re.escape(spelling) for spelling in spellings) + r")(?=\W)")
+
+    @staticmethod
+    def _can_overlap(spellings: Mapping[str, List[str]]) -> bool:
+        def non_word(text: str, index: int) -> bool:
+            # Characters outside the spelling come from the message and can be anything.
+            return index < 0 or index >= len(text) or _NON_WORD.fullmatch(text[index]) is not None
+
+        for name, own in spellings.items():
+            for other_name, others in spellings.items():
+                if other_name == name:
+                    continue
+                for a in own:
+                    for b in others:
+                        # A mention of a inside a mention of b.
+                        index = b.find(a)
+                        while index != -1:
+                            if non_word(b, index - 1) and non_word(b, index + len(a)):
+                                return True
+                            index = b.find(a, index + 1)
+                        # A mention of a that ends inside a mention of b.
+                        for k in range(1, min(len(a), len(b))):
+                            if a[-k:] == b[:k] and non_word(a, len(a) - k - 1) and non_word(b, k):
+                                return True
+        return False
+
+
+@lru_cache(maxsize=64)
+def _get_mention_matcher(agent_names: tuple[str, ...]) -> _MentionMatcher:
+    return _MentionMatcher(agent_names)
+
+
 class SelectorGroupChatManager(BaseGroupChatManager):
     """A group chat manager that selects the next speaker using a ChatCompletion
     model and a custom selector function."""
@@ -102,6 +177,16 @@ def __init__(
         else:
             self._model_context = UnboundedChatCompletionContext()
         self._cancellation_token = CancellationToken()
+        # Each agent sould appear on a single line.
+        self._roles = "\n".join(
+            re.sub(r"\s+", " ", f"{topic_type}: {description}").strip()
+            for topic_type, description in zip(self._participant_names, self._participant_descriptions, strict=True)
+        )
+        self._mention_matcher = _get_mention_matcher(tuple(self._participant_names))
+        # The messages last passed to construct_message_history with their rendered entries.
+        self._history_messages: List[LLMMessage] = []
+        self._history_entries: List[str | None] = []
+        self._history = ""
 
     async def validate_group_state(self, messages: List[BaseChatMessage] | None) -> None:
         pass
@@ -113,6 +198,9 @@ async def reset(self) -> None:
         if self._termination_condition is not None:
             await self._termination_condition.reset()
         self._previous_speaker = None
+        self._history_messages.clear()
+        self._history_entries.clear()
+        self._history = ""
 
     async def save_state(self) -> Mapping[str, Any]:
         state = SelectorManagerState(
@@ -146,7 +234,7 @@ async def _add_messages_to_context(
             await model_context.add_message(msg.to_model_message())
 
     async def update_message_thread(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> None:
-        self._message_thread.extend(messages)
+        await super().update_message_thread(messages)
         base_chat_messages = [m for m in messages if isinstance(m, BaseChatMessage)]
         await self._add_messages_to_context(self._model_context, base_chat_messages)
 
@@ -156,6 +244,14 @@ async def select_speaker(self, thread: List[BaseAgentEvent | BaseChatMessage]) -
 
         A key assumption is that the agent type is the same as the topic type, which we use as the agent name.
         """
+        return (await self._select(thread, many=False))[0]
+
+    async def select_speakers(self, thread: List[BaseAgentEvent | BaseChatMessage]) -> List[str]:
+        """Selects the next speakers to run concurrently, like :meth:`select_speaker`, except that
+        the selector function may return several names and all candidates mentioned by the model are selected."""
+        return await self._select(thread, many=True)
+
+    async def _select(self, thread: List[BaseAgentEvent | BaseChatMessage], many: bool) -> List[str]:
         # Use the selector function if provided.
         if self._selector_func is not None:
             if self._is_selector_func_async:
@@ -165,13 +261,20 @@ async def select_speaker(self, thread: List[BaseAgentEvent | BaseChatMessage]) -
                 sync_selector_func = cast(SyncSelectorFunc, self._selector_func)
                 speaker = sync_selector_func(thread)
             if speaker is not None:
-                if speaker not in self._participant_names:
+                speakers = [speaker] if isinstance(speaker, str) else speaker
+                if not speakers or (not many and len(speakers) > 1):
                     raise ValueError(
-                        f"Selector function returned an invalid speaker name: {speaker}. "
-                        f"Expected one of: {self._participant_names}."
+                        f"Selector function returned {len(speakers)} speakers: {speakers}. "
+                        "Multiple speakers require max_concurrent_speakers above 1."
                     )
+                for name in speakers:
+                    if name not in self._participant_names:
+                        raise ValueError(
+                            f"Selector function returned an invalid speaker name: {name}. "
+                            f"Expected one of: {self._participant_names}."
+                        )
                 # Skip the model based selection.
-                return speaker
+                return speakers
 
         # Use the candidate function to filter participants if provided
         if self._candidate_func is not None:
@@ -197,36 +300,57 @@ async def select_speaker(self, thread: List[BaseAgentEvent | BaseChatMessage]) -
 
         assert len(participants) > 0
 
-        # Construct agent roles.
-        # Each agent sould appear on a single line.
-        roles = ""
-        for topic_type, description in zip(self._participant_names, self._participant_descriptions, strict=True):
-            roles += re.sub(r"\s+", " ", f"{topic_type}: {description}").strip() + "\n"
-        roles = roles.strip()
-
         # Select the next speaker.
         if len(participants) > 1:
-            agent_name = await self._select_speaker(roles, participants, self._max_selector_attempts)
+            agent_names = await self._select_speakers_with_model(
+                self._roles, participants, self._max_selector_attempts, many=many
+            )
         else:
-            agent_name = participants[0]
-        self._previous_speaker = agent_name
-        trace_logger.debug(f"Selected speaker: {agent_name}")
-        return agent_name
+            agent_names = [participants[0]]
+        self._previous_speaker = agent_names[-1]
+        trace_logger.debug(f"Selected speakers: {agent_names}")
+        return agent_names
 
     def construct_message_history(self, message_history: List[LLMMessage]) -> str:
         # Construct the history of the conversation.
-        history_messages: List[str] = []
-        for msg in message_history:
-            if isinstance(msg, UserMessage) or isinstance(msg, AssistantMessage):
-                message = f"{msg.source}: {msg.content}"
-                history_messages.append(
-                    message.rstrip() + "\n\n"
-                )  # Create some consistency for how messages are separated in the transcript
-
-        history: str = "\n".join(history_messages)
-        return history
-
-    async def _select_speaker(self, roles: str, participants: List[str], max_attempts: int) -> str:
+        # Messages rendered by the previous call are reused, so when the history grows or slides
+        # only the new messages are formatted.
+        start = 0
+        if message_history and self._history_messages:
+            first = message_history[0]
+            start = next(
+                (i for i, msg in enumerate(self._history_messages) if msg is first), len(self._history_messages)
+            )
+        kept = len(self._history_messages) - start
+        if kept > len(message_history) or any(
+            new is not old for new, old in zip(message_history, self._history_messages[start:], strict=False)
+        ):
+            start, kept = len(self._history_messages), 0
+        new_entries = [self._format_history_entry(msg) for msg in message_history[kept:]]
+        new_history = "\n".join(entry for entry in new_entries if entry is not None)
+        if start == 0 and kept > 0:
+            if self._history and new_history:
+                self._history += "\n" + new_history
+            else:
+                self._history += new_history
+            self._history_entries.extend(new_entries)
+        else:
+            self._history_entries = self._history_entries[start:] + new_entries
+            self._history = "\n".join(entry for entry in self._history_entries if entry is not None)
+        self._history_messages = list(message_history)
+        return self._history
+
+    @staticmethod
+    def _format_history_entry(msg: LLMMessage) -> str | None:
+        if isinstance(msg, UserMessage) or isinstance(msg, AssistantMessage):
+            message = f"{msg.source}: {msg.content}"
+            # Create some consistency for how messages are separated in the transcript
+            return message.rstrip() + "\n\n"
+        return None
+
+    async def _select_speakers_with_model(
+        self, roles: str, participants: List[str], max_attempts: int, many: bool
+    ) -> List[str]:
         model_context_messages = await self._model_context.get_messages()
         model_context_history = self.construct_message_history(model_context_messages)
 
@@ -269,7 +393,15 @@ async def _select_speaker(self, roles: str, participants: List[str], max_attempt
             # NOTE: we use all participant names to check for mentions, even if the previous speaker is not allowed.
             # This is because the model may still select the previous speaker, and we want to catch that.
             mentions = self._mentioned_agents(response.content, self._participant_names)
-            if len(mentions) == 0:
+            if many:
+                agent_names = [name for name in mentions if name in participants]
+                if agent_names:
+                    trace_logger.debug(f"Model selected valid names: {agent_names} (attempt {num_attempts})")
+                    return agent_names
+                trace_logger.debug(f"Model failed to select a valid name: {response.content} (attempt {num_attempts})")
+                feedback = f"No valid name was mentioned. Please select from: {str(participants)}."
+                select_speaker_messages.append(UserMessage(content=feedback, source="user"))
+            elif len(mentions) == 0:
                 trace_logger.debug(f"Model failed to select a valid name: {response.content} (attempt {num_attempts})")
                 feedback = f"No valid name was mentioned. Please select from: {str(participants)}."
                 select_speaker_messages.append(UserMessage(content=feedback, source="user"))
@@ -294,15 +426,15 @@ async def _select_speaker(self, roles: str, participants: List[str], max_attempt
                 else:
                     # Valid selection
                     trace_logger.debug(f"Model selected a valid name: {agent_name} (attempt {num_attempts})")
-                    return agent_name
+                    return [agent_name]
 
         if self._previous_speaker is not None:
             trace_logger.warning(f"Model failed to select a speaker after {max_attempts}, using the previous speaker.")
-            return self._previous_speaker
+            return [self._previous_speaker]
         trace_logger.warning(
             f"Model failed to select a speaker after {max_attempts} and there was no previous speaker, using the first participant."
         )
-        return participants[0]
+        return [participants[0]]
 
     def _mentioned_agents(self, message_content: str, agent_names: List[str]) -> Dict[str, int]:
         """Counts the number of times each agent is mentioned in the provided message content.
@@ -318,24 +450,9 @@ def _mentioned_agents(self, message_content: str, agent_names: List[str]) -> Dic
         Returns:
             Dict: a counter for mentioned agents.
         """
-        mentions: Dict[str, int] = dict()
-        for name in agent_names:
-            # Finds agent mentions, taking word boundaries into account,
-            # accommodates escaping underscores and underscores as spaces
-            regex = (
-                r"(?<=\W)("
-                + re.escape(name)
-                + r"|"
-                + re.escape(name.replace("_", " "))
-                + r"|"
-                + re.escape(name.replace("_", r"\_"))
-                + r")(?=\W)"
-            )
-            # Pad the message to help with matching
-            count = len(re.findall(regex, f" {message_content} "))
-            if count > 0:
-                mentions[name] = count
-        return mentions
+        if agent_names == self._participant_names:
+            return self._mention_matcher.count(message_content)
+        return _get_mention_matcher(tuple(agent_names)).count(message_content)
 
 
 class SelectorGroupChatConfig(BaseModel):
@@ -350,6 +467,10 @@ class SelectorGroupChatConfig(BaseModel):
     # selector_func: ComponentModel | None
     max_selector_attempts: int = 3
     emit_team_events: bool = False
+    streaming_chunk_batch_chars: int | None = None
+    streaming_chunk_batch_interval: float | None = None
+    message_thread_retention: MessageThreadRetention | None = None
+    max_concurrent_speakers: int = 1
     model_client_streaming: bool = False
     model_context: ComponentModel | None = None
 
@@ -380,6 +501,7 @@ class SelectorGroupChat(BaseGroupChat, Component[SelectorGroupChatConfig]):
             function that takes the conversation history and returns the name of the next speaker.
             If provided, this function will be used to override the model to select the next speaker.
             If the function returns None, the model will be used to select the next speaker.
+            With ``max_concurrent_speakers`` above 1, it may also return a list of names to run concurrently.
         candidate_func (Callable[[Sequence[BaseAgentEvent | BaseChatMessage]], List[str]], Callable[[Sequence[BaseAgentEvent | BaseChatMessage]], Awaitable[List[str]]], optional):
             A custom function that takes the conversation history and returns a filtered list of candidates for the next speaker
             selection using model. If the function returns an empty list or `None`, `SelectorGroupChat` will raise a `ValueError`.
@@ -388,6 +510,16 @@ class SelectorGroupChat(BaseGroupChat, Component[SelectorGroupChatConfig]):
             If you are using custom message types or your agents produces custom message types, you need to specify them here.
             Make sure your custom message types are subclasses of :class:`~autogen_agentchat.messages.BaseAgentEvent` or :class:`~autogen_agentchat.messages.BaseChatMessage`.
         emit_team_events (bool, optional): Whether to emit team events through :meth:`BaseGroupChat.run_stream`. Defaults to False.
+        streaming_chunk_batch_chars (int, optional): If set, consecutive streaming chunks from a participant are
+            coalesced into one event once they reach this many characters. Defaults to None.
+        streaming_chunk_batch_interval (float, optional): If set, consecutive streaming chunks from a participant are
+            coalesced into one event emitted at most this many seconds after its first chunk. Defaults to None.
+        message_thread_retention (MessageThreadRetention, optional): The retention policy of the message thread kept by the
+            group chat manager, optionally spilling all messages to an on-disk log. Defaults to None, keeping all messages in memory.
+        max_concurrent_speakers (int, optional): The maximum number of speakers that run concurrently. Above 1,
+            the selector may select several speakers: ``selector_func`` may return a list of names, and all
+            candidates mentioned in the model's response are selected. They run concurrently, at most this many
+            at a time, and the next speakers are selected after all of them have responded. Defaults to 1.
         model_client_streaming (bool, optional): Whether to use streaming for the model client. (This is useful for reasoning models like QwQ). Defaults to False.
         model_context (ChatCompletionContext | None, optional): The model context for storing and retrieving
             :class:`~autogen_core.models.LLMMessage`. It can be preloaded with initial messages. Messages stored in model context will be used for speaker selection. The initial messages will be cleared when the team is reset.
@@ -591,6 +723,10 @@ def __init__(
         candidate_func: Optional[CandidateFuncType] = None,
         custom_message_types: List[type[BaseAgentEvent | BaseChatMessage]] | None = None,
         emit_team_events: bool = False,
+        streaming_chunk_batch_chars: int | None = None,
+        streaming_chunk_batch_interval: float | None = None,
+        message_thread_retention: MessageThreadRetention | None = None,
+        max_concurrent_speakers: int = 1,
         model_client_streaming: bool = False,
         model_context: ChatCompletionContext | None = None,
     ):
@@ -603,6 +739,10 @@ def __init__(
             runtime=runtime,
             custom_message_types=custom_message_types,
             emit_team_events=emit_team_events,
+            streaming_chunk_batch_chars=streaming_chunk_batch_chars,
+            streaming_chunk_batch_interval=streaming_chunk_batch_interval,
+            message_thread_retention=message_thread_retention,
+            max_concurrent_speakers=max_concurrent_speakers,
         )
         # Validate the participants.
         if len(participants) < 2:
@@ -662,6 +802,10 @@ def _to_config(self) -> SelectorGroupChatConfig:
             max_selector_attempts=self._max_selector_attempts,
             # selector_func=self._selector_func.dump_component() if self._selector_func else None,
             emit_team_events=self._emit_team_events,
+            streaming_chunk_batch_chars=self._streaming_chunk_batch_chars,
+            streaming_chunk_batch_interval=self._streaming_chunk_batch_interval,
+            message_thread_retention=self._message_thread_retention,
+            max_concurrent_speakers=self._max_concurrent_speakers,
             model_client_streaming=self._model_client_streaming,
             model_context=self._model_context.dump_component() if self._model_context else None,
         )
@@ -682,6 +826,10 @@ def _from_config(cls, config: SelectorGroupChatConfig) -> Self:
             # if config.selector_func
             # else None,
             emit_team_events=config.emit_team_events,
+            streaming_chunk_batch_chars=config.streaming_chunk_batch_chars,
+            streaming_chunk_batch_interval=config.streaming_chunk_batch_interval,
+            message_thread_retention=config.message_thread_retention,
+            max_concurrent_speakers=config.max_concurrent_speakers,
             model_client_streaming=config.model_client_streaming,
             model_context=ChatCompletionContext.load_component(config.model_context) if config.model_context else None,
         )
@@ -10,6 +10,7 @@
 from ._base_group_chat import BaseGroupChat
 from ._base_group_chat_manager import BaseGroupChatManager
 from ._events import GroupChatTermination
+from ._message_thread import MessageThreadRetention
 
 
 class SwarmGroupChatManager(BaseGroupChatManager):
@@ -114,6 +115,9 @@ class SwarmConfig(BaseModel):
     termination_condition: ComponentModel | None = None
     max_turns: int | None = None
     emit_team_events: bool = False
+    streaming_chunk_batch_chars: int | None = None
+    streaming_chunk_batch_interval: float | None = None
+    message_thread_retention: MessageThreadRetention | None = None
 
 
 class Swarm(BaseGroupChat, Component[SwarmConfig]):
@@ -133,6 +137,12 @@ class Swarm(BaseGroupChat, Component[SwarmConfig]):
             If you are using custom message types or your agents produces custom message types, you need to specify them here.
             Make sure your custom message types are subclasses of :class:`~autogen_agentchat.messages.BaseAgentEvent` or :class:`~autogen_agentchat.messages.BaseChatMessage`.
         emit_team_events (bool, optional): Whether to emit team events through :meth:`BaseGroupChat.run_stream`. Defaults to False.
+        streaming_chunk_batch_chars (int, optional): If set, consecutive streaming chunks from a participant are
+            coalesced into one event once they reach this many characters. Defaults to None.
+        streaming_chunk_batch_interval (float, optional): If set, consecutive streaming chunks from a participant are
+            coalesced into one event emitted at most this many seconds after its first chunk. Defaults to None.
+        message_thread_retention (MessageThreadRetention, optional): The retention policy of the message thread kept by the
+            group chat manager, optionally spilling all messages to an on-disk log. Defaults to None, keeping all messages in memory.
 
     Basic example:
 
@@ -221,6 +231,9 @@ def __init__(
         runtime: AgentRuntime | None = None,
         custom_message_types: List[type[BaseAgentEvent | BaseChatMessage]] | None = None,
         emit_team_events: bool = False,
+        streaming_chunk_batch_chars: int | None = None,
+        streaming_chunk_batch_interval: float | None = None,
+        message_thread_retention: MessageThreadRetention | None = None,
     ) -> None:
         super().__init__(
             participants,
@@ -231,6 +244,9 @@ def __init__(
             runtime=runtime,
             custom_message_types=custom_message_types,
             emit_team_events=emit_team_events,
+            streaming_chunk_batch_chars=streaming_chunk_batch_chars,
+            streaming_chunk_batch_interval=streaming_chunk_batch_interval,
+            message_thread_retention=message_thread_retention,
         )
         # The first participant must be able to produce handoff messages.
         first_participant = self._participants[0]
@@ -275,6 +291,9 @@ def _to_config(self) -> SwarmConfig:
             termination_condition=termination_condition,
             max_turns=self._max_turns,
             emit_team_events=self._emit_team_events,
+            streaming_chunk_batch_chars=self._streaming_chunk_batch_chars,
+            streaming_chunk_batch_interval=self._streaming_chunk_batch_interval,
+            message_thread_retention=self._message_thread_retention,
         )
 
     @classmethod
@@ -288,4 +307,7 @@ def _from_config(cls, config: SwarmConfig) -> "Swarm":
             termination_condition=termination_condition,
             max_turns=config.max_turns,
             emit_team_events=config.emit_team_events,
+            streaming_chunk_batch_chars=config.streaming_chunk_batch_chars,
+            streaming_chunk_batch_interval=config.streaming_chunk_batch_interval,
+            message_thread_retention=config.message_thread_retention,
         )
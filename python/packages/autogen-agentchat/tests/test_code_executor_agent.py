@@ -1,8 +1,9 @@
 import pytest
 from autogen_agentchat.agents import CodeExecutorAgent
-from autogen_agentchat.base import Response
+from autogen_agentchat.base import Response, TaskResult
 from autogen_agentchat.messages import (
     CodeExecutionEvent,
+    CodeExecutionStreamingChunkEvent,
     CodeGenerationEvent,
     TextMessage,
 )
@@ -399,6 +400,79 @@ async def test_code_execution_multiple_blocks() -> None:
     assert "ValueError: math domain error" in response.chat_message.content
 
 
+@pytest.mark.asyncio
+async def test_code_execution_stream() -> None:
+    """Test streaming the output of the code blocks as it is printed"""
+
+    agent = CodeExecutorAgent(
+        name="code_executor", code_executor=LocalCommandLineCodeExecutor(), code_executor_stream=True
+    )
+
+    task = TextMessage(
+        content="""
+```python
+import sys
+
+print("first", flush=True)
+print("warning", file=sys.stderr, flush=True)
+print("second", flush=True)
+```
+""".strip(),
+        source="assistant",
+    )
+
+    chunks: list[CodeExecutionStreamingChunkEvent] = []
+    result: TaskResult | None = None
+    async for message in agent.run_stream(task=task):
+        if isinstance(message, CodeExecutionStreamingChunkEvent):
+            assert message.source == "code_executor"
+            assert message.code_block_index == 0
+            chunks.append(message)
+        elif isinstance(message, TaskResult):
+            result = message
+
+    assert "".join(chunk.content for chunk in chunks if chunk.stream == "stdout") == "first\nsecond\n"
+    assert "".join(chunk.content for chunk in chunks if chunk.stream == "stderr") == "warning\n"
+    assert result is not None
+    # The streaming chunks are not part of the task result.
+    assert [type(message) for message in result.messages] == [TextMessage, TextMessage]
+    final_message = result.messages[-1]
+    assert isinstance(final_message, TextMessage)
+    assert "first" in final_message.content and "second" in final_message.content
+
+
+@pytest.mark.asyncio
+async def test_code_execution_stream_with_model_client() -> None:
+    """Test streaming the output of the code blocks generated by the model"""
+
+    model_client = ReplayChatCompletionClient(
+        ["Here is the code:\n```python\nimport sys\nprint('done')\nsys.exit(3)\n```", "TERMINATE"]
+    )
+    agent = CodeExecutorAgent(
+        name="code_executor_agent",
+        code_executor=LocalCommandLineCodeExecutor(),
+        model_client=model_client,
+        code_executor_stream=True,
+    )
+
+    chunks: list[CodeExecutionStreamingChunkEvent] = []
+    code_execution_event: CodeExecutionEvent | None = None
+    async for message in agent.on_messages_stream(
+        [TextMessage(content="Print done and fail", source="user")], CancellationToken()
+    ):
+        if isinstance(message, CodeExecutionStreamingChunkEvent):
+            assert message.retry_attempt == 0
+            chunks.append(message)
+        elif isinstance(message, CodeExecutionEvent):
+            code_execution_event = message
+
+    assert "done\n" in "".join(chunk.content for chunk in chunks if chunk.stream == "stdout")
+    assert code_execution_event is not None
+    # The final result is formatted the same way as without streaming.
+    assert code_execution_event.result.exit_code == 3
+    assert code_execution_event.result.output.startswith("The script ran, then exited with an error")
+
+
 @pytest.mark.asyncio
 async def test_code_execution_agent_serialization() -> None:
     """Test agent config serialization"""
@@ -412,6 +486,12 @@ async def test_code_execution_agent_serialization() -> None:
     assert isinstance(deserialized_agent, CodeExecutorAgent)
     assert deserialized_agent.name == "code_executor"
 
+    agent = CodeExecutorAgent(
+        name="code_executor", code_executor=LocalCommandLineCodeExecutor(), code_executor_stream=True
+    )
+    deserialized_agent = CodeExecutorAgent.load_component(agent.dump_component())
+    assert deserialized_agent._code_executor_stream  # type: ignore
+
 
 @pytest.mark.asyncio
 async def test_code_execution_agent_serialization_with_model_client() -> None:
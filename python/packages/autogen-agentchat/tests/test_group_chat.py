@@ -1,8 +1,12 @@
 import asyncio
+import copy
 import json
 import logging
+import re
 import tempfile
-from typing import Any, AsyncGenerator, Dict, List, Mapping, Sequence
+import time
+from pathlib import Path
+from typing import Any, AsyncGenerator, Callable, Dict, List, Literal, Mapping, Sequence, Tuple
 
 import pytest
 import pytest_asyncio
@@ -12,7 +16,7 @@
     BaseChatAgent,
     CodeExecutorAgent,
 )
-from autogen_agentchat.base import Handoff, Response, TaskResult, TerminationCondition
+from autogen_agentchat.base import ChatAgent, Handoff, Response, TaskResult, TerminationCondition
 from autogen_agentchat.conditions import (
     HandoffTermination,
     MaxMessageTermination,
@@ -22,7 +26,9 @@
 from autogen_agentchat.messages import (
     BaseAgentEvent,
     BaseChatMessage,
+    CodeExecutionStreamingChunkEvent,
     HandoffMessage,
+    MessageFactory,
     ModelClientStreamingChunkEvent,
     MultiModalMessage,
     SelectorEvent,
@@ -30,11 +36,21 @@
     StopMessage,
     StructuredMessage,
     TextMessage,
+    ThoughtEvent,
     ToolCallExecutionEvent,
     ToolCallRequestEvent,
     ToolCallSummaryMessage,
 )
-from autogen_agentchat.teams import MagenticOneGroupChat, RoundRobinGroupChat, SelectorGroupChat, Swarm
+from autogen_agentchat.state import compact_team_state
+from autogen_agentchat.teams import (
+    MagenticOneGroupChat,
+    MessageThreadLog,
+    MessageThreadRetention,
+    RoundRobinGroupChat,
+    SelectorGroupChat,
+    Swarm,
+)
+from autogen_agentchat.teams._group_chat._output_message_queue import OutputMessageQueue
 from autogen_agentchat.teams._group_chat._round_robin_group_chat import RoundRobinGroupChatManager
 from autogen_agentchat.teams._group_chat._selector_group_chat import SelectorGroupChatManager
 from autogen_agentchat.teams._group_chat._swarm_group_chat import SwarmGroupChatManager
@@ -1813,3 +1829,613 @@ async def test_selector_group_chat_streaming(runtime: AgentRuntime | None) -> No
                 streaming = []
             assert message == result.messages[index]
             index += 1
+
+
+class _ChunkStreamingAgent(BaseChatAgent):
+    """An agent that streams its reply as chunks, with a thought event in the middle."""
+
+    def __init__(self, name: str, words: List[str]) -> None:
+        super().__init__(name, "An agent that streams chunks.")
+        self._words = words
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (TextMessage,)
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        raise NotImplementedError
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        half = len(self._words) // 2
+        for word in self._words[:half]:
+            yield ModelClientStreamingChunkEvent(content=word, source=self.name)
+        yield ThoughtEvent(content="thinking", source=self.name)
+        for word in self._words[half:]:
+            yield ModelClientStreamingChunkEvent(content=word, source=self.name)
+        yield Response(chat_message=TextMessage(content="".join(self._words), source=self.name))
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_chars", [None, 6])
+async def test_group_chat_streaming_chunk_channel(runtime: AgentRuntime | None, batch_chars: int | None) -> None:
+    words = ["one ", "two ", "three ", "four ", "five ", "six "]
+    team = RoundRobinGroupChat(
+        [_ChunkStreamingAgent("streamer", words)],
+        max_turns=1,
+        runtime=runtime,
+        streaming_chunk_batch_chars=batch_chars,
+    )
+    outputs: List[str] = []
+    chunks: List[str] = []
+    async for message in team.run_stream(task="go"):
+        if isinstance(message, ModelClientStreamingChunkEvent):
+            outputs.append("chunk")
+            chunks.append(message.content)
+        elif isinstance(message, TaskResult):
+            assert [type(m) for m in message.messages] == [TextMessage, ThoughtEvent, TextMessage]
+        else:
+            outputs.append(type(message).__name__)
+
+    # Chunks stay in order with the full messages of the participant.
+    assert "".join(chunks) == "".join(words)
+    collapsed = [item for i, item in enumerate(outputs) if i == 0 or item != outputs[i - 1]]
+    assert collapsed == ["TextMessage", "chunk", "ThoughtEvent", "chunk", "TextMessage"]
+    if batch_chars is None:
+        assert chunks == words
+    else:
+        assert chunks == ["one two ", "three ", "four five ", "six "]
+
+
+@pytest.mark.asyncio
+async def test_output_message_queue_ordering() -> None:
+    queue = OutputMessageQueue(chunk_batch_interval=0.01)
+    sender = AgentId("agent", "default")
+
+    def chunk(content: str) -> ModelClientStreamingChunkEvent:
+        return ModelClientStreamingChunkEvent(content=content, source="agent")
+
+    first = TextMessage(content="first", source="agent")
+    second = TextMessage(content="second", source="agent")
+    first_id = queue.begin_relay(sender)
+    queue.put_chunk(sender, chunk("a"))
+    queue.put_chunk(sender, chunk("b"))
+    second_id = queue.begin_relay(sender)
+    queue.put_chunk(sender, chunk("c"))
+    await asyncio.sleep(0.05)
+    # Nothing is emitted before the messages published earlier have been relayed.
+    assert queue.empty()
+
+    # A message relayed out of order waits for the messages announced before it.
+    queue.end_relay(second_id, second)
+    assert queue.empty()
+    queue.end_relay(first_id, first)
+    contents: List[str] = []
+    while not queue.empty():
+        item = queue.get_nowait()
+        assert isinstance(item, (TextMessage, ModelClientStreamingChunkEvent))
+        contents.append(item.content)
+    assert contents == ["first", "ab", "second", "c"]
+
+    # Unannounced messages pass straight through.
+    queue.end_relay("unknown", first)
+    assert queue.get_nowait() == first
+    queue.put_chunk(sender, chunk("d"))
+    queue.clear()
+    await asyncio.sleep(0.05)
+    assert queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_output_message_queue_code_chunks() -> None:
+    queue = OutputMessageQueue(chunk_batch_chars=100)
+    sender = AgentId("agent", "default")
+
+    def code_chunk(content: str, stream: Literal["stdout", "stderr"], index: int) -> CodeExecutionStreamingChunkEvent:
+        return CodeExecutionStreamingChunkEvent(
+            content=content, stream=stream, code_block_index=index, retry_attempt=0, source="agent"
+        )
+
+    relay_id = queue.begin_relay(sender)
+    queue.put_chunk(sender, code_chunk("a", "stdout", 0))
+    queue.put_chunk(sender, code_chunk("b", "stdout", 0))
+    queue.put_chunk(sender, code_chunk("c", "stderr", 0))
+    queue.put_chunk(sender, code_chunk("d", "stdout", 1))
+    queue.put_chunk(sender, ModelClientStreamingChunkEvent(content="e", source="agent"))
+    queue.flush_chunks(sender)
+    assert queue.empty()
+    queue.end_relay(relay_id, TextMessage(content="first", source="agent"))
+
+    items: List[Tuple[str, str]] = []
+    while not queue.empty():
+        item = queue.get_nowait()
+        assert isinstance(item, (TextMessage, CodeExecutionStreamingChunkEvent, ModelClientStreamingChunkEvent))
+        items.append((type(item).__name__, item.content))
+    # Code chunks are only coalesced with chunks of the same code block and stream.
+    assert items == [
+        ("TextMessage", "first"),
+        ("CodeExecutionStreamingChunkEvent", "ab"),
+        ("CodeExecutionStreamingChunkEvent", "c"),
+        ("CodeExecutionStreamingChunkEvent", "d"),
+        ("ModelClientStreamingChunkEvent", "e"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_output_message_queue_from_other_threads() -> None:
+    queue = OutputMessageQueue(chunk_batch_interval=0.01)
+    queue.bind_loop(asyncio.get_running_loop())
+    sender = AgentId("agent", "default")
+
+    def produce() -> None:
+        # Runs without an event loop, like a participant on another shard.
+        relay_id = queue.begin_relay(sender)
+        queue.put_chunk(sender, ModelClientStreamingChunkEvent(content="a", source="agent"))
+        queue.put_chunk(sender, ModelClientStreamingChunkEvent(content="b", source="agent"))
+        queue.end_relay(relay_id, TextMessage(content="first", source="agent"))
+        queue.flush_chunks(sender)
+        queue.put_nowait(TextMessage(content="last", source="agent"))
+
+    await asyncio.to_thread(produce)
+    contents: List[str] = []
+    for _ in range(3):
+        item = await asyncio.wait_for(queue.get(), timeout=1)
+        assert isinstance(item, (TextMessage, ModelClientStreamingChunkEvent))
+        contents.append(item.content)
+    assert contents == ["first", "ab", "last"]
+
+
+@pytest.mark.asyncio
+async def test_group_chat_message_thread_retention(runtime: AgentRuntime | None, tmp_path: Path) -> None:
+    retention = MessageThreadRetention(
+        max_messages=3,
+        exclude_types=["StopMessage"],
+        spill_directory=str(tmp_path / "thread"),
+        segment_max_messages=2,
+    )
+    team = RoundRobinGroupChat(
+        participants=[_EchoAgent("echo", description="echo agent"), _StopAgent("stop", "stop agent", stop_at=3)],
+        max_turns=6,
+        runtime=runtime,
+        message_thread_retention=retention,
+    )
+    result = await team.run(task="Hello")
+    assert len(result.messages) == 7
+    assert isinstance(result.messages[-1], StopMessage)
+
+    # The manager keeps a window of the most recent messages without the excluded types.
+    state = await team.save_state()
+    thread = state["agent_states"]["RoundRobinGroupChatManager"]["message_thread"]
+    assert [(message["type"], message["source"]) for message in thread] == [
+        ("TextMessage", "echo"),
+        ("TextMessage", "stop"),
+        ("TextMessage", "echo"),
+    ]
+
+    # The full history is in the log, split across segments, and can be reopened.
+    log = team.message_thread_log
+    assert log is not None
+    assert len(log) == 7
+    assert log.read() == result.messages
+    assert len(list((tmp_path / "thread").glob("segment-*.jsonl"))) == 4
+    reopened = MessageThreadLog(tmp_path / "thread", MessageFactory(), segment_max_messages=2)
+    assert len(reopened) == 7
+    assert reopened.read(1, 6) == result.messages[1:6]
+
+    # A new team with the same policy appends to the same log.
+    team2 = RoundRobinGroupChat(
+        participants=[_EchoAgent("echo", description="echo agent")],
+        max_turns=1,
+        runtime=runtime,
+        message_thread_retention=retention,
+    )
+    result2 = await team2.run(task="Again")
+    assert team2.message_thread_log is not None
+    assert team2.message_thread_log.read(7) == result2.messages
+
+
+@pytest.mark.asyncio
+async def test_round_robin_group_chat_state_delta(runtime: AgentRuntime | None) -> None:
+    model_client = ReplayChatCompletionClient([f"Reply {i}" for i in range(20)])
+    team = RoundRobinGroupChat(
+        participants=[
+            AssistantAgent("agent1", model_client=model_client),
+            AssistantAgent("agent2", model_client=model_client),
+        ],
+        max_turns=2,
+        runtime=runtime,
+    )
+    deltas: List[Mapping[str, Any]] = []
+    for i in range(5):
+        await team.run(task=f"Task {i}")
+        deltas.append(await team.save_state_delta())
+
+    # Later deltas only carry the messages of their own run.
+    assert [delta["sequence"] for delta in deltas] == [1, 2, 3, 4, 5]
+    assert len(json.dumps(deltas[-1])) < len(json.dumps(await team.save_state())) / 2
+    manager_thread_ops = [
+        op
+        for op in deltas[-1]["operations"]
+        if op["path"] == ["agent_states", "RoundRobinGroupChatManager", "message_thread"]
+    ]
+    assert len(manager_thread_ops) == 1 and manager_thread_ops[0]["op"] == "append"
+    assert [message["content"] for message in manager_thread_ops[0]["value"]] == ["Task 4", "Reply 8", "Reply 9"]
+
+    # Compacting the chain in two steps reproduces the full state.
+    state = await team.save_state()
+    base = compact_team_state({}, deltas[:3])
+    assert compact_team_state(base, deltas[3:]) == state
+    with pytest.raises(ValueError):
+        compact_team_state(base, [deltas[3], deltas[2]])
+
+    # Deltas after loading a state are relative to it.
+    team2 = RoundRobinGroupChat(
+        participants=[
+            AssistantAgent("agent1", model_client=model_client),
+            AssistantAgent("agent2", model_client=model_client),
+        ],
+        max_turns=2,
+        runtime=runtime,
+    )
+    await team2.load_state(base)
+    await team2.reset()
+    delta = await team2.save_state_delta()
+    assert delta["sequence"] == 1
+    assert compact_team_state(base, [delta]) == await team2.save_state()
+
+
+@pytest.mark.asyncio
+async def test_group_chat_state_delta_is_incremental(runtime: AgentRuntime | None) -> None:
+    model_client = ReplayChatCompletionClient([f"Reply {i}" for i in range(20)])
+    team = RoundRobinGroupChat(
+        participants=[
+            AssistantAgent("agent1", model_client=model_client),
+            AssistantAgent("agent2", model_client=model_client),
+        ],
+        max_turns=2,
+        message_thread_retention=MessageThreadRetention(max_messages=4),
+        runtime=runtime,
+    )
+    await team.run(task="Task 0")
+    await team.save_state_delta()
+
+    # Without a run, no agent is saved and the delta is empty.
+    assert (await team.save_state_delta())["operations"] == []
+
+    # Mutating a loaded state does not affect the later deltas.
+    state = await team.save_state()
+    await team.load_state(state)
+    base = copy.deepcopy(state)
+    state["agent_states"]["agent2"]["agent_state"]["llm_context"]["messages"].clear()
+
+    await team.run(task="Task 1")
+    delta = await team.save_state_delta()
+    operations = {tuple(op["path"]): op for op in delta["operations"]}
+    context_op = operations[("agent_states", "agent2", "agent_state", "llm_context", "messages")]
+    assert context_op["op"] == "append"
+    assert [message["content"] for message in context_op["value"]] == ["Task 1", "Reply 2", "Reply 3"]
+    # The thread outgrew the retention window, so it is recorded in full.
+    thread_op = operations[("agent_states", "RoundRobinGroupChatManager", "message_thread")]
+    assert thread_op["op"] == "set"
+    assert [message["content"] for message in thread_op["value"]] == ["Reply 1", "Task 1", "Reply 2", "Reply 3"]
+
+    assert compact_team_state(base, [delta]) == await team.save_state()
+
+
+@pytest.mark.asyncio
+async def test_group_chat_state_delta_tracks_assistant_agents(
+    runtime: AgentRuntime | None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    model_client = ReplayChatCompletionClient([f"Reply {i}" for i in range(20)])
+    team = RoundRobinGroupChat(
+        participants=[
+            AssistantAgent("agent1", model_client=model_client),
+            _EchoAgent("echo", description="echo agent"),
+        ],
+        max_turns=2,
+        runtime=runtime,
+    )
+    await team.run(task="Task 0")
+    base = compact_team_state({}, [await team.save_state_delta()])
+
+    team_runtime = team._runtime  # pyright: ignore[reportPrivateUsage]
+    agent_save_state = team_runtime.agent_save_state
+    saved: List[str] = []
+
+    async def _recording_save_state(agent: AgentId) -> Mapping[str, Any]:
+        saved.append(agent.type)
+        return await agent_save_state(agent)
+
+    monkeypatch.setattr(team_runtime, "agent_save_state", _recording_save_state)
+    await team.run(task="Task 1")
+    delta = await team.save_state_delta()
+    monkeypatch.undo()
+
+    # The assistant agent's changes are taken from its model context and message buffer without saving it.
+    assert not any(agent_type.startswith("agent1") for agent_type in saved)
+    assert any(agent_type.startswith("echo") for agent_type in saved)
+    operations = {tuple(op["path"]): op for op in delta["operations"]}
+    context_op = operations[("agent_states", "agent1", "agent_state", "llm_context", "messages")]
+    assert context_op["op"] == "append"
+    # The echo agent repeated the first task before the second run.
+    assert [message["content"] for message in context_op["value"]] == ["Task 0", "Task 1", "Reply 1"]
+    assert compact_team_state(base, [delta]) == await team.save_state()
+
+    # A reset replaces the model context.
+    await team.reset()
+    delta = await team.save_state_delta()
+    operations = {tuple(op["path"]): op for op in delta["operations"]}
+    assert operations[("agent_states", "agent1", "agent_state", "llm_context", "messages")]["value"] == []
+
+
+def _reference_mentioned_agents(message_content: str, agent_names: List[str]) -> Dict[str, int]:
+    mentions: Dict[str, int] = dict()
+    for name in agent_names:
+        regex = (
+            r"(?<=\W)("
+            + re.escape(name)
+            + r"|"
+            + re.escape(name.replace("_", " "))
+            + r"|"
+            + re.escape(name.replace("_", r"\_"))
+            + r")(?=\W)"
+        )
+        count = len(re.findall(regex, f" {message_content} "))
+        if count > 0:
+            mentions[name] = count
+    return mentions
+
+
+def _reference_message_history(message_history: List[LLMMessage]) -> str:
+    history_messages: List[str] = []
+    for msg in message_history:
+        if isinstance(msg, UserMessage) or isinstance(msg, AssistantMessage):
+            history_messages.append(f"{msg.source}: {msg.content}".rstrip() + "\n\n")
+    return "\n".join(history_messages)
+
+
+def _create_selector_manager(participant_names: List[str]) -> SelectorGroupChatManager:
+    return SelectorGroupChatManager(
+        "SelectorGroupChatManager",
+        "group_topic",
+        "output_topic",
+        [f"{name}_topic" for name in participant_names],
+        participant_names,
+        [f"The {name} agent." for name in participant_names],
+        asyncio.Queue(),
+        termination_condition=None,
+        max_turns=None,
+        message_factory=MessageFactory(),
+        model_client=ReplayChatCompletionClient(["agent1"]),
+        selector_prompt="{roles}\n{participants}\n{history}",
+        allow_repeated_speaker=True,
+        selector_func=None,
+        max_selector_attempts=3,
+        candidate_func=None,
+        emit_team_events=False,
+        model_context=None,
+    )
+
+
+@pytest.mark.parametrize(
+    "participant_names",
+    [
+        ["agent1", "agent2", "agent10"],
+        ["Story_writer", "Story", "writer"],
+        ["a_b", "b_c", "c"],
+    ],
+)
+def test_selector_group_chat_mentioned_agents(participant_names: List[str]) -> None:
+    manager = _create_selector_manager(participant_names)
+    contents = [
+        "agent1",
+        "I choose agent10, not agent1.",
+        "agent1agent2 agent_1 (agent2) agent10.",
+        "Story writer, or Story\\_writer, or Story_writer, or just writer.",
+        "a b c and b c, a_b_c, a\\_b.",
+        "Nobody.",
+    ]
+    for content in contents:
+        assert manager._mentioned_agents(content, participant_names) == _reference_mentioned_agents(  # pyright: ignore
+            content, participant_names
+        )
+
+
+def test_selector_group_chat_message_history_incremental() -> None:
+    manager = _create_selector_manager(["agent1", "agent2"])
+    messages: List[LLMMessage] = [
+        UserMessage(content=f"Message {i}  ", source="agent1")
+        if i % 3
+        else AssistantMessage(content=f"Reply {i}", source="agent2")
+        for i in range(12)
+    ]
+    messages.insert(5, FunctionExecutionResultMessage(content=[]))
+    # The history grows, slides, shrinks, and is replaced.
+    windows = [messages[:0], messages[:1], messages[:4], messages[:9], messages[3:10], messages[6:], messages[6:8]]
+    windows += [messages[6:8], messages[:3], list(reversed(messages)), []]
+    for window in windows:
+        assert manager.construct_message_history(window) == _reference_message_history(window)
+
+
+def test_selector_group_chat_speaker_extraction_benchmark(record_property: Callable[[str, object], None]) -> None:
+    participant_names = [f"agent_{i}" for i in range(50)]
+    manager = _create_selector_manager(participant_names)
+    messages: List[LLMMessage] = [
+        UserMessage(content=f"Message {i} from {participant_names[i % 50]}.", source=participant_names[i % 50])
+        for i in range(500)
+    ]
+    responses = [f"The next speaker should be {name}." for name in participant_names]
+
+    start = time.perf_counter()
+    for response in responses * 10:
+        _reference_mentioned_agents(response, participant_names)
+    reference_mentions = time.perf_counter() - start
+    start = time.perf_counter()
+    for response in responses * 10:
+        manager._mentioned_agents(response, participant_names)  # pyright: ignore
+    mentions = time.perf_counter() - start
+
+    # Render the history once per turn as it grows to 500 messages.
+    start = time.perf_counter()
+    for turn in range(400, 501):
+        _reference_message_history(messages[:turn])
+    reference_history = time.perf_counter() - start
+    start = time.perf_counter()
+    for turn in range(400, 501):
+        history = manager.construct_message_history(messages[:turn])
+    history_time = time.perf_counter() - start
+
+    # Timings are only recorded, since they depend on the machine running the tests.
+    record_property("mentions_reference_s", reference_mentions)
+    record_property("mentions_s", mentions)
+    record_property("history_reference_s", reference_history)
+    record_property("history_s", history_time)
+    assert history == _reference_message_history(messages)
+    for response in responses:
+        assert manager._mentioned_agents(response, participant_names) == _reference_mentioned_agents(  # pyright: ignore
+            response, participant_names
+        )
+    assert manager._mentioned_agents(responses[7], participant_names) == {"agent_7": 1}  # pyright: ignore
+
+
+class _ConcurrencyTracker:
+    def __init__(self) -> None:
+        self.running = 0
+        self.max_running = 0
+
+
+class _SlowEchoAgent(_EchoAgent):
+    def __init__(self, name: str, tracker: _ConcurrencyTracker, delay: float = 0.05) -> None:
+        super().__init__(name, description=f"slow echo agent {name}")
+        self._tracker = tracker
+        self._delay = delay
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        self._tracker.running += 1
+        self._tracker.max_running = max(self._tracker.max_running, self._tracker.running)
+        await asyncio.sleep(self._delay)
+        self._tracker.running -= 1
+        return Response(chat_message=TextMessage(content=f"{self.name} done", source=self.name))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_concurrent_speakers", [2, 3])
+async def test_round_robin_group_chat_concurrent_speakers(
+    runtime: AgentRuntime | None, max_concurrent_speakers: int
+) -> None:
+    tracker = _ConcurrencyTracker()
+    team = RoundRobinGroupChat(
+        participants=[_SlowEchoAgent(f"agent{i}", tracker) for i in range(3)],
+        max_turns=6,
+        runtime=runtime,
+        emit_team_events=True,
+        max_concurrent_speakers=max_concurrent_speakers,
+    )
+    result = await team.run(task="Go")
+    assert tracker.max_running == max_concurrent_speakers
+    selections = [message for message in result.messages if isinstance(message, SelectSpeakerEvent)]
+    assert [selection.content for selection in selections] == [["agent0", "agent1", "agent2"]] * 2
+    responses = [message for message in result.messages if isinstance(message, TextMessage)][1:]
+    # Each round is joined before the next one starts.
+    assert sorted(message.source for message in responses[:3]) == ["agent0", "agent1", "agent2"]
+    assert sorted(message.source for message in responses[3:]) == ["agent0", "agent1", "agent2"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_speakers_drop_responses_after_termination(runtime: AgentRuntime | None) -> None:
+    tracker = _ConcurrencyTracker()
+    team = RoundRobinGroupChat(
+        participants=[
+            _SlowEchoAgent("agent0", tracker, delay=0.01),
+            _SlowEchoAgent("agent1", tracker, delay=0.2),
+            _SlowEchoAgent("agent2", tracker, delay=0.2),
+        ],
+        max_turns=1,
+        runtime=runtime,
+        max_concurrent_speakers=3,
+    )
+    result = await team.run(task="Go")
+    assert [message.source for message in result.messages] == ["user", "agent0"]
+    # The speakers still running when the group chat terminated are cancelled and never respond.
+    await asyncio.sleep(0.4)
+    assert tracker.running == 2
+    state = await team.save_state()
+    manager_state = state["agent_states"]["RoundRobinGroupChatManager"]
+    assert [message["source"] for message in manager_state["message_thread"]] == ["user", "agent0"]
+    for name in ["agent0", "agent1", "agent2"]:
+        assert [message["source"] for message in state["agent_states"][name]["message_buffer"]] in (
+            [],
+            ["agent0"],
+        )
+
+    # A speaker that responds before its cancellation reaches it is dropped by the manager and the others.
+    tracker = _ConcurrencyTracker()
+    team = RoundRobinGroupChat(
+        participants=[
+            _SlowEchoAgent("agent0", tracker, delay=0.01),
+            _SlowEchoAgent("agent1", tracker, delay=0.01),
+        ],
+        max_turns=1,
+        runtime=runtime,
+        max_concurrent_speakers=2,
+    )
+    await team.run(task="Go")
+    await asyncio.sleep(0.1)
+    state = await team.save_state()
+    for name in ["agent0", "agent1"]:
+        assert "agent1" not in [message["source"] for message in state["agent_states"][name]["message_buffer"]]
+    await team.run(task="Again")
+    state = await team.save_state()
+    manager_state = state["agent_states"]["RoundRobinGroupChatManager"]
+    assert [message["source"] for message in manager_state["message_thread"]] == ["user", "agent0", "user", "agent0"]
+
+
+@pytest.mark.asyncio
+async def test_selector_group_chat_concurrent_speakers(runtime: AgentRuntime | None) -> None:
+    tracker = _ConcurrencyTracker()
+    participants: List[ChatAgent] = [_SlowEchoAgent(f"agent{i}", tracker) for i in range(3)]
+    # The model selects two speakers, then one.
+    model_client = ReplayChatCompletionClient(["agent0 and agent2", "agent1"])
+    team = SelectorGroupChat(
+        participants=participants,
+        model_client=model_client,
+        max_turns=3,
+        runtime=runtime,
+        max_concurrent_speakers=3,
+    )
+    result = await team.run(task="Go")
+    assert tracker.max_running == 2
+    assert sorted(message.source for message in result.messages[1:3]) == ["agent0", "agent2"]
+    assert result.messages[3].source == "agent1"
+
+    # A selector function can return several speakers.
+    def selector_func(messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> List[str]:
+        return ["agent1", "agent2"]
+
+    tracker = _ConcurrencyTracker()
+    team = SelectorGroupChat(
+        participants=[_SlowEchoAgent(f"agent{i}", tracker) for i in range(3)],
+        model_client=model_client,
+        selector_func=selector_func,
+        max_turns=4,
+        runtime=runtime,
+        max_concurrent_speakers=2,
+    )
+    result = await team.run(task="Go")
+    assert tracker.max_running == 2
+    assert sorted(message.source for message in result.messages[1:]) == ["agent1", "agent1", "agent2", "agent2"]
+
+    # Without concurrent speakers, a selector function must select a single speaker.
+    team = SelectorGroupChat(
+        participants=[_SlowEchoAgent(f"agent{i}", tracker) for i in range(3)],
+        model_client=model_client,
+        selector_func=selector_func,
+        max_turns=4,
+        runtime=runtime,
+    )
+    with pytest.raises(ValueError, match="max_concurrent_speakers"):
+        await team.run(task="Go")
@@ -1,4 +1,5 @@
 import asyncio
+import time
 from typing import Any, AsyncGenerator, Callable, Dict, List, Sequence, Set
 from unittest.mock import AsyncMock, patch
 
@@ -29,6 +30,8 @@
     DiGraphEdge,
     DiGraphNode,
     GraphFlowManager,
+    _GraphExecutionPlan,  # pyright: ignore[reportPrivateUsage]
+    _ReadyIndex,  # pyright: ignore[reportPrivateUsage]
 )
 from autogen_core import AgentRuntime, CancellationToken, Component, SingleThreadedAgentRuntime
 from autogen_ext.models.replay import ReplayChatCompletionClient
@@ -381,6 +384,8 @@ def _create(
         manager._message_factory = MessageFactory()  # pyright: ignore[reportPrivateUsage]
         manager._message_thread = thread if thread is not None else []  # pyright: ignore[reportPrivateUsage]
         manager._pending_execution = pending if pending is not None else {node: [] for node in graph.get_start_nodes()}  # pyright: ignore[reportPrivateUsage]
+        manager._plan = _GraphExecutionPlan(graph)  # pyright: ignore[reportPrivateUsage]
+        manager._ready_index = _ReadyIndex(manager._plan, manager._pending_execution)  # pyright: ignore[reportPrivateUsage]
         manager._name = "test_manager"  # pyright: ignore[reportPrivateUsage]
         manager._use_default_start = False  # pyright: ignore[reportPrivateUsage]
         return manager
@@ -523,6 +528,39 @@ async def test_select_speakers_conditional_any_activation(
     assert "B" in manager._active_nodes  # pyright: ignore[reportPrivateUsage]
 
 
+@pytest.mark.asyncio
+async def test_select_speakers_large_dag_benchmark(
+    digraph_manager: Callable[..., GraphFlowManager], record_property: Callable[[str, object], None]
+) -> None:
+    # A root fans out to 998 workers that join into a single node, 1,000 nodes in total.
+    workers = [f"worker_{i}" for i in range(998)]
+    nodes = {
+        "root": DiGraphNode(name="root", edges=[DiGraphEdge(target=worker) for worker in workers]),
+        "join": DiGraphNode(name="join", edges=[]),
+    }
+    for worker in workers:
+        nodes[worker] = DiGraphNode(name=worker, edges=[DiGraphEdge(target="join")])
+    graph = DiGraph(nodes=nodes)
+    manager = digraph_manager(graph=graph, active_nodes=set(), pending={"root": []})
+
+    start = time.perf_counter()
+    assert await manager.select_speakers([]) == ["root"]
+    speakers = await manager.select_speakers([TextChatMessage(source="root", content="done", metadata={})])
+    assert sorted(speakers) == sorted(workers)
+    executed = ["root", *speakers]
+    for worker in workers:
+        speakers = await manager.select_speakers([TextChatMessage(source=worker, content="done", metadata={})])
+        executed.extend(speakers)
+    assert speakers == ["join"]
+    speakers = await manager.select_speakers([TextChatMessage(source="join", content="done", metadata={})])
+    elapsed = time.perf_counter() - start
+
+    assert speakers == [_DIGRAPH_STOP_AGENT_NAME]
+    assert sorted(executed) == sorted(nodes)
+    record_property("dag_nodes", len(nodes))
+    record_property("dag_completions_s", elapsed)
+
+
 class _EchoAgent(BaseChatAgent):
     def __init__(self, name: str, description: str) -> None:
         super().__init__(name, description)
@@ -1,13 +1,16 @@
 from types import MethodType
-from typing import Any, AsyncGenerator, Sequence
+from typing import Any, AsyncGenerator, List, Sequence
 
 import pytest
 import pytest_asyncio
-from autogen_agentchat.agents import AssistantAgent, SocietyOfMindAgent
+from autogen_agentchat.agents import AssistantAgent, CodeExecutorAgent, SocietyOfMindAgent
+from autogen_agentchat.base import Response
 from autogen_agentchat.conditions import MaxMessageTermination
+from autogen_agentchat.messages import CodeExecutionStreamingChunkEvent, TextMessage
 from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_core import AgentRuntime, SingleThreadedAgentRuntime
+from autogen_core import AgentRuntime, CancellationToken, SingleThreadedAgentRuntime
 from autogen_core.models import CreateResult, LLMMessage, SystemMessage
+from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
 from autogen_ext.models.replay import ReplayChatCompletionClient
 
 
@@ -195,3 +198,27 @@ async def _mock_create(
     inner_team = RoundRobinGroupChat([agent1, agent2], termination_condition=inner_termination, runtime=runtime)
     society_of_mind_agent = SocietyOfMindAgent("society_of_mind", team=inner_team, model_client=model_client_soma)
     await society_of_mind_agent.run(task="Count to 10.")
+
+
+@pytest.mark.asyncio
+async def test_society_of_mind_agent_code_execution_stream(runtime: AgentRuntime | None) -> None:
+    model_client = ReplayChatCompletionClient(["Done."])
+    code_executor_agent = CodeExecutorAgent(
+        "code_executor", code_executor=LocalCommandLineCodeExecutor(), code_executor_stream=True
+    )
+    inner_team = RoundRobinGroupChat([code_executor_agent], max_turns=1, runtime=runtime)
+    society_of_mind_agent = SocietyOfMindAgent("society_of_mind", team=inner_team, model_client=model_client)
+
+    chunks: List[str] = []
+    response: Response | None = None
+    async for message in society_of_mind_agent.on_messages_stream(
+        [TextMessage(content="```python\nprint('hello', flush=True)\n```", source="user")], CancellationToken()
+    ):
+        if isinstance(message, CodeExecutionStreamingChunkEvent):
+            chunks.append(message.content)
+        elif isinstance(message, Response):
+            response = message
+    assert "".join(chunks) == "hello\n"
+    assert response is not None
+    assert isinstance(response.chat_message, TextMessage)
+    assert response.chat_message.content == "Done."
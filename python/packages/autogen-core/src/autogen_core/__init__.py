@@ -10,7 +10,7 @@
 from ._agent_runtime import AgentRuntime
 from ._agent_type import AgentType
 from ._base_agent import BaseAgent
-from ._cache_store import CacheStore, InMemoryStore
+from ._cache_store import AsyncCacheStore, BoundedInMemoryStore, CacheStats, CacheStore, InMemoryStore
 from ._cancellation_token import CancellationToken
 from ._closure_agent import ClosureAgent, ClosureContext
 from ._component_config import (
@@ -48,6 +48,9 @@
 from ._serialization import (
     JSON_DATA_CONTENT_TYPE as JSON_DATA_CONTENT_TYPE_ALIAS,
 )
+from ._serialization import (
+    MSGPACK_DATA_CONTENT_TYPE as MSGPACK_DATA_CONTENT_TYPE_ALIAS,
+)
 from ._serialization import (
     PROTOBUF_DATA_CONTENT_TYPE as PROTOBUF_DATA_CONTENT_TYPE_ALIAS,
 )
@@ -56,6 +59,7 @@
     UnknownPayload,
     try_get_known_serializers_for_type,
 )
+from ._sharded_agent_runtime import ShardedAgentRuntime
 from ._single_threaded_agent_runtime import SingleThreadedAgentRuntime
 from ._subscription import Subscription
 from ._subscription_context import SubscriptionInstantiationContext
@@ -79,6 +83,9 @@
 PROTOBUF_DATA_CONTENT_TYPE = PROTOBUF_DATA_CONTENT_TYPE_ALIAS
 """The content type for Protobuf data."""
 
+MSGPACK_DATA_CONTENT_TYPE = MSGPACK_DATA_CONTENT_TYPE_ALIAS
+"""The content type for MessagePack data. Requires the ``msgpack`` package."""
+
 __all__ = [
     "Agent",
     "AgentId",
@@ -87,7 +94,10 @@
     "AgentRuntime",
     "BaseAgent",
     "CacheStore",
+    "AsyncCacheStore",
     "InMemoryStore",
+    "BoundedInMemoryStore",
+    "CacheStats",
     "CancellationToken",
     "AgentInstantiationContext",
     "TopicId",
@@ -115,7 +125,9 @@
     "TypePrefixSubscription",
     "JSON_DATA_CONTENT_TYPE",
     "PROTOBUF_DATA_CONTENT_TYPE",
+    "MSGPACK_DATA_CONTENT_TYPE",
     "SingleThreadedAgentRuntime",
+    "ShardedAgentRuntime",
     "ROOT_LOGGER_NAME",
     "EVENT_LOGGER_NAME",
     "TRACE_LOGGER_NAME",
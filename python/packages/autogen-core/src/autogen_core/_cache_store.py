@@ -1,5 +1,12 @@
+import asyncio
+import heapq
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Generic, Optional, TypeVar
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Generic, Iterable, List, Literal, Mapping, Optional, Sequence, Tuple, TypeVar, cast
 
 from pydantic import BaseModel
 from typing_extensions import Self
@@ -45,6 +52,70 @@ def set(self, key: str, value: T) -> None:
         ...
 
 
+class AsyncCacheStore(ABC, Generic[T], ComponentBase[BaseModel]):
+    """
+    This protocol defines the asynchronous interface for store/cache operations.
+
+    Implement it for stores backed by network or disk I/O so that lookups do not
+    block the event loop. Sub-classes should handle the lifecycle of underlying storage.
+    """
+
+    component_type = "cache_store"
+
+    @abstractmethod
+    async def aget(self, key: str, default: Optional[T] = None) -> Optional[T]:
+        """
+        Retrieve an item from the store.
+
+        Args:
+            key: The key identifying the item in the store.
+            default (optional): The default value to return if the key is not found.
+                                Defaults to None.
+
+        Returns:
+            The value associated with the key if found, else the default value.
+        """
+        ...
+
+    @abstractmethod
+    async def aset(self, key: str, value: T) -> None:
+        """
+        Set an item in the store.
+
+        Args:
+            key: The key under which the item is to be stored.
+            value: The value to be stored in the store.
+        """
+        ...
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[T]]:
+        """
+        Retrieve several items from the store.
+
+        The default implementation issues concurrent :meth:`aget` calls; stores with
+        a native batch operation should override it.
+
+        Args:
+            keys: The keys identifying the items in the store.
+
+        Returns:
+            The values associated with the keys, in order, with None for missing keys.
+        """
+        return list(await asyncio.gather(*(self.aget(key) for key in keys)))
+
+    async def mset(self, items: Mapping[str, T]) -> None:
+        """
+        Set several items in the store.
+
+        The default implementation issues concurrent :meth:`aset` calls; stores with
+        a native batch operation should override it.
+
+        Args:
+            items: A mapping of keys to the values to be stored.
+        """
+        await asyncio.gather(*(self.aset(key, value) for key, value in items.items()))
+
+
 class InMemoryStoreConfig(BaseModel):
     pass
 
@@ -68,3 +139,274 @@ def _to_config(self) -> InMemoryStoreConfig:
     @classmethod
     def _from_config(cls, config: InMemoryStoreConfig) -> Self:
         return cls()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """A snapshot of the counters of a :class:`BoundedInMemoryStore`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    approximate_bytes: int
+
+
+class BoundedInMemoryStoreConfig(BaseModel):
+    """Configuration for BoundedInMemoryStore"""
+
+    max_entries: Optional[int] = None
+    max_bytes: Optional[int] = None
+    eviction_policy: Literal["lru", "lfu"] = "lru"
+    ttl: Optional[float] = None
+
+
+class _BoundedEntry(Generic[T]):
+    __slots__ = ("value", "size", "expires_at", "frequency")
+
+    def __init__(self, value: T, size: int, expires_at: Optional[float]) -> None:
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.frequency = 1
+
+
+def _approximate_size(value: Any) -> int:
+    if isinstance(value, BaseModel):
+        return len(value.model_dump_json())
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    # sys.getsizeof only counts the references held by a container, so add the sizes of its items.
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_approximate_size(item) for item in cast(Iterable[Any], value))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _approximate_size(key) + _approximate_size(item) for key, item in value.items()
+        )
+    return sys.getsizeof(value)
+
+
+class BoundedInMemoryStore(CacheStore[T], Component[BoundedInMemoryStoreConfig]):
+    """An in-memory cache store with a bounded size and optional expiry.
+
+    Unlike :class:`InMemoryStore`, entries are evicted once the store holds more than
+    ``max_entries`` items or more than ``max_bytes`` of approximate value size, so it is
+    suitable as the backing store of a long-running cache. The size of a value is its
+    JSON length for pydantic models, its length for strings and bytes, the sum of the
+    sizes of its items for lists, tuples, sets and dicts, such as cached streams, and
+    :func:`sys.getsizeof` otherwise. A value larger than ``max_bytes`` is not stored.
+
+    Expired entries are dropped on every write, when they are read, and before the store
+    reports its size, so a store with only ``ttl`` set does not grow with entries that
+    have expired, and ``len()`` and :meth:`stats` only count live entries.
+
+    Args:
+        max_entries (int, optional): The maximum number of entries to keep.
+        max_bytes (int, optional): The maximum approximate size of all stored values.
+        eviction_policy (str): ``"lru"`` evicts the least recently used entry,
+            ``"lfu"`` evicts the least frequently used entry, breaking ties by recency.
+            Defaults to ``"lru"``.
+        ttl (float, optional): The default time to live of an entry in seconds.
+            Can be overridden per entry in :meth:`set`.
+
+    Example:
+
+        .. code-block:: python
+
+            from autogen_core import BoundedInMemoryStore
+
+            store = BoundedInMemoryStore[str](max_entries=2)
+            store.set("a", "1")
+            store.set("b", "2")
+            store.get("a")
+            store.set("c", "3")  # Evicts "b", the least recently used entry.
+            print(store.get("b"), store.stats())
+    """
+
+    component_provider_override = "autogen_core.BoundedInMemoryStore"
+    component_config_schema = BoundedInMemoryStoreConfig
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        eviction_policy: Literal["lru", "lfu"] = "lru",
+        ttl: Optional[float] = None,
+    ) -> None:
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        if eviction_policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._eviction_policy = eviction_policy
+        self._ttl = ttl
+        self._clock = time.monotonic
+        self._lock = threading.Lock()
+        # Ordered from least to most recently used.
+        self._entries: OrderedDict[str, _BoundedEntry[T]] = OrderedDict()
+        # For LFU, keys grouped by access frequency, each group ordered by recency.
+        self._frequencies: Dict[int, OrderedDict[str, None]] = {}
+        # A min-heap of the expiry times of the entries with a time to live. Records of removed or
+        # overwritten entries are skipped when they reach the top.
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._min_frequency = 0
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: str, default: Optional[T] = None) -> Optional[T]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            if entry.expires_at is not None and entry.expires_at <= self._clock():
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return default
+            self._hits += 1
+            self._touch(key, entry)
+            return entry.value
+
+    def set(self, key: str, value: T, ttl: Optional[float] = None) -> None:
+        """
+        Set an item in the store, evicting other items if the store is over its limits.
+
+        Args:
+            key: The key under which the item is to be stored.
+            value: The value to be stored in the store.
+            ttl (optional): The time to live of this item in seconds. Defaults to the store's ``ttl``.
+        """
+        ttl = ttl if ttl is not None else self._ttl
+        size = _approximate_size(value) if self._max_bytes is not None else 0
+        with self._lock:
+            now = self._clock()
+            self._purge_expired(now)
+            if key in self._entries:
+                self._remove(key)
+            if self._max_bytes is not None and size > self._max_bytes:
+                return
+            # Make room before inserting so that a new entry is never its own eviction victim.
+            self._evict(size)
+            entry = _BoundedEntry(value, size, now + ttl if ttl is not None else None)
+            self._entries[key] = entry
+            self._bytes += size
+            if entry.expires_at is not None:
+                heapq.heappush(self._expiry_heap, (entry.expires_at, key))
+                if len(self._expiry_heap) > 2 * len(self._entries) + 64:
+                    # Drop the records of overwritten entries.
+                    self._expiry_heap = [
+                        (item.expires_at, item_key)
+                        for item_key, item in self._entries.items()
+                        if item.expires_at is not None
+                    ]
+                    heapq.heapify(self._expiry_heap)
+            if self._eviction_policy == "lfu":
+                self._frequencies.setdefault(1, OrderedDict())[key] = None
+                self._min_frequency = 1
+
+    def clear(self) -> None:
+        """Remove all items from the store. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._frequencies.clear()
+            self._expiry_heap.clear()
+            self._min_frequency = 0
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the hit, miss, eviction and size counters."""
+        with self._lock:
+            self._purge_expired(self._clock())
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                entries=len(self._entries),
+                approximate_bytes=self._bytes,
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge_expired(self._clock())
+            return len(self._entries)
+
+    def _purge_expired(self, now: float) -> None:
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                self._expirations += 1
+
+    def _touch(self, key: str, entry: _BoundedEntry[T]) -> None:
+        if self._eviction_policy == "lru":
+            self._entries.move_to_end(key)
+            return
+        bucket = self._frequencies[entry.frequency]
+        del bucket[key]
+        if not bucket:
+            del self._frequencies[entry.frequency]
+            if self._min_frequency == entry.frequency:
+                self._min_frequency += 1
+        entry.frequency += 1
+        self._frequencies.setdefault(entry.frequency, OrderedDict())[key] = None
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        if self._eviction_policy == "lfu":
+            bucket = self._frequencies[entry.frequency]
+            del bucket[key]
+            if not bucket:
+                del self._frequencies[entry.frequency]
+                if self._min_frequency == entry.frequency:
+                    self._min_frequency = min(self._frequencies, default=0)
+
+    def _victim(self) -> str:
+        if self._eviction_policy == "lru":
+            return next(iter(self._entries))
+        return next(iter(self._frequencies[self._min_frequency]))
+
+    def _over_limits(self, incoming_size: int) -> bool:
+        if self._max_entries is not None and len(self._entries) >= self._max_entries:
+            return True
+        return self._max_bytes is not None and self._bytes + incoming_size > self._max_bytes
+
+    def _evict(self, incoming_size: int) -> None:
+        now = self._clock()
+        while self._entries and self._over_limits(incoming_size):
+            key = self._victim()
+            expires_at = self._entries[key].expires_at
+            self._remove(key)
+            if expires_at is not None and expires_at <= now:
+                self._expirations += 1
+            else:
+                self._evictions += 1
+
+    def _to_config(self) -> BoundedInMemoryStoreConfig:
+        return BoundedInMemoryStoreConfig(
+            max_entries=self._max_entries,
+            max_bytes=self._max_bytes,
+            eviction_policy=self._eviction_policy,
+            ttl=self._ttl,
+        )
+
+    @classmethod
+    def _from_config(cls, config: BoundedInMemoryStoreConfig) -> Self:
+        return cls(
+            max_entries=config.max_entries,
+            max_bytes=config.max_bytes,
+            eviction_policy=config.eviction_policy,
+            ttl=config.ttl,
+        )
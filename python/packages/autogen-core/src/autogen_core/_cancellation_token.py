@@ -32,6 +32,12 @@ def add_callback(self, callback: Callable[[], None]) -> None:
             else:
                 self._callbacks.append(callback)
 
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        """Detach a callback attached with :meth:`add_callback`. Does nothing if it is not attached."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
     def link_future(self, future: Future[Any]) -> Future[Any]:
         """Link a pending async call to a token to allow its cancellation"""
         with self._lock:
@@ -4,7 +4,7 @@
 import re
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, cast
+from typing import Any, Dict, Tuple, cast
 
 from PIL import Image as PILImage
 from pydantic import GetCoreSchemaHandler, ValidationInfo
@@ -15,6 +15,9 @@
 class Image:
     """Represents an image.
 
+    Images created from PNG or JPEG data (with :meth:`from_base64`, :meth:`from_uri` or :meth:`from_file`)
+    keep the original encoded bytes and are only decoded when :attr:`image` is accessed. The base64
+    representation is computed once and reused for serialization and :attr:`data_uri`.
 
     Example:
 
@@ -40,7 +43,50 @@ async def from_url(url: str) -> Image:
     """
 
     def __init__(self, image: PILImage.Image):
-        self.image: PILImage.Image = image.convert("RGB")
+        self._pil: PILImage.Image | None = image.convert("RGB")
+        self._encoded: bytes | None = None
+        self._mime_type: str | None = None
+        self._base64: str | None = None
+
+    @classmethod
+    def _from_encoded(cls, data: bytes) -> Image:
+        mime_type = _get_mime_type(data)
+        if mime_type not in _PASSTHROUGH_MIME_TYPES:
+            return cls(PILImage.open(BytesIO(data)))
+        image = cls.__new__(cls)
+        image._pil = None
+        image._encoded = data
+        image._mime_type = mime_type
+        image._base64 = None
+        return image
+
+    @property
+    def image(self) -> PILImage.Image:
+        """The decoded image. Images created from encoded data are only decoded when this is first accessed.
+
+        The returned image should be treated as read-only; assign a new image instead of modifying it in place,
+        as the encoded representation is cached.
+        """
+        if self._pil is None:
+            assert self._encoded is not None
+            self._pil = PILImage.open(BytesIO(self._encoded)).convert("RGB")
+        return self._pil
+
+    @image.setter
+    def image(self, image: PILImage.Image) -> None:
+        self._pil = image.convert("RGB")
+        self._encoded = None
+        self._mime_type = None
+        self._base64 = None
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """The width and height of the image, read from the encoded header if the image has not been decoded."""
+        if self._pil is None:
+            assert self._encoded is not None
+            with PILImage.open(BytesIO(self._encoded)) as header:
+                return header.size
+        return self._pil.size
 
     @classmethod
     def from_pil(cls, pil_image: PILImage.Image) -> Image:
@@ -57,17 +103,27 @@ def from_uri(cls, uri: str) -> Image:
 
     @classmethod
     def from_base64(cls, base64_str: str) -> Image:
-        return cls(PILImage.open(BytesIO(base64.b64decode(base64_str))))
+        return cls._from_encoded(base64.b64decode(base64_str))
+
+    def _encode(self) -> Tuple[bytes, str]:
+        if self._encoded is None:
+            buffered = BytesIO()
+            self.image.save(buffered, format="PNG")
+            self._encoded = buffered.getvalue()
+            self._mime_type = "image/png"
+        assert self._mime_type is not None
+        return self._encoded, self._mime_type
 
     def to_base64(self) -> str:
-        buffered = BytesIO()
-        self.image.save(buffered, format="PNG")
-        content = buffered.getvalue()
-        return base64.b64encode(content).decode("utf-8")
+        # Images created from PNG or JPEG data keep their original encoding; others are encoded as PNG once.
+        if self._base64 is None:
+            content, _ = self._encode()
+            self._base64 = base64.b64encode(content).decode("utf-8")
+        return self._base64
 
     @classmethod
     def from_file(cls, file_path: Path) -> Image:
-        return cls(PILImage.open(file_path))
+        return cls._from_encoded(Path(file_path).read_bytes())
 
     def _repr_html_(self) -> str:
         # Show the image in Jupyter notebook
@@ -75,7 +131,9 @@ def _repr_html_(self) -> str:
 
     @property
     def data_uri(self) -> str:
-        return _convert_base64_to_data_uri(self.to_base64())
+        base64_image = self.to_base64()
+        _, mime_type = self._encode()
+        return f"data:{mime_type};base64,{base64_image}"
 
     # Returns openai.types.chat.ChatCompletionContentPartImageParam, which is a TypedDict
     # We don't use the explicit type annotation so that we can avoid a dependency on the OpenAI Python SDK in this package.
@@ -107,21 +165,18 @@ def serialize(value: Image) -> dict[str, Any]:
         )
 
 
-def _convert_base64_to_data_uri(base64_image: str) -> str:
-    def _get_mime_type_from_data_uri(base64_image: str) -> str:
-        # Decode the base64 string
-        image_data = base64.b64decode(base64_image)
-        # Check the first few bytes for known signatures
-        if image_data.startswith(b"\xff\xd8\xff"):
-            return "image/jpeg"
-        elif image_data.startswith(b"\x89PNG\r\n\x1a\n"):
-            return "image/png"
-        elif image_data.startswith(b"GIF87a") or image_data.startswith(b"GIF89a"):
-            return "image/gif"
-        elif image_data.startswith(b"RIFF") and image_data[8:12] == b"WEBP":
-            return "image/webp"
-        return "image/jpeg"  # use jpeg for unknown formats, best guess.
-
-    mime_type = _get_mime_type_from_data_uri(base64_image)
-    data_uri = f"data:{mime_type};base64,{base64_image}"
-    return data_uri
+# Encoded data in these formats is kept as is; other formats are decoded and re-encoded as PNG.
+_PASSTHROUGH_MIME_TYPES = frozenset({"image/png", "image/jpeg"})
+
+
+def _get_mime_type(image_data: bytes) -> str | None:
+    # Check the first few bytes for known signatures
+    if image_data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    elif image_data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    elif image_data.startswith(b"GIF87a") or image_data.startswith(b"GIF89a"):
+        return "image/gif"
+    elif image_data.startswith(b"RIFF") and image_data[8:12] == b"WEBP":
+        return "image/webp"
+    return None
@@ -1,11 +1,14 @@
+import bisect
 from collections import defaultdict
-from typing import Awaitable, Callable, DefaultDict, List, Sequence, Set
+from typing import Awaitable, Callable, DefaultDict, Dict, List, Sequence, Set, Tuple
 
 from ._agent import Agent
 from ._agent_id import AgentId
 from ._agent_type import AgentType
 from ._subscription import Subscription
 from ._topic import TopicId
+from ._type_prefix_subscription import TypePrefixSubscription
+from ._type_subscription import TypeSubscription
 
 
 async def get_impl(
@@ -29,50 +32,194 @@ async def get_impl(
     return id
 
 
+class _PrefixTrieNode:
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _PrefixTrieNode] = {}
+        self.subscriptions: Dict[str, TypePrefixSubscription] = {}
+
+
+class SubscriptionRoutingTable:
+    """Indexed lookup of the subscriptions matching a topic.
+
+    :class:`TypeSubscription` entries are indexed by exact topic type, :class:`TypePrefixSubscription`
+    entries are stored in a character trie keyed by prefix, and any other :class:`Subscription`
+    implementation is kept aside and checked with :meth:`Subscription.is_match`.
+    Adding or removing a subscription only touches the index bucket it belongs to.
+
+    Matches are returned in the order the subscriptions were added.
+    """
+
+    def __init__(self) -> None:
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self._exact: Dict[str, Dict[str, TypeSubscription]] = {}
+        self._exact_keys: Dict[Tuple[str, str], str] = {}
+        self._prefix_root = _PrefixTrieNode()
+        self._prefix_keys: Dict[Tuple[str, str], str] = {}
+        self._other: Dict[str, Subscription] = {}
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._subscriptions
+
+    @property
+    def subscriptions(self) -> Sequence[Subscription]:
+        return list(self._subscriptions.values())
+
+    def get(self, id: str) -> Subscription | None:
+        return self._subscriptions.get(id)
+
+    def find_equal(self, subscription: Subscription) -> Subscription | None:
+        """Find an existing subscription equal to the given one, without scanning the indexed buckets."""
+        existing = self._subscriptions.get(subscription.id)
+        if existing is not None and existing == subscription:
+            return existing
+        if isinstance(subscription, TypeSubscription):
+            sub_id = self._exact_keys.get((subscription.agent_type, subscription.topic_type))
+        elif isinstance(subscription, TypePrefixSubscription):
+            sub_id = self._prefix_keys.get((subscription.agent_type, subscription.topic_type_prefix))
+        else:
+            # Unknown subscription types define their own equality, fall back to a full scan.
+            return next((sub for sub in self._subscriptions.values() if sub == subscription), None)
+        if sub_id is not None:
+            return self._subscriptions[sub_id]
+        return next((sub for sub in self._other.values() if sub == subscription), None)
+
+    def add(self, subscription: Subscription) -> None:
+        sub_id = subscription.id
+        if sub_id in self._subscriptions:
+            raise ValueError("Subscription already exists")
+        self._subscriptions[sub_id] = subscription
+        self._order[sub_id] = self._next_order
+        self._next_order += 1
+        if isinstance(subscription, TypeSubscription):
+            self._exact.setdefault(subscription.topic_type, {})[sub_id] = subscription
+            self._exact_keys[(subscription.agent_type, subscription.topic_type)] = sub_id
+        elif isinstance(subscription, TypePrefixSubscription):
+            node = self._prefix_root
+            for char in subscription.topic_type_prefix:
+                node = node.children.setdefault(char, _PrefixTrieNode())
+            node.subscriptions[sub_id] = subscription
+            self._prefix_keys[(subscription.agent_type, subscription.topic_type_prefix)] = sub_id
+        else:
+            self._other[sub_id] = subscription
+
+    def remove(self, id: str) -> Subscription:
+        subscription = self._subscriptions.pop(id)
+        del self._order[id]
+        if isinstance(subscription, TypeSubscription):
+            bucket = self._exact[subscription.topic_type]
+            del bucket[id]
+            if not bucket:
+                del self._exact[subscription.topic_type]
+            self._exact_keys.pop((subscription.agent_type, subscription.topic_type), None)
+        elif isinstance(subscription, TypePrefixSubscription):
+            path: List[Tuple[_PrefixTrieNode, str]] = []
+            node = self._prefix_root
+            for char in subscription.topic_type_prefix:
+                path.append((node, char))
+                node = node.children[char]
+            del node.subscriptions[id]
+            self._prefix_keys.pop((subscription.agent_type, subscription.topic_type_prefix), None)
+            # Prune empty branches so the trie does not grow with churn.
+            for parent, char in reversed(path):
+                child = parent.children[char]
+                if child.subscriptions or child.children:
+                    break
+                del parent.children[char]
+        else:
+            del self._other[id]
+        return subscription
+
+    def match(self, topic: TopicId) -> List[Subscription]:
+        matches: List[Subscription] = []
+        exact = self._exact.get(topic.type)
+        if exact:
+            matches.extend(exact.values())
+        node = self._prefix_root
+        if node.subscriptions:
+            matches.extend(node.subscriptions.values())
+        for char in topic.type:
+            next_node = node.children.get(char)
+            if next_node is None:
+                break
+            node = next_node
+            if node.subscriptions:
+                matches.extend(node.subscriptions.values())
+        for subscription in self._other.values():
+            if subscription.is_match(topic):
+                matches.append(subscription)
+        if len(matches) > 1:
+            order = self._order
+            matches.sort(key=lambda sub: order[sub.id])
+        return matches
+
+
 class SubscriptionManager:
     def __init__(self) -> None:
-        self._subscriptions: List[Subscription] = []
+        self._routing_table = SubscriptionRoutingTable()
         self._seen_topics: Set[TopicId] = set()
-        self._subscribed_recipients: DefaultDict[TopicId, List[AgentId]] = defaultdict(list)
+        self._seen_topics_by_type: DefaultDict[str, Set[TopicId]] = defaultdict(set)
+        # Sorted so that the seen topic types sharing a prefix form a contiguous range.
+        self._seen_topic_types: List[str] = []
+        self._subscribed_recipients: Dict[TopicId, List[AgentId]] = {}
 
     @property
     def subscriptions(self) -> Sequence[Subscription]:
-        return self._subscriptions
+        return self._routing_table.subscriptions
+
+    def find_equal(self, subscription: Subscription) -> Subscription | None:
+        """Find an existing subscription equal to the given one."""
+        return self._routing_table.find_equal(subscription)
 
     async def add_subscription(self, subscription: Subscription) -> None:
         # Check if the subscription already exists
-        if any(sub == subscription for sub in self._subscriptions):
+        if self._routing_table.find_equal(subscription) is not None:
             raise ValueError("Subscription already exists")
 
-        self._subscriptions.append(subscription)
-        self._rebuild_subscriptions(self._seen_topics)
+        self._routing_table.add(subscription)
+        self._invalidate_for(subscription)
 
     async def remove_subscription(self, id: str) -> None:
         # Check if the subscription exists
-        if not any(sub.id == id for sub in self._subscriptions):
+        if id not in self._routing_table:
             raise ValueError("Subscription does not exist")
 
-        def is_not_sub(x: Subscription) -> bool:
-            return x.id != id
-
-        self._subscriptions = list(filter(is_not_sub, self._subscriptions))
-
-        # Rebuild the subscriptions
-        self._rebuild_subscriptions(self._seen_topics)
+        subscription = self._routing_table.remove(id)
+        self._invalidate_for(subscription)
 
     async def get_subscribed_recipients(self, topic: TopicId) -> List[AgentId]:
+        recipients = self._subscribed_recipients.get(topic)
+        if recipients is None:
+            recipients = self._build_for_topic(topic)
+        return recipients
+
+    def _invalidate_for(self, subscription: Subscription) -> None:
+        """Drop the cached recipients of the seen topics a subscription can match."""
+        if isinstance(subscription, TypeSubscription):
+            for topic in self._seen_topics_by_type.get(subscription.topic_type, ()):
+                self._subscribed_recipients.pop(topic, None)
+        elif isinstance(subscription, TypePrefixSubscription):
+            prefix = subscription.topic_type_prefix
+            index = bisect.bisect_left(self._seen_topic_types, prefix)
+            while index < len(self._seen_topic_types) and self._seen_topic_types[index].startswith(prefix):
+                for topic in self._seen_topics_by_type[self._seen_topic_types[index]]:
+                    self._subscribed_recipients.pop(topic, None)
+                index += 1
+        else:
+            self._subscribed_recipients.clear()
+
+    def _build_for_topic(self, topic: TopicId) -> List[AgentId]:
         if topic not in self._seen_topics:
-            self._build_for_new_topic(topic)
-        return self._subscribed_recipients[topic]
-
-    # TODO: optimize this...
-    def _rebuild_subscriptions(self, topics: Set[TopicId]) -> None:
-        self._subscribed_recipients.clear()
-        for topic in topics:
-            self._build_for_new_topic(topic)
-
-    def _build_for_new_topic(self, topic: TopicId) -> None:
-        self._seen_topics.add(topic)
-        for subscription in self._subscriptions:
-            if subscription.is_match(topic):
-                self._subscribed_recipients[topic].append(subscription.map_to_agent(topic))
+            self._seen_topics.add(topic)
+            if topic.type not in self._seen_topics_by_type:
+                bisect.insort(self._seen_topic_types, topic.type)
+            self._seen_topics_by_type[topic.type].add(topic)
+        recipients = [subscription.map_to_agent(topic) for subscription in self._routing_table.match(topic)]
+        self._subscribed_recipients[topic] = recipients
+        return recipients
@@ -0,0 +1,659 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import uuid
+import zlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Mapping, Tuple, Type, TypeVar
+
+from opentelemetry.trace import TracerProvider
+
+from ._agent import Agent
+from ._agent_id import AgentId
+from ._agent_metadata import AgentMetadata
+from ._agent_runtime import AgentRuntime
+from ._agent_type import AgentType
+from ._cancellation_token import CancellationToken
+from ._intervention import InterventionHandler
+from ._message_context import MessageContext
+from ._runtime_impl_helpers import SubscriptionManager
+from ._serialization import (
+    JSON_DATA_CONTENT_TYPE,
+    PROTOBUF_DATA_CONTENT_TYPE,
+    MessageSerializer,
+    SerializationRegistry,
+)
+from ._single_threaded_agent_runtime import PublishMessageEnvelope, SingleThreadedAgentRuntime
+from ._subscription import Subscription
+from ._topic import TopicId
+
+T = TypeVar("T", bound=Agent)
+R = TypeVar("R")
+
+
+@dataclass
+class _SerializedMessage:
+    payload: bytes
+    type_name: str
+    data_content_type: str
+
+
+class _ShardSubscriptionManager(SubscriptionManager):
+    """Subscription manager of a shard that only yields the recipients owned by that shard."""
+
+    def __init__(self, owner: ShardedAgentRuntime, index: int) -> None:
+        super().__init__()
+        self._owner = owner
+        self._index = index
+
+    def _build_for_topic(self, topic: TopicId) -> List[AgentId]:
+        # The filtered list replaces the cached one, so it is invalidated with the routing table.
+        recipients = [
+            agent_id for agent_id in super()._build_for_topic(topic) if self._owner.shard_index(agent_id) == self._index
+        ]
+        self._subscribed_recipients[topic] = recipients
+        return recipients
+
+
+class _ShardRuntime(SingleThreadedAgentRuntime):
+    """A :class:`SingleThreadedAgentRuntime` that hosts one partition of the agents of a
+    :class:`ShardedAgentRuntime`. Agents bound to it see it as their runtime, so every call
+    that may concern another partition is forwarded to the owning sharded runtime."""
+
+    def __init__(
+        self,
+        owner: ShardedAgentRuntime,
+        index: int,
+        *,
+        intervention_handlers: List[InterventionHandler] | None,
+        tracer_provider: TracerProvider | None,
+        ignore_unhandled_exceptions: bool,
+        fan_out_concurrency_limit: int | None,
+    ) -> None:
+        super().__init__(
+            intervention_handlers=intervention_handlers,
+            tracer_provider=tracer_provider,
+            ignore_unhandled_exceptions=ignore_unhandled_exceptions,
+            fan_out_concurrency_limit=fan_out_concurrency_limit,
+        )
+        self._owner = owner
+        self._index = index
+        self._subscription_manager = _ShardSubscriptionManager(owner, index)
+        # Callbacks to invoke once a published message, keyed by its cancellation token, is processed. The
+        # callbacks of messages dropped by an intervention handler are invoked on close.
+        self._on_publish_processed: Dict[CancellationToken, Callable[[], None]] = {}
+
+    async def send_message(
+        self,
+        message: Any,
+        recipient: AgentId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+    ) -> Any:
+        return await self._owner.send_message(
+            message, recipient, sender=sender, cancellation_token=cancellation_token, message_id=message_id
+        )
+
+    async def publish_message(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+    ) -> None:
+        await self._owner.publish_message(
+            message, topic_id, sender=sender, cancellation_token=cancellation_token, message_id=message_id
+        )
+
+    async def register_factory(
+        self,
+        type: str | AgentType,
+        agent_factory: Callable[[], T | Awaitable[T]],
+        *,
+        expected_class: type[T] | None = None,
+    ) -> AgentType:
+        return await self._owner.register_factory(type, agent_factory, expected_class=expected_class)
+
+    async def add_subscription(self, subscription: Subscription) -> None:
+        await self._owner.add_subscription(subscription)
+
+    async def remove_subscription(self, id: str) -> None:
+        await self._owner.remove_subscription(id)
+
+    def add_message_serializer(self, serializer: MessageSerializer[Any] | Sequence[MessageSerializer[Any]]) -> None:
+        self._owner.add_message_serializer(serializer)
+
+    async def agent_metadata(self, agent: AgentId) -> AgentMetadata:
+        return await self._owner.agent_metadata(agent)
+
+    async def agent_save_state(self, agent: AgentId) -> Mapping[str, Any]:
+        return await self._owner.agent_save_state(agent)
+
+    async def agent_load_state(self, agent: AgentId, state: Mapping[str, Any]) -> None:
+        await self._owner.agent_load_state(agent, state)
+
+    async def get(
+        self, id_or_type: AgentId | AgentType | str, /, key: str = "default", *, lazy: bool = True
+    ) -> AgentId:
+        return await self._owner.get(id_or_type, key, lazy=lazy)
+
+    async def _get_agent(self, agent_id: AgentId) -> Agent:
+        # Instantiating an agent owned by another shard would create a second copy of it.
+        if self._owner.shard_index(agent_id) != self._index:
+            raise LookupError(f"Agent {agent_id} is not owned by shard {self._index}.")
+        return await super()._get_agent(agent_id)
+
+    async def _create_otel_attributes(
+        self,
+        sender_agent_id: AgentId | None = None,
+        recipient_agent_id: AgentId | None = None,
+        message_context: MessageContext | None = None,
+        message: Any = None,
+    ) -> Mapping[str, str]:
+        # The sender of a message, or the recipient of a response, may live on another shard: it is
+        # described by its id alone rather than looked up.
+        remote_sender = sender_agent_id is not None and self._owner.shard_index(sender_agent_id) != self._index
+        remote_recipient = recipient_agent_id is not None and self._owner.shard_index(recipient_agent_id) != self._index
+        attributes = dict(
+            await super()._create_otel_attributes(
+                sender_agent_id=None if remote_sender else sender_agent_id,
+                recipient_agent_id=None if remote_recipient else recipient_agent_id,
+                message_context=message_context,
+                message=message,
+            )
+        )
+        if remote_sender:
+            assert sender_agent_id is not None
+            attributes["sender_agent_type"] = sender_agent_id.type
+        if remote_recipient:
+            assert recipient_agent_id is not None
+            attributes["recipient_agent_type"] = recipient_agent_id.type
+        return attributes
+
+    # Local operations, only invoked by the owner on this shard's event loop.
+
+    async def _send_local(
+        self,
+        message: Any,
+        recipient: AgentId,
+        sender: AgentId | None,
+        cancellation_token: CancellationToken | None,
+        message_id: str | None,
+    ) -> Any:
+        return await super().send_message(
+            message, recipient, sender=sender, cancellation_token=cancellation_token, message_id=message_id
+        )
+
+    async def _publish_local(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        sender: AgentId | None,
+        cancellation_token: CancellationToken | None,
+        message_id: str,
+        on_processed: Callable[[], None] | None = None,
+    ) -> None:
+        if on_processed is None:
+            await super().publish_message(
+                message, topic_id, sender=sender, cancellation_token=cancellation_token, message_id=message_id
+            )
+            return
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+        self._on_publish_processed[cancellation_token] = on_processed
+        try:
+            await super().publish_message(
+                message, topic_id, sender=sender, cancellation_token=cancellation_token, message_id=message_id
+            )
+        except BaseException:
+            del self._on_publish_processed[cancellation_token]
+            on_processed()
+            raise
+
+    async def _process_publish(self, message_envelope: PublishMessageEnvelope) -> None:
+        try:
+            await super()._process_publish(message_envelope)
+        finally:
+            on_processed = self._on_publish_processed.pop(message_envelope.cancellation_token, None)
+            if on_processed is not None:
+                on_processed()
+
+    async def _register_factory_local(
+        self,
+        type: AgentType,
+        agent_factory: Callable[[], T | Awaitable[T]],
+        expected_class: type[T] | None,
+    ) -> AgentType:
+        return await super().register_factory(type, agent_factory, expected_class=expected_class)
+
+    async def _add_subscription_local(self, subscription: Subscription) -> None:
+        await super().add_subscription(subscription)
+
+    async def _remove_subscription_local(self, id: str) -> None:
+        await super().remove_subscription(id)
+
+    async def close(self) -> None:
+        try:
+            await super().close()
+        finally:
+            on_processed = list(self._on_publish_processed.values())
+            self._on_publish_processed.clear()
+            for callback in on_processed:
+                callback()
+
+    async def _wait_until_idle(self) -> None:
+        await self._message_queue.join()
+
+
+class _Shard:
+    def __init__(self, runtime: _ShardRuntime, index: int) -> None:
+        self.runtime = runtime
+        self.index = index
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the event loop of the shard in its worker thread, if it is not already running."""
+        if self.thread is not None:
+            return
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run_loop, name=f"autogen-shard-{self.index}", daemon=True)
+        self.thread.start()
+
+    def _run_loop(self) -> None:
+        assert self.loop is not None
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        self.loop.close()
+
+
+class ShardedAgentRuntime(AgentRuntime):
+    """An agent runtime that partitions agents across several event loops, each running
+    in its own worker thread.
+
+    Every agent is owned by exactly one shard, chosen by a stable hash of its :class:`AgentId`,
+    and each shard is a :class:`SingleThreadedAgentRuntime` driving its own loop. Because an agent
+    always lives on the same shard, messages to an agent are processed in the same order as
+    they would be by a single :class:`SingleThreadedAgentRuntime`.
+
+    Messages that cross shards are copied through the runtime's serialization registry, so the
+    receiving agent never shares a message object with the sender. Messages of types with no
+    registered serializer are passed by reference.
+
+    Agent factories are registered on every shard and invoked by the shard that owns the agent,
+    and subscriptions are replicated to every shard. Publishing a message delivers it on each
+    shard to the subscribed agents that shard owns.
+
+    The worker thread of a shard is started by :meth:`start`, or by the first message sent to the
+    shard before it. Until then, registrations, subscriptions and state operations run on the
+    caller's event loop.
+
+    .. note::
+
+        Shards are threads, so handlers only run in parallel when they release the GIL
+        (for example, native tokenizers, parsers or I/O), or on free-threaded Python builds.
+
+    Args:
+        num_shards (int, optional): The number of shards. Defaults to the number of CPUs.
+        intervention_handlers (List[InterventionHandler], optional): Intervention handlers installed on every shard. Defaults to None.
+        tracer_provider (TracerProvider, optional): The tracer provider used by every shard. Defaults to None.
+        ignore_unhandled_exceptions (bool, optional): See :class:`SingleThreadedAgentRuntime`. Defaults to True.
+        fan_out_concurrency_limit (int, optional): See :class:`SingleThreadedAgentRuntime`. Defaults to None.
+
+    Example:
+
+        .. code-block:: python
+
+            import asyncio
+
+            from autogen_core import ShardedAgentRuntime
+
+
+            async def main() -> None:
+                runtime = ShardedAgentRuntime(num_shards=4)
+                # ... register agents ...
+                runtime.start()
+                # ... send and publish messages ...
+                await runtime.stop_when_idle()
+                await runtime.close()
+
+
+            asyncio.run(main())
+    """
+
+    def __init__(
+        self,
+        *,
+        num_shards: int | None = None,
+        intervention_handlers: List[InterventionHandler] | None = None,
+        tracer_provider: TracerProvider | None = None,
+        ignore_unhandled_exceptions: bool = True,
+        fan_out_concurrency_limit: int | None = None,
+    ) -> None:
+        if num_shards is None:
+            num_shards = os.cpu_count() or 1
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1.")
+        self._serialization_registry = SerializationRegistry()
+        self._shards = [
+            _Shard(
+                _ShardRuntime(
+                    self,
+                    index,
+                    intervention_handlers=intervention_handlers,
+                    tracer_provider=tracer_provider,
+                    ignore_unhandled_exceptions=ignore_unhandled_exceptions,
+                    fan_out_concurrency_limit=fan_out_concurrency_limit,
+                ),
+                index,
+            )
+            for index in range(num_shards)
+        ]
+        self._running = False
+        self._closed = False
+        # Counts cross-shard dispatches so that idleness can be detected across all shards.
+        self._dispatch_lock = threading.Lock()
+        self._dispatch_count = 0
+        self._dispatches_in_flight = 0
+
+    @property
+    def num_shards(self) -> int:
+        return len(self._shards)
+
+    def shard_index(self, agent_id: AgentId) -> int:
+        """Get the index of the shard that owns the given agent."""
+        if len(self._shards) == 1:
+            return 0
+        return zlib.crc32(f"{agent_id.type}/{agent_id.key}".encode("utf-8")) % len(self._shards)
+
+    async def _run_on_shard(self, shard: _Shard, coro: Coroutine[Any, Any, R]) -> R:
+        if self._closed:
+            coro.close()
+            raise RuntimeError("Runtime is closed.")
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+        if shard.loop is None or current_loop is shard.loop:
+            # Before the worker thread is started, nothing else runs on the shard.
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, shard.loop))
+
+    async def _dispatch(self, shard: _Shard, coro: Coroutine[Any, Any, R]) -> R:
+        with self._dispatch_lock:
+            self._dispatch_count += 1
+            self._dispatches_in_flight += 1
+        try:
+            return await self._run_on_shard(shard, coro)
+        finally:
+            with self._dispatch_lock:
+                self._dispatches_in_flight -= 1
+
+    def _is_on_shard(self, shard: _Shard) -> bool:
+        try:
+            return asyncio.get_running_loop() is shard.loop
+        except RuntimeError:
+            return False
+
+    def _serialize(self, message: Any) -> Any:
+        if message is None:
+            return None
+        type_name = self._serialization_registry.type_name(message)
+        for data_content_type in (JSON_DATA_CONTENT_TYPE, PROTOBUF_DATA_CONTENT_TYPE):
+            if self._serialization_registry.is_registered(type_name, data_content_type):
+                payload = self._serialization_registry.serialize(
+                    message, type_name=type_name, data_content_type=data_content_type
+                )
+                return _SerializedMessage(payload=payload, type_name=type_name, data_content_type=data_content_type)
+        return message
+
+    def _deserialize(self, message: Any) -> Any:
+        if isinstance(message, _SerializedMessage):
+            return self._serialization_registry.deserialize(
+                message.payload, type_name=message.type_name, data_content_type=message.data_content_type
+            )
+        return message
+
+    def _link_cancellation(
+        self, cancellation_token: CancellationToken | None, shard: _Shard
+    ) -> Tuple[CancellationToken, Callable[[], None]]:
+        """Create a token for the target shard that is cancelled when the caller's token is.
+
+        Returns the token and a function that unlinks it, to be called once the shard is done with the message
+        so that a long-lived caller token does not accumulate callbacks."""
+        shard_token = CancellationToken()
+        if cancellation_token is None:
+            return shard_token, lambda: None
+        loop = shard.loop
+        assert loop is not None
+
+        def _cancel() -> None:
+            loop.call_soon_threadsafe(shard_token.cancel)
+
+        cancellation_token.add_callback(_cancel)
+        return shard_token, lambda: cancellation_token.remove_callback(_cancel)
+
+    async def send_message(
+        self,
+        message: Any,
+        recipient: AgentId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+    ) -> Any:
+        shard = self._shards[self.shard_index(recipient)]
+        if self._is_on_shard(shard):
+            return await shard.runtime._send_local(  # type: ignore[reportPrivateUsage]
+                message, recipient, sender, cancellation_token, message_id
+            )
+
+        # The response future and the linked cancellation token are bound to the loop that processes the
+        # message, so a message sent before start() starts the worker thread of its shard.
+        shard.start()
+        serialized = self._serialize(message)
+        shard_token, unlink = self._link_cancellation(cancellation_token, shard)
+
+        async def deliver() -> Any:
+            response = await shard.runtime._send_local(  # type: ignore[reportPrivateUsage]
+                self._deserialize(serialized), recipient, sender, shard_token, message_id
+            )
+            return self._serialize(response)
+
+        try:
+            return self._deserialize(await self._dispatch(shard, deliver()))
+        finally:
+            unlink()
+
+    async def publish_message(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+    ) -> None:
+        if message_id is None:
+            # All shards must see the same id for the one published message.
+            message_id = str(uuid.uuid4())
+        serialized: Any = None
+        deliveries: List[Awaitable[None]] = []
+        for shard in self._shards:
+            if self._is_on_shard(shard):
+                deliveries.append(
+                    shard.runtime._publish_local(  # type: ignore[reportPrivateUsage]
+                        message, topic_id, sender, cancellation_token, message_id
+                    )
+                )
+                continue
+            shard.start()
+            if serialized is None:
+                serialized = self._serialize(message)
+            shard_token, unlink = self._link_cancellation(cancellation_token, shard)
+            deliveries.append(
+                self._dispatch(
+                    shard,
+                    shard.runtime._publish_local(  # type: ignore[reportPrivateUsage]
+                        self._deserialize(serialized),
+                        topic_id,
+                        sender,
+                        shard_token,
+                        message_id,
+                        on_processed=unlink,
+                    ),
+                )
+            )
+        await asyncio.gather(*deliveries)
+
+    async def register_factory(
+        self,
+        type: str | AgentType,
+        agent_factory: Callable[[], T | Awaitable[T]],
+        *,
+        expected_class: type[T] | None = None,
+    ) -> AgentType:
+        if isinstance(type, str):
+            type = AgentType(type)
+        for shard in self._shards:
+            await self._run_on_shard(
+                shard,
+                shard.runtime._register_factory_local(type, agent_factory, expected_class),  # type: ignore[reportPrivateUsage]
+            )
+        return type
+
+    async def register_agent_instance(self, agent_instance: Agent, agent_id: AgentId) -> AgentId:
+        shard = self._shards[self.shard_index(agent_id)]
+        return await self._run_on_shard(shard, shard.runtime.register_agent_instance(agent_instance, agent_id))
+
+    # TODO: uncomment out the following type ignore when this is fixed in mypy: https://github.com/python/mypy/issues/3737
+    async def try_get_underlying_agent_instance(self, id: AgentId, type: Type[T] = Agent) -> T:  # type: ignore[assignment]
+        shard = self._shards[self.shard_index(id)]
+        return await self._run_on_shard(shard, shard.runtime.try_get_underlying_agent_instance(id, type))
+
+    async def get(
+        self, id_or_type: AgentId | AgentType | str, /, key: str = "default", *, lazy: bool = True
+    ) -> AgentId:
+        if isinstance(id_or_type, AgentId):
+            agent_id = id_or_type
+        else:
+            agent_id = AgentId(id_or_type if isinstance(id_or_type, str) else id_or_type.type, key)
+        if not lazy:
+            shard = self._shards[self.shard_index(agent_id)]
+            await self._run_on_shard(shard, SingleThreadedAgentRuntime.get(shard.runtime, agent_id, lazy=False))
+        return agent_id
+
+    async def save_state(self) -> Mapping[str, Any]:
+        state: Dict[str, Any] = {}
+        for shard in self._shards:
+            state.update(await self._run_on_shard(shard, shard.runtime.save_state()))
+        return state
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        partitions: List[Dict[str, Any]] = [{} for _ in self._shards]
+        for agent_id_str, agent_state in state.items():
+            partitions[self.shard_index(AgentId.from_str(agent_id_str))][agent_id_str] = agent_state
+        for shard, partition in zip(self._shards, partitions, strict=True):
+            if partition:
+                await self._run_on_shard(shard, shard.runtime.load_state(partition))
+
+    async def agent_metadata(self, agent: AgentId) -> AgentMetadata:
+        shard = self._shards[self.shard_index(agent)]
+        return await self._run_on_shard(shard, SingleThreadedAgentRuntime.agent_metadata(shard.runtime, agent))
+
+    async def agent_save_state(self, agent: AgentId) -> Mapping[str, Any]:
+        shard = self._shards[self.shard_index(agent)]
+        return await self._run_on_shard(shard, SingleThreadedAgentRuntime.agent_save_state(shard.runtime, agent))
+
+    async def agent_load_state(self, agent: AgentId, state: Mapping[str, Any]) -> None:
+        shard = self._shards[self.shard_index(agent)]
+        await self._run_on_shard(shard, SingleThreadedAgentRuntime.agent_load_state(shard.runtime, agent, state))
+
+    async def add_subscription(self, subscription: Subscription) -> None:
+        # Every shard holds the same subscriptions, so checking the first one is enough.
+        await self._run_on_shard(
+            self._shards[0],
+            self._shards[0].runtime._add_subscription_local(subscription),  # type: ignore[reportPrivateUsage]
+        )
+        for shard in self._shards[1:]:
+            await self._run_on_shard(shard, shard.runtime._add_subscription_local(subscription))  # type: ignore[reportPrivateUsage]
+
+    async def remove_subscription(self, id: str) -> None:
+        await self._run_on_shard(
+            self._shards[0],
+            self._shards[0].runtime._remove_subscription_local(id),  # type: ignore[reportPrivateUsage]
+        )
+        for shard in self._shards[1:]:
+            await self._run_on_shard(shard, shard.runtime._remove_subscription_local(id))  # type: ignore[reportPrivateUsage]
+
+    def add_message_serializer(self, serializer: MessageSerializer[Any] | Sequence[MessageSerializer[Any]]) -> None:
+        self._serialization_registry.add_serializer(serializer)
+        for shard in self._shards:
+            SingleThreadedAgentRuntime.add_message_serializer(shard.runtime, serializer)
+
+    def start(self) -> None:
+        """Start the message processing loop of every shard, without waiting for the shard threads."""
+        if self._closed:
+            raise RuntimeError("Runtime is closed.")
+        if self._running:
+            raise RuntimeError("Runtime is already started")
+        for shard in self._shards:
+            shard.start()
+            assert shard.loop is not None
+            # Messages are dispatched to the shard through the same loop queue, so they run after this.
+            shard.loop.call_soon_threadsafe(shard.runtime.start)
+        self._running = True
+
+    async def stop(self) -> None:
+        """Immediately stop the message processing loop of every shard."""
+        if not self._running:
+            raise RuntimeError("Runtime is not started")
+        try:
+            await asyncio.gather(*(self._run_on_shard(shard, shard.runtime.stop()) for shard in self._shards))
+        finally:
+            self._running = False
+
+    async def stop_when_idle(self) -> None:
+        """Stop the runtime once no shard has an outstanding message and no message is in transit between shards."""
+        if not self._running:
+            raise RuntimeError("Runtime is not started")
+        while True:
+            with self._dispatch_lock:
+                dispatch_count = self._dispatch_count
+            await asyncio.gather(
+                *(self._run_on_shard(shard, shard.runtime._wait_until_idle()) for shard in self._shards)  # type: ignore[reportPrivateUsage]
+            )
+            with self._dispatch_lock:
+                if self._dispatches_in_flight == 0 and self._dispatch_count == dispatch_count:
+                    break
+        try:
+            await asyncio.gather(*(self._run_on_shard(shard, shard.runtime.stop_when_idle()) for shard in self._shards))
+        finally:
+            self._running = False
+
+    async def close(self) -> None:
+        """Stop the runtime if it is running, close all instantiated agents and shut down the shard threads."""
+        if self._closed:
+            return
+        if self._running:
+            await self.stop()
+        for shard in self._shards:
+            await self._run_on_shard(shard, shard.runtime.close())
+        self._closed = True
+        threads: List[threading.Thread] = []
+        for shard in self._shards:
+            if shard.loop is not None and shard.thread is not None:
+                shard.loop.call_soon_threadsafe(shard.loop.stop)
+                threads.append(shard.thread)
+        await asyncio.gather(*(asyncio.to_thread(thread.join) for thread in threads))
+
+    @property
+    def unprocessed_messages_count(self) -> int:
+        return sum(shard.runtime.unprocessed_messages_count for shard in self._shards)
@@ -49,6 +49,15 @@
 logger = logging.getLogger("autogen_core")
 event_logger = logging.getLogger("autogen_core.events")
 
+
+def _event_logging_enabled() -> bool:
+    """Whether an INFO event on the event logger would reach a handler.
+
+    Building event payloads serializes the message, so callers check this first and
+    skip the work entirely when nothing would be emitted."""
+    return event_logger.isEnabledFor(logging.INFO) and event_logger.hasHandlers()
+
+
 # We use a type parameter in some functions which shadows the built-in `type` function.
 # This is a workaround to avoid shadowing the built-in `type` function.
 type_func_alias = type
@@ -161,6 +170,7 @@ class SingleThreadedAgentRuntime(AgentRuntime):
             handlers that can intercept messages before they are sent or published. Defaults to None.
         tracer_provider (TracerProvider, optional): The tracer provider to use for tracing. Defaults to None.
         ignore_unhandled_exceptions (bool, optional): Whether to ignore unhandled exceptions in that occur in agent event handlers. Any background exceptions will be raised on the next call to `process_next` or from an awaited `stop`, `stop_when_idle` or `stop_when`. Note, this does not apply to RPC handlers. Defaults to True.
+        fan_out_concurrency_limit (int, optional): The maximum number of subscriber handlers that run concurrently for a single published message. Defaults to None, which runs all subscriber handlers concurrently.
 
     Examples:
 
@@ -251,7 +261,10 @@ def __init__(
         intervention_handlers: List[InterventionHandler] | None = None,
         tracer_provider: TracerProvider | None = None,
         ignore_unhandled_exceptions: bool = True,
+        fan_out_concurrency_limit: int | None = None,
     ) -> None:
+        if fan_out_concurrency_limit is not None and fan_out_concurrency_limit < 1:
+            raise ValueError("fan_out_concurrency_limit must be at least 1.")
         self._tracer_helper = TraceHelper(tracer_provider, MessageRuntimeTracingConfig("SingleThreadedAgentRuntime"))
         self._message_queue: Queue[PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope] = Queue()
         # (namespace, type) -> List[AgentId]
@@ -267,6 +280,7 @@ def __init__(
         self._ignore_unhandled_handler_exceptions = ignore_unhandled_exceptions
         self._background_exception: BaseException | None = None
         self._agent_instance_types: Dict[str, Type[Agent]] = {}
+        self._fan_out_concurrency_limit = fan_out_concurrency_limit
 
     @property
     def unprocessed_messages_count(
@@ -343,15 +357,16 @@ async def send_message(
         if message_id is None:
             message_id = str(uuid.uuid4())
 
-        event_logger.info(
-            MessageEvent(
-                payload=self._try_serialize(message),
-                sender=sender,
-                receiver=recipient,
-                kind=MessageKind.DIRECT,
-                delivery_stage=DeliveryStage.SEND,
+        if _event_logging_enabled():
+            event_logger.info(
+                MessageEvent(
+                    payload=self._try_serialize(message),
+                    sender=sender,
+                    receiver=recipient,
+                    kind=MessageKind.DIRECT,
+                    delivery_stage=DeliveryStage.SEND,
+                )
             )
-        )
 
         with self._tracer_helper.trace_block(
             "create",
@@ -363,8 +378,9 @@ async def send_message(
             if recipient.type not in self._known_agent_names:
                 future.set_exception(Exception("Recipient not found"))
 
-            content = message.__dict__ if hasattr(message, "__dict__") else message
-            logger.info(f"Sending message of type {type(message).__name__} to {recipient.type}: {content}")
+            if logger.isEnabledFor(logging.INFO):
+                content = message.__dict__ if hasattr(message, "__dict__") else message
+                logger.info(f"Sending message of type {type(message).__name__} to {recipient.type}: {content}")
 
             await self._message_queue.put(
                 SendMessageEnvelope(
@@ -399,21 +415,23 @@ async def publish_message(
         ):
             if cancellation_token is None:
                 cancellation_token = CancellationToken()
-            content = message.__dict__ if hasattr(message, "__dict__") else message
-            logger.info(f"Publishing message of type {type(message).__name__} to all subscribers: {content}")
+            if logger.isEnabledFor(logging.INFO):
+                content = message.__dict__ if hasattr(message, "__dict__") else message
+                logger.info(f"Publishing message of type {type(message).__name__} to all subscribers: {content}")
 
             if message_id is None:
                 message_id = str(uuid.uuid4())
 
-            event_logger.info(
-                MessageEvent(
-                    payload=self._try_serialize(message),
-                    sender=sender,
-                    receiver=topic_id,
-                    kind=MessageKind.PUBLISH,
-                    delivery_stage=DeliveryStage.SEND,
+            if _event_logging_enabled():
+                event_logger.info(
+                    MessageEvent(
+                        payload=self._try_serialize(message),
+                        sender=sender,
+                        receiver=topic_id,
+                        kind=MessageKind.PUBLISH,
+                        delivery_stage=DeliveryStage.SEND,
+                    )
                 )
-            )
 
             await self._message_queue.put(
                 PublishMessageEnvelope(
@@ -469,19 +487,21 @@ async def _process_send(self, message_envelope: SendMessageEnvelope) -> None:
                 raise LookupError(f"Agent type '{recipient.type}' does not exist.")
 
             try:
-                sender_id = str(message_envelope.sender) if message_envelope.sender is not None else "Unknown"
-                logger.info(
-                    f"Calling message handler for {recipient} with message type {type(message_envelope.message).__name__} sent by {sender_id}"
-                )
-                event_logger.info(
-                    MessageEvent(
-                        payload=self._try_serialize(message_envelope.message),
-                        sender=message_envelope.sender,
-                        receiver=recipient,
-                        kind=MessageKind.DIRECT,
-                        delivery_stage=DeliveryStage.DELIVER,
+                if logger.isEnabledFor(logging.INFO):
+                    sender_id = str(message_envelope.sender) if message_envelope.sender is not None else "Unknown"
+                    logger.info(
+                        f"Calling message handler for {recipient} with message type {type(message_envelope.message).__name__} sent by {sender_id}"
+                    )
+                if _event_logging_enabled():
+                    event_logger.info(
+                        MessageEvent(
+                            payload=self._try_serialize(message_envelope.message),
+                            sender=message_envelope.sender,
+                            receiver=recipient,
+                            kind=MessageKind.DIRECT,
+                            delivery_stage=DeliveryStage.DELIVER,
+                        )
                     )
-                )
                 recipient_agent = await self._get_agent(recipient)
 
                 message_context = MessageContext(
@@ -511,35 +531,38 @@ async def _process_send(self, message_envelope: SendMessageEnvelope) -> None:
                 if not message_envelope.future.cancelled():
                     message_envelope.future.set_exception(e)
                 self._message_queue.task_done()
-                event_logger.info(
-                    MessageHandlerExceptionEvent(
-                        payload=self._try_serialize(message_envelope.message),
-                        handling_agent=recipient,
-                        exception=e,
+                if _event_logging_enabled():
+                    event_logger.info(
+                        MessageHandlerExceptionEvent(
+                            payload=self._try_serialize(message_envelope.message),
+                            handling_agent=recipient,
+                            exception=e,
+                        )
                     )
-                )
                 return
             except BaseException as e:
                 message_envelope.future.set_exception(e)
                 self._message_queue.task_done()
-                event_logger.info(
-                    MessageHandlerExceptionEvent(
-                        payload=self._try_serialize(message_envelope.message),
-                        handling_agent=recipient,
-                        exception=e,
+                if _event_logging_enabled():
+                    event_logger.info(
+                        MessageHandlerExceptionEvent(
+                            payload=self._try_serialize(message_envelope.message),
+                            handling_agent=recipient,
+                            exception=e,
+                        )
                     )
-                )
                 return
 
-            event_logger.info(
-                MessageEvent(
-                    payload=self._try_serialize(response),
-                    sender=message_envelope.recipient,
-                    receiver=message_envelope.sender,
-                    kind=MessageKind.RESPOND,
-                    delivery_stage=DeliveryStage.SEND,
+            if _event_logging_enabled():
+                event_logger.info(
+                    MessageEvent(
+                        payload=self._try_serialize(response),
+                        sender=message_envelope.recipient,
+                        receiver=message_envelope.sender,
+                        kind=MessageKind.RESPOND,
+                        delivery_stage=DeliveryStage.SEND,
+                    )
                 )
-            )
 
             await self._message_queue.put(
                 ResponseMessageEnvelope(
@@ -555,69 +578,60 @@ async def _process_send(self, message_envelope: SendMessageEnvelope) -> None:
     async def _process_publish(self, message_envelope: PublishMessageEnvelope) -> None:
         with self._tracer_helper.trace_block("publish", message_envelope.topic_id, parent=message_envelope.metadata):
             try:
-                responses: List[Awaitable[Any]] = []
                 recipients = await self._subscription_manager.get_subscribed_recipients(message_envelope.topic_id)
+                sender = message_envelope.sender
+                # Everything that does not depend on the recipient is resolved once for the whole fan-out.
+                message_type_name = type(message_envelope.message).__name__
+                sender_name = "Unknown"
+                if sender is not None and logger.isEnabledFor(logging.INFO):
+                    sender_name = str(sender)
+                payload: str | None = None
+                base_attributes: Mapping[str, str] | None = None
+                semaphore = (
+                    asyncio.Semaphore(self._fan_out_concurrency_limit)
+                    if self._fan_out_concurrency_limit is not None
+                    else None
+                )
+
+                responses: List[Awaitable[Any]] = []
                 for agent_id in recipients:
                     # Avoid sending the message back to the sender
-                    if message_envelope.sender is not None and agent_id == message_envelope.sender:
+                    if sender is not None and agent_id == sender:
                         continue
 
-                    sender_agent = (
-                        await self._get_agent(message_envelope.sender) if message_envelope.sender is not None else None
-                    )
-                    sender_name = str(sender_agent.id) if sender_agent is not None else "Unknown"
-                    logger.info(
-                        f"Calling message handler for {agent_id.type} with message type {type(message_envelope.message).__name__} published by {sender_name}"
-                    )
-                    event_logger.info(
-                        MessageEvent(
-                            payload=self._try_serialize(message_envelope.message),
-                            sender=message_envelope.sender,
-                            receiver=None,
-                            kind=MessageKind.PUBLISH,
-                            delivery_stage=DeliveryStage.DELIVER,
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            f"Calling message handler for {agent_id.type} with message type {message_type_name} published by {sender_name}"
+                        )
+                    if _event_logging_enabled():
+                        if payload is None:
+                            payload = self._try_serialize(message_envelope.message)
+                        event_logger.info(
+                            MessageEvent(
+                                payload=payload,
+                                sender=sender,
+                                receiver=None,
+                                kind=MessageKind.PUBLISH,
+                                delivery_stage=DeliveryStage.DELIVER,
+                            )
                         )
-                    )
                     message_context = MessageContext(
-                        sender=message_envelope.sender,
+                        sender=sender,
                         topic_id=message_envelope.topic_id,
                         is_rpc=False,
                         cancellation_token=message_envelope.cancellation_token,
                         message_id=message_envelope.message_id,
                     )
+                    if base_attributes is None:
+                        base_attributes = await self._create_otel_attributes(
+                            sender_agent_id=sender,
+                            message_context=message_context,
+                            message=message_envelope.message,
+                        )
                     agent = await self._get_agent(agent_id)
-
-                    async def _on_message(agent: Agent, message_context: MessageContext) -> Any:
-                        with self._tracer_helper.trace_block(
-                            "process",
-                            agent.id,
-                            parent=message_envelope.metadata,
-                            attributes=await self._create_otel_attributes(
-                                sender_agent_id=message_envelope.sender,
-                                recipient_agent_id=agent.id,
-                                message_context=message_context,
-                                message=message_envelope.message,
-                            ),
-                        ):
-                            with MessageHandlerContext.populate_context(agent.id):
-                                try:
-                                    return await agent.on_message(
-                                        message_envelope.message,
-                                        ctx=message_context,
-                                    )
-                                except BaseException as e:
-                                    logger.error(f"Error processing publish message for {agent.id}", exc_info=True)
-                                    event_logger.info(
-                                        MessageHandlerExceptionEvent(
-                                            payload=self._try_serialize(message_envelope.message),
-                                            handling_agent=agent.id,
-                                            exception=e,
-                                        )
-                                    )
-                                    raise e
-
-                    future = _on_message(agent, message_context)
-                    responses.append(future)
+                    responses.append(
+                        self._deliver_published(message_envelope, agent, message_context, base_attributes, semaphore)
+                    )
 
                 await asyncio.gather(*responses)
             except BaseException as e:
@@ -627,6 +641,53 @@ async def _on_message(agent: Agent, message_context: MessageContext) -> Any:
                 self._message_queue.task_done()
             # TODO if responses are given for a publish
 
+    async def _deliver_published(
+        self,
+        message_envelope: PublishMessageEnvelope,
+        agent: Agent,
+        message_context: MessageContext,
+        base_attributes: Mapping[str, str],
+        semaphore: asyncio.Semaphore | None,
+    ) -> Any:
+        if semaphore is None:
+            return await self._invoke_published_handler(message_envelope, agent, message_context, base_attributes)
+        async with semaphore:
+            return await self._invoke_published_handler(message_envelope, agent, message_context, base_attributes)
+
+    async def _invoke_published_handler(
+        self,
+        message_envelope: PublishMessageEnvelope,
+        agent: Agent,
+        message_context: MessageContext,
+        base_attributes: Mapping[str, str],
+    ) -> Any:
+        attributes = dict(base_attributes)
+        attributes["recipient_agent_type"] = agent.id.type
+        attributes["recipient_agent_class"] = agent.__class__.__name__
+        with self._tracer_helper.trace_block(
+            "process",
+            agent.id,
+            parent=message_envelope.metadata,
+            attributes=attributes,
+        ):
+            with MessageHandlerContext.populate_context(agent.id):
+                try:
+                    return await agent.on_message(
+                        message_envelope.message,
+                        ctx=message_context,
+                    )
+                except BaseException as e:
+                    logger.error(f"Error processing publish message for {agent.id}", exc_info=True)
+                    if _event_logging_enabled():
+                        event_logger.info(
+                            MessageHandlerExceptionEvent(
+                                payload=self._try_serialize(message_envelope.message),
+                                handling_agent=agent.id,
+                                exception=e,
+                            )
+                        )
+                    raise e
+
     async def _process_response(self, message_envelope: ResponseMessageEnvelope) -> None:
         with self._tracer_helper.trace_block(
             "ack",
@@ -638,23 +699,25 @@ async def _process_response(self, message_envelope: ResponseMessageEnvelope) ->
                 message=message_envelope.message,
             ),
         ):
-            content = (
-                message_envelope.message.__dict__
-                if hasattr(message_envelope.message, "__dict__")
-                else message_envelope.message
-            )
-            logger.info(
-                f"Resolving response with message type {type(message_envelope.message).__name__} for recipient {message_envelope.recipient} from {message_envelope.sender.type}: {content}"
-            )
-            event_logger.info(
-                MessageEvent(
-                    payload=self._try_serialize(message_envelope.message),
-                    sender=message_envelope.sender,
-                    receiver=message_envelope.recipient,
-                    kind=MessageKind.RESPOND,
-                    delivery_stage=DeliveryStage.DELIVER,
+            if logger.isEnabledFor(logging.INFO):
+                content = (
+                    message_envelope.message.__dict__
+                    if hasattr(message_envelope.message, "__dict__")
+                    else message_envelope.message
+                )
+                logger.info(
+                    f"Resolving response with message type {type(message_envelope.message).__name__} for recipient {message_envelope.recipient} from {message_envelope.sender.type}: {content}"
+                )
+            if _event_logging_enabled():
+                event_logger.info(
+                    MessageEvent(
+                        payload=self._try_serialize(message_envelope.message),
+                        sender=message_envelope.sender,
+                        receiver=message_envelope.recipient,
+                        kind=MessageKind.RESPOND,
+                        delivery_stage=DeliveryStage.DELIVER,
+                    )
                 )
-            )
             if not message_envelope.future.cancelled():
                 message_envelope.future.set_result(message_envelope.message)
             self._message_queue.task_done()
@@ -707,14 +770,15 @@ async def _process_next(self) -> None:
                                 future.set_exception(e)
                                 return
                             if temp_message is DropMessage or isinstance(temp_message, DropMessage):
-                                event_logger.info(
-                                    MessageDroppedEvent(
-                                        payload=self._try_serialize(message),
-                                        sender=sender,
-                                        receiver=recipient,
-                                        kind=MessageKind.DIRECT,
+                                if _event_logging_enabled():
+                                    event_logger.info(
+                                        MessageDroppedEvent(
+                                            payload=self._try_serialize(message),
+                                            sender=sender,
+                                            receiver=recipient,
+                                            kind=MessageKind.DIRECT,
+                                        )
                                     )
-                                )
                                 future.set_exception(MessageDroppedException())
                                 return
 
@@ -747,14 +811,15 @@ async def _process_next(self) -> None:
                                 logger.error(f"Exception raised in in intervention handler: {e}", exc_info=True)
                                 return
                             if temp_message is DropMessage or isinstance(temp_message, DropMessage):
-                                event_logger.info(
-                                    MessageDroppedEvent(
-                                        payload=self._try_serialize(message),
-                                        sender=sender,
-                                        receiver=topic_id,
-                                        kind=MessageKind.PUBLISH,
+                                if _event_logging_enabled():
+                                    event_logger.info(
+                                        MessageDroppedEvent(
+                                            payload=self._try_serialize(message),
+                                            sender=sender,
+                                            receiver=topic_id,
+                                            kind=MessageKind.PUBLISH,
+                                        )
                                     )
-                                )
                                 return
 
                         message_envelope.message = temp_message
@@ -773,14 +838,15 @@ async def _process_next(self) -> None:
                             future.set_exception(e)
                             return
                         if temp_message is DropMessage or isinstance(temp_message, DropMessage):
-                            event_logger.info(
-                                MessageDroppedEvent(
-                                    payload=self._try_serialize(message),
-                                    sender=sender,
-                                    receiver=recipient,
-                                    kind=MessageKind.RESPOND,
+                            if _event_logging_enabled():
+                                event_logger.info(
+                                    MessageDroppedEvent(
+                                        payload=self._try_serialize(message),
+                                        sender=sender,
+                                        receiver=recipient,
+                                        kind=MessageKind.RESPOND,
+                                    )
                                 )
-                            )
                             future.set_exception(MessageDroppedException())
                             return
                         message_envelope.message = temp_message
@@ -961,12 +1027,13 @@ async def _invoke_agent_factory(
                 return agent
 
             except BaseException as e:
-                event_logger.info(
-                    AgentConstructionExceptionEvent(
-                        agent_id=agent_id,
-                        exception=e,
+                if _event_logging_enabled():
+                    event_logger.info(
+                        AgentConstructionExceptionEvent(
+                            agent_id=agent_id,
+                            exception=e,
+                        )
                     )
-                )
                 logger.error(f"Error constructing agent {agent_id}", exc_info=True)
                 raise
 
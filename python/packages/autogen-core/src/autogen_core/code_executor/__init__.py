@@ -1,4 +1,4 @@
-from ._base import CodeBlock, CodeExecutor, CodeResult
+from ._base import CodeBlock, CodeExecutor, CodeOutputChunk, CodeResult
 from ._func_with_reqs import (
     Alias,
     FunctionWithRequirements,
@@ -11,6 +11,7 @@
 __all__ = [
     "CodeBlock",
     "CodeExecutor",
+    "CodeOutputChunk",
     "CodeResult",
     "Alias",
     "ImportFromModule",
@@ -6,7 +6,7 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from types import TracebackType
-from typing import List, Optional, Type
+from typing import AsyncGenerator, List, Literal, Optional, Type
 
 from pydantic import BaseModel
 from typing_extensions import Self
@@ -31,6 +31,16 @@ class CodeResult:
     output: str
 
 
+@dataclass
+class CodeOutputChunk:
+    """A chunk of output that a code block printed while it was running."""
+
+    content: str
+    stream: Literal["stdout", "stderr"]
+    code_block_index: int
+    """The index of the code block in the executed code blocks."""
+
+
 class CodeExecutor(ABC, ComponentBase[BaseModel]):
     """Executes code blocks and returns the result.
 
@@ -71,6 +81,23 @@ async def execute_code_blocks(
         """
         ...
 
+    async def execute_code_blocks_stream(
+        self, code_blocks: List[CodeBlock], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[CodeOutputChunk | CodeResult, None]:
+        """Execute code blocks, yield the output as it is printed, and yield the result last.
+
+        The default implementation waits for :meth:`execute_code_blocks` and only yields its result.
+        Code executors that can read the output of running code should override this method.
+
+        Args:
+            code_blocks (List[CodeBlock]): The code blocks to execute.
+
+        Returns:
+            AsyncGenerator[CodeOutputChunk | CodeResult, None]: The output chunks, followed by the result of
+            the code execution.
+        """
+        yield await self.execute_code_blocks(code_blocks, cancellation_token)
+
     @abstractmethod
     async def start(self) -> None:
         """Start the code executor."""
@@ -53,29 +53,73 @@ def __init__(
         self._token_limit = token_limit
         self._model_client = model_client
         self._tool_schema = tool_schema or []
+        self._base_tokens: int | None = None
+        self._empty_tokens: int | None = None
+        self._counted_messages: List[LLMMessage] = []
+        self._counted_tokens: List[int] = []
 
     async def get_messages(self) -> List[LLMMessage]:
         """Get at most `token_limit` tokens in recent messages. If the token limit is not
-        provided, then return as many messages as the remaining token allowed by the model client."""
+        provided, then return as many messages as the remaining token allowed by the model client.
+
+        Messages are removed from the middle of the history until the remaining messages fit.
+        Token counts are cached per message, so each call only tokenizes the messages added
+        since the previous call. The token count of a list of messages is taken to be the
+        count of an empty list (tool schemas and reply priming) plus the count of each message
+        on its own, which holds for the model clients' ``count_tokens`` implementations.
+        """
         messages = list(self._messages)
+        message_tokens = self._message_token_counts(messages)
+        total_tokens = self._base_token_count() + sum(message_tokens)
         if self._token_limit is None:
             remaining_tokens = self._model_client.remaining_tokens(messages, tools=self._tool_schema)
-            while remaining_tokens < 0 and len(messages) > 0:
-                middle_index = len(messages) // 2
-                messages.pop(middle_index)
-                remaining_tokens = self._model_client.remaining_tokens(messages, tools=self._tool_schema)
+            limit = total_tokens + remaining_tokens
         else:
-            token_count = self._model_client.count_tokens(messages, tools=self._tool_schema)
-            while token_count > self._token_limit and len(messages) > 0:
-                middle_index = len(messages) // 2
-                messages.pop(middle_index)
-                token_count = self._model_client.count_tokens(messages, tools=self._tool_schema)
+            limit = self._token_limit
+
+        if total_tokens > limit and messages:
+            # Popping the middle message repeatedly removes a contiguous block around the middle,
+            # so the kept messages are always a head of length `head` and a tail of length `tail`.
+            head = len(messages) // 2
+            tail = len(messages) - head
+            while total_tokens > limit and head + tail > 0:
+                middle_index = (head + tail) // 2
+                if middle_index < head:
+                    head -= 1
+                    total_tokens -= message_tokens[head]
+                else:
+                    total_tokens -= message_tokens[len(messages) - tail]
+                    tail -= 1
+            messages = messages[:head] + messages[len(messages) - tail :]
+
         if messages and isinstance(messages[0], FunctionExecutionResultMessage):
             # Handle the first message is a function call result message.
             # Remove the first message from the list.
             messages = messages[1:]
         return messages
 
+    def _base_token_count(self) -> int:
+        if self._base_tokens is None:
+            self._base_tokens = self._model_client.count_tokens([], tools=self._tool_schema)
+        return self._base_tokens
+
+    def _message_token_counts(self, messages: List[LLMMessage]) -> List[int]:
+        """Token count of each message on its own, reusing the counts of messages seen by the previous call."""
+        if self._empty_tokens is None:
+            self._empty_tokens = self._model_client.count_tokens([])
+        # The history is append-only between clears, so the counted messages usually form a prefix.
+        reused = 0
+        for counted, message in zip(self._counted_messages, messages, strict=False):
+            if counted is not message:
+                break
+            reused += 1
+        token_counts = self._counted_tokens[:reused]
+        for message in messages[reused:]:
+            token_counts.append(self._model_client.count_tokens([message]) - self._empty_tokens)
+        self._counted_messages = list(messages)
+        self._counted_tokens = token_counts
+        return token_counts
+
     def _to_config(self) -> TokenLimitedChatCompletionContextConfig:
         return TokenLimitedChatCompletionContextConfig(
             model_client=self._model_client.dump_component(),
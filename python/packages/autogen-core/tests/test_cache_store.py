@@ -1,6 +1,9 @@
+from typing import Dict, List, Optional, Union
 from unittest.mock import Mock
 
-from autogen_core import CacheStore, InMemoryStore
+import pytest
+from autogen_core import AsyncCacheStore, BoundedInMemoryStore, CacheStore, InMemoryStore
+from autogen_core.models import CreateResult, RequestUsage
 
 
 def test_set_and_get_object_key_value() -> None:
@@ -46,3 +49,140 @@ def test_inmemory_store() -> None:
     key = "non_existent_key"
     default_value = 99
     assert store.get(key, default_value) == default_value
+
+
+def test_bounded_store_lru_eviction() -> None:
+    store = BoundedInMemoryStore[int](max_entries=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    assert store.get("a") == 1
+    store.set("c", 3)
+    assert store.get("b") is None
+    assert store.get("a") == 1
+    assert store.get("c") == 3
+
+    stats = store.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (3, 1, 1, 2)
+
+
+def test_bounded_store_lfu_eviction() -> None:
+    store = BoundedInMemoryStore[int](max_entries=2, eviction_policy="lfu")
+    store.set("a", 1)
+    store.set("b", 2)
+    for _ in range(3):
+        store.get("a")
+    store.get("b")
+    store.set("c", 3)
+    # "b" is used less often than "a"; "c" is new and goes next.
+    assert store.get("b") is None
+    store.set("d", 4)
+    assert store.get("c") is None
+    assert store.get("a") == 1
+    assert store.get("d") == 4
+
+
+def test_bounded_store_max_bytes() -> None:
+    store = BoundedInMemoryStore[str](max_bytes=10)
+    store.set("a", "12345")
+    store.set("b", "12345")
+    assert store.stats().approximate_bytes == 10
+    store.set("c", "123")
+    assert store.get("a") is None
+    assert store.stats().approximate_bytes == 8
+    # Values larger than the budget are not stored.
+    store.set("d", "12345678901")
+    assert store.get("d") is None
+    # Overwriting an entry replaces its size.
+    store.set("b", "1")
+    assert store.stats().approximate_bytes == 4
+
+
+def test_bounded_store_max_bytes_counts_list_items() -> None:
+    result = CreateResult(
+        finish_reason="stop",
+        content="x" * 1000,
+        usage=RequestUsage(prompt_tokens=0, completion_tokens=0),
+        cached=False,
+    )
+    stream: List[Union[str, CreateResult]] = ["x" * 1000 for _ in range(100)] + [result]
+    store = BoundedInMemoryStore[List[Union[str, CreateResult]]](max_bytes=200_000)
+    store.set("stream", stream)
+    # The size of a cached stream includes its chunks, not only the list of references.
+    assert store.stats().approximate_bytes > 101_000
+    store.set("other", stream)
+    assert store.get("stream") is None
+    assert store.stats().evictions == 1
+    # A stream larger than the budget is not stored.
+    store.set("large", stream * 2)
+    assert store.get("large") is None
+
+
+def test_bounded_store_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 100.0
+    store = BoundedInMemoryStore[int](ttl=10)
+    monkeypatch.setattr(store, "_clock", lambda: now)
+    store.set("a", 1)
+    store.set("b", 2, ttl=30)
+    now = 105.0
+    assert store.get("a") == 1
+    now = 115.0
+    assert store.get("a", -1) == -1
+    assert store.get("b") == 2
+    now = 135.0
+    assert store.get("b") is None
+    stats = store.stats()
+    assert (stats.expirations, stats.entries) == (2, 0)
+
+
+def test_bounded_store_ttl_purges_on_write(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 100.0
+    store = BoundedInMemoryStore[int](ttl=10)
+    monkeypatch.setattr(store, "_clock", lambda: now)
+    for i in range(100):
+        store.set(f"old{i}", i)
+    store.set("kept", -1, ttl=60)
+    assert len(store) == 101
+    now = 115.0
+    # Expired entries are not counted, and are dropped by the next write without being read.
+    assert len(store) == 1
+    store.set("new", 1)
+    assert store.stats().entries == 2
+    assert store.stats().expirations == 100
+    now = 130.0
+    store.set("newer", 2)
+    assert set(store._entries) == {"kept", "newer"}  # type: ignore[reportPrivateUsage]
+    # Records of overwritten entries do not accumulate.
+    for _ in range(1000):
+        store.set("newer", 2)
+    assert len(store._expiry_heap) < 100  # type: ignore[reportPrivateUsage]
+
+
+def test_bounded_store_component_config() -> None:
+    store = BoundedInMemoryStore[int](max_entries=5, max_bytes=100, eviction_policy="lfu", ttl=60)
+    config = store.dump_component()
+    assert config.provider == "autogen_core.BoundedInMemoryStore"
+    loaded = BoundedInMemoryStore[int].load_component(config)
+    assert loaded.dump_component().config == config.config
+
+    with pytest.raises(ValueError):
+        BoundedInMemoryStore[int](max_entries=0)
+
+
+class DictAsyncStore(AsyncCacheStore[int]):
+    def __init__(self) -> None:
+        self.store: Dict[str, int] = {}
+
+    async def aget(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        return self.store.get(key, default)
+
+    async def aset(self, key: str, value: int) -> None:
+        self.store[key] = value
+
+
+@pytest.mark.asyncio
+async def test_async_store_batch_defaults() -> None:
+    store = DictAsyncStore()
+    await store.mset({"a": 1, "b": 2})
+    assert await store.aget("a") == 1
+    assert await store.mget(["b", "missing", "a"]) == [2, None, 1]
+    assert await store.aget("missing", 3) == 3
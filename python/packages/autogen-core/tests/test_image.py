@@ -0,0 +1,116 @@
+import base64
+import os
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, List
+
+import pytest
+from autogen_core import Image
+from autogen_core.models import LLMMessage, SystemMessage, UserMessage
+from PIL import Image as PILImage
+from pydantic import TypeAdapter
+
+
+def _encode(pil_image: PILImage.Image, format: str) -> bytes:
+    buffered = BytesIO()
+    pil_image.save(buffered, format=format)
+    return buffered.getvalue()
+
+
+def _noise_image(width: int, height: int) -> PILImage.Image:
+    return PILImage.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+
+
+class _SaveCounter:
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.calls = 0
+        original_save = PILImage.Image.save
+
+        def save(image: PILImage.Image, *args: Any, **kwargs: Any) -> None:
+            self.calls += 1
+            original_save(image, *args, **kwargs)
+
+        monkeypatch.setattr(PILImage.Image, "save", save)
+
+
+def test_image_keeps_encoded_bytes(monkeypatch: pytest.MonkeyPatch) -> None:
+    jpeg_data = _encode(_noise_image(32, 16), "JPEG")
+    jpeg_base64 = base64.b64encode(jpeg_data).decode("utf-8")
+    saves = _SaveCounter(monkeypatch)
+
+    image = Image.from_base64(jpeg_base64)
+    assert image._pil is None  # pyright: ignore[reportPrivateUsage]
+    assert image.size == (32, 16)
+    assert image.to_base64() == jpeg_base64
+    assert image.data_uri == f"data:image/jpeg;base64,{jpeg_base64}"
+    assert Image.from_uri(image.data_uri).to_base64() == jpeg_base64
+    assert image._pil is None  # pyright: ignore[reportPrivateUsage]
+    assert saves.calls == 0
+
+    # Pixels are decoded on first access.
+    assert image.image.mode == "RGB"
+    assert image.image.size == (32, 16)
+    assert image.to_base64() == jpeg_base64
+    assert saves.calls == 0
+
+
+def test_image_from_file(tmp_path: Path) -> None:
+    png_data = _encode(PILImage.new("RGBA", (8, 8), (255, 0, 0, 128)), "PNG")
+    png_path = tmp_path / "image.png"
+    png_path.write_bytes(png_data)
+    image = Image.from_file(png_path)
+    assert base64.b64decode(image.to_base64()) == png_data
+    assert image.image.mode == "RGB"
+
+    # Formats other than PNG and JPEG are converted to PNG.
+    bmp_path = tmp_path / "image.bmp"
+    bmp_path.write_bytes(_encode(PILImage.new("RGB", (8, 4)), "BMP"))
+    image = Image.from_file(bmp_path)
+    assert image.data_uri.startswith("data:image/png;base64,")
+    assert image.size == (8, 4)
+
+
+def test_image_from_pil_encodes_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    saves = _SaveCounter(monkeypatch)
+    image = Image.from_pil(PILImage.new("RGB", (10, 10), (0, 255, 0)))
+    first = image.to_base64()
+    assert image.data_uri == f"data:image/png;base64,{first}"
+    assert image.to_openai_format()["image_url"]["url"] == image.data_uri
+    assert saves.calls == 1
+
+    # Assigning a new image invalidates the cached encoding.
+    image.image = PILImage.new("RGB", (10, 10), (0, 0, 255))
+    assert image.to_base64() != first
+    assert saves.calls == 2
+
+
+def test_image_conversation_benchmark(
+    monkeypatch: pytest.MonkeyPatch, record_property: Callable[[str, object], None]
+) -> None:
+    num_images = 20
+    num_passes = 10
+    encoded = [base64.b64encode(_encode(_noise_image(256, 256), "PNG")).decode("utf-8") for _ in range(num_images)]
+    adapter: TypeAdapter[List[LLMMessage]] = TypeAdapter(List[LLMMessage])
+    saves = _SaveCounter(monkeypatch)
+
+    start = time.perf_counter()
+    messages: List[LLMMessage] = [SystemMessage(content="You are a helpful assistant.")]
+    for i, data in enumerate(encoded):
+        messages.append(UserMessage(content=[f"Screenshot {i}", Image.from_base64(data)], source="user"))
+    for _ in range(num_passes):
+        # The per-turn work: serializing state, building cache keys and converting for the model API.
+        dumped = adapter.dump_json(messages)
+        for message in messages:
+            if isinstance(message, UserMessage) and not isinstance(message.content, str):
+                for item in message.content:
+                    if isinstance(item, Image):
+                        item.to_openai_format()
+    elapsed = time.perf_counter() - start
+
+    record_property("num_images", num_images)
+    record_property("num_passes", num_passes)
+    record_property("elapsed_seconds", elapsed)
+    # Images constructed from encoded data are never re-encoded.
+    assert saves.calls == 0
+    assert dumped.count(encoded[0].encode()) == 1
@@ -1,4 +1,5 @@
-from typing import List
+import time
+from typing import Callable, List, Sequence
 
 import pytest
 from autogen_core.model_context import (
@@ -14,8 +15,10 @@
     LLMMessage,
     UserMessage,
 )
+from autogen_core.tools import Tool, ToolSchema
 from autogen_ext.models.ollama import OllamaChatCompletionClient
 from autogen_ext.models.openai import OpenAIChatCompletionClient
+from autogen_ext.models.replay import ReplayChatCompletionClient
 
 
 @pytest.mark.asyncio
@@ -205,3 +208,66 @@ async def test_token_limited_model_context_openai_with_function_result(
     assert type(retrieved[0]) == UserMessage  # Function result should be removed
     assert type(retrieved[1]) == AssistantMessage
     assert type(retrieved[2]) == UserMessage
+
+
+class _CountingReplayClient(ReplayChatCompletionClient):
+    def __init__(self) -> None:
+        super().__init__([])
+        self.tokenized_messages = 0
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        self.tokenized_messages += len(messages)
+        return super().count_tokens(messages, tools=tools)
+
+
+def _trim_by_popping_middle(
+    messages: List[LLMMessage], count_tokens: Callable[[List[LLMMessage]], int], token_limit: int
+) -> List[LLMMessage]:
+    messages = list(messages)
+    while count_tokens(messages) > token_limit and len(messages) > 0:
+        messages.pop(len(messages) // 2)
+    if messages and isinstance(messages[0], FunctionExecutionResultMessage):
+        messages = messages[1:]
+    return messages
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("num_messages", [1, 2, 7, 10])
+async def test_token_limited_model_context_matches_popping_middle(num_messages: int) -> None:
+    messages: List[LLMMessage] = [
+        UserMessage(content=" ".join(["word"] * (i % 4 + 1)), source="user") for i in range(num_messages)
+    ]
+    reference_client = ReplayChatCompletionClient([])
+    for token_limit in range(1, 30):
+        model_context = TokenLimitedChatCompletionContext(model_client=_CountingReplayClient(), token_limit=token_limit)
+        for message in messages:
+            await model_context.add_message(message)
+        expected = _trim_by_popping_middle(messages, reference_client.count_tokens, token_limit)
+        assert await model_context.get_messages() == expected
+
+
+@pytest.mark.asyncio
+async def test_token_limited_model_context_incremental_benchmark(
+    record_property: Callable[[str, object], None],
+) -> None:
+    num_messages = 2000
+    num_turns = 20
+    token_limit = 5000
+    model_client = _CountingReplayClient()
+    model_context = TokenLimitedChatCompletionContext(model_client=model_client, token_limit=token_limit)
+    for i in range(num_messages):
+        await model_context.add_message(UserMessage(content=f"message number {i} " * 3, source="user"))
+    await model_context.get_messages()
+
+    reference_client = ReplayChatCompletionClient([])
+    model_client.tokenized_messages = 0
+    start = time.perf_counter()
+    for i in range(num_turns):
+        await model_context.add_message(AssistantMessage(content=f"reply {i}", source="assistant"))
+        retrieved = await model_context.get_messages()
+        assert 0 < reference_client.count_tokens(retrieved) <= token_limit
+    elapsed = time.perf_counter() - start
+
+    # Only the message added on each turn is tokenized.
+    assert model_client.tokenized_messages == num_turns
+    record_property("seconds_per_get_messages", elapsed / num_turns)
@@ -1,10 +1,15 @@
+import asyncio
 import logging
+import time
+from typing import Any, Callable, List
 
 import pytest
 from autogen_core import (
+    EVENT_LOGGER_NAME,
     AgentId,
     AgentInstantiationContext,
     AgentType,
+    BaseAgent,
     DefaultTopicId,
     MessageContext,
     RoutedAgent,
@@ -15,10 +20,13 @@
     try_get_known_serializers_for_type,
     type_subscription,
 )
+from autogen_core import _single_threaded_agent_runtime as single_threaded_agent_runtime
 from autogen_core._default_subscription import default_subscription
+from autogen_core.logging import MessageEvent
 from autogen_test_utils import (
     CascadingAgent,
     CascadingMessageType,
+    ContentMessage,
     LoopbackAgent,
     LoopbackAgentWithDefaultSubscription,
     MessageType,
@@ -364,3 +372,131 @@ async def test_event_handler_exception_multi_message() -> None:
         await runtime.stop_when_idle()
 
     await runtime.close()
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(level=logging.INFO)
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.mark.asyncio
+async def test_dispatch_event_logging_benchmark(
+    monkeypatch: pytest.MonkeyPatch, record_property: Callable[[str, object], None]
+) -> None:
+    num_messages = 500
+    runtime = SingleThreadedAgentRuntime()
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+    runtime.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+
+    events_built = 0
+
+    class CountingMessageEvent(MessageEvent):
+        def __init__(self, **kwargs: Any) -> None:
+            nonlocal events_built
+            events_built += 1
+            super().__init__(**kwargs)
+
+    monkeypatch.setattr(single_threaded_agent_runtime, "MessageEvent", CountingMessageEvent)
+    event_logger = logging.getLogger(EVENT_LOGGER_NAME)
+    original_level = event_logger.level
+    handler = _RecordingHandler()
+
+    async def dispatch() -> float:
+        runtime.start()
+        start = time.perf_counter()
+        for i in range(num_messages):
+            await runtime.send_message(ContentMessage(content=f"message {i}"), AgentId("name", "default"))
+        elapsed = time.perf_counter() - start
+        await runtime.stop_when_idle()
+        return elapsed
+
+    try:
+        # Logging off: no events or payloads are built.
+        event_logger.setLevel(logging.WARNING)
+        elapsed_off = await dispatch()
+        assert events_built == 0
+
+        # Logging on: each delivery stage emits an event carrying the serialized payload.
+        event_logger.setLevel(logging.INFO)
+        event_logger.addHandler(handler)
+        elapsed_on = await dispatch()
+    finally:
+        event_logger.removeHandler(handler)
+        event_logger.setLevel(original_level)
+    assert events_built == num_messages * 4
+    assert len(handler.records) == num_messages * 4
+    assert "message 0" in str(handler.records[0].msg)
+
+    record_property("messages_per_second_logging_off", num_messages / elapsed_off)
+    record_property("messages_per_second_logging_on", num_messages / elapsed_on)
+
+
+class _ConcurrencyTrackingAgent(BaseAgent):
+    active = 0
+    max_active = 0
+    num_calls = 0
+
+    def __init__(self) -> None:
+        super().__init__("An agent that tracks concurrent handler execution.")
+
+    async def on_message_impl(self, message: Any, ctx: MessageContext) -> None:
+        cls = _ConcurrencyTrackingAgent
+        cls.num_calls += 1
+        cls.active += 1
+        cls.max_active = max(cls.max_active, cls.active)
+        await asyncio.sleep(0)
+        cls.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_publish_fan_out_concurrency_limit() -> None:
+    _ConcurrencyTrackingAgent.max_active = 0
+    _ConcurrencyTrackingAgent.num_calls = 0
+    runtime = SingleThreadedAgentRuntime(fan_out_concurrency_limit=3)
+    for i in range(10):
+        await _ConcurrencyTrackingAgent.register(runtime, f"tracking_{i}", _ConcurrencyTrackingAgent)
+        await runtime.add_subscription(TypeSubscription("broadcast", f"tracking_{i}"))
+
+    runtime.start()
+    await runtime.publish_message(MessageType(), topic_id=TopicId("broadcast", "default"))
+    await runtime.stop_when_idle()
+
+    assert _ConcurrencyTrackingAgent.num_calls == 10
+    assert _ConcurrencyTrackingAgent.max_active == 3
+
+    with pytest.raises(ValueError):
+        SingleThreadedAgentRuntime(fan_out_concurrency_limit=0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fan_out_concurrency_limit", [None, 16])
+async def test_publish_fan_out_benchmark(
+    fan_out_concurrency_limit: int | None, record_property: Callable[[str, object], None]
+) -> None:
+    num_subscribers = 200
+    num_messages = 20
+    _ConcurrencyTrackingAgent.max_active = 0
+    _ConcurrencyTrackingAgent.num_calls = 0
+    runtime = SingleThreadedAgentRuntime(fan_out_concurrency_limit=fan_out_concurrency_limit)
+    await LoopbackAgent.register(runtime, "sender", LoopbackAgent)
+    for i in range(num_subscribers):
+        await _ConcurrencyTrackingAgent.register(runtime, f"subscriber_{i}", _ConcurrencyTrackingAgent)
+        await runtime.add_subscription(TypeSubscription("broadcast", f"subscriber_{i}"))
+
+    runtime.start()
+    start = time.perf_counter()
+    for _ in range(num_messages):
+        await runtime.publish_message(
+            MessageType(), topic_id=TopicId("broadcast", "default"), sender=AgentId("sender", "default")
+        )
+    await runtime.stop_when_idle()
+    elapsed = time.perf_counter() - start
+
+    assert _ConcurrencyTrackingAgent.num_calls == num_subscribers * num_messages
+    if fan_out_concurrency_limit is not None:
+        assert _ConcurrencyTrackingAgent.max_active <= fan_out_concurrency_limit * num_messages
+    record_property("deliveries_per_second", num_subscribers * num_messages / elapsed)
@@ -1,20 +1,24 @@
-from dataclasses import dataclass
-from typing import Union
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Union
 
 import pytest
 from autogen_core import Image
 from autogen_core._serialization import (
     JSON_DATA_CONTENT_TYPE,
+    MSGPACK_DATA_CONTENT_TYPE,
     PROTOBUF_DATA_CONTENT_TYPE,
     DataclassJsonMessageSerializer,
+    DataclassMsgpackMessageSerializer,
     MessageSerializer,
     PydanticJsonMessageSerializer,
+    PydanticMsgpackMessageSerializer,
     SerializationRegistry,
     try_get_known_serializers_for_type,
 )
 from PIL import Image as PILImage
 from protos.serialization_test_pb2 import NestingProtoMessage, ProtoMessage
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 
 
 class PydanticMessage(BaseModel):
@@ -200,3 +204,136 @@ def test_type_name_for_protos() -> None:
 
     type_name = SerializationRegistry().type_name(NestingProtoMessage)
     assert type_name == "agents.NestingProtoMessage"
+
+
+class RichPydanticMessage(BaseModel):
+    content: str
+    count: int
+    ratio: float
+    tags: List[str]
+    metadata: Dict[str, str]
+    nested: PydanticMessage
+    data: bytes = b""
+
+
+class ComputedPydanticMessage(BaseModel):
+    message: str
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def length(self) -> int:
+        return len(self.message)
+
+
+@dataclass
+class RichDataclassMessage:
+    content: str
+    count: int
+    ratio: float
+    tags: List[str] = field(default_factory=list)
+    metadata: Dict[str, str] = field(default_factory=dict)
+    items: List[Any] = field(default_factory=list)
+
+
+def test_msgpack_dataclass() -> None:
+    pytest.importorskip("msgpack")
+    serde = SerializationRegistry()
+    serde.add_serializer(try_get_known_serializers_for_type(RichDataclassMessage, include_msgpack=True))
+
+    message = RichDataclassMessage(content="hello", count=3, ratio=0.5, tags=["a", "b"], metadata={"k": "v"})
+    name = serde.type_name(message)
+    assert serde.is_registered(name, JSON_DATA_CONTENT_TYPE)
+    assert serde.is_registered(name, MSGPACK_DATA_CONTENT_TYPE)
+    data = serde.serialize(message, type_name=name, data_content_type=MSGPACK_DATA_CONTENT_TYPE)
+    assert len(data) < len(serde.serialize(message, type_name=name, data_content_type=JSON_DATA_CONTENT_TYPE))
+    assert serde.deserialize(data, type_name=name, data_content_type=MSGPACK_DATA_CONTENT_TYPE) == message
+
+    # Dataclasses inside containers are packed as mappings, like the JSON serializer does.
+    message = RichDataclassMessage(content="hello", count=3, ratio=0.5, items=[DataclassMessage(message="world")])
+    for data_content_type in [JSON_DATA_CONTENT_TYPE, MSGPACK_DATA_CONTENT_TYPE]:
+        data = serde.serialize(message, type_name=name, data_content_type=data_content_type)
+        deserialized = serde.deserialize(data, type_name=name, data_content_type=data_content_type)
+        assert deserialized.items == [{"message": "world"}]
+
+    with pytest.raises(ValueError):
+        DataclassMsgpackMessageSerializer(NestingDataclassMessage)
+
+
+def test_msgpack_is_opt_in() -> None:
+    serde = SerializationRegistry()
+    serde.add_serializer(try_get_known_serializers_for_type(RichDataclassMessage))
+    serde.add_serializer(try_get_known_serializers_for_type(RichPydanticMessage))
+    for cls in [RichDataclassMessage, RichPydanticMessage]:
+        assert serde.is_registered(cls.__name__, JSON_DATA_CONTENT_TYPE)
+        assert not serde.is_registered(cls.__name__, MSGPACK_DATA_CONTENT_TYPE)
+
+
+def test_msgpack_pydantic() -> None:
+    pytest.importorskip("msgpack")
+    serde = SerializationRegistry()
+    serde.add_serializer(try_get_known_serializers_for_type(RichPydanticMessage, include_msgpack=True))
+
+    message = RichPydanticMessage(
+        content="hello",
+        count=3,
+        ratio=0.5,
+        tags=["a", "b"],
+        metadata={"k": "v"},
+        nested=PydanticMessage(message="world"),
+        data=b"\x00\x01",
+    )
+    name = serde.type_name(message)
+    data = serde.serialize(message, type_name=name, data_content_type=MSGPACK_DATA_CONTENT_TYPE)
+    assert len(data) < len(serde.serialize(message, type_name=name, data_content_type=JSON_DATA_CONTENT_TYPE))
+    assert serde.deserialize(data, type_name=name, data_content_type=MSGPACK_DATA_CONTENT_TYPE) == message
+
+    # Models that dump more than their fields are packed as a map.
+    serializer = PydanticMsgpackMessageSerializer(ComputedPydanticMessage)
+    computed = ComputedPydanticMessage(message="hello")
+    assert serializer.deserialize(serializer.serialize(computed)) == computed
+
+    pil_image = PILImage.new("RGB", (10, 10))
+
+    class PydanticImageMessage(BaseModel):
+        image: Image
+
+    image_serializer = PydanticMsgpackMessageSerializer(PydanticImageMessage)
+    deserialized = image_serializer.deserialize(
+        image_serializer.serialize(PydanticImageMessage(image=Image(pil_image)))
+    )
+    assert deserialized.image.image == pil_image
+
+
+def test_serialization_benchmark(record_property: Callable[[str, object], None]) -> None:
+    pytest.importorskip("msgpack")
+    dataclass_message = RichDataclassMessage(
+        content="hello world " * 20, count=42, ratio=0.5, tags=["a", "b", "c"], metadata={"k": "v", "x": "y"}
+    )
+    pydantic_message = RichPydanticMessage(
+        content="hello world " * 20,
+        count=42,
+        ratio=0.5,
+        tags=["a", "b", "c"],
+        metadata={"k": "v", "x": "y"},
+        nested=PydanticMessage(message="world"),
+    )
+    serializers: List[tuple[str, Any, MessageSerializer[Any]]] = [
+        ("dataclass_json", dataclass_message, DataclassJsonMessageSerializer(RichDataclassMessage)),
+        ("dataclass_msgpack", dataclass_message, DataclassMsgpackMessageSerializer(RichDataclassMessage)),
+        ("pydantic_json", pydantic_message, PydanticJsonMessageSerializer(RichPydanticMessage)),
+        ("pydantic_msgpack", pydantic_message, PydanticMsgpackMessageSerializer(RichPydanticMessage)),
+    ]
+    iterations = 2000
+    for label, message, serializer in serializers:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            payload = serializer.serialize(message)
+        serialize_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(iterations):
+            deserialized = serializer.deserialize(payload)
+        deserialize_time = time.perf_counter() - start
+        assert deserialized == message
+        record_property(f"{label}_serialize_us", serialize_time / iterations * 1e6)
+        record_property(f"{label}_deserialize_us", deserialize_time / iterations * 1e6)
+        record_property(f"{label}_bytes", len(payload))
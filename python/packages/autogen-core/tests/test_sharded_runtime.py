@@ -0,0 +1,238 @@
+import threading
+from typing import Any, AsyncGenerator, List, Mapping
+
+import pytest
+import pytest_asyncio
+from autogen_core import (
+    AgentId,
+    CancellationToken,
+    DefaultTopicId,
+    MessageContext,
+    RoutedAgent,
+    ShardedAgentRuntime,
+    TopicId,
+    TypeSubscription,
+    default_subscription,
+    message_handler,
+)
+from autogen_test_utils import CascadingAgent, CascadingMessageType, ContentMessage, LoopbackAgent, MessageType
+
+
+class ThreadRecordingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that records the threads it runs on.")
+        self.threads: set[str] = set()
+        self.received: List[str] = []
+
+    @message_handler
+    async def on_content(self, message: ContentMessage, ctx: MessageContext) -> ContentMessage:
+        self.threads.add(threading.current_thread().name)
+        self.received.append(message.content)
+        return ContentMessage(content=f"echo: {message.content}")
+
+
+@default_subscription
+class RelayAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that forwards published messages to an echo agent.")
+        self.responses: List[str] = []
+
+    @message_handler
+    async def on_content(self, message: ContentMessage, ctx: MessageContext) -> None:
+        response = await self.send_message(message, AgentId("echo", message.content))
+        self.responses.append(response.content)
+
+
+class CallingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that sends the content it receives to the echo agent it names.")
+        self.calls = 0
+
+    @message_handler
+    async def on_content(self, message: ContentMessage, ctx: MessageContext) -> ContentMessage:
+        self.calls += 1
+        response = await self.send_message(ContentMessage(content="ping"), AgentId("echo", message.content))
+        assert isinstance(response, ContentMessage)
+        return response
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return {"calls": self.calls}
+
+
+@pytest_asyncio.fixture
+async def runtime() -> AsyncGenerator[ShardedAgentRuntime, None]:
+    runtime = ShardedAgentRuntime(num_shards=4)
+    yield runtime
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_send_across_shards(runtime: ShardedAgentRuntime) -> None:
+    await ThreadRecordingAgent.register(runtime, "echo", ThreadRecordingAgent)
+    runtime.start()
+
+    message = ContentMessage(content="hello")
+    for key in range(20):
+        response = await runtime.send_message(message, AgentId("echo", str(key)))
+        assert response == ContentMessage(content="echo: hello")
+    await runtime.stop_when_idle()
+
+    shard_threads: set[str] = set()
+    for key in range(20):
+        agent = await runtime.try_get_underlying_agent_instance(AgentId("echo", str(key)), ThreadRecordingAgent)
+        # Each agent only ever runs on the thread of the shard that owns it.
+        assert agent.threads == {f"autogen-shard-{runtime.shard_index(agent.id)}"}
+        shard_threads |= agent.threads
+    assert len(shard_threads) > 1
+
+
+@pytest.mark.asyncio
+async def test_per_agent_ordering(runtime: ShardedAgentRuntime) -> None:
+    await ThreadRecordingAgent.register(runtime, "echo", ThreadRecordingAgent)
+    runtime.start()
+    for i in range(50):
+        await runtime.publish_message(ContentMessage(content=str(i)), TopicId("echo:", "ordered"))
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("echo", "ordered"), ThreadRecordingAgent)
+    assert agent.received == [str(i) for i in range(50)]
+
+
+@pytest.mark.asyncio
+async def test_publish_delivers_once_per_subscriber(runtime: ShardedAgentRuntime) -> None:
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    await runtime.add_subscription(TypeSubscription("broadcast", "loopback"))
+    runtime.start()
+    for key in range(16):
+        await runtime.publish_message(MessageType(), TopicId("broadcast", str(key)))
+    await runtime.stop_when_idle()
+
+    for key in range(16):
+        agent = await runtime.try_get_underlying_agent_instance(AgentId("loopback", str(key)), LoopbackAgent)
+        assert agent.num_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_shard_recipients_are_cached_and_invalidated(runtime: ShardedAgentRuntime) -> None:
+    await runtime.add_subscription(TypeSubscription("broadcast", "first"))
+    topic = TopicId("broadcast", "key")
+    owner = runtime.shard_index(AgentId("first", "key"))
+    managers = [shard.runtime._subscription_manager for shard in runtime._shards]  # type: ignore[reportPrivateUsage]
+
+    recipients = [await manager.get_subscribed_recipients(topic) for manager in managers]
+    assert [len(shard_recipients) for shard_recipients in recipients] == [
+        int(index == owner) for index in range(runtime.num_shards)
+    ]
+    for manager, shard_recipients in zip(managers, recipients, strict=True):
+        assert await manager.get_subscribed_recipients(topic) is shard_recipients
+
+    await runtime.add_subscription(TypeSubscription("broadcast", "second"))
+    second_owner = runtime.shard_index(AgentId("second", "key"))
+    for index, manager in enumerate(managers):
+        expected = [
+            agent_type
+            for agent_type, agent_owner in [("first", owner), ("second", second_owner)]
+            if agent_owner == index
+        ]
+        assert [agent_id.type for agent_id in await manager.get_subscribed_recipients(topic)] == expected
+
+
+@pytest.mark.asyncio
+async def test_cross_shard_messages_from_agents(runtime: ShardedAgentRuntime) -> None:
+    await ThreadRecordingAgent.register(runtime, "echo", ThreadRecordingAgent)
+    await RelayAgent.register(runtime, "relay", RelayAgent)
+    runtime.start()
+    for i in range(10):
+        await runtime.publish_message(ContentMessage(content=str(i)), DefaultTopicId())
+    await runtime.stop_when_idle()
+
+    relay = await runtime.try_get_underlying_agent_instance(AgentId("relay", "default"), RelayAgent)
+    # Publish handlers run concurrently, so only the set of responses is deterministic.
+    assert sorted(relay.responses) == sorted(f"echo: {i}" for i in range(10))
+
+
+@pytest.mark.asyncio
+async def test_stop_when_idle_waits_for_cascade(runtime: ShardedAgentRuntime) -> None:
+    num_agents = 5
+    num_initial_messages = 5
+    max_rounds = 4
+    total_num_calls_expected = 0
+    for i in range(0, max_rounds):
+        total_num_calls_expected += num_initial_messages * ((num_agents - 1) ** i)
+
+    for i in range(num_agents):
+        await CascadingAgent.register(runtime, f"name{i}", lambda: CascadingAgent(max_rounds))
+    runtime.start()
+    for _ in range(num_initial_messages):
+        await runtime.publish_message(CascadingMessageType(round=1), DefaultTopicId())
+    await runtime.stop_when_idle()
+
+    for i in range(num_agents):
+        agent = await runtime.try_get_underlying_agent_instance(AgentId(f"name{i}", "default"), CascadingAgent)
+        assert agent.num_calls == total_num_calls_expected
+
+
+@pytest.mark.asyncio
+async def test_save_and_load_state(runtime: ShardedAgentRuntime) -> None:
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    for key in range(8):
+        await runtime.get("loopback", str(key), lazy=False)
+    state = await runtime.save_state()
+    assert set(state) == {f"loopback/{key}" for key in range(8)}
+    await runtime.load_state(state)
+
+
+@pytest.mark.asyncio
+async def test_cross_shard_sender_is_not_instantiated_on_recipient_shard(runtime: ShardedAgentRuntime) -> None:
+    await CallingAgent.register(runtime, "caller", CallingAgent)
+    await ThreadRecordingAgent.register(runtime, "echo", ThreadRecordingAgent)
+    await runtime.add_subscription(TypeSubscription("calls", "caller"))
+    caller = AgentId("caller", "default")
+    # Echo agents owned by other shards than the caller.
+    keys = [
+        str(key) for key in range(20) if runtime.shard_index(AgentId("echo", str(key))) != runtime.shard_index(caller)
+    ]
+    runtime.start()
+    for key in keys:
+        response = await runtime.send_message(ContentMessage(content=key), caller)
+        assert response == ContentMessage(content="echo: ping")
+        await runtime.publish_message(ContentMessage(content=key), TopicId("calls", "default"))
+    await runtime.stop_when_idle()
+
+    state = await runtime.save_state()
+    # The caller exists once, on its own shard, and was not re-created by the shards of the echo agents.
+    assert set(state) == {str(caller)} | {f"echo/{key}" for key in keys}
+    assert state[str(caller)] == {"calls": 2 * len(keys)}
+
+
+@pytest.mark.asyncio
+async def test_shard_threads_start_with_runtime() -> None:
+    runtime = ShardedAgentRuntime(num_shards=2)
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("autogen-shard-")]
+    runtime.start()
+    assert sum(thread.name.startswith("autogen-shard-") for thread in threading.enumerate()) == 2
+    await runtime.stop()
+    await runtime.close()
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("autogen-shard-")]
+
+
+@pytest.mark.asyncio
+async def test_cancellation_callbacks_are_removed(runtime: ShardedAgentRuntime) -> None:
+    await ThreadRecordingAgent.register(runtime, "echo", ThreadRecordingAgent)
+    runtime.start()
+    cancellation_token = CancellationToken()
+    for key in range(20):
+        await runtime.send_message(
+            ContentMessage(content="hello"), AgentId("echo", str(key)), cancellation_token=cancellation_token
+        )
+        await runtime.publish_message(
+            ContentMessage(content="hello"), TopicId("echo:", str(key)), cancellation_token=cancellation_token
+        )
+    await runtime.stop_when_idle()
+    assert cancellation_token._callbacks == []  # type: ignore[reportPrivateUsage]
+
+
+def test_invalid_num_shards() -> None:
+    with pytest.raises(ValueError):
+        ShardedAgentRuntime(num_shards=0)
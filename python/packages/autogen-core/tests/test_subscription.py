@@ -1,3 +1,6 @@
+import time
+from typing import Callable
+
 import pytest
 from autogen_core import (
     AgentId,
@@ -5,8 +8,10 @@
     DefaultTopicId,
     SingleThreadedAgentRuntime,
     TopicId,
+    TypePrefixSubscription,
     TypeSubscription,
 )
+from autogen_core._runtime_impl_helpers import SubscriptionManager
 from autogen_core.exceptions import CantHandleException
 from autogen_test_utils import LoopbackAgent, MessageType
 
@@ -120,3 +125,71 @@ async def test_subscription_deduplication() -> None:
     default_subscription = DefaultSubscription(agent_type=agent_type)
     with pytest.raises(ValueError, match="Subscription already exists"):
         await runtime.add_subscription(default_subscription)
+
+
+@pytest.mark.asyncio
+async def test_subscription_manager_routing() -> None:
+    manager = SubscriptionManager()
+    exact = TypeSubscription("chat.session", "exact")
+    prefix = TypePrefixSubscription("chat.", "prefix")
+    root = TypePrefixSubscription("", "root")
+    await manager.add_subscription(exact)
+    await manager.add_subscription(prefix)
+
+    topic = TopicId("chat.session", "s1")
+    assert await manager.get_subscribed_recipients(topic) == [AgentId("exact", "s1"), AgentId("prefix", "s1")]
+    assert await manager.get_subscribed_recipients(TopicId("chat.other", "s1")) == [AgentId("prefix", "s1")]
+    assert await manager.get_subscribed_recipients(TopicId("chat", "s1")) == []
+
+    # Recipients follow subscription insertion order and seen topics are updated incrementally.
+    await manager.add_subscription(root)
+    assert await manager.get_subscribed_recipients(topic) == [
+        AgentId("exact", "s1"),
+        AgentId("prefix", "s1"),
+        AgentId("root", "s1"),
+    ]
+    assert await manager.get_subscribed_recipients(TopicId("chat", "s1")) == [AgentId("root", "s1")]
+
+    await manager.remove_subscription(prefix.id)
+    assert await manager.get_subscribed_recipients(topic) == [AgentId("exact", "s1"), AgentId("root", "s1")]
+    assert await manager.get_subscribed_recipients(TopicId("chat.other", "s1")) == [AgentId("root", "s1")]
+
+    with pytest.raises(ValueError, match="Subscription already exists"):
+        await manager.add_subscription(TypePrefixSubscription("", "root"))
+    with pytest.raises(ValueError, match="Subscription does not exist"):
+        await manager.remove_subscription(prefix.id)
+
+    # Re-adding an equal subscription after removal is allowed.
+    await manager.add_subscription(TypePrefixSubscription("chat.", "prefix"))
+    assert [sub.id for sub in manager.subscriptions][:2] == [exact.id, root.id]
+
+
+@pytest.mark.asyncio
+async def test_subscription_manager_churn_benchmark(record_property: Callable[[str, object], None]) -> None:
+    num_subscriptions = 10_000
+    manager = SubscriptionManager()
+    subscriptions = [
+        TypeSubscription(f"session_{i}", f"agent_{i}")
+        if i % 2 == 0
+        else TypePrefixSubscription(f"session_{i}.", f"agent_{i}")
+        for i in range(num_subscriptions)
+    ]
+    for subscription in subscriptions:
+        await manager.add_subscription(subscription)
+    topics = [TopicId(f"session_{i}", "default") for i in range(0, num_subscriptions, 2)]
+    for topic in topics:
+        await manager.get_subscribed_recipients(topic)
+
+    # Each session ends and a new one starts while every topic has been seen before.
+    start = time.perf_counter()
+    for i, subscription in enumerate(subscriptions):
+        await manager.remove_subscription(subscription.id)
+        await manager.add_subscription(TypeSubscription(f"session_{i}", f"agent_{i}_next"))
+    for topic in topics:
+        await manager.get_subscribed_recipients(topic)
+    elapsed = time.perf_counter() - start
+
+    assert await manager.get_subscribed_recipients(TopicId("session_4", "s")) == [AgentId("agent_4_next", "s")]
+    assert await manager.get_subscribed_recipients(TopicId("session_5.x", "s")) == []
+    record_property("subscriptions", num_subscriptions)
+    record_property("churn_s", elapsed)
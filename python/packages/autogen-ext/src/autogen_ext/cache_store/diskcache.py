@@ -1,7 +1,9 @@
-from typing import Any, Optional, TypeVar, cast
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, List, Mapping, Optional, Sequence, TypeVar, cast
 
 import diskcache
-from autogen_core import CacheStore, Component
+from autogen_core import AsyncCacheStore, CacheStore, Component
 from pydantic import BaseModel
 from typing_extensions import Self
 
@@ -15,21 +17,26 @@ class DiskCacheStoreConfig(BaseModel):
     # Could add other diskcache.Cache parameters like size_limit, etc.
 
 
-class DiskCacheStore(CacheStore[T], Component[DiskCacheStoreConfig]):
+class DiskCacheStore(CacheStore[T], AsyncCacheStore[T], Component[DiskCacheStoreConfig]):
     """
     A typed CacheStore implementation that uses diskcache as the underlying storage.
+    The async methods run the disk I/O on a thread pool so they do not block the event loop;
+    :meth:`mget` and :meth:`mset` perform the whole batch in a single thread hop.
     See :class:`~autogen_ext.models.cache.ChatCompletionCache` for an example of usage.
 
     Args:
         cache_instance: An instance of diskcache.Cache.
                         The user is responsible for managing the DiskCache instance's lifetime.
+        executor (optional): The executor used by the async methods.
+                             Defaults to the event loop's default executor.
     """
 
     component_config_schema = DiskCacheStoreConfig
     component_provider_override = "autogen_ext.cache_store.diskcache.DiskCacheStore"
 
-    def __init__(self, cache_instance: diskcache.Cache):  # type: ignore[no-any-unimported]
+    def __init__(self, cache_instance: diskcache.Cache, executor: Optional[Executor] = None):  # type: ignore[no-any-unimported]
         self.cache = cache_instance
+        self._executor = executor
 
     def get(self, key: str, default: Optional[T] = None) -> Optional[T]:
         return cast(Optional[T], self.cache.get(key, default))  # type: ignore[reportUnknownMemberType]
@@ -37,6 +44,26 @@ def get(self, key: str, default: Optional[T] = None) -> Optional[T]:
     def set(self, key: str, value: T) -> None:
         self.cache.set(key, cast(Any, value))  # type: ignore[reportUnknownMemberType]
 
+    async def aget(self, key: str, default: Optional[T] = None) -> Optional[T]:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.get, key, default)
+
+    async def aset(self, key: str, value: T) -> None:
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.set, key, value)
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[T]]:
+        def _mget() -> List[Optional[T]]:
+            return [self.get(key) for key in keys]
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, _mget)
+
+    async def mset(self, items: Mapping[str, T]) -> None:
+        def _mset() -> None:
+            with self.cache.transact():  # type: ignore[reportUnknownMemberType]
+                for key, value in items.items():
+                    self.set(key, value)
+
+        await asyncio.get_running_loop().run_in_executor(self._executor, _mset)
+
     def _to_config(self) -> DiskCacheStoreConfig:
         # Get directory from cache instance
         return DiskCacheStoreConfig(directory=self.cache.directory)
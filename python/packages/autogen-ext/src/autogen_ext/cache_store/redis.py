@@ -1,13 +1,39 @@
-from typing import Any, Dict, Optional, TypeVar, cast
+import json
+from typing import Any, Dict, List, Mapping, Optional, Sequence, TypeVar, Union, cast
 
 import redis
-from autogen_core import CacheStore, Component
+import redis.asyncio
+from autogen_core import AsyncCacheStore, CacheStore, Component
 from pydantic import BaseModel
 from typing_extensions import Self
 
 T = TypeVar("T")
 
 
+def _encode(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in cast(Sequence[Any], value)]
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in cast(Dict[str, Any], value).items()}
+    return value
+
+
+def _serialize(value: Any) -> bytes:
+    """Serialize a value to JSON. Pydantic models, including the ones in lists such as cached streams,
+    are dumped to plain JSON objects."""
+    return json.dumps(_encode(value)).encode("utf-8")
+
+
+def _deserialize(value: Union[bytes, str, None]) -> Any:
+    # The data is only decoded as JSON: validating it into models is left to the reader, which knows the
+    # expected type, so cached data never decides which classes are instantiated.
+    if value is None:
+        return None
+    return json.loads(value)
+
+
 class RedisStoreConfig(BaseModel):
     """Configuration for RedisStore"""
 
@@ -38,13 +64,13 @@ def __init__(self, redis_instance: redis.Redis):
         self.cache = redis_instance
 
     def get(self, key: str, default: Optional[T] = None) -> Optional[T]:
-        value = cast(Optional[T], self.cache.get(key))
+        value = cast(Optional[T], _deserialize(self.cache.get(key)))
         if value is None:
             return default
         return value
 
     def set(self, key: str, value: T) -> None:
-        self.cache.set(key, cast(Any, value))
+        self.cache.set(key, _serialize(value))
 
     def _to_config(self) -> RedisStoreConfig:
         # Extract connection info from redis instance
@@ -78,3 +104,87 @@ def _from_config(cls, config: RedisStoreConfig) -> Self:
             socket_timeout=config.socket_timeout,
         )
         return cls(redis_instance=redis_instance)
+
+
+class AsyncRedisStoreConfig(RedisStoreConfig):
+    """Configuration for AsyncRedisStore"""
+
+    max_connections: Optional[int] = None
+
+
+class AsyncRedisStore(AsyncCacheStore[T], Component[AsyncRedisStoreConfig]):
+    """
+    A typed AsyncCacheStore implementation that uses the non-blocking `redis.asyncio` client,
+    so cache lookups do not block the event loop.
+    Connections are drawn from the client's connection pool, and :meth:`mget` and :meth:`mset`
+    use a single round-trip.
+    Values are stored as JSON, in the same format as :class:`RedisStore`: pydantic models, such as
+    :class:`~autogen_core.models.CreateResult`, are stored as plain JSON objects and read back as dicts,
+    so the reader validates them into the type it expects.
+    See :class:`~autogen_ext.models.cache.ChatCompletionCache` for an example of usage.
+
+    Args:
+        redis_instance: An instance of `redis.asyncio.Redis`.
+                        The user is responsible for managing the Redis instance's lifetime.
+    """
+
+    component_config_schema = AsyncRedisStoreConfig
+    component_provider_override = "autogen_ext.cache_store.redis.AsyncRedisStore"
+
+    def __init__(self, redis_instance: redis.asyncio.Redis):
+        self.cache = redis_instance
+
+    async def aget(self, key: str, default: Optional[T] = None) -> Optional[T]:
+        value = cast(Optional[T], _deserialize(await self.cache.get(key)))
+        if value is None:
+            return default
+        return value
+
+    async def aset(self, key: str, value: T) -> None:
+        await self.cache.set(key, _serialize(value))
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[T]]:
+        if not keys:
+            return []
+        values: List[Union[bytes, str, None]] = await self.cache.mget(list(keys))
+        return [cast(Optional[T], _deserialize(value)) for value in values]
+
+    async def mset(self, items: Mapping[str, T]) -> None:
+        if not items:
+            return
+        await self.cache.mset({key: _serialize(value) for key, value in items.items()})
+
+    def _to_config(self) -> AsyncRedisStoreConfig:
+        connection_pool = self.cache.connection_pool
+        connection_kwargs: Dict[str, Any] = connection_pool.connection_kwargs  # type: ignore[reportUnknownMemberType]
+
+        username = connection_kwargs.get("username")
+        password = connection_kwargs.get("password")
+        socket_timeout = connection_kwargs.get("socket_timeout")
+        max_connections = connection_pool.max_connections
+
+        return AsyncRedisStoreConfig(
+            host=str(connection_kwargs.get("host", "localhost")),
+            port=int(connection_kwargs.get("port", 6379)),
+            db=int(connection_kwargs.get("db", 0)),
+            username=str(username) if username is not None else None,
+            password=str(password) if password is not None else None,
+            ssl=bool(connection_kwargs.get("ssl", False)),
+            socket_timeout=float(socket_timeout) if socket_timeout is not None else None,
+            # redis-py uses a very large sentinel when the pool is unbounded.
+            max_connections=max_connections if max_connections < 2**31 else None,
+        )
+
+    @classmethod
+    def _from_config(cls, config: AsyncRedisStoreConfig) -> Self:
+        redis_instance = redis.asyncio.Redis(
+            host=config.host,
+            port=config.port,
+            db=config.db,
+            username=config.username,
+            password=config.password,
+            ssl=config.ssl,
+            socket_timeout=config.socket_timeout,
+            max_connections=config.max_connections,
+        )
+        return cls(redis_instance=redis_instance)
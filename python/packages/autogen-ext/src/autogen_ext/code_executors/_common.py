@@ -1,12 +1,36 @@
+import asyncio
+import codecs
 import inspect
 import re
 import shutil
+from collections import deque
 from dataclasses import dataclass
-from pathlib import Path
+from pathlib import Path, PurePath
 from textwrap import dedent, indent
-from typing import Any, Callable, Optional, Sequence, Set, TypeVar, Union
-
-from autogen_core.code_executor import Alias, CodeResult, FunctionWithRequirements, FunctionWithRequirementsStr, Import
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Deque,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+    Union,
+)
+
+from autogen_core.code_executor import (
+    Alias,
+    CodeBlock,
+    CodeOutputChunk,
+    CodeResult,
+    FunctionWithRequirements,
+    FunctionWithRequirementsStr,
+    Import,
+)
 from typing_extensions import ParamSpec
 
 
@@ -20,6 +44,12 @@ class CommandLineCodeResult(CodeResult):
 T = TypeVar("T")
 P = ParamSpec("P")
 
+OutputCallback = Callable[[CodeOutputChunk], Awaitable[None]]
+"""Receives the output of a code block while it runs. :meta private:"""
+
+_STREAM_READ_SIZE = 64 * 1024
+_STREAM_QUEUE_SIZE = 64
+
 
 def _to_code(func: Union[FunctionWithRequirements[T, P], Callable[P, T], FunctionWithRequirementsStr]) -> str:
     if isinstance(func, FunctionWithRequirementsStr):
@@ -151,6 +181,263 @@ def get_required_packages(code: str, lang: str) -> set[str]:
 
 PYTHON_VARIANTS = ["python", "Python", "py"]
 
+# A comment line at the top of a code block that opts the block in to running concurrently with other blocks.
+INDEPENDENT_BLOCK_MARKER = "# independent"
+
+# A string literal that looks like a file path: it contains a path separator or ends with a file extension.
+_PATH_LITERAL_PATTERN = re.compile(r"""(['"])((?:[^'"\n]*[/\\][^'"\n]*)|(?:[^'"\s]+\.[A-Za-z][A-Za-z0-9]{0,7}))\1""")
+
+
+def is_marked_independent(code: str) -> bool:
+    for line in code.split("\n"):
+        line = line.strip()
+        if not line.startswith("#"):
+            return False
+        if line.lower() == INDEPENDENT_BLOCK_MARKER:
+            return True
+    return False
+
+
+def _referenced_paths(code: str) -> Set[str]:
+    """The file names and paths in the string literals of the code, and their base names."""
+    paths: Set[str] = set()
+    for match in _PATH_LITERAL_PATTERN.finditer(code):
+        literal = match.group(2).strip()
+        if not literal or "://" in literal:
+            continue
+        paths.add(literal)
+        name = PurePath(literal).name
+        if name:
+            paths.add(name)
+    return paths
+
+
+def get_code_block_dependencies(code_blocks: Sequence[CodeBlock], workspace_path: Path) -> List[Set[int]]:
+    """Return the indices of the earlier code blocks that each code block must run after.
+
+    Blocks run in order by default: a block depends on all earlier blocks. Two blocks that are both marked
+    with ``# independent`` in their leading comments do not depend on each other, unless they may share a
+    file: they are saved to the same file, one mentions the file or the Python module name of the other, or
+    they have a file name or path string literal in common. Shell blocks can install packages or change any
+    file, so they always run after all earlier blocks and before all later blocks.
+
+    :meta private:
+    """
+    filenames: List[Optional[str]] = []
+    for code_block in code_blocks:
+        try:
+            filenames.append(get_file_name_from_content(code_block.code, workspace_path))
+        except ValueError:
+            filenames.append(None)
+    references: List[Optional[re.Pattern[str]]] = []
+    for filename in filenames:
+        if filename is None:
+            references.append(None)
+            continue
+        path = Path(filename)
+        names = {re.escape(filename), re.escape(path.name)}
+        if path.suffix == ".py":
+            names.add(re.escape(path.stem))
+        references.append(re.compile(r"(?<![\w.])(" + "|".join(sorted(names)) + r")(?![\w])"))
+
+    independent = [is_marked_independent(code_block.code) for code_block in code_blocks]
+    is_shell = [code_block.language.lower() not in (*PYTHON_VARIANTS, "python3") for code_block in code_blocks]
+    paths = [
+        _referenced_paths(code_block.code) if independent[index] else set()
+        for index, code_block in enumerate(code_blocks)
+    ]
+
+    def may_share_files(index: int, earlier: int) -> bool:
+        if filenames[earlier] is not None and filenames[earlier] == filenames[index]:
+            return True
+        if not paths[index].isdisjoint(paths[earlier]):
+            return True
+        for referenced, code in ((earlier, code_blocks[index].code), (index, code_blocks[earlier].code)):
+            pattern = references[referenced]
+            if pattern is not None and pattern.search(code) is not None:
+                return True
+        return False
+
+    dependencies: List[Set[int]] = []
+    for index in range(len(code_blocks)):
+        depends_on: Set[int] = set()
+        for earlier in range(index):
+            if (
+                not independent[index]
+                or not independent[earlier]
+                or is_shell[index]
+                or is_shell[earlier]
+                or may_share_files(index, earlier)
+            ):
+                depends_on.add(earlier)
+        dependencies.append(depends_on)
+    return dependencies
+
+
+async def execute_code_blocks_concurrently(
+    code_blocks: Sequence[CodeBlock],
+    execute_code_block: Callable[[CodeBlock, int], Awaitable[CommandLineCodeResult]],
+    workspace_path: Path,
+    max_concurrent_blocks: int,
+) -> CommandLineCodeResult:
+    """Execute code blocks concurrently, each after the blocks it depends on, and merge the results in order.
+
+    A block whose dependency failed is skipped. The output of the executed blocks is concatenated in the
+    order of the blocks, and the exit code is the exit code of the first failed block, or 0.
+
+    :meta private:
+    """
+    dependencies = get_code_block_dependencies(code_blocks, workspace_path)
+    semaphore = asyncio.Semaphore(max_concurrent_blocks)
+    tasks: List[asyncio.Task[Optional[CommandLineCodeResult]]] = []
+
+    async def run(index: int) -> Optional[CommandLineCodeResult]:
+        for dependency in sorted(dependencies[index]):
+            result = await tasks[dependency]
+            if result is None or result.exit_code != 0:
+                return None
+        async with semaphore:
+            return await execute_code_block(code_blocks[index], index)
+
+    for index in range(len(code_blocks)):
+        tasks.append(asyncio.create_task(run(index)))
+    try:
+        results = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    executed = [result for result in results if result is not None]
+    exit_code = next((result.exit_code for result in executed if result.exit_code != 0), 0)
+    code_file = next((result.code_file for result in executed if result.code_file is not None), None)
+    return CommandLineCodeResult(
+        exit_code=exit_code, output="".join(result.output for result in executed), code_file=code_file
+    )
+
+
+class OutputRingBuffer:
+    """Keeps the last ``max_size`` characters of the output of a streamed code execution.
+
+    :meta private:
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._chunks: Deque[str] = deque()
+        self._size = 0
+        self._dropped = 0
+
+    def append(self, text: str) -> None:
+        self._chunks.append(text)
+        self._size += len(text)
+        while self._size > self._max_size:
+            excess = self._size - self._max_size
+            first = self._chunks[0]
+            if len(first) <= excess:
+                self._chunks.popleft()
+                removed = len(first)
+            else:
+                self._chunks[0] = first[excess:]
+                removed = excess
+            self._size -= removed
+            self._dropped += removed
+
+    def getvalue(self) -> str:
+        output = "".join(self._chunks)
+        if self._dropped:
+            return f"[{self._dropped} characters of earlier output were dropped]\n{output}"
+        return output
+
+
+async def stream_code_execution(
+    execute: Callable[[OutputCallback], Awaitable[CommandLineCodeResult]],
+    max_output_size: int,
+) -> AsyncGenerator[Union[CodeOutputChunk, CommandLineCodeResult], None]:
+    """Run a code execution that reports its output to a callback, and yield the output as it arrives.
+
+    The execution waits while the consumer has not taken the previous chunks, so a script that prints
+    faster than the output is consumed is slowed down instead of filling the memory. The last chunk is
+    followed by the result, whose output is the last ``max_output_size`` characters of the chunks.
+
+    :meta private:
+    """
+    queue: asyncio.Queue[CodeOutputChunk] = asyncio.Queue(maxsize=_STREAM_QUEUE_SIZE)
+    buffer = OutputRingBuffer(max_output_size)
+
+    async def on_output(chunk: CodeOutputChunk) -> None:
+        buffer.append(chunk.content)
+        await queue.put(chunk)
+
+    task: asyncio.Future[CommandLineCodeResult] = asyncio.ensure_future(execute(on_output))
+    get_chunk: Optional[asyncio.Future[CodeOutputChunk]] = None
+    try:
+        while True:
+            get_chunk = asyncio.ensure_future(queue.get())
+            waiting: List[asyncio.Future[Any]] = [get_chunk, task]
+            await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if get_chunk.done():
+                yield get_chunk.result()
+                continue
+            get_chunk.cancel()
+            # The execution finished, so the chunks in the queue are the last ones.
+            while not queue.empty():
+                yield queue.get_nowait()
+            break
+        result = await task
+    finally:
+        if get_chunk is not None:
+            get_chunk.cancel()
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    yield CommandLineCodeResult(exit_code=result.exit_code, output=buffer.getvalue(), code_file=result.code_file)
+
+
+async def stream_process_output(
+    process: asyncio.subprocess.Process, code_block_index: int, on_output: OutputCallback
+) -> None:
+    """Report the stdout and stderr of a process as they are written, and wait for the process to exit.
+
+    :meta private:
+    """
+
+    async def pump(reader: Optional[asyncio.StreamReader], stream: Literal["stdout", "stderr"]) -> None:
+        assert reader is not None
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            data = await reader.read(_STREAM_READ_SIZE)
+            text = decoder.decode(data, final=not data)
+            if text:
+                await on_output(CodeOutputChunk(content=text, stream=stream, code_block_index=code_block_index))
+            if not data:
+                return
+
+    await asyncio.gather(pump(process.stdout, "stdout"), pump(process.stderr, "stderr"))
+    await process.wait()
+
+
+async def to_code_block_result(
+    exit_code: int,
+    code_file: Optional[str],
+    code_block_index: int,
+    on_output: Optional[OutputCallback],
+    stdout: str = "",
+    stderr: str = "",
+) -> CommandLineCodeResult:
+    """Return the result of a code block, reporting the output that was not streamed yet to ``on_output``.
+
+    When the output is reported, it is left out of the result, since the streamed result is built from the chunks.
+
+    :meta private:
+    """
+    if on_output is None:
+        return CommandLineCodeResult(exit_code=exit_code, output=stderr + stdout, code_file=code_file)
+    if stderr:
+        await on_output(CodeOutputChunk(content=stderr, stream="stderr", code_block_index=code_block_index))
+    if stdout:
+        await on_output(CodeOutputChunk(content=stdout, stream="stdout", code_block_index=code_block_index))
+    return CommandLineCodeResult(exit_code=exit_code, output="", code_file=code_file)
+
 
 def lang_to_cmd(lang: str) -> str:
     if lang in PYTHON_VARIANTS:
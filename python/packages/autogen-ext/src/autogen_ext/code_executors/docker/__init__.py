@@ -1,3 +1,4 @@
+from ._container_pool import DockerContainerLease, DockerContainerPool
 from ._docker_code_executor import DockerCommandLineCodeExecutor
 
-__all__ = ["DockerCommandLineCodeExecutor"]
+__all__ = ["DockerCommandLineCodeExecutor", "DockerContainerLease", "DockerContainerPool"]
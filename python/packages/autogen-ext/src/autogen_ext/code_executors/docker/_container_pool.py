@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import shutil
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Union
+
+try:
+    import asyncio_atexit
+
+    import docker
+    from docker.errors import DockerException, ImageNotFound, NotFound
+    from docker.models.containers import Container
+    from docker.types import DeviceRequest
+except ImportError as e:
+    raise RuntimeError(
+        "Missing dependecies for DockerContainerPool. Please ensure the autogen-ext package was installed with the 'docker' extra."
+    ) from e
+
+logger = logging.getLogger(__name__)
+
+# Kills the processes left behind by the previous executor and empties the workspace. `kill -1` signals every
+# process of the container except the shell that runs it and the entrypoint. Nothing else is reset, see the
+# DockerContainerPool docstring.
+_RESET_COMMAND = ["/bin/sh", "-c", "kill -9 -1 2>/dev/null; find /workspace -mindepth 1 -delete"]
+
+
+@dataclass(eq=False)
+class DockerContainerLease:
+    """A container of a :class:`DockerContainerPool` leased to an executor."""
+
+    container: Container
+    """The running container, with :attr:`work_dir` mounted at ``/workspace``."""
+
+    work_dir: Path
+    """The host directory mounted at ``/workspace`` in the container."""
+
+    leases: int = field(default=0, repr=False)
+    """The number of times the container was leased."""
+
+
+class DockerContainerPool:
+    """(Experimental) A pool of running Docker containers shared by
+    :class:`~autogen_ext.code_executors.docker.DockerCommandLineCodeExecutor` instances.
+
+    Creating and starting a container takes seconds, which dominates the start-up of an executor when many
+    short-lived executors are used, for example one per session. The pool starts ``size`` containers up front
+    and leases them to executors created with ``container_pool``: :meth:`DockerCommandLineCodeExecutor.start`
+    leases a container and :meth:`DockerCommandLineCodeExecutor.stop` releases it.
+
+    On release, the processes started by the executor are killed and the workspace of the container is emptied
+    before the container is leased again. Other changes to the container are not reset and carry over to the
+    next executor: packages installed with pip or the system package manager, files written outside the
+    workspace, for example in ``/tmp`` or the home directory, and changes to the environment persisted in
+    files such as shell profiles. Only share a pool between executors that trust each other, and lower
+    ``max_leases_per_container`` to bound how long such changes live. A container that is no longer running
+    when it is leased, or that fails to reset, is removed and replaced in the background. Containers are also
+    replaced after ``max_leases_per_container`` leases.
+
+    .. note::
+
+        This class requires the :code:`docker` extra for the :code:`autogen-ext` package:
+
+        .. code-block:: bash
+
+            pip install "autogen-ext[docker]"
+
+    Args:
+        image (str, optional): Docker image to use for the containers. Defaults to "python:3-slim".
+        size (int, optional): The number of containers kept in the pool. Defaults to 4.
+        work_dir (Union[Path, str], optional): The directory under which a workspace directory is created for
+            each container. Defaults to a temporary directory.
+        bind_dir (Union[Path, str], optional): The path of ``work_dir`` as seen by the Docker daemon. Useful
+            when the pool is used from within a container. Defaults to work_dir.
+        auto_remove (bool, optional): If true, the Docker daemon removes a container when it is stopped.
+            Defaults to True.
+        device_requests (Optional[List[DeviceRequest]], optional): A list of device request instances to add to
+            the containers. Defaults to None.
+        extra_volumes (Optional[Dict[str, Dict[str, str]]], optional): A dictionary of extra volumes (beyond the
+            workspace) to mount to the containers. Defaults to None.
+        extra_hosts (Optional[Dict[str, str]], optional): A dictionary of host mappings to add to the containers.
+            Defaults to None.
+        init_command (Optional[str], optional): A shell command to run when a container starts. Defaults to None.
+        max_leases_per_container (int, optional): The number of leases after which a container is replaced.
+            Defaults to 100.
+        client (Optional[docker.DockerClient], optional): The Docker client to use. Defaults to the client
+            configured by the environment.
+
+    Example:
+
+        .. code-block:: python
+
+            import asyncio
+
+            from autogen_core import CancellationToken
+            from autogen_core.code_executor import CodeBlock
+            from autogen_ext.code_executors.docker import DockerCommandLineCodeExecutor, DockerContainerPool
+
+
+            async def main() -> None:
+                pool = DockerContainerPool(size=2)
+                await pool.start()
+
+                async def run_session(index: int) -> None:
+                    async with DockerCommandLineCodeExecutor(container_pool=pool) as executor:
+                        result = await executor.execute_code_blocks(
+                            [CodeBlock(code=f"print({index})", language="python")], CancellationToken()
+                        )
+                        print(result.output)
+
+                await asyncio.gather(*(run_session(index) for index in range(8)))
+                await pool.stop()
+
+
+            asyncio.run(main())
+    """
+
+    def __init__(
+        self,
+        image: str = "python:3-slim",
+        size: int = 4,
+        *,
+        work_dir: Union[Path, str, None] = None,
+        bind_dir: Union[Path, str, None] = None,
+        auto_remove: bool = True,
+        device_requests: Optional[List[DeviceRequest]] = None,
+        extra_volumes: Optional[Dict[str, Dict[str, str]]] = None,
+        extra_hosts: Optional[Dict[str, str]] = None,
+        init_command: Optional[str] = None,
+        max_leases_per_container: int = 100,
+        client: Any = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("Size must be greater than or equal to 1.")
+        if max_leases_per_container < 1:
+            raise ValueError("Max leases per container must be greater than or equal to 1.")
+
+        self._image = image
+        self._size = size
+        self._work_dir = Path(work_dir) if work_dir is not None else None
+        self._bind_dir = Path(bind_dir) if bind_dir is not None else None
+        self._auto_remove = auto_remove
+        self._device_requests = device_requests
+        self._extra_volumes = extra_volumes if extra_volumes is not None else {}
+        self._extra_hosts = extra_hosts if extra_hosts is not None else {}
+        self._init_command = init_command
+        self._max_leases = max_leases_per_container
+        self._client = client
+
+        self._temp_dir: Optional[tempfile.TemporaryDirectory[str]] = None
+        self._idle: asyncio.Queue[Optional[DockerContainerLease]] = asyncio.Queue()
+        self._leased: Set[DockerContainerLease] = set()
+        self._replacing: Set[asyncio.Task[None]] = set()
+        self._spawn_error: Optional[str] = None
+        self._running = False
+
+    @property
+    def size(self) -> int:
+        """The number of containers kept in the pool."""
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        """The number of containers ready to be leased."""
+        return self._idle.qsize()
+
+    async def start(self) -> None:
+        """Pull the image if needed and start the containers.
+
+        Raises:
+            RuntimeError: If Docker is not available.
+            DockerException: If a container fails to start.
+        """
+        if self._running:
+            return
+
+        if self._client is None:
+            try:
+                self._client = docker.from_env()
+            except DockerException as e:
+                if "FileNotFoundError" in str(e):
+                    raise RuntimeError(
+                        "Failed to connect to Docker. Please ensure Docker is installed and running."
+                    ) from e
+                raise
+
+        try:
+            await asyncio.to_thread(self._client.images.get, self._image)
+        except ImageNotFound:
+            logger.info(f"Pulling image {self._image}...")
+            await asyncio.to_thread(self._client.images.pull, self._image)
+
+        if self._work_dir is None:
+            self._temp_dir = tempfile.TemporaryDirectory()
+            self._work_dir = Path(self._temp_dir.name)
+        self._work_dir.mkdir(exist_ok=True, parents=True)
+
+        self._running = True
+        results = await asyncio.gather(*(self._spawn() for _ in range(self._size)), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        for result in results:
+            if isinstance(result, DockerContainerLease):
+                self._idle.put_nowait(result)
+        if errors:
+            await self.stop()
+            raise errors[0]
+
+        async def cleanup() -> None:
+            await self.stop()
+            asyncio_atexit.unregister(cleanup)  # type: ignore
+
+        asyncio_atexit.register(cleanup)  # type: ignore
+
+    async def stop(self) -> None:
+        """Remove the containers, including the ones leased to executors, and their workspaces."""
+        if not self._running:
+            return
+        self._running = False
+
+        for task in self._replacing:
+            task.cancel()
+        await asyncio.gather(*self._replacing, return_exceptions=True)
+        leases: List[DockerContainerLease] = list(self._leased)
+        while not self._idle.empty():
+            lease = self._idle.get_nowait()
+            if lease is not None:
+                leases.append(lease)
+        self._leased.clear()
+        await asyncio.gather(*(self._remove(lease) for lease in leases))
+
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+            self._work_dir = None
+
+    async def lease(self) -> DockerContainerLease:
+        """Wait for a healthy idle container and lease it.
+
+        Raises:
+            RuntimeError: If the pool is not started, or a replacement container failed to start.
+        """
+        if not self._running:
+            raise RuntimeError("The container pool is not running. Must first be started with start.")
+        while True:
+            lease = await self._idle.get()
+            if lease is None:
+                raise RuntimeError(f"Failed to start a replacement container: {self._spawn_error}")
+            try:
+                await asyncio.to_thread(lease.container.reload)
+                healthy = lease.container.status == "running"
+            except DockerException as e:
+                logger.warning(f"Failed to inspect container {lease.container.name}: {e}")
+                healthy = False
+            if healthy:
+                lease.leases += 1
+                self._leased.add(lease)
+                return lease
+            logger.warning(f"Container {lease.container.name} is not running, replacing it.")
+            self._replace(lease)
+
+    async def release(self, lease: DockerContainerLease) -> None:
+        """Reset the workspace of a leased container and return it to the pool."""
+        if lease not in self._leased:
+            return
+        self._leased.discard(lease)
+        if not self._running:
+            return
+        if lease.leases >= self._max_leases:
+            self._replace(lease)
+            return
+        try:
+            result = await asyncio.to_thread(lease.container.exec_run, _RESET_COMMAND)
+            healthy = result.exit_code == 0
+            if not healthy:
+                logger.warning(
+                    f"Failed to reset container {lease.container.name}: {result.output.decode('utf-8', errors='replace')}"
+                )
+        except DockerException as e:
+            logger.warning(f"Failed to reset container {lease.container.name}: {e}")
+            healthy = False
+        if not self._running:
+            # The pool was stopped while the container was reset.
+            await self._remove(lease)
+        elif healthy:
+            self._idle.put_nowait(lease)
+        else:
+            self._replace(lease)
+
+    def _replace(self, lease: DockerContainerLease) -> None:
+        async def replace() -> None:
+            await self._remove(lease)
+            if not self._running:
+                return
+            try:
+                self._idle.put_nowait(await self._spawn())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to replace a container: {e}")
+                self._spawn_error = str(e)
+                self._idle.put_nowait(None)
+
+        task = asyncio.create_task(replace())
+        self._replacing.add(task)
+        task.add_done_callback(self._replacing.discard)
+
+    async def _spawn(self) -> DockerContainerLease:
+        assert self._work_dir is not None
+        name = f"autogen-code-exec-pool-{uuid.uuid4()}"
+        work_dir = self._work_dir / name
+        work_dir.mkdir()
+        bind_dir = (self._bind_dir / name) if self._bind_dir is not None else work_dir
+
+        shell_command = "/bin/sh"
+        command = ["-c", f"{(self._init_command)};exec {shell_command}"] if self._init_command else None
+        container = await asyncio.to_thread(
+            self._client.containers.create,
+            self._image,
+            name=name,
+            entrypoint=shell_command,
+            command=command,
+            tty=True,
+            detach=True,
+            auto_remove=self._auto_remove,
+            volumes={str(bind_dir.resolve()): {"bind": "/workspace", "mode": "rw"}, **self._extra_volumes},
+            working_dir="/workspace",
+            extra_hosts=self._extra_hosts,
+            device_requests=self._device_requests,
+        )
+        lease = DockerContainerLease(container=container, work_dir=work_dir)
+        try:
+            await asyncio.to_thread(container.start)
+            await asyncio.to_thread(container.reload)
+            if container.status != "running":
+                logs = container.logs().decode("utf-8", errors="replace")
+                raise ValueError(f"Failed to start container from image {self._image}. Logs: {logs}")
+        except BaseException:
+            await self._remove(lease)
+            raise
+        return lease
+
+    async def _remove(self, lease: DockerContainerLease) -> None:
+        try:
+            await asyncio.to_thread(lease.container.remove, force=True)
+        except NotFound:
+            pass
+        except DockerException as e:
+            logger.error(f"Failed to remove container {lease.container.name}: {e}")
+        # Files created in the container may be owned by another user, so the workspace is removed on a best effort basis.
+        await asyncio.to_thread(shutil.rmtree, lease.work_dir, ignore_errors=True)
@@ -4,22 +4,28 @@
 from __future__ import annotations
 
 import asyncio
+import codecs
 import logging
 import shlex
 import sys
 import tempfile
+import threading
+import time
 import uuid
 import warnings
 from collections.abc import Sequence
 from concurrent.futures import Future as ConcurrentFuture
+from concurrent.futures import TimeoutError as ConcurrentTimeoutError
+from functools import partial
 from hashlib import sha256
 from pathlib import Path
-from typing import Any, Callable, ClassVar, Dict, List, Optional, ParamSpec, Tuple, Union
+from typing import Any, AsyncGenerator, Callable, ClassVar, Dict, List, Literal, Optional, ParamSpec, Tuple, Union
 
 from autogen_core import CancellationToken, Component
 from autogen_core.code_executor import (
     CodeBlock,
     CodeExecutor,
+    CodeOutputChunk,
     FunctionWithRequirements,
     FunctionWithRequirementsStr,
 )
@@ -30,11 +36,16 @@
 
 from .._common import (
     CommandLineCodeResult,
+    OutputCallback,
     build_python_functions_file,
+    execute_code_blocks_concurrently,
     get_file_name_from_content,
     lang_to_cmd,
     silence_pip,
+    stream_code_execution,
+    to_code_block_result,
 )
+from ._container_pool import DockerContainerLease, DockerContainerPool
 
 if sys.version_info >= (3, 11):
     from typing import Self
@@ -82,6 +93,8 @@ class DockerCommandLineCodeExecutorConfig(BaseModel):
     extra_hosts: Dict[str, str] = {}
     init_command: Optional[str] = None
     delete_tmp_files: bool = False
+    max_concurrent_blocks: int = 1
+    stream_output_buffer_size: int = 1_000_000
 
 
 class DockerCommandLineCodeExecutor(CodeExecutor, Component[DockerCommandLineCodeExecutorConfig]):
@@ -130,6 +143,19 @@ class DockerCommandLineCodeExecutor(CodeExecutor, Component[DockerCommandLineCod
         init_command (Optional[str], optional): A shell command to run before each shell operation execution. Defaults to None.
             Example: init_command="kubectl config use-context docker-hub"
         delete_tmp_files (bool, optional): If true, will delete temporary files after execution. Defaults to False.
+        max_concurrent_blocks (int, optional): The maximum number of code blocks of one call that run at the same time.
+            Defaults to 1, which runs the blocks in order and stops at the first failure. With more than 1, blocks
+            that opt in with a leading ``# independent`` comment run concurrently unless they may share a file, a
+            block is skipped if a block it waits for failed, and the outputs are merged in the order of the blocks.
+            See :class:`~autogen_ext.code_executors.local.LocalCommandLineCodeExecutor` for how the dependencies
+            are detected.
+        stream_output_buffer_size (int, optional): The number of characters of the latest output that
+            :meth:`execute_code_blocks_stream` keeps for its result. Defaults to 1,000,000.
+        container_pool (Optional[DockerContainerPool], optional): A started pool to lease the container from
+            instead of creating one. :meth:`start` leases a container from the pool, and :meth:`stop` releases it
+            and empties its workspace. The container and its workspace are configured by the pool, so the
+            container options of this executor, ``work_dir`` and ``bind_dir`` are not used. The pool is not
+            included in the serialized configuration. Defaults to None.
 
     .. note::
         Using the current directory (".") as working directory is deprecated. Using it will raise a deprecation warning.
@@ -180,9 +206,18 @@ def __init__(
         extra_hosts: Optional[Dict[str, str]] = None,
         init_command: Optional[str] = None,
         delete_tmp_files: bool = False,
+        max_concurrent_blocks: int = 1,
+        stream_output_buffer_size: int = 1_000_000,
+        container_pool: Optional[DockerContainerPool] = None,
     ):
         if timeout < 1:
             raise ValueError("Timeout must be greater than or equal to 1.")
+        if max_concurrent_blocks < 1:
+            raise ValueError("Max concurrent blocks must be greater than or equal to 1.")
+        if stream_output_buffer_size < 0:
+            raise ValueError("Stream output buffer size must be greater than or equal to 0.")
+        if container_pool is not None and (work_dir is not None or bind_dir is not None):
+            raise ValueError("work_dir and bind_dir cannot be used with a container pool.")
 
         # Handle working directory logic
         if work_dir is None:
@@ -234,6 +269,8 @@ def __init__(
         self._extra_hosts = extra_hosts if extra_hosts is not None else {}
         self._init_command = init_command
         self._delete_tmp_files = delete_tmp_files
+        self._max_concurrent_blocks = max_concurrent_blocks
+        self._stream_output_buffer_size = stream_output_buffer_size
         self._device_requests = device_requests
 
         # Setup could take some time so we intentionally wait for the first code block to do it.
@@ -243,6 +280,8 @@ def __init__(
             self._setup_functions_complete = True
 
         self._container: Container | None = None
+        self._container_pool = container_pool
+        self._lease: Optional[DockerContainerLease] = None
         self._running = False
 
         self._loop: Optional[asyncio.AbstractEventLoop] = None
@@ -291,22 +330,91 @@ async def _kill_running_command(self, command: List[str]) -> None:
             return
         await asyncio.to_thread(self._container.exec_run, ["pkill", "-f", " ".join(command)])
 
-    async def _execute_command(self, command: List[str], cancellation_token: CancellationToken) -> Tuple[str, int]:
+    def _stream_command(
+        self,
+        command: List[str],
+        code_block_index: int,
+        on_output: OutputCallback,
+        loop: asyncio.AbstractEventLoop,
+        stopped: threading.Event,
+    ) -> int:
+        # Runs in a worker thread, and hands the output to the event loop as it arrives.
+        assert self._container is not None
+        api = self._container.client.api
+        exec_id = api.exec_create(self._container.id, command)["Id"]
+        decoders = {
+            "stdout": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            "stderr": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+        }
+
+        def report(text: str, stream: Literal["stdout", "stderr"]) -> None:
+            if not text:
+                return
+            chunk = CodeOutputChunk(content=text, stream=stream, code_block_index=code_block_index)
+            future = asyncio.run_coroutine_threadsafe(on_output(chunk), loop)
+            # Wait until the chunk is consumed, unless the execution is cancelled meanwhile.
+            while not stopped.is_set():
+                try:
+                    future.result(timeout=0.1)
+                    return
+                except ConcurrentTimeoutError:
+                    continue
+            future.cancel()
+
+        for stdout, stderr in api.exec_start(exec_id, stream=True, demux=True):
+            if stopped.is_set():
+                break
+            if stdout:
+                report(decoders["stdout"].decode(stdout), "stdout")
+            if stderr:
+                report(decoders["stderr"].decode(stderr), "stderr")
+        report(decoders["stdout"].decode(b"", final=True), "stdout")
+        report(decoders["stderr"].decode(b"", final=True), "stderr")
+        # The exit code is None until Docker has recorded the exit of the process, which can lag
+        # behind the end of its output.
+        exit_code = api.exec_inspect(exec_id)["ExitCode"]
+        while exit_code is None:
+            if stopped.is_set():
+                # The command is being killed and its result is discarded.
+                return 1
+            time.sleep(0.05)
+            exit_code = api.exec_inspect(exec_id)["ExitCode"]
+        return int(exit_code)
+
+    async def _execute_command(
+        self,
+        command: List[str],
+        cancellation_token: CancellationToken,
+        code_block_index: int = 0,
+        on_output: Optional[OutputCallback] = None,
+    ) -> Tuple[str, int]:
         if self._container is None or not self._running:
             raise ValueError("Container is not running. Must first be started with either start or a context manager.")
 
-        exec_task = asyncio.create_task(asyncio.to_thread(self._container.exec_run, command))
+        stopped = threading.Event()
+        if on_output is None:
+            exec_task = asyncio.create_task(asyncio.to_thread(self._container.exec_run, command))
+        else:
+            exec_task = asyncio.create_task(
+                asyncio.to_thread(
+                    self._stream_command, command, code_block_index, on_output, asyncio.get_running_loop(), stopped
+                )
+            )
         cancellation_token.link_future(exec_task)
 
         # Wait for the exec task to finish.
         try:
             result = await exec_task
+            if isinstance(result, int):
+                # The output was streamed.
+                return ("\n Timeout" if result == 124 else ""), result
             exit_code = result.exit_code
             output = result.output.decode("utf-8")
             if exit_code == 124:
                 output += "\n Timeout"
             return output, exit_code
         except asyncio.CancelledError:
+            stopped.set()
             # Schedule a task to kill the running command in the background.
             if self._loop and not self._loop.is_closed():
                 try:
@@ -327,7 +435,10 @@ async def _execute_command(self, command: List[str], cancellation_token: Cancell
             return "Code execution was cancelled.", 1
 
     async def _execute_code_dont_check_setup(
-        self, code_blocks: List[CodeBlock], cancellation_token: CancellationToken
+        self,
+        code_blocks: List[CodeBlock],
+        cancellation_token: CancellationToken,
+        on_output: Optional[OutputCallback] = None,
     ) -> CommandLineCodeResult:
         if self._container is None or not self._running:
             raise ValueError("Container is not running. Must first be started with either start or a context manager.")
@@ -339,32 +450,24 @@ async def _execute_code_dont_check_setup(
         files: List[Path] = []
         last_exit_code = 0
         try:
-            for code_block in code_blocks:
-                lang = code_block.language.lower()
-                code = silence_pip(code_block.code, lang)
-
-                # Check if there is a filename comment
-                try:
-                    filename = get_file_name_from_content(code, self.work_dir)
-                except ValueError:
-                    outputs.append("Filename is not in the workspace")
-                    last_exit_code = 1
-                    break
-
-                if not filename:
-                    filename = f"tmp_code_{sha256(code.encode()).hexdigest()}.{lang}"
-
-                code_path = self.work_dir / filename
-                with code_path.open("w", encoding="utf-8") as fout:
-                    fout.write(code)
-                files.append(code_path)
-
-                command = ["timeout", str(self._timeout), lang_to_cmd(lang), filename]
+            if self._max_concurrent_blocks > 1 and len(code_blocks) > 1:
+                return await execute_code_blocks_concurrently(
+                    code_blocks,
+                    partial(
+                        self._execute_code_block,
+                        cancellation_token=cancellation_token,
+                        files=files,
+                        on_output=on_output,
+                    ),
+                    self.work_dir,
+                    self._max_concurrent_blocks,
+                )
 
-                output, exit_code = await self._execute_command(command, cancellation_token)
-                outputs.append(output)
-                last_exit_code = exit_code
-                if exit_code != 0:
+            for index, code_block in enumerate(code_blocks):
+                result = await self._execute_code_block(code_block, index, cancellation_token, files, on_output)
+                outputs.append(result.output)
+                last_exit_code = result.exit_code
+                if last_exit_code != 0:
                     break
         finally:
             if self._delete_tmp_files:
@@ -377,8 +480,44 @@ async def _execute_code_dont_check_setup(
         code_file = str(files[0]) if files else None
         return CommandLineCodeResult(exit_code=last_exit_code, output="".join(outputs), code_file=code_file)
 
+    async def _execute_code_block(
+        self,
+        code_block: CodeBlock,
+        code_block_index: int,
+        cancellation_token: CancellationToken,
+        files: List[Path],
+        on_output: Optional[OutputCallback] = None,
+    ) -> CommandLineCodeResult:
+        lang = code_block.language.lower()
+        code = silence_pip(code_block.code, lang)
+
+        # Check if there is a filename comment
+        try:
+            filename = get_file_name_from_content(code, self.work_dir)
+        except ValueError:
+            return await to_code_block_result(
+                1, None, code_block_index, on_output, stderr="Filename is not in the workspace"
+            )
+
+        if not filename:
+            # Identical blocks may run at the same time, so each block gets its own file.
+            filename = f"tmp_code_{sha256(code.encode()).hexdigest()}_{uuid.uuid4().hex}.{lang}"
+
+        code_path = self.work_dir / filename
+        with code_path.open("w", encoding="utf-8") as fout:
+            fout.write(code)
+        files.append(code_path)
+
+        command = ["timeout", str(self._timeout), lang_to_cmd(lang), filename]
+
+        output, exit_code = await self._execute_command(command, cancellation_token, code_block_index, on_output)
+        return await to_code_block_result(exit_code, str(code_path), code_block_index, on_output, stdout=output)
+
     @property
     def work_dir(self) -> Path:
+        # If the container is leased from a pool, use the workspace of the container
+        if self._container_pool is not None and self._lease is not None:
+            return self._lease.work_dir
         # If a user specifies a working directory, use that
         if self._work_dir is not None:
             # If a user specifies the current directory, warn them that this is deprecated
@@ -420,6 +559,29 @@ async def execute_code_blocks(
 
         return await self._execute_code_dont_check_setup(code_blocks, cancellation_token)
 
+    async def execute_code_blocks_stream(
+        self, code_blocks: List[CodeBlock], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[CodeOutputChunk | CommandLineCodeResult, None]:
+        """(Experimental) Execute the code blocks, yield their output as it is printed, and yield the result last.
+
+        The output of the result is the last ``stream_output_buffer_size`` characters of the streamed output.
+
+        Args:
+            code_blocks (List[CodeBlock]): The code blocks to execute.
+
+        Returns:
+            AsyncGenerator[CodeOutputChunk | CommandLineCodeResult, None]: The output chunks, followed by the
+            result of the code execution."""
+
+        if not self._setup_functions_complete:
+            await self._setup_functions(cancellation_token)
+
+        async for item in stream_code_execution(
+            partial(self._execute_code_dont_check_setup, code_blocks, cancellation_token),
+            self._stream_output_buffer_size,
+        ):
+            yield item
+
     async def restart(self) -> None:
         """(Experimental) Restart the Docker container code executor."""
         if self._container is None or not self._running:
@@ -437,10 +599,20 @@ async def stop(self) -> None:
         Stops the Docker container and cleans up any temporary files (if they were created), along with the temporary directory.
         The method first waits for all cancellation tasks to finish before stopping the container. Finally it marks the executor as not running.
         If the container is not running, the method does nothing.
+        When the container is leased from a container pool, it is released to the pool instead of being stopped.
         """
         if not self._running:
             return
 
+        if self._container_pool is not None and self._lease is not None:
+            await self._wait_for_cancellation_futures()
+            lease = self._lease
+            self._lease = None
+            self._container = None
+            self._running = False
+            await self._container_pool.release(lease)
+            return
+
         if self._temp_dir is not None:
             self._temp_dir.cleanup()
             self._temp_dir = None
@@ -455,32 +627,7 @@ async def stop(self) -> None:
                 self._cancellation_futures.clear()
                 return
 
-            if self._cancellation_futures:
-                if not self._loop or self._loop.is_closed():
-                    logging.warning(
-                        f"Executor loop ({self._loop!r}) is closed or unavailable. Cannot reliably wait for "
-                        f"{len(self._cancellation_futures)} cancellation futures."
-                    )
-                    self._cancellation_futures.clear()
-                else:
-                    # concurrent.futures.Future -> asyncio.Future
-                    asyncio_futures = [asyncio.wrap_future(f, loop=self._loop) for f in self._cancellation_futures]
-
-                    if asyncio_futures:
-                        logging.debug(
-                            f"Waiting for {len(asyncio_futures)} cancellation futures to complete on loop {self._loop!r}..."
-                        )
-                        results = await asyncio.gather(*asyncio_futures, return_exceptions=True)
-                        for i, result in enumerate(results):
-                            original_future = self._cancellation_futures[i]
-                            if isinstance(result, Exception):
-                                logging.warning(f"Cancellation future {original_future!r} failed: {result}")
-                            else:
-                                logging.debug(f"Cancellation future {original_future!r} completed successfully.")
-                    else:
-                        logging.debug("No valid cancellation futures to await.")
-
-                    self._cancellation_futures.clear()
+            await self._wait_for_cancellation_futures()
 
             logging.debug(f"Stopping container {self.container_name}...")
             await asyncio.to_thread(container.stop)
@@ -494,13 +641,54 @@ async def stop(self) -> None:
             self._running = False
             self._cancellation_futures.clear()
 
+    async def _wait_for_cancellation_futures(self) -> None:
+        if self._cancellation_futures:
+            if not self._loop or self._loop.is_closed():
+                logging.warning(
+                    f"Executor loop ({self._loop!r}) is closed or unavailable. Cannot reliably wait for "
+                    f"{len(self._cancellation_futures)} cancellation futures."
+                )
+                self._cancellation_futures.clear()
+            else:
+                # concurrent.futures.Future -> asyncio.Future
+                asyncio_futures = [asyncio.wrap_future(f, loop=self._loop) for f in self._cancellation_futures]
+
+                if asyncio_futures:
+                    logging.debug(
+                        f"Waiting for {len(asyncio_futures)} cancellation futures to complete on loop {self._loop!r}..."
+                    )
+                    results = await asyncio.gather(*asyncio_futures, return_exceptions=True)
+                    for i, result in enumerate(results):
+                        original_future = self._cancellation_futures[i]
+                        if isinstance(result, Exception):
+                            logging.warning(f"Cancellation future {original_future!r} failed: {result}")
+                        else:
+                            logging.debug(f"Cancellation future {original_future!r} completed successfully.")
+                else:
+                    logging.debug("No valid cancellation futures to await.")
+
+                self._cancellation_futures.clear()
+
     async def start(self) -> None:
         """(Experimental) Start the code executor.
 
         This method sets the working environment variables, connects to Docker and starts the code executor.
         If no working directory was provided to the code executor, it creates a temporary directory and sets it as the code executor working directory.
+        If a container pool was provided, it leases a container from the pool instead.
         """
 
+        if self._container_pool is not None:
+            if self._lease is not None:
+                return
+            self._lease = await self._container_pool.lease()
+            self._container = self._lease.container
+            # The workspace of a leased container is empty, so the functions are set up again.
+            self._setup_functions_complete = len(self._functions) == 0
+            self._loop = asyncio.get_running_loop()
+            self._cancellation_futures = []
+            self._running = True
+            return
+
         if self._work_dir is None and self._temp_dir is None:
             self._temp_dir = tempfile.TemporaryDirectory()
             self._temp_dir_path = Path(self._temp_dir.name)
@@ -576,6 +764,8 @@ def _to_config(self) -> DockerCommandLineCodeExecutorConfig:
         """(Experimental) Convert the component to a config object."""
         if self._functions:
             logging.info("Functions will not be included in serialized configuration")
+        if self._container_pool is not None:
+            logging.info("The container pool will not be included in serialized configuration")
 
         return DockerCommandLineCodeExecutorConfig(
             image=self._image,
@@ -590,6 +780,8 @@ def _to_config(self) -> DockerCommandLineCodeExecutorConfig:
             extra_hosts=self._extra_hosts,
             init_command=self._init_command,
             delete_tmp_files=self._delete_tmp_files,
+            max_concurrent_blocks=self._max_concurrent_blocks,
+            stream_output_buffer_size=self._stream_output_buffer_size,
         )
 
     @classmethod
@@ -610,4 +802,6 @@ def _from_config(cls, config: DockerCommandLineCodeExecutorConfig) -> Self:
             extra_hosts=config.extra_hosts,
             init_command=config.init_command,
             delete_tmp_files=config.delete_tmp_files,
+            max_concurrent_blocks=config.max_concurrent_blocks,
+            stream_output_buffer_size=config.stream_output_buffer_size,
         )
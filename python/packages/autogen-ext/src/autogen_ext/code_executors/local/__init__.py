@@ -6,27 +6,41 @@
 import os
 import sys
 import tempfile
+import uuid
 import warnings
+from functools import partial
 from hashlib import sha256
 from pathlib import Path
 from string import Template
 from types import SimpleNamespace
-from typing import Any, Callable, ClassVar, List, Optional, Sequence, Union
+from typing import Any, AsyncGenerator, Callable, ClassVar, Dict, List, Optional, Sequence, Tuple, Union
 
 from autogen_core import CancellationToken, Component
-from autogen_core.code_executor import CodeBlock, CodeExecutor, FunctionWithRequirements, FunctionWithRequirementsStr
+from autogen_core.code_executor import (
+    CodeBlock,
+    CodeExecutor,
+    CodeOutputChunk,
+    FunctionWithRequirements,
+    FunctionWithRequirementsStr,
+)
 from pydantic import BaseModel
 from typing_extensions import ParamSpec, Self
 
 from .._common import (
     PYTHON_VARIANTS,
     CommandLineCodeResult,
+    OutputCallback,
     build_python_functions_file,
+    execute_code_blocks_concurrently,
     get_file_name_from_content,
     lang_to_cmd,
     silence_pip,
+    stream_code_execution,
+    stream_process_output,
+    to_code_block_result,
     to_stub,
 )
+from ._warm_pool import WarmInterpreterPool
 
 __all__ = ("LocalCommandLineCodeExecutor",)
 
@@ -39,6 +53,11 @@ class LocalCommandLineCodeExecutorConfig(BaseModel):
     timeout: int = 60
     work_dir: Optional[str] = None
     functions_module: str = "functions"
+    warm_pool_size: int = 0
+    preload_modules: List[str] = []
+    max_runs_per_interpreter: int = 100
+    max_concurrent_blocks: int = 1
+    stream_output_buffer_size: int = 1_000_000
 
 
 class LocalCommandLineCodeExecutor(CodeExecutor, Component[LocalCommandLineCodeExecutorConfig]):
@@ -79,10 +98,45 @@ class LocalCommandLineCodeExecutor(CodeExecutor, Component[LocalCommandLineCodeE
         functions (List[Union[FunctionWithRequirements[Any, A], Callable[..., Any]]]): A list of functions that are available to the code executor. Default is an empty list.
         functions_module (str, optional): The name of the module that will be created to store the functions. Defaults to "functions".
         virtual_env_context (Optional[SimpleNamespace], optional): The virtual environment context. Defaults to None.
+        warm_pool_size (int, optional): The number of long-lived Python interpreters that run Python code blocks,
+            instead of starting a new interpreter for each block. Defaults to 0, which disables the pool.
+            See the warm interpreter pool section below.
+        preload_modules (Sequence[str], optional): The modules that the warm interpreters import when they start,
+            such as ``["numpy", "pandas"]``. Defaults to an empty list.
+        max_runs_per_interpreter (int, optional): The number of code blocks a warm interpreter runs before it is
+            replaced by a fresh one. Defaults to 100.
+        max_concurrent_blocks (int, optional): The maximum number of code blocks of one call that run at the same time.
+            Defaults to 1, which runs the blocks in order and stops at the first failure.
+            See the concurrent execution section below.
+        stream_output_buffer_size (int, optional): The number of characters of the latest output that
+            :meth:`execute_code_blocks_stream` keeps for its result. Defaults to 1,000,000.
 
     .. note::
         Using the current directory (".") as working directory is deprecated. Using it will raise a deprecation warning.
 
+    .. note::
+        **Warm interpreter pool.** Starting the interpreter and importing heavy libraries can take longer than
+        running a short code block. With ``warm_pool_size`` greater than 0, Python code blocks run in a pool of
+        interpreters that are started by :meth:`start`, or by the first Python code block, and import the
+        ``preload_modules`` once. Each block still runs as the ``__main__`` module of its own file, with fresh
+        globals and the working directory as the current directory, and modules imported from the working
+        directory are forgotten after each block. Other state of the interpreter, such as changes to imported
+        modules, environment variables or threads started by a block, can be seen by later blocks until the
+        interpreter is replaced after ``max_runs_per_interpreter`` blocks, or when a block times out, is
+        cancelled or ends the interpreter. The environment of the interpreters is copied when they start.
+        Shell code blocks always run in a new process.
+
+    .. note::
+        **Concurrent execution.** Code blocks run in order unless they opt in to concurrency with a leading
+        ``# independent`` comment (after the ``# filename:`` comment, if any). With ``max_concurrent_blocks``
+        greater than 1, blocks marked this way run concurrently with each other, except that a block waits for the
+        earlier marked blocks it may share a file with: blocks saved to the same file, blocks that mention the file
+        or the Python module name of the other, and blocks with a file name or path string literal in common, such
+        as one block writing ``"data.csv"`` and another reading it. Unmarked blocks and shell blocks wait for all
+        earlier blocks, and all later blocks wait for them. A block is skipped if a block it waits for failed. The
+        outputs of the blocks are merged in the order of the blocks, and the exit code is the exit code of the
+        first failed block.
+
 
     Example:
 
@@ -155,9 +209,22 @@ def __init__(
         ] = [],
         functions_module: str = "functions",
         virtual_env_context: Optional[SimpleNamespace] = None,
+        warm_pool_size: int = 0,
+        preload_modules: Sequence[str] = (),
+        max_runs_per_interpreter: int = 100,
+        max_concurrent_blocks: int = 1,
+        stream_output_buffer_size: int = 1_000_000,
     ):
         if timeout < 1:
             raise ValueError("Timeout must be greater than or equal to 1.")
+        if warm_pool_size < 0:
+            raise ValueError("Warm pool size must be greater than or equal to 0.")
+        if max_runs_per_interpreter < 1:
+            raise ValueError("Max runs per interpreter must be greater than or equal to 1.")
+        if max_concurrent_blocks < 1:
+            raise ValueError("Max concurrent blocks must be greater than or equal to 1.")
+        if stream_output_buffer_size < 0:
+            raise ValueError("Stream output buffer size must be greater than or equal to 0.")
 
         self._work_dir: Optional[Path] = None
         if work_dir is not None:
@@ -190,6 +257,14 @@ def __init__(
 
         self._virtual_env_context: Optional[SimpleNamespace] = virtual_env_context
 
+        self._warm_pool_size = warm_pool_size
+        self._preload_modules = list(preload_modules)
+        self._max_runs_per_interpreter = max_runs_per_interpreter
+        self._warm_pool: Optional[WarmInterpreterPool] = None
+        self._warm_pool_lock = asyncio.Lock()
+        self._max_concurrent_blocks = max_concurrent_blocks
+        self._stream_output_buffer_size = stream_output_buffer_size
+
         self._temp_dir: Optional[tempfile.TemporaryDirectory[str]] = None
         self._started = False
 
@@ -254,6 +329,37 @@ def work_dir(self) -> Path:
                 self._started = True
             return Path(self._temp_dir.name)
 
+    def _build_env(self) -> Dict[str, str]:
+        env = os.environ.copy()
+        if self._virtual_env_context:
+            virtual_env_bin_abs_path = os.path.abspath(self._virtual_env_context.bin_path)
+            env["PATH"] = f"{virtual_env_bin_abs_path}{os.pathsep}{env['PATH']}"
+        return env
+
+    def _python_executable(self) -> str:
+        return os.path.abspath(self._virtual_env_context.env_exe) if self._virtual_env_context else sys.executable
+
+    async def _get_warm_pool(self) -> WarmInterpreterPool:
+        async with self._warm_pool_lock:
+            if self._warm_pool is None:
+                warm_pool = WarmInterpreterPool(
+                    program=self._python_executable(),
+                    size=self._warm_pool_size,
+                    cwd=self.work_dir,
+                    env=self._build_env(),
+                    preload_modules=self._preload_modules,
+                    max_runs=self._max_runs_per_interpreter,
+                )
+                await warm_pool.start()
+                self._warm_pool = warm_pool
+            return self._warm_pool
+
+    async def _stop_warm_pool(self) -> None:
+        async with self._warm_pool_lock:
+            if self._warm_pool is not None:
+                await self._warm_pool.stop()
+                self._warm_pool = None
+
     async def _setup_functions(self, cancellation_token: CancellationToken) -> None:
         func_file_content = build_python_functions_file(self._functions)
         func_file = self.work_dir / f"{self._functions_module}.py"
@@ -322,134 +428,213 @@ async def execute_code_blocks(
 
         return await self._execute_code_dont_check_setup(code_blocks, cancellation_token)
 
-    async def _execute_code_dont_check_setup(
+    async def execute_code_blocks_stream(
         self, code_blocks: List[CodeBlock], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[CodeOutputChunk | CommandLineCodeResult, None]:
+        """(Experimental) Execute the code blocks, yield their output as it is printed, and yield the result last.
+
+        The output of the result is the last ``stream_output_buffer_size`` characters of the streamed output,
+        in the order it was printed. Python code blocks that run in the warm interpreter pool report their
+        output when they finish.
+
+        Args:
+            code_blocks (List[CodeBlock]): The code blocks to execute.
+            cancellation_token (CancellationToken): a token to cancel the operation
+
+        Returns:
+            AsyncGenerator[CodeOutputChunk | CommandLineCodeResult, None]: The output chunks, followed by the
+            result of the code execution."""
+
+        if not self._setup_functions_complete:
+            await self._setup_functions(cancellation_token)
+
+        async for item in stream_code_execution(
+            partial(self._execute_code_dont_check_setup, code_blocks, cancellation_token),
+            self._stream_output_buffer_size,
+        ):
+            yield item
+
+    async def _execute_code_dont_check_setup(
+        self,
+        code_blocks: List[CodeBlock],
+        cancellation_token: CancellationToken,
+        on_output: Optional[OutputCallback] = None,
     ) -> CommandLineCodeResult:
         """
         Execute the provided code blocks in the local command line without re-checking setup.
         Returns a CommandLineCodeResult indicating success or failure.
+        If on_output is provided, the output is reported to it instead of being included in the result.
         """
+        if self._max_concurrent_blocks > 1 and len(code_blocks) > 1:
+            return await execute_code_blocks_concurrently(
+                code_blocks,
+                partial(self._execute_code_block, cancellation_token=cancellation_token, on_output=on_output),
+                self.work_dir,
+                self._max_concurrent_blocks,
+            )
+
         logs_all: str = ""
-        file_names: List[Path] = []
+        file_names: List[str] = []
         exitcode = 0
 
-        for code_block in code_blocks:
-            lang, code = code_block.language, code_block.code
-            lang = lang.lower()
+        for index, code_block in enumerate(code_blocks):
+            result = await self._execute_code_block(code_block, index, cancellation_token, on_output)
+            logs_all += result.output
+            if result.code_file is not None:
+                file_names.append(result.code_file)
+            exitcode = result.exit_code
+            if exitcode != 0:
+                break
 
-            # Remove pip output where possible
-            code = silence_pip(code, lang)
+        code_file = file_names[0] if file_names else None
+        return CommandLineCodeResult(exit_code=exitcode, output=logs_all, code_file=code_file)
 
-            # Normalize python variants to "python"
-            if lang in PYTHON_VARIANTS:
-                lang = "python"
+    async def _execute_code_block(
+        self,
+        code_block: CodeBlock,
+        code_block_index: int,
+        cancellation_token: CancellationToken,
+        on_output: Optional[OutputCallback] = None,
+    ) -> CommandLineCodeResult:
+        lang, code = code_block.language, code_block.code
+        lang = lang.lower()
 
-            # Abort if not supported
-            if lang not in self.SUPPORTED_LANGUAGES:
-                exitcode = 1
-                logs_all += "\n" + f"unknown language {lang}"
-                break
+        # Remove pip output where possible
+        code = silence_pip(code, lang)
 
-            # Try extracting a filename (if present)
-            try:
-                filename = get_file_name_from_content(code, self.work_dir)
-            except ValueError:
-                return CommandLineCodeResult(
-                    exit_code=1,
-                    output="Filename is not in the workspace",
-                    code_file=None,
-                )
+        # Normalize python variants to "python"
+        if lang in PYTHON_VARIANTS:
+            lang = "python"
 
-            # If no filename is found, create one
-            if filename is None:
-                code_hash = sha256(code.encode()).hexdigest()
-                if lang.startswith("python"):
-                    ext = "py"
-                elif lang in ["pwsh", "powershell", "ps1"]:
-                    ext = "ps1"
-                else:
-                    ext = lang
-
-                filename = f"tmp_code_{code_hash}.{ext}"
-
-            written_file = (self.work_dir / filename).resolve()
-            with written_file.open("w", encoding="utf-8") as f:
-                f.write(code)
-            file_names.append(written_file)
-
-            # Build environment
-            env = os.environ.copy()
-            if self._virtual_env_context:
-                virtual_env_bin_abs_path = os.path.abspath(self._virtual_env_context.bin_path)
-                env["PATH"] = f"{virtual_env_bin_abs_path}{os.pathsep}{env['PATH']}"
+        # Abort if not supported
+        if lang not in self.SUPPORTED_LANGUAGES:
+            return await to_code_block_result(
+                1, None, code_block_index, on_output, stderr="\n" + f"unknown language {lang}"
+            )
 
-            # Decide how to invoke the script
-            if lang == "python":
-                program = (
-                    os.path.abspath(self._virtual_env_context.env_exe) if self._virtual_env_context else sys.executable
-                )
-                extra_args = [str(written_file.absolute())]
-            else:
-                # Get the appropriate command for the language
-                program = lang_to_cmd(lang)
-
-                # Special handling for PowerShell
-                if program == "pwsh":
-                    extra_args = [
-                        "-NoProfile",
-                        "-ExecutionPolicy",
-                        "Bypass",
-                        "-File",
-                        str(written_file.absolute()),
-                    ]
-                else:
-                    # Shell commands (bash, sh, etc.)
-                    extra_args = [str(written_file.absolute())]
-
-            # Create a subprocess and run
-            task = asyncio.create_task(
-                asyncio.create_subprocess_exec(
-                    program,
-                    *extra_args,
-                    cwd=self.work_dir,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    env=env,
-                )
+        # Try extracting a filename (if present)
+        try:
+            filename = get_file_name_from_content(code, self.work_dir)
+        except ValueError:
+            return await to_code_block_result(
+                1, None, code_block_index, on_output, stderr="Filename is not in the workspace"
             )
-            cancellation_token.link_future(task)
 
-            proc = None  # Track the process
+        # If no filename is found, create one
+        if filename is None:
+            code_hash = sha256(code.encode()).hexdigest()
+            if lang.startswith("python"):
+                ext = "py"
+            elif lang in ["pwsh", "powershell", "ps1"]:
+                ext = "ps1"
+            else:
+                ext = lang
+
+            # Identical blocks may run at the same time, so each block gets its own file.
+            filename = f"tmp_code_{code_hash}_{uuid.uuid4().hex}.{ext}"
+
+        written_file = (self.work_dir / filename).resolve()
+        with written_file.open("w", encoding="utf-8") as f:
+            f.write(code)
+        code_file = str(written_file)
+
+        if lang == "python" and self._warm_pool_size > 0:
+            # Run the file in a warm interpreter of the pool.
+            run_task = asyncio.create_task(self._run_in_warm_pool(written_file))
+            cancellation_token.link_future(run_task)
             try:
-                proc = await task
-                stdout, stderr = await asyncio.wait_for(proc.communicate(), self._timeout)
-                exitcode = proc.returncode or 0
+                exitcode, stdout_text, stderr_text = await run_task
             except asyncio.TimeoutError:
-                logs_all += "\nTimeout"
-                exitcode = 124
-                if proc:
-                    proc.terminate()
-                    await proc.wait()  # Ensure process is fully dead
-                break
+                return await to_code_block_result(124, code_file, code_block_index, on_output, stderr="\nTimeout")
             except asyncio.CancelledError:
-                logs_all += "\nCancelled"
-                exitcode = 125
-                if proc:
-                    proc.terminate()
-                    await proc.wait()
-                break
+                return await to_code_block_result(125, code_file, code_block_index, on_output, stderr="\nCancelled")
+            return await to_code_block_result(
+                exitcode, code_file, code_block_index, on_output, stdout=stdout_text, stderr=stderr_text
+            )
 
-            logs_all += stderr.decode()
-            logs_all += stdout.decode()
+        # Build environment
+        env = self._build_env()
 
-            if exitcode != 0:
-                break
+        # Decide how to invoke the script
+        if lang == "python":
+            program = self._python_executable()
+            extra_args = [str(written_file.absolute())]
+        else:
+            # Get the appropriate command for the language
+            program = lang_to_cmd(lang)
+
+            # Special handling for PowerShell
+            if program == "pwsh":
+                extra_args = [
+                    "-NoProfile",
+                    "-ExecutionPolicy",
+                    "Bypass",
+                    "-File",
+                    str(written_file.absolute()),
+                ]
+            else:
+                # Shell commands (bash, sh, etc.)
+                extra_args = [str(written_file.absolute())]
 
-        code_file = str(file_names[0]) if file_names else None
-        return CommandLineCodeResult(exit_code=exitcode, output=logs_all, code_file=code_file)
+        # Create a subprocess and run
+        task = asyncio.create_task(
+            asyncio.create_subprocess_exec(
+                program,
+                *extra_args,
+                cwd=self.work_dir,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+            )
+        )
+        cancellation_token.link_future(task)
+
+        proc = None  # Track the process
+        try:
+            proc = await task
+            # Link the wait to the token too, so that cancelling stops a running process.
+            communicate_task = asyncio.create_task(
+                asyncio.wait_for(self._communicate(proc, code_block_index, on_output), self._timeout)
+            )
+            cancellation_token.link_future(communicate_task)
+            stdout, stderr = await communicate_task
+            exitcode = proc.returncode or 0
+        except asyncio.TimeoutError:
+            if proc:
+                proc.terminate()
+                await proc.wait()  # Ensure process is fully dead
+            return await to_code_block_result(124, code_file, code_block_index, on_output, stderr="\nTimeout")
+        except asyncio.CancelledError:
+            if proc:
+                proc.terminate()
+                await proc.wait()
+            return await to_code_block_result(125, code_file, code_block_index, on_output, stderr="\nCancelled")
+
+        return await to_code_block_result(
+            exitcode, code_file, code_block_index, on_output, stdout=stdout.decode(), stderr=stderr.decode()
+        )
+
+    @staticmethod
+    async def _communicate(
+        proc: asyncio.subprocess.Process, code_block_index: int, on_output: Optional[OutputCallback]
+    ) -> Tuple[bytes, bytes]:
+        if on_output is None:
+            return await proc.communicate()
+        await stream_process_output(proc, code_block_index, on_output)
+        return b"", b""
+
+    async def _run_in_warm_pool(self, file: Path) -> Tuple[int, str, str]:
+        warm_pool = await self._get_warm_pool()
+        return await warm_pool.run(file, self.work_dir, self._timeout)
 
     async def restart(self) -> None:
-        """(Experimental) Restart the code executor."""
+        """(Experimental) Restart the code executor.
+
+        Replaces the warm interpreters if the warm interpreter pool is enabled, and does nothing otherwise."""
+        if self._warm_pool_size > 0:
+            await self._stop_warm_pool()
+            await self._get_warm_pool()
+            return
         warnings.warn(
             "Restarting local command line code executor is not supported. No action is taken.",
             stacklevel=2,
@@ -464,6 +649,8 @@ async def start(self) -> None:
         """
         if self._work_dir is None and self._temp_dir is None:
             self._temp_dir = tempfile.TemporaryDirectory()
+        if self._warm_pool_size > 0:
+            await self._get_warm_pool()
         self._started = True
 
     async def stop(self) -> None:
@@ -471,7 +658,9 @@ async def stop(self) -> None:
 
         Stops the local code executor and performs the cleanup of the temporary working directory (if it was created).
         The executor's internal state is markes as no longer started.
+        The warm interpreters are stopped, including the ones that are running code.
         """
+        await self._stop_warm_pool()
         if self._temp_dir is not None:
             self._temp_dir.cleanup()
             self._temp_dir = None
@@ -488,6 +677,11 @@ def _to_config(self) -> LocalCommandLineCodeExecutorConfig:
             timeout=self._timeout,
             work_dir=str(self.work_dir),
             functions_module=self._functions_module,
+            warm_pool_size=self._warm_pool_size,
+            preload_modules=self._preload_modules,
+            max_runs_per_interpreter=self._max_runs_per_interpreter,
+            max_concurrent_blocks=self._max_concurrent_blocks,
+            stream_output_buffer_size=self._stream_output_buffer_size,
         )
 
     @classmethod
@@ -496,4 +690,9 @@ def _from_config(cls, config: LocalCommandLineCodeExecutorConfig) -> Self:
             timeout=config.timeout,
             work_dir=Path(config.work_dir) if config.work_dir is not None else None,
             functions_module=config.functions_module,
+            warm_pool_size=config.warm_pool_size,
+            preload_modules=config.preload_modules,
+            max_runs_per_interpreter=config.max_runs_per_interpreter,
+            max_concurrent_blocks=config.max_concurrent_blocks,
+            stream_output_buffer_size=config.stream_output_buffer_size,
         )
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WORKER_SCRIPT = Path(__file__).with_name("_warm_worker.py")
+
+
+class _WarmInterpreter:
+    def __init__(self, process: asyncio.subprocess.Process) -> None:
+        self.process = process
+        self.runs = 0
+
+    async def send(self, message: Mapping[str, str]) -> None:
+        assert self.process.stdin is not None
+        self.process.stdin.write((json.dumps(message) + "\n").encode())
+        await self.process.stdin.drain()
+
+    async def receive(self) -> Optional[Dict[str, object]]:
+        assert self.process.stdout is not None
+        line = await self.process.stdout.readline()
+        if not line:
+            return None
+        reply: Dict[str, object] = json.loads(line)
+        return reply
+
+    async def kill(self) -> None:
+        """Kill the process and wait for its exit, even if the waiting task is cancelled."""
+        if self.process.returncode is None:
+            self.process.kill()
+        # Close the request pipe, so the transport of the process is closed once the process has exited.
+        if self.process.stdin is not None:
+            self.process.stdin.close()
+        try:
+            await self.process.wait()
+        except asyncio.CancelledError:
+            # Observe the exit of the killed process even when the pool is stopped meanwhile.
+            await self.process.wait()
+            raise
+
+
+class WarmInterpreterPool:
+    """Long-lived Python interpreters that run code files without paying the interpreter start-up.
+
+    Each interpreter imports the preloaded modules once and then runs one file at a time in a fresh
+    ``__main__`` module, in the requested working directory. An interpreter is replaced after
+    ``max_runs`` runs, and when a run crashes it, times out or is cancelled.
+    """
+
+    def __init__(
+        self,
+        program: str,
+        size: int,
+        cwd: Path,
+        env: Mapping[str, str],
+        preload_modules: Sequence[str] = (),
+        max_runs: int = 100,
+    ) -> None:
+        self._program = program
+        self._size = size
+        self._cwd = cwd
+        self._env = dict(env)
+        self._preload_modules = list(preload_modules)
+        self._max_runs = max_runs
+        self._idle: asyncio.Queue[Optional[_WarmInterpreter]] = asyncio.Queue()
+        self._busy: Set[_WarmInterpreter] = set()
+        self._spawning: Set[asyncio.Task[None]] = set()
+        self._spawn_error: Optional[str] = None
+        self._output_dir: Optional[tempfile.TemporaryDirectory[str]] = None
+        self._run_count = 0
+        self._stopped = False
+
+    async def start(self) -> None:
+        """Start the interpreters and wait until they have imported the preloaded modules.
+
+        Raises:
+            RuntimeError: If an interpreter fails to import the preloaded modules.
+        """
+        self._output_dir = tempfile.TemporaryDirectory()
+        interpreters = await asyncio.gather(*(self._spawn() for _ in range(self._size)), return_exceptions=True)
+        errors = [error for error in interpreters if isinstance(error, BaseException)]
+        for interpreter in interpreters:
+            if isinstance(interpreter, _WarmInterpreter):
+                self._idle.put_nowait(interpreter)
+        if errors:
+            await self.stop()
+            raise errors[0]
+
+    async def stop(self) -> None:
+        """Kill the interpreters, including the ones that are running code and the ones being started.
+
+        Waits until every killed interpreter has exited, so no subprocess transport outlives the event loop.
+        """
+        self._stopped = True
+        for task in self._spawning:
+            task.cancel()
+        await asyncio.gather(*self._spawning, return_exceptions=True)
+        interpreters: List[_WarmInterpreter] = list(self._busy)
+        while not self._idle.empty():
+            interpreter = self._idle.get_nowait()
+            if interpreter is not None:
+                interpreters.append(interpreter)
+        await asyncio.gather(*(interpreter.kill() for interpreter in interpreters))
+        self._busy.clear()
+        if self._output_dir is not None:
+            self._output_dir.cleanup()
+            self._output_dir = None
+
+    async def run(self, file: Path, cwd: Path, timeout: float) -> Tuple[int, str, str]:
+        """Run a Python file in an idle interpreter and return its exit code, stdout and stderr.
+
+        Raises:
+            asyncio.TimeoutError: If the file does not finish within ``timeout`` seconds.
+            RuntimeError: If a replacement interpreter failed to start.
+        """
+        assert self._output_dir is not None, "The pool is not started."
+        interpreter = await self._idle.get()
+        if interpreter is None:
+            raise RuntimeError(f"Failed to start a warm interpreter: {self._spawn_error}")
+        self._busy.add(interpreter)
+        self._run_count += 1
+        stdout_path = Path(self._output_dir.name) / f"run_{self._run_count}.out"
+        stderr_path = Path(self._output_dir.name) / f"run_{self._run_count}.err"
+        healthy = False
+        try:
+            await interpreter.send(
+                {"file": str(file), "cwd": str(cwd), "stdout": str(stdout_path), "stderr": str(stderr_path)}
+            )
+            reply = await asyncio.wait_for(interpreter.receive(), timeout)
+            if reply is None:
+                # The code ended the interpreter, for example with os._exit() or a crash of an extension module.
+                exit_code = await interpreter.process.wait()
+            else:
+                exit_code = int(reply["exit_code"])  # type: ignore[call-overload]
+                interpreter.runs += 1
+                healthy = interpreter.runs < self._max_runs
+            return exit_code, _read_output(stdout_path), _read_output(stderr_path)
+        finally:
+            self._busy.discard(interpreter)
+            stdout_path.unlink(missing_ok=True)
+            stderr_path.unlink(missing_ok=True)
+            if healthy:
+                self._idle.put_nowait(interpreter)
+            else:
+                self._replace(interpreter)
+
+    def _replace(self, interpreter: _WarmInterpreter) -> None:
+        async def replace() -> None:
+            await interpreter.kill()
+            if self._stopped:
+                return
+            try:
+                self._idle.put_nowait(await self._spawn())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Failed to replace a warm interpreter: %s", e)
+                self._spawn_error = str(e)
+                self._idle.put_nowait(None)
+
+        task = asyncio.create_task(replace())
+        self._spawning.add(task)
+        task.add_done_callback(self._spawning.discard)
+
+    async def _spawn(self) -> _WarmInterpreter:
+        process = await asyncio.create_subprocess_exec(
+            self._program,
+            "-u",
+            str(_WORKER_SCRIPT),
+            *self._preload_modules,
+            cwd=self._cwd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=self._env,
+        )
+        interpreter = _WarmInterpreter(process)
+        try:
+            reply = await interpreter.receive()
+        except BaseException:
+            # The pool was stopped while the interpreter was importing the preloaded modules.
+            await interpreter.kill()
+            raise
+        if reply is None or "error" in reply:
+            await interpreter.kill()
+            error = reply["error"] if reply is not None else f"exit code {process.returncode}"
+            raise RuntimeError(f"Failed to start a warm interpreter: {error}")
+        return interpreter
+
+
+def _read_output(path: Path) -> str:
+    try:
+        return path.read_bytes().decode(errors="replace")
+    except FileNotFoundError:
+        return ""
@@ -0,0 +1,101 @@
+"""The interpreter loop of a warm pool worker of :class:`LocalCommandLineCodeExecutor`.
+
+The script is run by the interpreter of the executor, which can be a virtual environment without
+autogen-ext installed, so it only uses the standard library. Requests and replies are JSON lines on
+private copies of the stdin and stdout pipes, while the code runs with stdin read from the null device
+and stdout and stderr written to the files named in the request.
+"""
+
+import importlib
+import json
+import os
+import sys
+import traceback
+import types
+from typing import Any, Dict, TextIO
+
+
+def _exit_code(exit: SystemExit) -> int:
+    if exit.code is None:
+        return 0
+    if isinstance(exit.code, int):
+        return exit.code
+    sys.stderr.write(f"{exit.code}\n")
+    return 1
+
+
+def _run(request: Dict[str, Any]) -> int:
+    path: str = request["file"]
+    cwd: str = request["cwd"]
+    stdout_fd = os.open(request["stdout"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    stderr_fd = os.open(request["stderr"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.dup2(stdout_fd, 1)
+    os.dup2(stderr_fd, 2)
+    os.close(stdout_fd)
+    os.close(stderr_fd)
+
+    # Run the file as a fresh __main__ module, as the interpreter would when started with the file.
+    main = types.ModuleType("__main__")
+    main.__file__ = path
+    previous_main = sys.modules["__main__"]
+    sys.modules["__main__"] = main
+    modules = set(sys.modules)
+    sys.argv = [path]
+    sys.path[0] = os.path.dirname(path)
+    os.chdir(cwd)
+    try:
+        with open(path, "rb") as f:
+            code = compile(f.read(), path, "exec")
+        exec(code, main.__dict__)
+        exit_code = 0
+    except SystemExit as e:
+        exit_code = _exit_code(e)
+    except BaseException as e:
+        # Skip the frame of this function, so the traceback starts at the executed file.
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next if e.__traceback__ else None)
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sys.modules["__main__"] = previous_main
+        # Forget the modules imported from the working directory, so later runs see their current contents.
+        for name in set(sys.modules) - modules:
+            file = getattr(sys.modules[name], "__file__", None)
+            if file is not None and os.path.abspath(file).startswith(os.path.join(os.path.abspath(cwd), "")):
+                del sys.modules[name]
+        null_fd = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(null_fd, 1)
+        os.dup2(null_fd, 2)
+        os.close(null_fd)
+    return exit_code
+
+
+def _reply(channel: TextIO, message: Dict[str, Any]) -> None:
+    channel.write(json.dumps(message) + "\n")
+    channel.flush()
+
+
+def main() -> None:
+    requests = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    replies = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    null_fd = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(null_fd, fd)
+    os.close(null_fd)
+    # Resolve the preloaded modules from the working directory rather than from the directory of this script.
+    sys.path[0] = os.getcwd()
+
+    try:
+        for module in sys.argv[1:]:
+            importlib.import_module(module)
+    except BaseException:
+        _reply(replies, {"error": traceback.format_exc()})
+        return
+    _reply(replies, {"ready": True})
+
+    for line in requests:
+        _reply(replies, {"exit_code": _run(json.loads(line))})
+
+
+if __name__ == "__main__":
+    main()
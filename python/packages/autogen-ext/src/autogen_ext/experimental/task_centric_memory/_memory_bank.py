@@ -1,7 +1,7 @@
 import os
 import pickle
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, TypedDict
+from typing import Dict, List, Optional, Set, Tuple, TypedDict
 
 from ._string_similarity_map import StringSimilarityMap
 from .utils.page_logger import PageLogger
@@ -163,10 +163,15 @@ def get_relevant_memos(self, topics: List[str]) -> List[Memo]:
         """
         self.logger.enter_function()
 
-        # Retrieve all topic matches, and gather them into a single list.
+        # Retrieve the matches of all distinct topics with a single query, and gather them into a single list.
+        unique_topics = list(dict.fromkeys(topics))
+        topic_matches = self.string_map.get_related_string_pairs_batch(
+            unique_topics, self.n_results, self.distance_threshold
+        )
+        matches_per_topic = dict(zip(unique_topics, topic_matches, strict=True))
         matches: List[Tuple[str, str, float]] = []  # Each match is a tuple: (topic, memo_id, distance)
         for topic in topics:
-            matches.extend(self.string_map.get_related_string_pairs(topic, self.n_results, self.distance_threshold))
+            matches.extend(matches_per_topic[topic])
 
         # Build a dict of memo-relevance pairs from the matches.
         memo_relevance_dict: Dict[str, float] = {}
@@ -191,11 +196,15 @@ def get_relevant_memos(self, topics: List[str]) -> List[Memo]:
         # Sort the memo-relevance pairs by relevance, in descending order.
         memo_relevance_dict = dict(sorted(memo_relevance_dict.items(), key=lambda item: item[1], reverse=True))
 
-        # Compose the list of sufficiently relevant memos to return.
+        # Compose the list of sufficiently relevant memos to return, skipping the duplicates of more relevant memos.
         memo_list: List[Memo] = []
+        memo_contents: Set[Tuple[str | None, str]] = set()
         for memo_id in memo_relevance_dict:
             if memo_relevance_dict[memo_id] >= 0:
-                memo_list.append(self.uid_memo_dict[memo_id])
+                memo = self.uid_memo_dict[memo_id]
+                if (memo.task, memo.insight) not in memo_contents:
+                    memo_contents.add((memo.task, memo.insight))
+                    memo_list.append(memo)
 
         self.logger.leave_function()
         return memo_list
@@ -244,10 +244,12 @@ async def validate_insight(self, insight: str, task_description: str) -> bool:
         user_message.append("\n# Possibly useful insight")
         user_message.append(insight)
         self._clear_history()
+        # The exchange is not kept in the chat history, so that several insights can be validated concurrently.
         response = await self.call_model(
             summary="Ask the model to validate the insight",
             system_message_content=sys_message,
             user_content=user_message,
+            keep_these_messages=False,
         )
         return response == "1"
 
@@ -102,23 +102,33 @@ def get_related_string_pairs(
         """
         Retrieves up to n string pairs that are related to the given query text within the specified distance threshold.
         """
-        string_pairs_with_distances: List[Tuple[str, str, float]] = []
+        return self.get_related_string_pairs_batch([query_text], n_results, threshold)[0]
+
+    def get_related_string_pairs_batch(
+        self, query_texts: List[str], n_results: int, threshold: Union[int, float]
+    ) -> List[List[Tuple[str, str, float]]]:
+        """
+        Retrieves up to n string pairs for each of the given query texts within the specified distance threshold,
+        using a single query of the vector DB. Returns one list of string pairs per query text, in the same order.
+        """
+        string_pairs_per_query: List[List[Tuple[str, str, float]]] = [[] for _ in query_texts]
         if n_results > len(self.uid_text_dict):
             n_results = len(self.uid_text_dict)
-        if n_results > 0:
-            results: QueryResult = self.vec_db.query(query_texts=[query_text], n_results=n_results)
-            num_results = len(results["ids"][0])
-            for i in range(num_results):
-                uid = results["ids"][0][i]
-                input_text = results["documents"][0][i] if results["documents"] else ""
-                distance = results["distances"][0][i] if results["distances"] else 0.0
-                if distance < threshold:
-                    input_text_2, output_text = self.uid_text_dict[uid]
-                    assert input_text == input_text_2
-                    self.logger.debug(
-                        "\nINPUT-OUTPUT PAIR RETRIEVED FROM VECTOR DATABASE:\n  INPUT1\n    {}\n  OUTPUT\n    {}\n  DISTANCE\n    {}".format(
-                            input_text, output_text, distance
+        if n_results > 0 and len(query_texts) > 0:
+            results: QueryResult = self.vec_db.query(query_texts=query_texts, n_results=n_results)
+            for query_index, string_pairs_with_distances in enumerate(string_pairs_per_query):
+                num_results = len(results["ids"][query_index])
+                for i in range(num_results):
+                    uid = results["ids"][query_index][i]
+                    input_text = results["documents"][query_index][i] if results["documents"] else ""
+                    distance = results["distances"][query_index][i] if results["distances"] else 0.0
+                    if distance < threshold:
+                        input_text_2, output_text = self.uid_text_dict[uid]
+                        assert input_text == input_text_2
+                        self.logger.debug(
+                            "\nINPUT-OUTPUT PAIR RETRIEVED FROM VECTOR DATABASE:\n  INPUT1\n    {}\n  OUTPUT\n    {}\n  DISTANCE\n    {}".format(
+                                input_text, output_text, distance
+                            )
                         )
-                    )
-                    string_pairs_with_distances.append((input_text, output_text, distance))
-        return string_pairs_with_distances
+                        string_pairs_with_distances.append((input_text, output_text, distance))
+        return string_pairs_per_query
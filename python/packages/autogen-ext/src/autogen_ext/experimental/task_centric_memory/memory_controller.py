@@ -1,3 +1,4 @@
+import asyncio
 from typing import TYPE_CHECKING, Awaitable, Callable, List, Tuple, TypedDict
 
 from autogen_core.models import (
@@ -20,6 +21,7 @@ class MemoryControllerConfig(TypedDict, total=False):
     revise_generalized_task: bool
     generate_topics: bool
     validate_memos: bool
+    max_concurrent_validations: int
     max_memos_to_retrieve: int
     max_train_trials: int
     max_test_trials: int
@@ -42,6 +44,7 @@ class MemoryController:
             - revise_generalized_task: Whether to critique then rewrite the generalized task.
             - generate_topics: Whether to base retrieval directly on tasks, or on topics extracted from tasks.
             - validate_memos: Whether to apply a final validation stage to retrieved memos.
+            - max_concurrent_validations: The maximum number of retrieved memos validated by the model at the same time.
             - max_memos_to_retrieve: The maximum number of memos to return from retrieve_relevant_memos().
             - max_train_trials: The maximum number of learning iterations to attempt when training on a task.
             - max_test_trials: The total number of attempts made when testing for failure on a task.
@@ -105,6 +108,7 @@ def __init__(
         self.revise_generalized_task = True
         self.generate_topics = True
         self.validate_memos = True
+        self.max_concurrent_validations = 5
         self.max_memos_to_retrieve = 10
         self.max_train_trials = 10
         self.max_test_trials = 3
@@ -114,10 +118,13 @@ def __init__(
             self.revise_generalized_task = config.get("revise_generalized_task", self.revise_generalized_task)
             self.generate_topics = config.get("generate_topics", self.generate_topics)
             self.validate_memos = config.get("validate_memos", self.validate_memos)
+            self.max_concurrent_validations = config.get("max_concurrent_validations", self.max_concurrent_validations)
             self.max_memos_to_retrieve = config.get("max_memos_to_retrieve", self.max_memos_to_retrieve)
             self.max_train_trials = config.get("max_train_trials", self.max_train_trials)
             self.max_test_trials = config.get("max_test_trials", self.max_test_trials)
             memory_bank_config = config.get("MemoryBank", memory_bank_config)
+        if self.max_concurrent_validations < 1:
+            raise ValueError("max_concurrent_validations must be greater than or equal to 1.")
 
         self.client = client
         self.task_assignment_callback = task_assignment_callback
@@ -282,12 +289,10 @@ async def retrieve_relevant_memos(self, task: str) -> List[Memo]:
             memo_list = self.memory_bank.get_relevant_memos(topics=task_topics)
 
             # Apply a final validation stage to keep only the memos that the LLM concludes are sufficiently relevant.
-            validated_memos: List[Memo] = []
-            for memo in memo_list:
-                if len(validated_memos) >= self.max_memos_to_retrieve:
-                    break
-                if (not self.validate_memos) or await self.prompter.validate_insight(memo.insight, task):
-                    validated_memos.append(memo)
+            if self.validate_memos:
+                validated_memos = await self._validate_memos(memo_list, task)
+            else:
+                validated_memos = memo_list[: self.max_memos_to_retrieve]
 
             self.logger.info("\n{} VALIDATED MEMOS".format(len(validated_memos)))
             for memo in validated_memos:
@@ -301,6 +306,27 @@ async def retrieve_relevant_memos(self, task: str) -> List[Memo]:
         self.logger.leave_function()
         return validated_memos
 
+    async def _validate_memos(self, memo_list: List[Memo], task: str) -> List[Memo]:
+        """
+        Returns the first memos (up to max_memos_to_retrieve) that the LLM concludes are relevant to the task.
+        The memos are validated concurrently, in batches of as many memos as are still needed, so that no memo
+        is validated beyond the one that completes the list.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_validations)
+
+        async def validate(memo: Memo) -> bool:
+            async with semaphore:
+                return await self.prompter.validate_insight(memo.insight, task)
+
+        validated_memos: List[Memo] = []
+        next_index = 0
+        while len(validated_memos) < self.max_memos_to_retrieve and next_index < len(memo_list):
+            batch = memo_list[next_index : next_index + self.max_memos_to_retrieve - len(validated_memos)]
+            next_index += len(batch)
+            results = await asyncio.gather(*(validate(memo) for memo in batch))
+            validated_memos.extend(memo for memo, is_valid in zip(batch, results, strict=True) if is_valid)
+        return validated_memos
+
     def _format_memory_section(self, memories: List[str]) -> str:
         """
         Formats a list of memories as a section for appending to a task description.
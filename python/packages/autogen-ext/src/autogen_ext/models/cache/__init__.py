@@ -1,6 +1,10 @@
-from ._chat_completion_cache import CHAT_CACHE_VALUE_TYPE, ChatCompletionCache
+from ._chat_completion_cache import CHAT_CACHE_VALUE_TYPE, ChatCompletionCache, ChatCompletionCacheStats
+from ._semantic_cache import EmbeddingFunction, SemanticCacheIndex
 
 __all__ = [
     "CHAT_CACHE_VALUE_TYPE",
     "ChatCompletionCache",
+    "ChatCompletionCacheStats",
+    "EmbeddingFunction",
+    "SemanticCacheIndex",
 ]
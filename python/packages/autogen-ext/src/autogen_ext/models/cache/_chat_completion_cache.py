@@ -1,9 +1,19 @@
+import asyncio
 import hashlib
 import json
 import warnings
-from typing import Any, AsyncGenerator, List, Mapping, Optional, Sequence, Union, cast
-
-from autogen_core import CacheStore, CancellationToken, Component, ComponentModel, InMemoryStore
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict, List, Mapping, Optional, Sequence, Union, cast
+
+from autogen_core import (
+    AsyncCacheStore,
+    CacheStore,
+    CancellationToken,
+    Component,
+    ComponentLoader,
+    ComponentModel,
+    InMemoryStore,
+)
 from autogen_core.models import (
     ChatCompletionClient,
     CreateResult,
@@ -13,17 +23,76 @@
     RequestUsage,
 )
 from autogen_core.tools import Tool, ToolSchema
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from typing_extensions import Self
 
+from ._semantic_cache import SemanticCacheIndex, normalize_messages, render_normalized_messages
+
 CHAT_CACHE_VALUE_TYPE = Union[CreateResult, List[Union[str, CreateResult]]]
 
+# Validates values read back from stores that hold plain JSON, such as the redis stores.
+_CHAT_CACHE_VALUE_ADAPTER: TypeAdapter[CHAT_CACHE_VALUE_TYPE] = TypeAdapter(CHAT_CACHE_VALUE_TYPE)
+
+
+@dataclass(frozen=True)
+class ChatCompletionCacheStats:
+    """Counters of a :class:`ChatCompletionCache`.
+
+    ``coalesced`` counts requests that were served by waiting on an identical
+    in-flight call to the underlying client instead of issuing their own.
+    ``normalized_hits`` and ``semantic_hits`` count the hits, included in ``hits``,
+    that were served by the normalized and semantic lookup tiers.
+    """
+
+    hits: int
+    misses: int
+    coalesced: int
+    normalized_hits: int = 0
+    semantic_hits: int = 0
+
+
+class _StreamFlight:
+    """The chunks of a stream from the underlying client, shared by concurrent callers."""
+
+    def __init__(self) -> None:
+        self.chunks: List[Union[str, CreateResult]] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.task: Optional[asyncio.Task[None]] = None
+        self._update = asyncio.Event()
+
+    def append(self, chunk: Union[str, CreateResult]) -> None:
+        self.chunks.append(chunk)
+        self._notify()
+
+    def finish(self, error: Optional[BaseException]) -> None:
+        self.done = True
+        self.error = error
+        self._notify()
+
+    async def wait_for_update(self) -> None:
+        await self._update.wait()
+
+    def _notify(self) -> None:
+        # Wake up current waiters and start a new generation for the next update.
+        self._update.set()
+        self._update = asyncio.Event()
+
+
+@dataclass
+class _CacheKey:
+    exact: str
+    normalized: Optional[str] = None
+    scope: Optional[str] = None
+    embedding: Optional[Sequence[float]] = None
+
 
 class ChatCompletionCacheConfig(BaseModel):
     """ """
 
     client: ComponentModel
     store: Optional[ComponentModel] = None
+    normalize_messages: bool = False
 
 
 class ChatCompletionCache(ChatCompletionClient, Component[ChatCompletionCacheConfig]):
@@ -66,6 +135,10 @@ async def main():
                 # import redis
                 # redis_instance = redis.Redis()
                 # cache_store = RedisCacheStore[CHAT_CACHE_VALUE_TYPE](redis_instance)
+                # Or, to avoid blocking the event loop on cache lookups, an async store like:
+                # from autogen_ext.cache_store.redis import AsyncRedisStore
+                # import redis.asyncio
+                # cache_store = AsyncRedisStore[CHAT_CACHE_VALUE_TYPE](redis.asyncio.Redis())
                 cache_store = DiskCacheStore[CHAT_CACHE_VALUE_TYPE](Cache(tmpdirname))
                 cache_client = ChatCompletionCache(openai_model_client, cache_store)
 
@@ -81,9 +154,18 @@ async def main():
 
     Args:
         client (ChatCompletionClient): The original ChatCompletionClient to wrap.
-        store (CacheStore): A store object that implements get and set methods.
+        store (CacheStore | AsyncCacheStore): A store object that implements get and set methods,
+            or aget and aset methods. When the store implements :class:`~autogen_core.AsyncCacheStore`,
+            the async methods are used so cache lookups do not block the event loop.
             The user is responsible for managing the store's lifecycle & clearing it (if needed).
             Defaults to using in-memory cache.
+        normalize_messages (bool): If True, a prompt that misses the exact-match cache is looked up again
+            after normalizing its messages: whitespace is collapsed, UUIDs and timestamps in text are
+            replaced by placeholders and function call ids are dropped. Defaults to False.
+        semantic_index (SemanticCacheIndex, optional): If given, a prompt that misses the other tiers is
+            served from the most similar cached prompt with the same tools and output settings, if any
+            is above the index's similarity threshold. The index is kept in memory and is not part of
+            the component configuration.
     """
 
     component_type = "chat_completion_cache"
@@ -93,21 +175,64 @@ async def main():
     def __init__(
         self,
         client: ChatCompletionClient,
-        store: Optional[CacheStore[CHAT_CACHE_VALUE_TYPE]] = None,
+        store: Optional[Union[CacheStore[CHAT_CACHE_VALUE_TYPE], AsyncCacheStore[CHAT_CACHE_VALUE_TYPE]]] = None,
+        *,
+        normalize_messages: bool = False,
+        semantic_index: Optional[SemanticCacheIndex] = None,
     ):
         self.client = client
         self.store = store or InMemoryStore[CHAT_CACHE_VALUE_TYPE]()
-
-    def _check_cache(
+        self._normalize_messages = normalize_messages
+        self._semantic_index = semantic_index
+        # Calls to the underlying client that are in progress, by cache key.
+        self._in_flight: Dict[str, asyncio.Future[CreateResult]] = {}
+        self._in_flight_streams: Dict[str, _StreamFlight] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._normalized_hits = 0
+        self._semantic_hits = 0
+
+    async def _store_get(self, key: str) -> Optional[CHAT_CACHE_VALUE_TYPE]:
+        if isinstance(self.store, AsyncCacheStore):
+            value = await self.store.aget(key)
+        else:
+            value = self.store.get(key)
+        if value is None or isinstance(value, CreateResult):
+            return value
+        try:
+            return _CHAT_CACHE_VALUE_ADAPTER.validate_python(value)
+        except ValidationError:
+            # An entry this cache cannot read is treated as a miss and overwritten.
+            return None
+
+    async def _store_set(self, key: str, value: CHAT_CACHE_VALUE_TYPE) -> None:
+        if isinstance(self.store, AsyncCacheStore):
+            await self.store.aset(key, value)
+        else:
+            self.store.set(key, value)
+
+    async def _store_result(self, cache_key: _CacheKey, value: CHAT_CACHE_VALUE_TYPE) -> None:
+        await self._store_set(cache_key.exact, value)
+        if cache_key.normalized is not None:
+            await self._store_set(cache_key.normalized, value)
+        if self._semantic_index is not None and cache_key.scope is not None and cache_key.embedding is not None:
+            self._semantic_index.add(cache_key.scope, cache_key.embedding, cache_key.exact)
+
+    async def _check_cache(
         self,
         messages: Sequence[LLMMessage],
         tools: Sequence[Tool | ToolSchema],
         json_output: Optional[bool | type[BaseModel]],
         extra_create_args: Mapping[str, Any],
-    ) -> tuple[Optional[Union[CreateResult, List[Union[str, CreateResult]]]], str]:
+        stream: bool = False,
+    ) -> tuple[Optional[Union[CreateResult, List[Union[str, CreateResult]]]], _CacheKey]:
         """
         Helper function to check the cache for a result.
         Returns a tuple of (cached_result, cache_key).
+
+        The exact-match tier is checked first, followed by the normalized and semantic
+        tiers if they are enabled.
         """
 
         json_output_data: str | bool | None = None
@@ -117,19 +242,45 @@ def _check_cache(
         elif isinstance(json_output, bool):
             json_output_data = json_output
 
+        tools_data = [(tool.schema if isinstance(tool, Tool) else tool) for tool in tools]
         data = {
             "messages": [message.model_dump() for message in messages],
-            "tools": [(tool.schema if isinstance(tool, Tool) else tool) for tool in tools],
+            "tools": tools_data,
             "json_output": json_output_data,
             "extra_create_args": extra_create_args,
         }
         serialized_data = json.dumps(data, sort_keys=True)
-        cache_key = hashlib.sha256(serialized_data.encode()).hexdigest()
+        cache_key = _CacheKey(exact=hashlib.sha256(serialized_data.encode()).hexdigest())
 
-        cached_result = cast(Optional[CreateResult], self.store.get(cache_key))
+        cached_result = cast(Optional[CreateResult], await self._store_get(cache_key.exact))
         if cached_result is not None:
             return cached_result, cache_key
 
+        if not self._normalize_messages and self._semantic_index is None:
+            return None, cache_key
+
+        # Results of create and create_stream have different types, so secondary tiers keep them apart.
+        expected_type = list if stream else CreateResult
+        normalized = normalize_messages(messages)
+        if self._normalize_messages:
+            normalized_data = {**data, "messages": normalized, "normalized": True}
+            cache_key.normalized = hashlib.sha256(json.dumps(normalized_data, sort_keys=True).encode()).hexdigest()
+            normalized_result = await self._store_get(cache_key.normalized)
+            if isinstance(normalized_result, expected_type):
+                self._normalized_hits += 1
+                return normalized_result, cache_key
+
+        if self._semantic_index is not None:
+            scope_data = {"tools": tools_data, "json_output": json_output_data, "extra_create_args": extra_create_args}
+            cache_key.scope = f"{'stream' if stream else 'create'}:{json.dumps(scope_data, sort_keys=True)}"
+            cache_key.embedding = await self._semantic_index.embed(render_normalized_messages(normalized))
+            nearest_key = await self._semantic_index.nearest(cache_key.scope, cache_key.embedding)
+            if nearest_key is not None:
+                semantic_result = await self._store_get(nearest_key)
+                if isinstance(semantic_result, expected_type):
+                    self._semantic_hits += 1
+                    return semantic_result, cache_key
+
         return None, cache_key
 
     async def create(
@@ -144,24 +295,57 @@ async def create(
         """
         Cached version of ChatCompletionClient.create.
         If the result of a call to create has been cached, it will be returned immediately
-        without invoking the underlying client.
+        without invoking the underlying client. Concurrent calls with the same arguments
+        share a single call to the underlying client; only the first caller's result is
+        marked as not cached. If that call fails, the error is raised in all callers
+        waiting on it, except for cancellation, after which a waiting caller retries.
 
         NOTE: cancellation_token is ignored for cached results.
         """
-        cached_result, cache_key = self._check_cache(messages, tools, json_output, extra_create_args)
-        if cached_result:
-            assert isinstance(cached_result, CreateResult)
-            cached_result.cached = True
-            return cached_result
-
-        result = await self.client.create(
-            messages,
-            tools=tools,
-            json_output=json_output,
-            extra_create_args=extra_create_args,
-            cancellation_token=cancellation_token,
-        )
-        self.store.set(cache_key, result)
+        while True:
+            cached_result, cache_key = await self._check_cache(messages, tools, json_output, extra_create_args)
+            if cached_result:
+                assert isinstance(cached_result, CreateResult)
+                self._hits += 1
+                cached_result.cached = True
+                return cached_result
+
+            in_flight = self._in_flight.get(cache_key.exact)
+            if in_flight is None:
+                break
+            self._coalesced += 1
+            try:
+                shared_result = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if in_flight.cancelled():
+                    continue
+                raise
+            return shared_result.model_copy(update={"cached": True})
+
+        self._misses += 1
+        future: asyncio.Future[CreateResult] = asyncio.get_running_loop().create_future()
+        # Mark the exception as retrieved in case no other caller is waiting on it.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[cache_key.exact] = future
+        try:
+            result = await self.client.create(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            await self._store_result(cache_key, result)
+        finally:
+            del self._in_flight[cache_key.exact]
         return result
 
     def create_stream(
@@ -176,42 +360,105 @@ def create_stream(
         """
         Cached version of ChatCompletionClient.create_stream.
         If the result of a call to create_stream has been cached, it will be returned
-        without streaming from the underlying client.
+        without streaming from the underlying client. Concurrent calls with the same
+        arguments share a single stream from the underlying client: later callers replay
+        the chunks received so far and then follow the stream as it progresses. The shared
+        stream runs to completion even if the first caller stops consuming it, and its
+        results are cached once it completes.
 
         NOTE: cancellation_token is ignored for cached results.
         """
 
         async def _generator() -> AsyncGenerator[Union[str, CreateResult], None]:
-            cached_result, cache_key = self._check_cache(
-                messages,
-                tools,
-                json_output,
-                extra_create_args,
-            )
-            if cached_result:
-                assert isinstance(cached_result, list)
-                for result in cached_result:
-                    if isinstance(result, CreateResult):
-                        result.cached = True
-                    yield result
+            while True:
+                cached_result, cache_key = await self._check_cache(
+                    messages,
+                    tools,
+                    json_output,
+                    extra_create_args,
+                    stream=True,
+                )
+                if cached_result:
+                    assert isinstance(cached_result, list)
+                    self._hits += 1
+                    for result in cached_result:
+                        if isinstance(result, CreateResult):
+                            result.cached = True
+                        yield result
+                    return
+
+                flight = self._in_flight_streams.get(cache_key.exact)
+                if flight is not None:
+                    self._coalesced += 1
+                    is_leader = False
+                else:
+                    self._misses += 1
+                    is_leader = True
+                    flight = _StreamFlight()
+                    self._in_flight_streams[cache_key.exact] = flight
+                    flight.task = asyncio.create_task(
+                        self._produce_stream(
+                            flight,
+                            cache_key,
+                            self.client.create_stream(
+                                messages,
+                                tools=tools,
+                                json_output=json_output,
+                                extra_create_args=extra_create_args,
+                                cancellation_token=cancellation_token,
+                            ),
+                        )
+                    )
+
+                index = 0
+                while True:
+                    while index < len(flight.chunks):
+                        chunk = flight.chunks[index]
+                        index += 1
+                        if not is_leader and isinstance(chunk, CreateResult):
+                            chunk = chunk.model_copy(update={"cached": True})
+                        yield chunk
+                    if flight.done:
+                        break
+                    await flight.wait_for_update()
+
+                if isinstance(flight.error, asyncio.CancelledError) and not is_leader and index == 0:
+                    # The shared stream was cancelled before producing anything; start over.
+                    continue
+                if flight.error is not None:
+                    raise flight.error
                 return
 
-            result_stream = self.client.create_stream(
-                messages,
-                tools=tools,
-                json_output=json_output,
-                extra_create_args=extra_create_args,
-                cancellation_token=cancellation_token,
-            )
-
-            output_results: List[Union[str, CreateResult]] = []
-            self.store.set(cache_key, output_results)
+        return _generator()
 
+    async def _produce_stream(
+        self,
+        flight: "_StreamFlight",
+        cache_key: _CacheKey,
+        result_stream: AsyncGenerator[Union[str, CreateResult], None],
+    ) -> None:
+        try:
             async for result in result_stream:
-                output_results.append(result)
-                yield result
-
-        return _generator()
+                flight.append(result)
+        except BaseException as e:
+            flight.finish(e)
+            if not isinstance(e, (Exception, asyncio.CancelledError)):
+                raise
+        else:
+            flight.finish(None)
+            await self._store_result(cache_key, list(flight.chunks))
+        finally:
+            del self._in_flight_streams[cache_key.exact]
+
+    def stats(self) -> ChatCompletionCacheStats:
+        """Return the number of cache hits, misses and requests coalesced into an in-flight call."""
+        return ChatCompletionCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            coalesced=self._coalesced,
+            normalized_hits=self._normalized_hits,
+            semantic_hits=self._semantic_hits,
+        )
 
     async def close(self) -> None:
         await self.client.close()
@@ -241,12 +488,16 @@ def _to_config(self) -> ChatCompletionCacheConfig:
         return ChatCompletionCacheConfig(
             client=self.client.dump_component(),
             store=self.store.dump_component() if not isinstance(self.store, InMemoryStore) else None,
+            normalize_messages=self._normalize_messages,
         )
 
     @classmethod
     def _from_config(cls, config: ChatCompletionCacheConfig) -> Self:
         client = ChatCompletionClient.load_component(config.client)
-        store: Optional[CacheStore[CHAT_CACHE_VALUE_TYPE]] = (
-            CacheStore.load_component(config.store) if config.store else InMemoryStore()
-        )
-        return cls(client=client, store=store)
+        store: Optional[Union[CacheStore[CHAT_CACHE_VALUE_TYPE], AsyncCacheStore[CHAT_CACHE_VALUE_TYPE]]] = None
+        if config.store:
+            loaded_store = ComponentLoader.load_component(config.store)
+            if not isinstance(loaded_store, (CacheStore, AsyncCacheStore)):
+                raise TypeError("Expected type does not match")
+            store = cast(Union[CacheStore[CHAT_CACHE_VALUE_TYPE], AsyncCacheStore[CHAT_CACHE_VALUE_TYPE]], loaded_store)
+        return cls(client=client, store=store, normalize_messages=config.normalize_messages)
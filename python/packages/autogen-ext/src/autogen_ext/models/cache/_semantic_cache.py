@@ -0,0 +1,214 @@
+import asyncio
+import math
+import re
+from collections import OrderedDict
+from types import ModuleType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from autogen_core.models import LLMMessage
+
+numpy: ModuleType | None = None
+try:
+    import numpy
+except ImportError:
+    pass
+
+EmbeddingFunction = Callable[[str], Awaitable[Sequence[float]]]
+"""An async function that returns the embedding vector of a text."""
+
+_UUID_PATTERN = re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b")
+_TIMESTAMP_PATTERN = re.compile(
+    r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?(?![\w:])"
+)
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+# Fields that identify a particular call rather than its content, e.g. FunctionCall.id and
+# FunctionExecutionResult.call_id.
+_VOLATILE_FIELDS = frozenset({"id", "call_id"})
+
+
+def _normalize_text(text: str) -> str:
+    text = _UUID_PATTERN.sub("<uuid>", text)
+    text = _TIMESTAMP_PATTERN.sub("<timestamp>", text)
+    return _WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return _normalize_text(value)
+    if isinstance(value, Mapping):
+        return {
+            key: _normalize_value(item)
+            for key, item in value.items()  # type: ignore[reportUnknownVariableType]
+            if key not in _VOLATILE_FIELDS
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(item) for item in value]  # type: ignore[reportUnknownVariableType]
+    return value
+
+
+def normalize_messages(messages: Sequence[LLMMessage]) -> List[Dict[str, Any]]:
+    """Return the serialized messages with volatile details removed.
+
+    Runs of whitespace are collapsed, UUIDs and ISO 8601 timestamps in text are replaced by
+    placeholders, and call ids of function calls and their results are dropped, so that
+    prompts that differ only in these details normalize to the same data.
+    """
+    return [_normalize_value(message.model_dump()) for message in messages]
+
+
+def render_normalized_messages(normalized_messages: Sequence[Mapping[str, Any]]) -> str:
+    """Render normalized messages as the text that is embedded for semantic lookups."""
+    lines: List[str] = []
+    for message in normalized_messages:
+        content = message.get("content")
+        lines.append(f"{message.get('type')}: {content if isinstance(content, str) else repr(content)}")
+    return "\n".join(lines)
+
+
+class SemanticCacheIndex:
+    """An in-memory nearest-neighbour index that maps prompt embeddings to cache keys.
+
+    Used by :class:`~autogen_ext.models.cache.ChatCompletionCache` as a secondary lookup tier:
+    when a prompt misses the exact-match cache, the most similar previously cached prompt
+    with the same tools and output settings is served if its cosine similarity is at least
+    ``similarity_threshold``.
+
+    Args:
+        embedding_function: An async function that returns the embedding vector of a text.
+        similarity_threshold (float): The minimum cosine similarity for a match. Defaults to 0.95.
+        max_entries (int): The maximum number of prompts kept per scope; the oldest are
+            dropped first. Defaults to 10000.
+
+    Each lookup compares the prompt with every entry of its scope. If numpy is installed, the
+    vectors of a scope are kept in a matrix and compared with one matrix-vector product, which
+    takes a few milliseconds for 10000 entries of 1536 dimensions. Otherwise the comparison is a
+    Python loop, which is run in a worker thread so that it does not block the event loop, and takes
+    in the order of a second for the same index; lower ``max_entries`` if numpy is not available.
+
+    Example:
+
+        .. code-block:: python
+
+            from autogen_ext.models.cache import ChatCompletionCache, SemanticCacheIndex
+            from autogen_ext.models.openai import OpenAIChatCompletionClient
+            from openai import AsyncOpenAI
+
+            openai_client = AsyncOpenAI()
+
+
+            async def embed(text: str) -> list[float]:
+                response = await openai_client.embeddings.create(model="text-embedding-3-small", input=text)
+                return response.data[0].embedding
+
+
+            cache_client = ChatCompletionCache(
+                OpenAIChatCompletionClient(model="gpt-4o"),
+                semantic_index=SemanticCacheIndex(embed, similarity_threshold=0.97),
+            )
+    """
+
+    def __init__(
+        self,
+        embedding_function: EmbeddingFunction,
+        similarity_threshold: float = 0.95,
+        max_entries: int = 10_000,
+    ) -> None:
+        if not -1.0 <= similarity_threshold <= 1.0:
+            raise ValueError("similarity_threshold must be between -1 and 1")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._embedding_function = embedding_function
+        self._similarity_threshold = similarity_threshold
+        self._max_entries = max_entries
+        self._scopes: Dict[str, _SemanticScope] = {}
+
+    @property
+    def similarity_threshold(self) -> float:
+        return self._similarity_threshold
+
+    async def embed(self, text: str) -> Tuple[float, ...]:
+        """Return the unit-length embedding vector of a text."""
+        vector = await self._embedding_function(text)
+        norm = math.sqrt(sum(component * component for component in vector))
+        if norm == 0:
+            return tuple(vector)
+        return tuple(component / norm for component in vector)
+
+    async def nearest(self, scope: str, vector: Sequence[float]) -> Optional[str]:
+        """Return the cache key of the most similar entry in a scope, if it meets the threshold."""
+        entries = self._scopes.get(scope)
+        if entries is None or len(entries) == 0 or len(vector) != entries.dimension:
+            return None
+        if entries.matrix is not None:
+            similarities = entries.matrix[: len(entries)] @ numpy.asarray(vector, dtype=entries.matrix.dtype)  # type: ignore[union-attr]
+            row = int(similarities.argmax())
+            similarity = float(similarities[row])
+        else:
+            # Scan a snapshot of the rows, since entries may be added while the thread runs.
+            row, similarity = await asyncio.to_thread(_scan, list(entries.rows), vector)
+        if similarity < self._similarity_threshold:
+            return None
+        return entries.keys[row]
+
+    def add(self, scope: str, vector: Sequence[float], cache_key: str) -> None:
+        """Add the embedding of a cached prompt to a scope."""
+        entries = self._scopes.get(scope)
+        if entries is None or entries.dimension != len(vector):
+            # The scope is new, or the embedding function changed its dimension.
+            entries = self._scopes[scope] = _SemanticScope(len(vector))
+        entries.add(cache_key, vector, self._max_entries)
+
+    def clear(self) -> None:
+        """Remove all entries from the index."""
+        self._scopes.clear()
+
+
+class _SemanticScope:
+    """The entries of one scope of a :class:`SemanticCacheIndex`. Each entry has a row: the vectors are
+    the rows of a matrix if numpy is installed, or of a list of tuples otherwise. The row of the oldest
+    entry is reused when the scope is full."""
+
+    def __init__(self, dimension: int) -> None:
+        self.dimension = dimension
+        # The row of each cache key, oldest first.
+        self.rows_by_key: OrderedDict[str, int] = OrderedDict()
+        self.keys: List[str] = []
+        self.rows: List[Tuple[float, ...]] = []
+        self.matrix: Any = None
+        if numpy is not None:
+            self.matrix = numpy.zeros((8, dimension), dtype=numpy.float64)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, cache_key: str, vector: Sequence[float], max_entries: int) -> None:
+        if cache_key in self.rows_by_key:
+            row = self.rows_by_key[cache_key]
+            self.rows_by_key.move_to_end(cache_key)
+        elif len(self.keys) >= max_entries:
+            _, row = self.rows_by_key.popitem(last=False)
+            self.rows_by_key[cache_key] = row
+            self.keys[row] = cache_key
+        else:
+            row = len(self.keys)
+            self.rows_by_key[cache_key] = row
+            self.keys.append(cache_key)
+        if self.matrix is None:
+            if row == len(self.rows):
+                self.rows.append(tuple(vector))
+            else:
+                self.rows[row] = tuple(vector)
+            return
+        if row == self.matrix.shape[0]:
+            # Double the capacity of the matrix.
+            self.matrix = numpy.concatenate([self.matrix, numpy.zeros_like(self.matrix)])  # type: ignore[union-attr]
+        self.matrix[row] = vector
+
+
+def _scan(rows: Sequence[Tuple[float, ...]], vector: Sequence[float]) -> Tuple[int, float]:
+    best_row, best_similarity = 0, -math.inf
+    for row, candidate in enumerate(rows):
+        similarity = sum(a * b for a, b in zip(vector, candidate, strict=True))
+        if similarity > best_similarity:
+            best_row, best_similarity = row, similarity
+    return best_row, best_similarity
@@ -1,12 +1,17 @@
 import asyncio
+import functools
+import hashlib
 import inspect
 import json
 import logging
 import math
 import os
 import re
+import threading
 import warnings
+import weakref
 from asyncio import Task
+from collections import OrderedDict
 from dataclasses import dataclass
 from importlib.metadata import PackageNotFoundError, version
 from typing import (
@@ -14,6 +19,7 @@
     AsyncGenerator,
     Callable,
     Dict,
+    Hashable,
     List,
     Mapping,
     Optional,
@@ -189,7 +195,7 @@ def calculate_vision_tokens(image: Image, detail: str = "auto") -> int:
     if detail == "low":
         return BASE_TOKEN_COUNT
 
-    width, height = image.image.size
+    width, height = image.size
 
     # Scale down to fit within a MAX_LONG_EDGE x MAX_LONG_EDGE square if necessary
 
@@ -274,65 +280,108 @@ def normalize_name(name: str) -> str:
     return re.sub(r"[^a-zA-Z0-9_-]", "_", name)[:64]
 
 
-def count_tokens_openai(
-    messages: Sequence[LLMMessage],
-    model: str,
-    *,
-    add_name_prefixes: bool = False,
-    tools: Sequence[Tool | ToolSchema] = [],
-    model_family: str = ModelFamily.UNKNOWN,
-) -> int:
+_TOKEN_COUNT_CACHE_SIZE = 4096
+
+
+class _TokenCountCache:
+    """A thread-safe, bounded LRU mapping of content keys to token counts."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._entries: OrderedDict[Hashable, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> int | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: int) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _message_key(message: LLMMessage) -> bytes:
+    # Keyed by content, so a message that was mutated in place, including its nested lists, is counted again.
+    return hashlib.blake2b(message.model_dump_json().encode("utf-8"), digest_size=16).digest()
+
+
+_message_token_cache = _TokenCountCache(_TOKEN_COUNT_CACHE_SIZE)
+_tool_token_cache = _TokenCountCache(_TOKEN_COUNT_CACHE_SIZE)
+# Tool.schema rebuilds the JSON schema on each access, so the serialized schema is kept per tool instance.
+_tool_schema_keys: weakref.WeakKeyDictionary[Tool, str] = weakref.WeakKeyDictionary()
+
+
+@functools.lru_cache(maxsize=64)
+def _get_encoding(model: str) -> tiktoken.Encoding:
     try:
-        encoding = tiktoken.encoding_for_model(model)
+        return tiktoken.encoding_for_model(model)
     except KeyError:
         trace_logger.warning(f"Model {model} not found. Using cl100k_base encoding.")
-        encoding = tiktoken.get_encoding("cl100k_base")
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _count_message_tokens(
+    message: LLMMessage,
+    model: str,
+    encoding: tiktoken.Encoding,
+    *,
+    add_name_prefixes: bool,
+    model_family: str,
+) -> int:
     tokens_per_message = 3
     tokens_per_name = 1
-    num_tokens = 0
+    num_tokens = tokens_per_message
+    oai_message = to_oai_type(message, prepend_name=add_name_prefixes, model=model, model_family=model_family)
+    for oai_message_part in oai_message:
+        for key, value in oai_message_part.items():
+            if value is None:
+                continue
 
-    # Message tokens.
-    for message in messages:
-        num_tokens += tokens_per_message
-        oai_message = to_oai_type(message, prepend_name=add_name_prefixes, model=model, model_family=model_family)
-        for oai_message_part in oai_message:
-            for key, value in oai_message_part.items():
-                if value is None:
-                    continue
-
-                if isinstance(message, UserMessage) and isinstance(value, list):
-                    typed_message_value = cast(List[ChatCompletionContentPartParam], value)
-
-                    assert len(typed_message_value) == len(
-                        message.content
-                    ), "Mismatch in message content and typed message value"
-
-                    # We need image properties that are only in the original message
-                    for part, content_part in zip(typed_message_value, message.content, strict=False):
-                        if isinstance(content_part, Image):
-                            # TODO: add detail parameter
-                            num_tokens += calculate_vision_tokens(content_part)
-                        elif isinstance(part, str):
-                            num_tokens += len(encoding.encode(part))
-                        else:
-                            try:
-                                serialized_part = json.dumps(part)
-                                num_tokens += len(encoding.encode(serialized_part))
-                            except TypeError:
-                                trace_logger.warning(f"Could not convert {part} to string, skipping.")
-                else:
-                    if not isinstance(value, str):
+            if isinstance(message, UserMessage) and isinstance(value, list):
+                typed_message_value = cast(List[ChatCompletionContentPartParam], value)
+
+                assert len(typed_message_value) == len(
+                    message.content
+                ), "Mismatch in message content and typed message value"
+
+                # We need image properties that are only in the original message
+                for part, content_part in zip(typed_message_value, message.content, strict=False):
+                    if isinstance(content_part, Image):
+                        # TODO: add detail parameter
+                        num_tokens += calculate_vision_tokens(content_part)
+                    elif isinstance(part, str):
+                        num_tokens += len(encoding.encode(part))
+                    else:
                         try:
-                            value = json.dumps(value)
+                            serialized_part = json.dumps(part)
+                            num_tokens += len(encoding.encode(serialized_part))
                         except TypeError:
-                            trace_logger.warning(f"Could not convert {value} to string, skipping.")
-                            continue
-                    num_tokens += len(encoding.encode(value))
-                    if key == "name":
-                        num_tokens += tokens_per_name
-    num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
+                            trace_logger.warning(f"Could not convert {part} to string, skipping.")
+            else:
+                if not isinstance(value, str):
+                    try:
+                        value = json.dumps(value)
+                    except TypeError:
+                        trace_logger.warning(f"Could not convert {value} to string, skipping.")
+                        continue
+                num_tokens += len(encoding.encode(value))
+                if key == "name":
+                    num_tokens += tokens_per_name
+    return num_tokens
 
-    # Tool tokens.
+
+def _count_tool_tokens(tools: Sequence[Tool | ToolSchema], encoding: tiktoken.Encoding) -> int:
+    num_tokens = 0
     oai_tools = convert_tools(tools)
     for tool in oai_tools:
         function = tool["function"]
@@ -366,6 +415,61 @@ def count_tokens_openai(
                 if len(parameters["properties"]) == 0:  # pyright: ignore
                     tool_tokens -= 2
         num_tokens += tool_tokens
+    return num_tokens
+
+
+def _tool_schema_key(tool: Tool | ToolSchema) -> str:
+    if isinstance(tool, Tool):
+        try:
+            key = _tool_schema_keys.get(tool)
+        except TypeError:
+            # Tools that cannot be weakly referenced are keyed by their current schema.
+            return json.dumps(tool.schema, sort_keys=True, default=str)
+        if key is None:
+            key = json.dumps(tool.schema, sort_keys=True, default=str)
+            _tool_schema_keys[tool] = key
+        return key
+    return json.dumps(tool, sort_keys=True, default=str)
+
+
+def count_tokens_openai(
+    messages: Sequence[LLMMessage],
+    model: str,
+    *,
+    add_name_prefixes: bool = False,
+    tools: Sequence[Tool | ToolSchema] = [],
+    model_family: str = ModelFamily.UNKNOWN,
+) -> int:
+    """Count the tokens of a request to an OpenAI model.
+
+    The tiktoken encoding is loaded once per model. The token count of each message, keyed by a hash
+    of its serialized content, and of each tool list, is memoized in a bounded LRU cache, so counting
+    a growing conversation only tokenizes the messages that were not counted before.
+    """
+    encoding = _get_encoding(model)
+    num_tokens = 0
+
+    # Message tokens.
+    options = (model, model_family, add_name_prefixes)
+    for message in messages:
+        message_key = (options, _message_key(message))
+        message_tokens = _message_token_cache.get(message_key)
+        if message_tokens is None:
+            message_tokens = _count_message_tokens(
+                message, model, encoding, add_name_prefixes=add_name_prefixes, model_family=model_family
+            )
+            _message_token_cache.put(message_key, message_tokens)
+        num_tokens += message_tokens
+    num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
+
+    # Tool tokens.
+    if tools:
+        tools_key = (encoding.name, tuple(_tool_schema_key(tool) for tool in tools))
+        tool_tokens = _tool_token_cache.get(tools_key)
+        if tool_tokens is None:
+            tool_tokens = _count_tool_tokens(tools, encoding)
+            _tool_token_cache.put(tools_key, tool_tokens)
+        num_tokens += tool_tokens
     num_tokens += 12
     return num_tokens
 
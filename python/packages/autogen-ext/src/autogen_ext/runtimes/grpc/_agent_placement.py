@@ -0,0 +1,78 @@
+import bisect
+import hashlib
+from dataclasses import dataclass, field
+from typing import List, Set
+
+
+@dataclass
+class WorkerLoad:
+    """The load of a worker connected to a :class:`GrpcWorkerAgentRuntimeHost`."""
+
+    agent_types: List[str] = field(default_factory=list)
+    """The agent types registered by the worker."""
+
+    requests: int = 0
+    """The number of RPC requests delivered to the worker."""
+
+    events: int = 0
+    """The number of events delivered to the worker."""
+
+    pending_requests: int = 0
+    """The number of RPC requests delivered to the worker that have not been answered yet."""
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class ConsistentHashRing:
+    """Assigns agent keys to the workers that registered an agent type.
+
+    Each worker is placed on the ring at ``replicas`` points, and a key belongs to the worker at the
+    first point after the hash of the key. When a worker joins or leaves, only the keys between its
+    points and the preceding points are reassigned, so most keys keep their worker. The ring only
+    routes keys: it does not move agents or their state.
+    """
+
+    def __init__(self, replicas: int = 64) -> None:
+        self._replicas = replicas
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._members: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, member: str) -> bool:
+        return member in self._members
+
+    @property
+    def members(self) -> List[str]:
+        return sorted(self._members)
+
+    def add(self, member: str) -> None:
+        if member in self._members:
+            return
+        self._members.add(member)
+        for replica in range(self._replicas):
+            point = _hash(f"{member}#{replica}")
+            index = bisect.bisect_left(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, member)
+
+    def remove(self, member: str) -> None:
+        if member not in self._members:
+            return
+        self._members.remove(member)
+        kept = [(point, owner) for point, owner in zip(self._points, self._owners, strict=True) if owner != member]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def get(self, key: str) -> str | None:
+        """Return the member that owns a key, or None if the ring is empty."""
+        if not self._owners:
+            return None
+        if len(self._members) == 1:
+            return self._owners[0]
+        index = bisect.bisect_right(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
@@ -6,6 +6,7 @@
 DATA_SCHEMA_ATTR = "dataschema"
 AGENT_SENDER_TYPE_ATTR = "agagentsendertype"
 AGENT_SENDER_KEY_ATTR = "agagentsenderkey"
+AGENT_RECIPIENTS_ATTR = "agagentrecipients"
 MESSAGE_KIND_ATTR = "agmsgkind"
 MESSAGE_KIND_VALUE_PUBLISH = "publish"
 MESSAGE_KIND_VALUE_RPC_REQUEST = "rpc_request"
@@ -1,3 +1,5 @@
+import zlib
+
 from autogen_core._subscription import Subscription
 from autogen_core._type_prefix_subscription import TypePrefixSubscription
 from autogen_core._type_subscription import TypeSubscription
@@ -43,3 +45,30 @@ def subscription_from_proto(subscription: agent_worker_pb2.Subscription) -> Subs
             )
         case None:
             raise ValueError("Invalid subscription message.")
+
+
+def message_partition_key(message: agent_worker_pb2.Message) -> str:
+    """Return the key that decides which stream of a connection carries a message.
+
+    Messages with the same key are sent on the same stream, so events published to a topic and requests
+    sent to an agent are delivered in order."""
+    oneofcase = message.WhichOneof("message")
+    match oneofcase:
+        case "request":
+            return f"agent:{message.request.target.type}/{message.request.target.key}"
+        case "response":
+            return f"response:{message.response.request_id}"
+        case "cloudEvent":
+            return f"topic:{message.cloudEvent.type}/{message.cloudEvent.source}"
+        case _:
+            return ""
+
+
+def message_partition(message: agent_worker_pb2.Message, num_partitions: int) -> int:
+    """Return the index of the stream, out of ``num_partitions``, that carries a message.
+
+    The key is hashed with CRC-32 rather than :func:`hash`, which is salted per process, so the host and the
+    workers assign a key to the same stream index."""
+    if num_partitions == 1:
+        return 0
+    return zlib.crc32(message_partition_key(message).encode("utf-8")) % num_partitions
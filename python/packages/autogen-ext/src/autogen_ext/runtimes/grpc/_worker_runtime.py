@@ -33,6 +33,7 @@
 
 from autogen_core import (
     JSON_DATA_CONTENT_TYPE,
+    MSGPACK_DATA_CONTENT_TYPE,
     PROTOBUF_DATA_CONTENT_TYPE,
     Agent,
     AgentId,
@@ -56,7 +57,7 @@
 from opentelemetry.trace import TracerProvider
 from typing_extensions import Self
 
-from autogen_ext.runtimes.grpc._utils import subscription_to_proto
+from autogen_ext.runtimes.grpc._utils import message_partition, subscription_to_proto
 
 from . import _constants
 from ._constants import GRPC_IMPORT_ERROR_STR
@@ -93,6 +94,21 @@ def __aiter__(self) -> AsyncIterator[Any]:
 
 
 class HostConnection:
+    """A connection to the host made of one or more ``OpenChannel`` streams.
+
+    Outgoing messages are assigned to a stream by :func:`message_partition_key`, so messages published
+    to the same topic or sent to the same agent keep their order. Messages received on any stream are
+    put into a single receive queue.
+
+    Args:
+        channel (grpc.aio.Channel): The channel to the host.
+        stub (Any): The ``AgentRpc`` stub for the channel.
+        num_streams (int): The number of ``OpenChannel`` streams. Defaults to 1.
+        max_queue_size (int): The maximum number of messages in each send queue and in the receive queue.
+            :meth:`send` waits while the send queue is full, and messages are not read from the host while
+            the receive queue is full. Defaults to 0, which means the queues are unbounded.
+    """
+
     DEFAULT_GRPC_CONFIG: ClassVar[ChannelArgumentType] = [
         (
             "grpc.service_config",
@@ -115,13 +131,25 @@ class HostConnection:
         )
     ]
 
-    def __init__(self, channel: grpc.aio.Channel, stub: Any) -> None:  # type: ignore
+    def __init__(  # type: ignore
+        self,
+        channel: grpc.aio.Channel,
+        stub: Any,
+        num_streams: int = 1,
+        max_queue_size: int = 0,
+    ) -> None:
+        if num_streams < 1:
+            raise ValueError("num_streams must be at least 1.")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size must not be negative.")
         self._channel = channel
-        self._send_queue = asyncio.Queue[agent_worker_pb2.Message]()
-        self._recv_queue = asyncio.Queue[agent_worker_pb2.Message]()
-        self._connection_task: Task[None] | None = None
+        self._send_queues = [asyncio.Queue[agent_worker_pb2.Message](max_queue_size) for _ in range(num_streams)]
+        self._recv_queue = asyncio.Queue[agent_worker_pb2.Message](max_queue_size)
+        self._connection_tasks: List[Task[None]] = []
         self._stub: AgentRpcAsyncStub = stub
         self._client_id = str(uuid.uuid4())
+        # The error that stopped a stream from sending, after which the connection is unusable.
+        self._send_error: BaseException | None = None
 
     @property
     def stub(self) -> Any:
@@ -131,9 +159,17 @@ def stub(self) -> Any:
     def metadata(self) -> Sequence[Tuple[str, str]]:
         return [("client-id", self._client_id)]
 
+    @property
+    def num_streams(self) -> int:
+        return len(self._send_queues)
+
     @classmethod
     async def from_host_address(
-        cls, host_address: str, extra_grpc_config: ChannelArgumentType = DEFAULT_GRPC_CONFIG
+        cls,
+        host_address: str,
+        extra_grpc_config: ChannelArgumentType = DEFAULT_GRPC_CONFIG,
+        num_streams: int = 1,
+        max_queue_size: int = 0,
     ) -> Self:
         logger.info("Connecting to %s", host_address)
         #  Always use DEFAULT_GRPC_CONFIG and override it with provided grpc_config
@@ -146,19 +182,24 @@ async def from_host_address(
             options=merged_options,
         )
         stub: AgentRpcAsyncStub = agent_worker_pb2_grpc.AgentRpcStub(channel)  # type: ignore
-        instance = cls(channel, stub)
+        instance = cls(channel, stub, num_streams=num_streams, max_queue_size=max_queue_size)
 
-        instance._connection_task = await instance._connect(
-            stub, instance._send_queue, instance._recv_queue, instance._client_id
-        )
+        for send_queue in instance._send_queues:
+            instance._connection_tasks.extend(
+                await instance._connect(
+                    stub, send_queue, instance._recv_queue, instance._client_id, instance._on_send_error
+                )
+            )
 
         return instance
 
     async def close(self) -> None:
-        if self._connection_task is None:
+        if not self._connection_tasks:
             raise RuntimeError("Connection is not open.")
         await self._channel.close()
-        await self._connection_task
+        for task in self._connection_tasks:
+            task.cancel()
+        await asyncio.gather(*self._connection_tasks, return_exceptions=True)
 
     @staticmethod
     async def _connect(
@@ -166,36 +207,69 @@ async def _connect(
         send_queue: asyncio.Queue[agent_worker_pb2.Message],
         receive_queue: asyncio.Queue[agent_worker_pb2.Message],
         client_id: str,
-    ) -> Task[None]:
+        on_send_error: Callable[[BaseException], None],
+    ) -> List[Task[None]]:
         from grpc.aio import StreamStreamCall
 
         # TODO: where do exceptions from reading the iterable go? How do we recover from those?
         stream: StreamStreamCall[agent_worker_pb2.Message, agent_worker_pb2.Message] = stub.OpenChannel(  # type: ignore
-            QueueAsyncIterable(send_queue), metadata=[("client-id", client_id)]
+            metadata=[("client-id", client_id)]
         )
 
         await stream.wait_for_connection()
 
         async def read_loop() -> None:
             while True:
-                logger.info("Waiting for message from host")
                 message = cast(agent_worker_pb2.Message, await stream.read())  # type: ignore
                 if message == grpc.aio.EOF:  # type: ignore
                     logger.info("EOF")
                     break
-                logger.info(f"Received a message from host: {message}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Received a message from host: %s", message)
+                # Waits while the receive queue is full, which stops reading from the stream and lets
+                # gRPC flow control slow down the host.
                 await receive_queue.put(message)
-                logger.info("Put message in receive queue")
 
-        return asyncio.create_task(read_loop())
+        async def write_loop() -> None:
+            while True:
+                # Waits for the stream to accept each message, so a full send queue makes send() wait.
+                message = await send_queue.get()
+                try:
+                    await stream.write(message)  # type: ignore
+                except Exception as e:
+                    logger.error("Failed to send a message to the host, closing the connection.", exc_info=e)
+                    stream.cancel()
+                    on_send_error(e)
+                    return
+
+        return [asyncio.create_task(read_loop()), asyncio.create_task(write_loop())]
+
+    def _on_send_error(self, error: BaseException) -> None:
+        if self._send_error is None:
+            self._send_error = error
+        # Drop the messages that can no longer be sent, which also wakes up the senders waiting on a full queue.
+        for send_queue in self._send_queues:
+            while not send_queue.empty():
+                send_queue.get_nowait()
+
+    def _raise_on_send_error(self) -> None:
+        if self._send_error is not None:
+            raise RuntimeError("The connection to the host failed.") from self._send_error
 
     async def send(self, message: agent_worker_pb2.Message) -> None:
-        logger.info(f"Send message to host: {message}")
-        await self._send_queue.put(message)
-        logger.info("Put message in send queue")
+        """Queue a message to send to the host.
+
+        Raises:
+            RuntimeError: If a stream of the connection failed to send a message.
+        """
+        self._raise_on_send_error()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Send message to host: %s", message)
+        await self._send_queues[message_partition(message, len(self._send_queues))].put(message)
+        # The connection may have failed while the queue was full.
+        self._raise_on_send_error()
 
     async def recv(self) -> agent_worker_pb2.Message:
-        logger.info("Getting message from queue")
         return await self._recv_queue.get()
 
 
@@ -223,6 +297,29 @@ class GrpcWorkerAgentRuntime(AgentRuntime):
 
     .. _cloudevent.proto: https://github.com/microsoft/autogen/blob/main/protos/cloudevent.proto
 
+    Args:
+        host_address (str): The address of the host.
+        tracer_provider (TracerProvider | None): The tracer provider for telemetry. Defaults to None.
+        extra_grpc_config (ChannelArgumentType | None): Extra gRPC channel options. Defaults to None.
+        payload_serialization_format (str): The preferred format of message payloads: JSON, Protobuf, or
+            MessagePack (:data:`~autogen_core.MSGPACK_DATA_CONTENT_TYPE`). MessagePack requires the ``msgpack``
+            extra of ``autogen-core`` and serializers added with
+            ``try_get_known_serializers_for_type(cls, include_msgpack=True)``.
+            Messages whose type has no serializer for this format are sent as JSON, and responses to
+            RPC requests use the format of the request when possible. Defaults to JSON.
+        num_streams (int): The number of parallel ``OpenChannel`` streams to the host. Messages published to
+            the same topic or sent to the same agent always use the same stream and keep their order, while
+            messages on different streams may be delivered in a different order than they were sent.
+            Defaults to 1.
+        max_queue_size (int): The maximum number of messages waiting to be sent on each stream and waiting
+            to be processed after being received. Sending waits while the queue is full. Defaults to 0,
+            which means the queues are unbounded.
+
+    .. note::
+
+        Messages are logged at the ``DEBUG`` level of the ``autogen_core`` logger. They are only formatted
+        when that level is enabled.
+
     """
 
     # TODO: Needs to handle agent close() call
@@ -232,6 +329,8 @@ def __init__(
         tracer_provider: TracerProvider | None = None,
         extra_grpc_config: ChannelArgumentType | None = None,
         payload_serialization_format: str = JSON_DATA_CONTENT_TYPE,
+        num_streams: int = 1,
+        max_queue_size: int = 0,
     ) -> None:
         self._host_address = host_address
         self._trace_helper = TraceHelper(tracer_provider, MessageRuntimeTracingConfig("Worker Runtime"))
@@ -253,8 +352,18 @@ def __init__(
         self._extra_grpc_config = extra_grpc_config or []
         self._agent_instance_types: Dict[str, Type[Agent]] = {}
 
-        if payload_serialization_format not in {JSON_DATA_CONTENT_TYPE, PROTOBUF_DATA_CONTENT_TYPE}:
+        if payload_serialization_format not in {
+            JSON_DATA_CONTENT_TYPE,
+            PROTOBUF_DATA_CONTENT_TYPE,
+            MSGPACK_DATA_CONTENT_TYPE,
+        }:
             raise ValueError(f"Unsupported payload serialization format: {payload_serialization_format}")
+        if num_streams < 1:
+            raise ValueError("num_streams must be at least 1.")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size must not be negative.")
+        self._num_streams = num_streams
+        self._max_queue_size = max_queue_size
 
         self._payload_serialization_format = payload_serialization_format
 
@@ -264,7 +373,10 @@ async def start(self) -> None:
             raise ValueError("Runtime is already running.")
         logger.info(f"Connecting to host: {self._host_address}")
         self._host_connection = await HostConnection.from_host_address(
-            self._host_address, extra_grpc_config=self._extra_grpc_config
+            self._host_address,
+            extra_grpc_config=self._extra_grpc_config,
+            num_streams=self._num_streams,
+            max_queue_size=self._max_queue_size,
         )
         logger.info("Connection established")
         if self._read_task is None:
@@ -385,8 +497,9 @@ async def send_message(
             future = asyncio.get_event_loop().create_future()
             request_id = await self._get_new_request_id()
             self._pending_requests[request_id] = future
+            data_content_type = self._get_payload_content_type(data_type, self._payload_serialization_format)
             serialized_message = self._serialization_registry.serialize(
-                message, type_name=data_type, data_content_type=JSON_DATA_CONTENT_TYPE
+                message, type_name=data_type, data_content_type=data_content_type
             )
             telemetry_metadata = get_telemetry_grpc_metadata()
             runtime_message = agent_worker_pb2.Message(
@@ -398,7 +511,7 @@ async def send_message(
                     payload=agent_worker_pb2.Payload(
                         data_type=data_type,
                         data=serialized_message,
-                        data_content_type=JSON_DATA_CONTENT_TYPE,
+                        data_content_type=data_content_type,
                     ),
                 )
             )
@@ -430,14 +543,15 @@ async def publish_message(
         with self._trace_helper.trace_block(
             "create", topic_id, parent=None, extraAttributes={"message_type": message_type}
         ):
+            data_content_type = self._get_payload_content_type(message_type, self._payload_serialization_format)
             serialized_message = self._serialization_registry.serialize(
-                message, type_name=message_type, data_content_type=self._payload_serialization_format
+                message, type_name=message_type, data_content_type=data_content_type
             )
 
             sender_id = sender or AgentId("unknown", "unknown")
             attributes = {
                 _constants.DATA_CONTENT_TYPE_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(
-                    ce_string=self._payload_serialization_format
+                    ce_string=data_content_type
                 ),
                 _constants.DATA_SCHEMA_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(ce_string=message_type),
                 _constants.AGENT_SENDER_TYPE_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(
@@ -451,11 +565,11 @@ async def publish_message(
                 ),
             }
 
-            # If sending JSON we fill text_data with the serialized message
+            # If sending JSON or MessagePack we fill binary_data with the serialized message
             # If sending Protobuf we fill proto_data with the serialized message
             # TODO: add an encoding field for serializer
 
-            if self._payload_serialization_format == JSON_DATA_CONTENT_TYPE:
+            if data_content_type != PROTOBUF_DATA_CONTENT_TYPE:
                 runtime_message = agent_worker_pb2.Message(
                     cloudEvent=cloudevent_pb2.CloudEvent(
                         id=message_id,
@@ -489,6 +603,16 @@ async def publish_message(
             task.add_done_callback(self._raise_on_exception)
             task.add_done_callback(self._background_tasks.discard)
 
+    def _get_payload_content_type(self, type_name: str, preferred: str) -> str:
+        # Use JSON for message types without a serializer for the preferred format.
+        if (
+            preferred != JSON_DATA_CONTENT_TYPE
+            and not self._serialization_registry.is_registered(type_name, preferred)
+            and self._serialization_registry.is_registered(type_name, JSON_DATA_CONTENT_TYPE)
+        ):
+            return JSON_DATA_CONTENT_TYPE
+        return preferred
+
     async def save_state(self) -> Mapping[str, Any]:
         raise NotImplementedError("Saving state is not yet implemented.")
 
@@ -561,8 +685,9 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
 
         # Serialize the result.
         result_type = self._serialization_registry.type_name(result)
+        result_content_type = self._get_payload_content_type(result_type, request.payload.data_content_type)
         serialized_result = self._serialization_registry.serialize(
-            result, type_name=result_type, data_content_type=JSON_DATA_CONTENT_TYPE
+            result, type_name=result_type, data_content_type=result_content_type
         )
 
         # Create the response message.
@@ -572,7 +697,7 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
                 payload=agent_worker_pb2.Payload(
                     data_type=result_type,
                     data=serialized_result,
-                    data_content_type=JSON_DATA_CONTENT_TYPE,
+                    data_content_type=result_content_type,
                 ),
                 metadata=get_telemetry_grpc_metadata(),
             )
@@ -620,7 +745,7 @@ async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
         message_content_type = event_attributes[_constants.DATA_CONTENT_TYPE_ATTR].ce_string
         message_type = event_attributes[_constants.DATA_SCHEMA_ATTR].ce_string
 
-        if message_content_type == JSON_DATA_CONTENT_TYPE:
+        if message_content_type in (JSON_DATA_CONTENT_TYPE, MSGPACK_DATA_CONTENT_TYPE):
             message = self._serialization_registry.deserialize(
                 event.binary_data, type_name=message_type, data_content_type=message_content_type
             )
@@ -643,11 +768,21 @@ async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
         if is_rpc and not is_marked_rpc_type:
             warnings.warn("Received RPC request with topic type suffix but not marked as RPC request.", stacklevel=2)
 
+        # With agent types shared between workers, the host tells each worker which of its agents an event is for.
+        recipient_ids: Set[AgentId] | None = None
+        if _constants.AGENT_RECIPIENTS_ATTR in event_attributes:
+            recipient_ids = {
+                AgentId.from_str(agent_id)
+                for agent_id in json.loads(event_attributes[_constants.AGENT_RECIPIENTS_ATTR].ce_string)
+            }
+
         # Send the message to each recipient.
         responses: List[Awaitable[Any]] = []
         for agent_id in recipients:
             if agent_id == sender:
                 continue
+            if recipient_ids is not None and agent_id not in recipient_ids:
+                continue
             message_context = MessageContext(
                 sender=sender,
                 topic_id=topic_id,
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from abc import ABC, abstractmethod
 from asyncio import Future, Task
-from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generic, Sequence, Set, Tuple, TypeVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generic, List, Sequence, Set, Tuple, TypeVar
 
 from autogen_core import TopicId
 from autogen_core._agent_id import AgentId
 from autogen_core._runtime_impl_helpers import SubscriptionManager
 
+from . import _constants
+from ._agent_placement import ConsistentHashRing, WorkerLoad
 from ._constants import GRPC_IMPORT_ERROR_STR
-from ._utils import subscription_from_proto, subscription_to_proto
+from ._utils import message_partition, subscription_from_proto, subscription_to_proto
 
 try:
     import grpc
@@ -55,7 +58,8 @@ def __init__(self, request_iterator: AsyncIterator[ReceiveT], client_id: str) ->
     async def _receive_messages(self, client_id: ClientConnectionId, request_iterator: AsyncIterator[ReceiveT]) -> None:
         # Receive messages from the client and process them.
         async for message in request_iterator:
-            logger.info(f"Received message from client {client_id}: {message}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Received message from client %s: %s", client_id, message)
             await self._handle_message(message)
 
     def __aiter__(self) -> AsyncIterator[SendT]:
@@ -95,21 +99,65 @@ async def _handle_message(self, message: ReceiveT) -> None:
 
 
 class GrpcWorkerAgentRuntimeHostServicer(agent_worker_pb2_grpc.AgentRpcServicer):
-    """A gRPC servicer that hosts message delivery service for agents."""
-
-    def __init__(self) -> None:
+    """A gRPC servicer that hosts message delivery service for agents.
+
+    Args:
+        shared_agent_types (bool): Whether several workers can register the same agent type.
+            Messages for an agent type registered by several workers are routed by consistent hashing
+            on the agent key, so each agent key is served by one worker at a time. Defaults to False, in
+            which case registering an agent type that another worker registered is an error.
+
+    .. warning::
+
+        Agent state is not transferred when the worker of an agent key changes. When a worker joins or
+        leaves, only the agent keys assigned to it are reassigned, but messages for a reassigned key
+        go to a new agent instance created on its new worker, with no state. When a worker joins, the
+        instances it takes keys from stay alive on their previous worker and receive no more messages.
+        Agents whose state must survive membership changes should persist it themselves, for example
+        with :meth:`~autogen_core.AgentRuntime.agent_save_state` before a worker leaves.
+    """
+
+    def __init__(self, shared_agent_types: bool = False) -> None:
+        self._shared_agent_types = shared_agent_types
+        # A client can open several data streams, see GrpcWorkerAgentRuntime's num_streams.
         self._data_connections: Dict[
-            ClientConnectionId, ChannelConnection[agent_worker_pb2.Message, agent_worker_pb2.Message]
+            ClientConnectionId, List[ChannelConnection[agent_worker_pb2.Message, agent_worker_pb2.Message]]
         ] = {}
         self._control_connections: Dict[
             ClientConnectionId, ChannelConnection[agent_worker_pb2.ControlMessage, agent_worker_pb2.ControlMessage]
         ] = {}
         self._agent_type_to_client_id_lock = asyncio.Lock()
-        self._agent_type_to_client_id: Dict[str, ClientConnectionId] = {}
+        self._agent_type_to_client_id: Dict[str, ConsistentHashRing] = {}
         self._pending_responses: Dict[ClientConnectionId, Dict[str, Future[Any]]] = {}
         self._background_tasks: Set[Task[Any]] = set()
         self._subscription_manager = SubscriptionManager()
         self._client_id_to_subscription_id_mapping: Dict[ClientConnectionId, set[str]] = {}
+        # With shared agent types, workers of the same agent type add equal subscriptions. The subscription
+        # manager keeps the first one, and it is removed when no client holds it anymore.
+        self._subscription_clients: Dict[str, Set[ClientConnectionId]] = {}
+        self._subscription_aliases: Dict[str, str] = {}
+        self._worker_loads: Dict[ClientConnectionId, WorkerLoad] = {}
+
+    def get_worker_loads(self) -> Dict[ClientConnectionId, WorkerLoad]:
+        """Return the load of each connected worker, keyed by client id."""
+        loads: Dict[ClientConnectionId, WorkerLoad] = {}
+        for client_id in self._data_connections:
+            load = self._worker_loads.get(client_id, WorkerLoad())
+            loads[client_id] = WorkerLoad(
+                agent_types=sorted(
+                    agent_type for agent_type, ring in self._agent_type_to_client_id.items() if client_id in ring
+                ),
+                requests=load.requests,
+                events=load.events,
+                pending_requests=len(self._pending_responses.get(client_id, {})),
+            )
+        return loads
+
+    def _get_client_id(self, agent_type: str, agent_key: str) -> ClientConnectionId | None:
+        ring = self._agent_type_to_client_id.get(agent_type)
+        if ring is None:
+            return None
+        return ring.get(agent_key)
 
     async def OpenChannel(  # type: ignore
         self,
@@ -124,20 +172,23 @@ async def handle_callback(message: agent_worker_pb2.Message) -> None:
         connection = CallbackChannelConnection[agent_worker_pb2.Message, agent_worker_pb2.Message](
             request_iterator, client_id, handle_callback=handle_callback
         )
-        self._data_connections[client_id] = connection
+        self._data_connections.setdefault(client_id, []).append(connection)
         logger.info(f"Client {client_id} connected.")
 
         try:
             async for message in connection:
                 yield message
         finally:
-            # Clean up the client connection.
-            del self._data_connections[client_id]
-            # Cancel pending requests sent to this client.
-            for future in self._pending_responses.pop(client_id, {}).values():
-                future.cancel()
-            # Remove the client id from the agent type to client id mapping.
-            await self._on_client_disconnect(client_id)
+            # Clean up the client connection once its last data stream is closed.
+            connections = self._data_connections[client_id]
+            connections.remove(connection)
+            if not connections:
+                del self._data_connections[client_id]
+                # Cancel pending requests sent to this client.
+                for future in self._pending_responses.pop(client_id, {}).values():
+                    future.cancel()
+                # Remove the client id from the agent type to client id mapping.
+                await self._on_client_disconnect(client_id)
 
     async def OpenControlChannel(  # type: ignore
         self,
@@ -164,17 +215,23 @@ async def handle_callback(message: agent_worker_pb2.ControlMessage) -> None:
 
     async def _on_client_disconnect(self, client_id: ClientConnectionId) -> None:
         async with self._agent_type_to_client_id_lock:
-            agent_types = [agent_type for agent_type, id_ in self._agent_type_to_client_id.items() if id_ == client_id]
+            agent_types = [
+                agent_type for agent_type, ring in self._agent_type_to_client_id.items() if client_id in ring
+            ]
             for agent_type in agent_types:
-                logger.info(f"Removing agent type {agent_type} from agent type to client id mapping")
-                del self._agent_type_to_client_id[agent_type]
-            for sub_id in self._client_id_to_subscription_id_mapping.get(client_id, set()):
-                logger.info(f"Client id {client_id} disconnected. Removing corresponding subscription with id {id}")
+                logger.info(f"Removing client {client_id} from the clients of agent type {agent_type}")
+                ring = self._agent_type_to_client_id[agent_type]
+                ring.remove(client_id)
+                if not ring:
+                    del self._agent_type_to_client_id[agent_type]
+            for sub_id in self._client_id_to_subscription_id_mapping.pop(client_id, set()):
+                logger.info(f"Client id {client_id} disconnected. Removing corresponding subscription with id {sub_id}")
                 try:
-                    await self._subscription_manager.remove_subscription(sub_id)
+                    await self._release_subscription(sub_id, client_id)
                 # Catch and ignore if the subscription does not exist.
                 except ValueError:
                     continue
+            self._worker_loads.pop(client_id, None)
         logger.info(f"Client {client_id} disconnected successfully")
 
     def _raise_on_exception(self, task: Task[Any]) -> None:
@@ -183,7 +240,8 @@ def _raise_on_exception(self, task: Task[Any]) -> None:
             raise exception
 
     async def _receive_message(self, client_id: ClientConnectionId, message: agent_worker_pb2.Message) -> None:
-        logger.info(f"Received message from client {client_id}: {message}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received message from client %s: %s", client_id, message)
         oneofcase = message.WhichOneof("message")
         match oneofcase:
             case "request":
@@ -209,11 +267,12 @@ async def _receive_message(self, client_id: ClientConnectionId, message: agent_w
     async def _receive_control_message(
         self, client_id: ClientConnectionId, message: agent_worker_pb2.ControlMessage
     ) -> None:
-        logger.info(f"Received message from client {client_id}: {message}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received message from client %s: %s", client_id, message)
         destination = message.destination
         if destination.startswith("agentid="):
             agent_id = AgentId.from_str(destination[len("agentid=") :])
-            target_client_id = self._agent_type_to_client_id.get(agent_id.type)
+            target_client_id = self._get_client_id(agent_id.type, agent_id.key)
             if target_client_id is None:
                 logger.error(f"Agent client id not found for agent type {agent_id.type}.")
                 return
@@ -232,15 +291,17 @@ async def _receive_control_message(
     async def _process_request(self, request: agent_worker_pb2.RpcRequest, client_id: ClientConnectionId) -> None:
         # Deliver the message to a client given the target agent type.
         async with self._agent_type_to_client_id_lock:
-            target_client_id = self._agent_type_to_client_id.get(request.target.type)
+            target_client_id = self._get_client_id(request.target.type, request.target.key)
         if target_client_id is None:
             logger.error(f"Agent {request.target.type} not found, failed to deliver message.")
             return
-        target_send_queue = self._data_connections.get(target_client_id)
+        message = agent_worker_pb2.Message(request=request)
+        target_send_queue = self._get_data_connection(target_client_id, message)
         if target_send_queue is None:
             logger.error(f"Client {target_client_id} not found, failed to deliver message.")
             return
-        await target_send_queue.send(agent_worker_pb2.Message(request=request))
+        await target_send_queue.send(message)
+        self._worker_loads.setdefault(target_client_id, WorkerLoad()).requests += 1
 
         # Create a future to wait for the response from the target.
         future = asyncio.get_event_loop().create_future()
@@ -257,7 +318,7 @@ async def _wait_and_send_response(
     ) -> None:
         response = await future
         message = agent_worker_pb2.Message(response=response)
-        send_queue = self._data_connections.get(client_id)
+        send_queue = self._get_data_connection(client_id, message)
         if send_queue is None:
             logger.error(f"Client {client_id} not found, failed to send response message.")
             return
@@ -271,18 +332,40 @@ async def _process_response(self, response: agent_worker_pb2.RpcResponse, client
     async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
         topic_id = TopicId(type=event.type, source=event.source)
         recipients = await self._subscription_manager.get_subscribed_recipients(topic_id)
-        # Get the client ids of the recipients.
+        # Get the client ids of the recipients, and the recipients each client hosts.
         async with self._agent_type_to_client_id_lock:
-            client_ids: Set[ClientConnectionId] = set()
+            client_recipients: Dict[ClientConnectionId, List[AgentId]] = {}
             for recipient in recipients:
-                client_id = self._agent_type_to_client_id.get(recipient.type)
+                client_id = self._get_client_id(recipient.type, recipient.key)
                 if client_id is not None:
-                    client_ids.add(client_id)
+                    client_recipients.setdefault(client_id, []).append(recipient)
                 else:
                     logger.error(f"Agent {recipient.type} and its client not found for topic {topic_id}.")
         # Deliver the event to clients.
-        for client_id in client_ids:
-            await self._data_connections[client_id].send(agent_worker_pb2.Message(cloudEvent=event))
+        message = agent_worker_pb2.Message(cloudEvent=event)
+        for client_id, client_agent_ids in client_recipients.items():
+            if self._shared_agent_types:
+                # Other workers subscribe the same agent types to the topic and host other keys of them, so
+                # tell the client which of its agents the event is for.
+                message = agent_worker_pb2.Message(cloudEvent=event)
+                message.cloudEvent.attributes[_constants.AGENT_RECIPIENTS_ATTR].ce_string = json.dumps(
+                    [str(agent_id) for agent_id in client_agent_ids]
+                )
+            send_queue = self._get_data_connection(client_id, message)
+            if send_queue is None:
+                logger.error(f"Client {client_id} not found, failed to deliver event.")
+                continue
+            await send_queue.send(message)
+            self._worker_loads.setdefault(client_id, WorkerLoad()).events += 1
+
+    def _get_data_connection(
+        self, client_id: ClientConnectionId, message: agent_worker_pb2.Message
+    ) -> ChannelConnection[agent_worker_pb2.Message, agent_worker_pb2.Message] | None:
+        # Pick the stream the same way the worker does, so related messages keep their order.
+        connections = self._data_connections.get(client_id)
+        if not connections:
+            return None
+        return connections[message_partition(message, len(connections))]
 
     async def RegisterAgent(  # type: ignore
         self,
@@ -294,14 +377,20 @@ async def RegisterAgent(  # type: ignore
         client_id = await get_client_id_or_abort(context)
 
         async with self._agent_type_to_client_id_lock:
-            if request.type in self._agent_type_to_client_id:
-                existing_client_id = self._agent_type_to_client_id[request.type]
+            ring = self._agent_type_to_client_id.get(request.type)
+            if ring is not None and (not self._shared_agent_types or client_id in ring):
+                existing_client_ids = ", ".join(ring.members)
                 await context.abort(
                     grpc.StatusCode.INVALID_ARGUMENT,
-                    f"Agent type {request.type} already registered with client {existing_client_id}.",
+                    f"Agent type {request.type} already registered with client {existing_client_ids}.",
                 )
             else:
-                self._agent_type_to_client_id[request.type] = client_id
+                if ring is not None:
+                    logger.warning(
+                        f"Client {client_id} joined the clients of agent type {request.type}. Some agent keys "
+                        "are reassigned to it, and their agents are created anew without their state."
+                    )
+                self._agent_type_to_client_id.setdefault(request.type, ConsistentHashRing()).add(client_id)
 
         return agent_worker_pb2.RegisterAgentTypeResponse()
 
@@ -315,10 +404,20 @@ async def AddSubscription(  # type: ignore
         client_id = await get_client_id_or_abort(context)
 
         subscription = subscription_from_proto(request.subscription)
+        if self._shared_agent_types:
+            existing = self._subscription_manager.find_equal(subscription)
+            if existing is not None and client_id not in self._subscription_clients.get(existing.id, set()):
+                # Another worker of the same agent type added this subscription, share it.
+                self._subscription_clients.setdefault(existing.id, set()).add(client_id)
+                self._subscription_aliases[subscription.id] = existing.id
+                self._client_id_to_subscription_id_mapping.setdefault(client_id, set()).add(subscription.id)
+                return agent_worker_pb2.AddSubscriptionResponse()
         try:
             await self._subscription_manager.add_subscription(subscription)
             subscription_ids = self._client_id_to_subscription_id_mapping.setdefault(client_id, set())
             subscription_ids.add(subscription.id)
+            if self._shared_agent_types:
+                self._subscription_clients[subscription.id] = {client_id}
         except ValueError as e:
             await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
         return agent_worker_pb2.AddSubscriptionResponse()
@@ -330,10 +429,25 @@ async def RemoveSubscription(  # type: ignore
             agent_worker_pb2.RemoveSubscriptionRequest, agent_worker_pb2.RemoveSubscriptionResponse
         ],
     ) -> agent_worker_pb2.RemoveSubscriptionResponse:
-        _client_id = await get_client_id_or_abort(context)
-        await self._subscription_manager.remove_subscription(request.id)
+        client_id = await get_client_id_or_abort(context)
+        if self._shared_agent_types:
+            self._client_id_to_subscription_id_mapping.get(client_id, set()).discard(request.id)
+            await self._release_subscription(request.id, client_id)
+        else:
+            await self._subscription_manager.remove_subscription(request.id)
         return agent_worker_pb2.RemoveSubscriptionResponse()
 
+    async def _release_subscription(self, subscription_id: str, client_id: ClientConnectionId) -> None:
+        # Remove the subscription once no client that added it (or an equal one) holds it anymore.
+        subscription_id = self._subscription_aliases.pop(subscription_id, subscription_id)
+        clients = self._subscription_clients.get(subscription_id)
+        if clients is not None:
+            clients.discard(client_id)
+            if clients:
+                return
+            del self._subscription_clients[subscription_id]
+        await self._subscription_manager.remove_subscription(subscription_id)
+
     async def GetSubscriptions(  # type: ignore
         self,
         request: agent_worker_pb2.GetSubscriptionsRequest,
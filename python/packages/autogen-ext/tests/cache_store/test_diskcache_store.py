@@ -53,3 +53,21 @@ def test_diskcache_with_different_instances() -> None:
         loaded_store_1: DiskCacheStore[int] = DiskCacheStore.load_component(store_1_config)
         assert loaded_store_1.get(test_key) == test_value_1
         loaded_store_1.cache.close()
+
+
+@pytest.mark.asyncio
+async def test_diskcache_store_async() -> None:
+    from autogen_core import AsyncCacheStore
+    from autogen_ext.cache_store.diskcache import DiskCacheStore
+    from diskcache import Cache
+
+    with tempfile.TemporaryDirectory() as temp_dir, Cache(temp_dir) as cache:
+        store = DiskCacheStore[int](cache)
+        assert isinstance(store, AsyncCacheStore)
+        await store.aset("a", 1)
+        assert await store.aget("a") == 1
+        assert store.get("a") == 1
+        assert await store.aget("missing", 99) == 99
+
+        await store.mset({"b": 2, "c": 3})
+        assert await store.mget(["c", "missing", "b"]) == [3, None, 2]
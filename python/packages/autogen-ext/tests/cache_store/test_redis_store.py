@@ -1,6 +1,10 @@
+import json
+from typing import Any, Dict, List, Mapping, Optional, Union
 from unittest.mock import MagicMock
 
 import pytest
+from autogen_core import FunctionCall
+from autogen_core.models import CreateResult, RequestUsage, UserMessage
 
 redis = pytest.importorskip("redis")
 
@@ -13,14 +17,14 @@ def test_redis_store_basic() -> None:
     test_key = "test_key"
     test_value = 42
     store.set(test_key, test_value)
-    redis_instance.set.assert_called_with(test_key, test_value)
-    redis_instance.get.return_value = test_value
+    redis_instance.set.assert_called_with(test_key, b"42")
+    redis_instance.get.return_value = b"42"
     assert store.get(test_key) == test_value
 
     new_value = 2
     store.set(test_key, new_value)
-    redis_instance.set.assert_called_with(test_key, new_value)
-    redis_instance.get.return_value = new_value
+    redis_instance.set.assert_called_with(test_key, b"2")
+    redis_instance.get.return_value = b"2"
     assert store.get(test_key) == new_value
 
     key = "non_existent_key"
@@ -43,16 +47,151 @@ def test_redis_with_different_instances() -> None:
     test_value_2 = 6
 
     store_1.set(test_key, test_value_1)
-    redis_instance_1.set.assert_called_with(test_key, test_value_1)
-    redis_instance_1.get.return_value = test_value_1
+    redis_instance_1.set.assert_called_with(test_key, b"5")
+    redis_instance_1.get.return_value = b"5"
     assert store_1.get(test_key) == test_value_1
 
     store_2.set(test_key, test_value_2)
-    redis_instance_2.set.assert_called_with(test_key, test_value_2)
-    redis_instance_2.get.return_value = test_value_2
+    redis_instance_2.set.assert_called_with(test_key, b"6")
+    redis_instance_2.get.return_value = b"6"
     assert store_2.get(test_key) == test_value_2
 
     # test serialization
     store_1_config = store_1.dump_component()
     assert store_1_config.component_type == "cache_store"
     assert store_1_config.component_version == 1
+
+
+class _FakeAsyncRedis:
+    """An in-memory stand-in for `redis.asyncio.Redis` that encodes values like the real client does."""
+
+    def __init__(self) -> None:
+        from redis._parsers import Encoder
+
+        self.encoder = Encoder(encoding="utf-8", encoding_errors="strict", decode_responses=False)  # type: ignore[no-untyped-call]
+        self.data: Dict[str, bytes] = {}
+        self.round_trips = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self.round_trips += 1
+        return self.data.get(key)
+
+    async def set(self, key: str, value: Any) -> None:
+        self.round_trips += 1
+        self.data[key] = self.encoder.encode(value)  # type: ignore[no-untyped-call]
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        self.round_trips += 1
+        return [self.data.get(key) for key in keys]
+
+    async def mset(self, mapping: Mapping[str, Any]) -> None:
+        self.round_trips += 1
+        for key, value in mapping.items():
+            self.data[key] = self.encoder.encode(value)  # type: ignore[no-untyped-call]
+
+
+@pytest.mark.asyncio
+async def test_async_redis_store() -> None:
+    from autogen_ext.cache_store.redis import AsyncRedisStore
+
+    redis_instance = _FakeAsyncRedis()
+    store = AsyncRedisStore[int](redis_instance)  # type: ignore[arg-type]
+    await store.aset("test_key", 42)
+    assert await store.aget("test_key") == 42
+    assert await store.aget("missing", 99) == 99
+
+    # Batches are sent in a single round-trip.
+    redis_instance.round_trips = 0
+    await store.mset({"a": 1, "b": 2})
+    assert await store.mget(["a", "missing"]) == [1, None]
+    assert redis_instance.round_trips == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_stores_share_json_format() -> None:
+    from autogen_ext.cache_store.redis import AsyncRedisStore, RedisStore
+
+    redis_instance = _FakeAsyncRedis()
+    store = AsyncRedisStore[Any](redis_instance)  # type: ignore[arg-type]
+    result = CreateResult(
+        finish_reason="function_calls",
+        content=[FunctionCall(id="1", name="add", arguments='{"a": 1}')],
+        usage=RequestUsage(prompt_tokens=10, completion_tokens=5),
+        cached=False,
+    )
+    stream: List[Union[str, CreateResult]] = ["Hello", " world", result]
+
+    await store.aset("create", result)
+    await store.mset({"stream": stream})
+    assert isinstance(redis_instance.data["create"], bytes)
+    # Models are read back as plain JSON data.
+    assert await store.aget("create") == result.model_dump(mode="json")
+    assert await store.mget(["stream", "missing"]) == [["Hello", " world", result.model_dump(mode="json")], None]
+
+    # The sync store reads and writes the same bytes.
+    sync_redis = MagicMock()
+    sync_store = RedisStore[Any](sync_redis)
+    sync_store.set("create", result)
+    assert sync_redis.set.call_args.args[1] == redis_instance.data["create"]
+    sync_redis.get.return_value = redis_instance.data["stream"]
+    assert sync_store.get("stream") == await store.aget("stream")
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_cache_with_async_redis_store() -> None:
+    from autogen_ext.cache_store.redis import AsyncRedisStore
+    from autogen_ext.models.cache import CHAT_CACHE_VALUE_TYPE, ChatCompletionCache
+    from autogen_ext.models.replay import ReplayChatCompletionClient
+
+    replay_client = ReplayChatCompletionClient(["Hello world", "Streamed reply"])
+    replay_client.set_cached_bool_value(False)
+    store = AsyncRedisStore[CHAT_CACHE_VALUE_TYPE](_FakeAsyncRedis())  # type: ignore[arg-type]
+    cached_client = ChatCompletionCache(replay_client, store)
+    messages = [UserMessage(content="Hi", source="user")]
+    stream_messages = [UserMessage(content="Stream", source="user")]
+
+    response = await cached_client.create(messages)
+    original = [chunk async for chunk in cached_client.create_stream(stream_messages)]
+
+    cached_response = await cached_client.create(messages)
+    assert isinstance(cached_response, CreateResult)
+    assert cached_response.cached
+    assert cached_response.content == response.content
+    replayed = [chunk async for chunk in cached_client.create_stream(stream_messages)]
+    assert [chunk for chunk in replayed if isinstance(chunk, str)] == [
+        chunk for chunk in original if isinstance(chunk, str)
+    ]
+    assert isinstance(replayed[-1], CreateResult)
+    assert replayed[-1].cached
+
+
+@pytest.mark.asyncio
+async def test_async_redis_store_does_not_import_from_cached_data() -> None:
+    import sys
+
+    from autogen_ext.cache_store.redis import AsyncRedisStore
+
+    redis_instance = _FakeAsyncRedis()
+    store = AsyncRedisStore[Any](redis_instance)  # type: ignore[arg-type]
+    payload = {"__pydantic_model__": "antigravity:Anything", "data": {}}
+    redis_instance.data["key"] = json.dumps(payload).encode()
+    assert await store.aget("key") == payload
+    assert "antigravity" not in sys.modules
+
+
+@pytest.mark.asyncio
+async def test_async_redis_store_config() -> None:
+    import redis.asyncio
+    from autogen_ext.cache_store.redis import AsyncRedisStore
+
+    redis_instance = redis.asyncio.Redis(host="example", port=6380, max_connections=8)
+    store = AsyncRedisStore[int](redis_instance)
+    config = store.dump_component()
+    assert config.component_type == "cache_store"
+    assert config.config["max_connections"] == 8
+
+    loaded = AsyncRedisStore[int].load_component(config)
+    assert loaded.cache.connection_pool.connection_kwargs["host"] == "example"
+    assert loaded.cache.connection_pool.max_connections == 8
+    await loaded.cache.aclose()
+    await redis_instance.aclose()
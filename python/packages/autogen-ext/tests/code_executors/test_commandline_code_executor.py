@@ -8,16 +8,18 @@
 import subprocess
 import sys
 import tempfile
+import time
 import types
 import venv
 from pathlib import Path
-from typing import AsyncGenerator, TypeAlias
+from typing import AsyncGenerator, Callable, List, TypeAlias
 
 import pytest
 import pytest_asyncio
 from aiofiles import open
 from autogen_core import CancellationToken
-from autogen_core.code_executor import CodeBlock
+from autogen_core.code_executor import CodeBlock, CodeOutputChunk, CodeResult
+from autogen_ext.code_executors._common import CommandLineCodeResult, get_code_block_dependencies
 from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
 
 HAS_POWERSHELL: bool = platform.system() == "Windows" and (
@@ -399,3 +401,337 @@ async def test_ps1_script(executor_and_temp_dir: ExecutorFixture) -> None:
     assert result.exit_code == 0
     assert "hello from powershell!" in result.output
     assert result.code_file is not None
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_execute_code() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        executor = LocalCommandLineCodeExecutor(
+            work_dir=temp_dir, warm_pool_size=1, preload_modules=["json"], max_runs_per_interpreter=3
+        )
+        await executor.start()
+        cancellation_token = CancellationToken()
+        try:
+            code_result = await executor.execute_code_blocks(
+                [
+                    CodeBlock(code="import os, sys; x = 1; print(os.getcwd()); print(__name__)", language="python"),
+                    CodeBlock(code="print('x' in globals())", language="python"),
+                ],
+                cancellation_token,
+            )
+            assert code_result.exit_code == 0
+            assert code_result.output.split() == [str(Path(temp_dir).resolve()), "__main__", "False"]
+
+            # Modules written to the working directory are imported again by later blocks.
+            for value in ["1", "2"]:
+                code_result = await executor.execute_code_blocks(
+                    [
+                        CodeBlock(code=f"# filename: helper.py\nVALUE = {value}", language="python"),
+                        CodeBlock(code="import helper; print(helper.VALUE)", language="python"),
+                    ],
+                    cancellation_token,
+                )
+                assert code_result.exit_code == 0 and code_result.output.strip() == value
+
+            code_result = await executor.execute_code_blocks(
+                [CodeBlock(code="import sys; print('before'); sys.exit(3)", language="python")], cancellation_token
+            )
+            assert code_result.exit_code == 3 and "before" in code_result.output
+
+            code_result = await executor.execute_code_blocks(
+                [CodeBlock(code="raise ValueError('boom')", language="python")], cancellation_token
+            )
+            assert code_result.exit_code == 1 and "ValueError: boom" in code_result.output
+            assert "_warm_worker" not in code_result.output
+
+            # A block that ends the interpreter is reported like a crashed process, and the interpreter is replaced.
+            code_result = await executor.execute_code_blocks(
+                [CodeBlock(code="import os; print('bye', flush=True); os._exit(7)", language="python")],
+                cancellation_token,
+            )
+            assert code_result.exit_code == 7 and "bye" in code_result.output
+            code_result = await executor.execute_code_blocks(
+                [CodeBlock(code="print('hello world!')", language="python")], cancellation_token
+            )
+            assert code_result.exit_code == 0 and code_result.output.strip() == "hello world!"
+        finally:
+            await executor.stop()
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_recycles_interpreters() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        executor = LocalCommandLineCodeExecutor(work_dir=temp_dir, warm_pool_size=1, max_runs_per_interpreter=2)
+        await executor.start()
+        try:
+            pids = []
+            for _ in range(4):
+                code_result = await executor.execute_code_blocks(
+                    [CodeBlock(code="import os; print(os.getpid())", language="python")], CancellationToken()
+                )
+                assert code_result.exit_code == 0
+                pids.append(int(code_result.output))
+            assert pids[0] == pids[1] and pids[2] == pids[3] and pids[1] != pids[2]
+        finally:
+            await executor.stop()
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_timeout_and_cancellation() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        executor = LocalCommandLineCodeExecutor(timeout=1, work_dir=temp_dir, warm_pool_size=1)
+        await executor.start()
+        try:
+            code_blocks = [CodeBlock(code="import time; time.sleep(10); print('hello world!')", language="python")]
+            code_result = await executor.execute_code_blocks(code_blocks, CancellationToken())
+            assert code_result.exit_code == 124 and "Timeout" in code_result.output
+
+            cancellation_token = CancellationToken()
+            code = 'import time\ntime.sleep(0.5)\nwith open("hello.txt", "w") as f:\n    f.write("hello world!")\n'
+            coro = executor.execute_code_blocks([CodeBlock(code=code, language="python")], cancellation_token)
+            task = asyncio.create_task(coro)
+            await asyncio.sleep(0.2)
+            cancellation_token.cancel()
+            code_result = await task
+            assert code_result.exit_code == 125 and "Cancelled" in code_result.output
+            await asyncio.sleep(0.5)
+            assert not (Path(temp_dir) / "hello.txt").exists()
+
+            # The interpreters that were killed are replaced.
+            code_result = await executor.execute_code_blocks(
+                [CodeBlock(code="print('hello world!')", language="python")], CancellationToken()
+            )
+            assert code_result.exit_code == 0 and "hello world!" in code_result.output
+        finally:
+            await executor.stop()
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_preload_failure() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        executor = LocalCommandLineCodeExecutor(
+            work_dir=temp_dir, warm_pool_size=1, preload_modules=["module_that_does_not_exist"]
+        )
+        with pytest.raises(RuntimeError, match="module_that_does_not_exist"):
+            await executor.start()
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_serialize_deserialize() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        executor = LocalCommandLineCodeExecutor(
+            work_dir=temp_dir, warm_pool_size=2, preload_modules=["json"], max_runs_per_interpreter=10
+        )
+        loaded_executor = LocalCommandLineCodeExecutor.load_component(executor.dump_component())
+        assert loaded_executor._to_config() == executor._to_config()  # type: ignore[reportPrivateUsage]
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_latency_benchmark(record_property: Callable[[str, object], None]) -> None:
+    # Per-block latency of a block that imports a module, with a new interpreter per block and with a warm pool.
+    code_blocks = [CodeBlock(code="import asyncio, json; print(json.dumps([1, 2]))", language="python")]
+    runs = 10
+    latencies: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for mode, kwargs in [
+            ("cold", {}),
+            ("warm", {"warm_pool_size": 1, "preload_modules": ["asyncio", "json"]}),
+        ]:
+            executor = LocalCommandLineCodeExecutor(work_dir=temp_dir, **kwargs)  # type: ignore[arg-type]
+            await executor.start()
+            try:
+                start = time.perf_counter()
+                for _ in range(runs):
+                    code_result = await executor.execute_code_blocks(code_blocks, CancellationToken())
+                    assert code_result.exit_code == 0 and code_result.output.strip() == "[1, 2]"
+                latencies[mode] = (time.perf_counter() - start) / runs
+            finally:
+                await executor.stop()
+    record_property("cold_block_latency_ms", round(latencies["cold"] * 1000, 2))
+    record_property("warm_block_latency_ms", round(latencies["warm"] * 1000, 2))
+    assert latencies["warm"] < latencies["cold"]
+
+
+def test_code_block_dependencies(tmp_path: Path) -> None:
+    code_blocks = [
+        CodeBlock(code="# independent\nprint('a')", language="python"),
+        CodeBlock(code="# filename: helper.py\n# independent\nVALUE = 1", language="python"),
+        CodeBlock(code="# independent\nimport helper\nprint(helper.VALUE)", language="python"),
+        CodeBlock(code="# independent\nprint('helpers')", language="python"),
+        CodeBlock(code="pip install requests", language="sh"),
+        CodeBlock(code="# independent\nimport requests", language="python"),
+        CodeBlock(code="print('c')", language="python"),
+        CodeBlock(code="# filename: helper.py\n# independent\nVALUE = 2", language="python"),
+    ]
+    assert get_code_block_dependencies(code_blocks, tmp_path) == [
+        set(),
+        set(),
+        {1},
+        set(),
+        {0, 1, 2, 3},
+        {4},
+        {0, 1, 2, 3, 4, 5},
+        {1, 2, 4, 6},
+    ]
+
+
+def test_code_block_dependencies_shared_data_file(tmp_path: Path) -> None:
+    write = "# independent\nwith open('data.csv', 'w') as f:\n    f.write('1,2')"
+    read = '# independent\nwith open("./data.csv") as f:\n    print(f.read())'
+    unrelated = "# independent\nprint('report.txt is not opened, but it is a file name')"
+    code_blocks = [
+        CodeBlock(code=write, language="python"),
+        CodeBlock(code=read, language="python"),
+        CodeBlock(code=unrelated, language="python"),
+    ]
+    # The reader runs after the writer, while the block without a shared file does not wait.
+    assert get_code_block_dependencies(code_blocks, tmp_path) == [set(), {0}, set()]
+
+    # Without the marker, blocks run in order even when they share nothing.
+    code_blocks = [CodeBlock(code="print(1)", language="python"), CodeBlock(code="print(2)", language="python")]
+    assert get_code_block_dependencies(code_blocks, tmp_path) == [set(), {0}]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_code_blocks() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        executor = LocalCommandLineCodeExecutor(work_dir=temp_dir, max_concurrent_blocks=3)
+        await executor.start()
+        cancellation_token = CancellationToken()
+        try:
+            # Marked blocks without shared files run at the same time, and their outputs keep the order of the blocks.
+            code_blocks = [
+                CodeBlock(
+                    code=f"# independent\nimport time; time.sleep({delay}); print('block {index}')", language="python"
+                )
+                for index, delay in enumerate([1.5, 1, 0.5])
+            ]
+            start = time.perf_counter()
+            code_result = await executor.execute_code_blocks(code_blocks, cancellation_token)
+            assert time.perf_counter() - start < 2.5
+            assert code_result.exit_code == 0
+            assert code_result.output.split("\n")[:3] == ["block 0", "block 1", "block 2"]
+            assert code_result.code_file is not None and Path(code_result.code_file).read_text() == code_blocks[0].code
+
+            # A block runs after the block that writes the module it imports, and is skipped if that block fails.
+            code_result = await executor.execute_code_blocks(
+                [
+                    CodeBlock(
+                        code="# filename: helper.py\n# independent\nimport time\ntime.sleep(0.5)\nVALUE = 1",
+                        language="python",
+                    ),
+                    CodeBlock(code="# independent\nimport helper; print(helper.VALUE)", language="python"),
+                ],
+                cancellation_token,
+            )
+            assert code_result.exit_code == 0 and code_result.output.strip() == "1"
+            code_result = await executor.execute_code_blocks(
+                [
+                    CodeBlock(code="# filename: broken.py\n# independent\nraise ValueError('boom')", language="python"),
+                    CodeBlock(code="# independent\nimport broken; print('imported')", language="python"),
+                    CodeBlock(code="# independent\nimport sys; print('independent'); sys.exit(2)", language="python"),
+                ],
+                cancellation_token,
+            )
+            assert code_result.exit_code == 1
+            assert "ValueError: boom" in code_result.output and "independent" in code_result.output
+            assert "imported" not in code_result.output
+
+            # Identical blocks without a filename run at the same time from separate files.
+            code_block = CodeBlock(code="# independent\nimport time; time.sleep(0.2); print('same')", language="python")
+            code_result = await executor.execute_code_blocks([code_block, code_block], cancellation_token)
+            assert code_result.exit_code == 0 and code_result.output.split("\n")[:2] == ["same", "same"]
+            code_files = [path for path in Path(temp_dir).glob("tmp_code_*.py") if path.read_text() == code_block.code]
+            assert len(code_files) == 2
+        finally:
+            await executor.stop()
+
+
+@pytest.mark.asyncio
+async def test_execute_code_blocks_stream() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        executor = LocalCommandLineCodeExecutor(work_dir=temp_dir)
+        await executor.start()
+        try:
+            code = "import sys, time\nprint('first', flush=True)\ntime.sleep(1)\nprint('oops', file=sys.stderr)\nprint('last')"
+            code_blocks = [CodeBlock(code=code, language="python"), CodeBlock(code="echo done", language="sh")]
+            start = time.perf_counter()
+            chunks: List[tuple[float, CodeOutputChunk]] = []
+            results: List[CodeResult] = []
+            async for item in executor.execute_code_blocks_stream(code_blocks, CancellationToken()):
+                if isinstance(item, CodeOutputChunk):
+                    chunks.append((time.perf_counter() - start, item))
+                else:
+                    results.append(item)
+            # The first line arrives while the block is still running.
+            assert chunks[0][1].content.startswith("first") and chunks[0][0] < 0.9
+            streams: dict[tuple[int, str], str] = {}
+            for _, chunk in chunks:
+                key = (chunk.code_block_index, chunk.stream)
+                streams[key] = streams.get(key, "") + chunk.content
+            assert streams == {(0, "stdout"): "first\nlast\n", (0, "stderr"): "oops\n", (1, "stdout"): "done\n"}
+            assert len(results) == 1 and results[0].exit_code == 0
+            assert results[0].output == "".join(chunk.content for _, chunk in chunks)
+            assert isinstance(results[0], CommandLineCodeResult) and results[0].code_file is not None
+
+            # A failed block ends the execution, and its status is streamed like the output.
+            items = [
+                item
+                async for item in executor.execute_code_blocks_stream(
+                    [CodeBlock(code="print(1)", language="unknown"), CodeBlock(code="print(2)", language="python")],
+                    CancellationToken(),
+                )
+            ]
+            assert items == [
+                CodeOutputChunk(content="\nunknown language unknown", stream="stderr", code_block_index=0),
+                CommandLineCodeResult(exit_code=1, output="\nunknown language unknown", code_file=None),
+            ]
+        finally:
+            await executor.stop()
+
+
+@pytest.mark.asyncio
+async def test_execute_code_blocks_stream_bounded_output() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        executor = LocalCommandLineCodeExecutor(work_dir=temp_dir, stream_output_buffer_size=100)
+        await executor.start()
+        try:
+            code = "for i in range(10000):\n    print(f'line {i:05d}')"
+            streamed = ""
+            result: CodeResult | None = None
+            async for item in executor.execute_code_blocks_stream(
+                [CodeBlock(code=code, language="python")], CancellationToken()
+            ):
+                if isinstance(item, CodeOutputChunk):
+                    streamed += item.content
+                else:
+                    result = item
+            assert streamed == "".join(f"line {i:05d}\n" for i in range(10000))
+            assert result is not None and result.exit_code == 0
+            header, tail = result.output.split("\n", 1)
+            assert header == f"[{len(streamed) - 100} characters of earlier output were dropped]"
+            assert tail == streamed[-100:]
+        finally:
+            await executor.stop()
+
+
+@pytest.mark.asyncio
+async def test_execute_code_blocks_stream_cancellation() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        executor = LocalCommandLineCodeExecutor(work_dir=temp_dir)
+        await executor.start()
+        try:
+            cancellation_token = CancellationToken()
+            code = "import time\nprint('started', flush=True)\ntime.sleep(10)"
+            items: List[CodeOutputChunk | CodeResult] = []
+            async for item in executor.execute_code_blocks_stream(
+                [CodeBlock(code=code, language="python")], cancellation_token
+            ):
+                items.append(item)
+                if isinstance(item, CodeOutputChunk):
+                    cancellation_token.cancel()
+            last = items[-1]
+            assert isinstance(last, CodeResult) and last.exit_code == 125
+            assert last.output.startswith("started") and last.output.endswith("\nCancelled")
+        finally:
+            await executor.stop()
@@ -4,15 +4,17 @@
 import shutil
 import sys
 import tempfile
+import time
 from pathlib import Path
-from typing import AsyncGenerator, TypeAlias
+from types import SimpleNamespace
+from typing import AsyncGenerator, Dict, Generator, List, Optional, Set, Tuple, TypeAlias
 
 import pytest
 import pytest_asyncio
 from aiofiles import open
 from autogen_core import CancellationToken
-from autogen_core.code_executor import CodeBlock
-from autogen_ext.code_executors.docker import DockerCommandLineCodeExecutor
+from autogen_core.code_executor import CodeBlock, CodeOutputChunk, CodeResult
+from autogen_ext.code_executors.docker import DockerCommandLineCodeExecutor, DockerContainerPool
 
 
 def docker_tests_enabled() -> bool:
@@ -267,6 +269,267 @@ async def test_docker_commandline_code_executor_serialization() -> None:
         assert executor.timeout == loaded_executor.timeout
 
 
+class _FakeContainer:
+    """A container whose commands print the name of the executed file after a delay."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.commands: List[List[str]] = []
+        self.id = "fake"
+        self.client = SimpleNamespace(api=self)
+        self._execs: Dict[str, List[str]] = {}
+        self._inspected: Set[str] = set()
+
+    def exec_run(self, command: List[str]) -> SimpleNamespace:
+        self.commands.append(command)
+        time.sleep(self.delay)
+        exit_code = 1 if "fail" in command[-1] else 0
+        return SimpleNamespace(exit_code=exit_code, output=f"ran {command[-1]}\n".encode())
+
+    # The low-level API used to stream the output of a command.
+    def exec_create(self, container: str, command: List[str]) -> Dict[str, str]:
+        exec_id = f"exec-{len(self._execs)}"
+        self._execs[exec_id] = command
+        return {"Id": exec_id}
+
+    def exec_start(
+        self, exec_id: str, stream: bool, demux: bool
+    ) -> Generator[Tuple[Optional[bytes], Optional[bytes]], None, None]:
+        command = self._execs[exec_id]
+        self.commands.append(command)
+        yield f"start {command[-1]}\n".encode(), None
+        time.sleep(self.delay)
+        # A multi-byte character split between two reads.
+        yield None, "\u00e9".encode()[:1]
+        yield "end\n".encode(), "\u00e9".encode()[1:]
+
+    def exec_inspect(self, exec_id: str) -> Dict[str, Optional[int]]:
+        # Docker reports no exit code until it has recorded the exit of the process.
+        if exec_id not in self._inspected:
+            self._inspected.add(exec_id)
+            return {"ExitCode": None}
+        return {"ExitCode": 1 if "fail" in self._execs[exec_id][-1] else 0}
+
+
+@pytest.mark.asyncio
+async def test_docker_commandline_code_executor_concurrent_blocks() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        executor = DockerCommandLineCodeExecutor(work_dir=temp_dir, max_concurrent_blocks=3)
+        container = _FakeContainer(delay=0.5)
+        executor._container = container  # type: ignore[assignment]
+        executor._running = True  # type: ignore[reportPrivateUsage]
+
+        code_blocks = [
+            CodeBlock(code=f"# filename: script_{index}.py\n# independent\nprint({index})", language="python")
+            for index in range(3)
+        ]
+        start = time.perf_counter()
+        result = await executor.execute_code_blocks(code_blocks, CancellationToken())
+        assert time.perf_counter() - start < 1.2
+        assert result.exit_code == 0
+        assert result.output == "ran script_0.py\nran script_1.py\nran script_2.py\n"
+
+        # The block that imports the failed module is skipped, and the shell block runs after the other blocks.
+        code_blocks = [
+            CodeBlock(code="# filename: fail_module.py\n# independent\nraise ValueError()", language="python"),
+            CodeBlock(code="# filename: user.py\n# independent\nimport fail_module", language="python"),
+            CodeBlock(code="# filename: other.py\n# independent\nprint(1)", language="python"),
+        ]
+        container.commands.clear()
+        result = await executor.execute_code_blocks(code_blocks, CancellationToken())
+        assert result.exit_code == 1
+        assert result.output == "ran fail_module.py\nran other.py\n"
+        assert [command[-1] for command in container.commands] in (
+            ["fail_module.py", "other.py"],
+            ["other.py", "fail_module.py"],
+        )
+
+
+@pytest.mark.asyncio
+async def test_docker_commandline_code_executor_stream() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        executor = DockerCommandLineCodeExecutor(work_dir=temp_dir)
+        container = _FakeContainer(delay=1)
+        executor._container = container  # type: ignore[assignment]
+        executor._running = True  # type: ignore[reportPrivateUsage]
+
+        code_blocks = [
+            CodeBlock(code="# filename: first.py\nprint(1)", language="python"),
+            CodeBlock(code="# filename: fail.py\nprint(2)", language="python"),
+            CodeBlock(code="# filename: never.py\nprint(3)", language="python"),
+        ]
+        start = time.perf_counter()
+        chunks: List[Tuple[float, CodeOutputChunk]] = []
+        results: List[CodeResult] = []
+        async for item in executor.execute_code_blocks_stream(code_blocks, CancellationToken()):
+            if isinstance(item, CodeOutputChunk):
+                chunks.append((time.perf_counter() - start, item))
+            else:
+                results.append(item)
+        # The first chunk arrives before the command finishes, and the execution stops at the failed block.
+        assert chunks[0][0] < 0.9
+        assert [(chunk.content, chunk.stream, chunk.code_block_index) for _, chunk in chunks] == [
+            ("start first.py\n", "stdout", 0),
+            ("end\n", "stdout", 0),
+            ("\u00e9", "stderr", 0),
+            ("start fail.py\n", "stdout", 1),
+            ("end\n", "stdout", 1),
+            ("\u00e9", "stderr", 1),
+        ]
+        assert len(results) == 1
+        assert results[0].exit_code == 1
+        assert results[0].output == "start first.py\nend\n\u00e9start fail.py\nend\n\u00e9"
+
+
+class _FakePoolContainer(_FakeContainer):
+    """A container created by a :class:`_FakeDockerClient`, whose workspace is a host directory."""
+
+    def __init__(self, name: str, work_dir: Path) -> None:
+        super().__init__(delay=0)
+        self.id = name
+        self.name = name
+        self.work_dir = work_dir
+        self.status = "created"
+        self.fail_reset = False
+        self.removed = False
+
+    def start(self) -> None:
+        self.status = "running"
+
+    def reload(self) -> None:
+        pass
+
+    def remove(self, force: bool) -> None:
+        self.status = "removed"
+        self.removed = True
+
+    def exec_run(self, command: List[str]) -> SimpleNamespace:
+        if command[0] != "/bin/sh":
+            return super().exec_run(command)
+        # The reset command of the pool.
+        self.commands.append(command)
+        if self.fail_reset:
+            return SimpleNamespace(exit_code=1, output=b"reset failed")
+        for path in self.work_dir.iterdir():
+            path.unlink()
+        return SimpleNamespace(exit_code=0, output=b"")
+
+
+class _FakeDockerClient:
+    def __init__(self) -> None:
+        self.created: List[_FakePoolContainer] = []
+        self.images = SimpleNamespace(get=lambda image: None)
+        self.containers = SimpleNamespace(create=self._create)
+
+    def _create(
+        self, image: str, name: str, volumes: Dict[str, Dict[str, str]], **kwargs: object
+    ) -> _FakePoolContainer:
+        (work_dir,) = [Path(path) for path, volume in volumes.items() if volume["bind"] == "/workspace"]
+        container = _FakePoolContainer(name, work_dir)
+        self.created.append(container)
+        return container
+
+
+async def _wait_for_idle(pool: DockerContainerPool, count: int) -> None:
+    for _ in range(100):
+        if pool.idle == count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Expected {count} idle containers, got {pool.idle}")
+
+
+@pytest.mark.asyncio
+async def test_docker_container_pool() -> None:
+    client = _FakeDockerClient()
+    pool = DockerContainerPool(size=2, client=client)
+    await pool.start()
+    assert len(client.created) == 2
+    assert all(container.status == "running" for container in client.created)
+    assert len({container.work_dir for container in client.created}) == 2
+
+    executor = DockerCommandLineCodeExecutor(container_pool=pool)
+    await executor.start()
+    assert pool.idle == 1
+    container = next(container for container in client.created if container.work_dir == executor.work_dir)
+    result = await executor.execute_code_blocks(
+        [CodeBlock(code="# filename: script.py\nprint(1)", language="python")], CancellationToken()
+    )
+    assert result.exit_code == 0
+    assert result.output == "ran script.py\n"
+    assert (container.work_dir / "script.py").exists()
+
+    # Stopping the executor resets the workspace and returns the container to the pool.
+    await executor.stop()
+    assert pool.idle == 2
+    assert container.commands[-1][0] == "/bin/sh"
+    assert list(container.work_dir.iterdir()) == []
+    assert not container.removed
+
+    # With both containers leased, a third executor waits until one of them is released.
+    executors = [DockerCommandLineCodeExecutor(container_pool=pool) for _ in range(3)]
+    await executors[0].start()
+    await executors[1].start()
+    third_start = asyncio.create_task(executors[2].start())
+    await asyncio.sleep(0.05)
+    assert not third_start.done()
+    await executors[0].stop()
+    await third_start
+    assert len(client.created) == 2
+
+    await pool.stop()
+    assert all(container.removed for container in client.created)
+    # Releasing a container after the pool is stopped does nothing.
+    await executors[1].stop()
+    await executors[2].stop()
+
+
+@pytest.mark.asyncio
+async def test_docker_container_pool_replaces_containers() -> None:
+    client = _FakeDockerClient()
+    pool = DockerContainerPool(size=2, max_leases_per_container=2, client=client)
+    await pool.start()
+    first, second = client.created
+
+    # A container that stopped running is replaced when it would be leased.
+    first.status = "exited"
+    executor = DockerCommandLineCodeExecutor(container_pool=pool)
+    await executor.start()
+    assert executor.work_dir == second.work_dir
+    await _wait_for_idle(pool, 1)
+    assert first.removed
+    assert len(client.created) == 3
+
+    # A container that fails to reset is replaced when it is released.
+    second.fail_reset = True
+    await executor.stop()
+    await _wait_for_idle(pool, 2)
+    assert second.removed
+    assert len(client.created) == 4
+
+    # A container is replaced once it was leased max_leases_per_container times.
+    third = client.created[2]
+    for _ in range(2):
+        await executor.start()
+        assert executor.work_dir == third.work_dir
+        await executor.stop()
+        await _wait_for_idle(pool, 2)
+        # Lease the other container in between, so the next lease gets the same one.
+        other = DockerCommandLineCodeExecutor(container_pool=pool)
+        await other.start()
+        await other.stop()
+        await _wait_for_idle(pool, 2)
+    assert third.removed
+    assert len(client.created) == 6
+
+    await pool.stop()
+
+
+def test_docker_container_pool_with_work_dir() -> None:
+    pool = DockerContainerPool(client=_FakeDockerClient())
+    with pytest.raises(ValueError, match="work_dir and bind_dir cannot be used with a container pool."):
+        _ = DockerCommandLineCodeExecutor(work_dir=".", container_pool=pool)
+
+
 def test_invalid_timeout() -> None:
     with pytest.raises(ValueError, match="Timeout must be greater than or equal to 1."):
         _ = DockerCommandLineCodeExecutor(timeout=0)
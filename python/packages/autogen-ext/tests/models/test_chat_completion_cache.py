@@ -1,7 +1,9 @@
+import asyncio
 import copy
-from typing import List, Tuple, Union
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple, Union
 
 import pytest
+from autogen_core import AsyncCacheStore
 from autogen_core.models import (
     ChatCompletionClient,
     CreateResult,
@@ -9,7 +11,12 @@
     SystemMessage,
     UserMessage,
 )
-from autogen_ext.models.cache import ChatCompletionCache
+from autogen_ext.models.cache import (
+    CHAT_CACHE_VALUE_TYPE,
+    ChatCompletionCache,
+    ChatCompletionCacheStats,
+    SemanticCacheIndex,
+)
 from autogen_ext.models.replay import ReplayChatCompletionClient
 from pydantic import BaseModel
 
@@ -184,3 +191,229 @@ async def test_cache_create_stream() -> None:
     # cached_client_config = cached_client.dump_component()
     # loaded_client = ChatCompletionCache.load_component(cached_client_config)
     # assert loaded_client.client == cached_client.client
+
+
+class RecordingAsyncStore(AsyncCacheStore[CHAT_CACHE_VALUE_TYPE]):
+    def __init__(self) -> None:
+        self.store: Dict[str, CHAT_CACHE_VALUE_TYPE] = {}
+        self.calls: List[str] = []
+
+    async def aget(self, key: str, default: Optional[CHAT_CACHE_VALUE_TYPE] = None) -> Optional[CHAT_CACHE_VALUE_TYPE]:
+        self.calls.append("aget")
+        return copy.deepcopy(self.store.get(key, default))
+
+    async def aset(self, key: str, value: CHAT_CACHE_VALUE_TYPE) -> None:
+        self.calls.append("aset")
+        self.store[key] = copy.deepcopy(value)
+
+
+@pytest.mark.asyncio
+async def test_cache_with_async_store() -> None:
+    responses, prompts, system_prompt, replay_client, _ = get_test_data()
+    store = RecordingAsyncStore()
+    cached_client = ChatCompletionCache(replay_client, store)
+
+    messages: List[LLMMessage] = [system_prompt, UserMessage(content=prompts[0], source="user")]
+    response0 = await cached_client.create(messages)
+    assert not response0.cached
+    response0_cached = await cached_client.create(messages)
+    assert response0_cached.cached
+    assert response0_cached.content == responses[0]
+    assert store.calls == ["aget", "aset", "aget"]
+
+    # Streams are stored once they complete, so the full stream is replayed.
+    stream_messages: List[LLMMessage] = [system_prompt, UserMessage(content=prompts[1], source="user")]
+    original = [chunk async for chunk in cached_client.create_stream(stream_messages)]
+    replayed = [chunk async for chunk in cached_client.create_stream(stream_messages)]
+    assert len(replayed) == len(original) > 0
+    assert replayed[:-1] == original[:-1]
+    final = replayed[-1]
+    assert isinstance(final, CreateResult) and final.cached
+
+
+class GatedReplayClient(ReplayChatCompletionClient):
+    """A replay client whose calls wait until the gate is opened."""
+
+    def __init__(self, responses: List[str]) -> None:
+        super().__init__(responses)
+        self.gate = asyncio.Event()
+        self.num_calls = 0
+        self.error: Optional[Exception] = None
+
+    async def create(self, messages: Any, **kwargs: Any) -> CreateResult:
+        self.num_calls += 1
+        await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return await super().create(messages, **kwargs)
+
+    async def create_stream(self, messages: Any, **kwargs: Any) -> AsyncGenerator[Union[str, CreateResult], None]:
+        self.num_calls += 1
+        async for chunk in super().create_stream(messages, **kwargs):
+            await self.gate.wait()
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_cache_coalesces_concurrent_create() -> None:
+    client = GatedReplayClient(["response"])
+    client.set_cached_bool_value(False)
+    cached_client = ChatCompletionCache(client)
+    messages: List[LLMMessage] = [UserMessage(content="prompt", source="user")]
+
+    tasks = [asyncio.create_task(cached_client.create(messages)) for _ in range(5)]
+    await asyncio.sleep(0)
+    client.gate.set()
+    results = await asyncio.gather(*tasks)
+
+    assert client.num_calls == 1
+    assert all(result.content == "response" for result in results)
+    assert [result.cached for result in results].count(False) == 1
+    assert cached_client.stats() == ChatCompletionCacheStats(hits=0, misses=1, coalesced=4)
+
+    assert (await cached_client.create(messages)).cached
+    assert cached_client.stats().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_coalesced_create_errors() -> None:
+    client = GatedReplayClient(["response"])
+    cached_client = ChatCompletionCache(client)
+    messages: List[LLMMessage] = [UserMessage(content="prompt", source="user")]
+
+    client.error = ValueError("upstream failure")
+    tasks = [asyncio.create_task(cached_client.create(messages)) for _ in range(3)]
+    await asyncio.sleep(0)
+    client.gate.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert client.num_calls == 1
+
+    # A cancelled leader does not fail the callers waiting on it.
+    client.error = None
+    client.gate.clear()
+    leader = asyncio.create_task(cached_client.create(messages))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cached_client.create(messages))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    client.gate.set()
+    assert (await follower).content == "response"
+    assert leader.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_cache_coalesces_concurrent_create_stream() -> None:
+    client = GatedReplayClient(["a streamed response"])
+    client.set_cached_bool_value(False)
+    cached_client = ChatCompletionCache(client)
+    messages: List[LLMMessage] = [UserMessage(content="prompt", source="user")]
+
+    async def consume() -> List[Union[str, CreateResult]]:
+        return [chunk async for chunk in cached_client.create_stream(messages)]
+
+    tasks = [asyncio.create_task(consume()) for _ in range(3)]
+    await asyncio.sleep(0)
+    client.gate.set()
+    results = await asyncio.gather(*tasks)
+
+    assert client.num_calls == 1
+    assert cached_client.stats() == ChatCompletionCacheStats(hits=0, misses=1, coalesced=2)
+    for chunks in results:
+        assert chunks[:-1] == ["a ", "streamed ", "response"]
+        final = chunks[-1]
+        assert isinstance(final, CreateResult) and final.content == "a streamed response"
+    assert [isinstance(chunks[-1], CreateResult) and chunks[-1].cached for chunks in results].count(False) == 1
+
+    # The complete stream is cached.
+    replayed = await consume()
+    assert replayed[:-1] == ["a ", "streamed ", "response"]
+    assert cached_client.stats().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_normalized_tier() -> None:
+    responses, _, system_prompt, replay_client, _ = get_test_data()
+    cached_client = ChatCompletionCache(replay_client, normalize_messages=True)
+
+    prompt = "Summarize  request 123e4567-e89b-12d3-a456-426614174000 received at 2025-01-01T10:00:00Z."
+    response0 = await cached_client.create([system_prompt, UserMessage(content=prompt, source="user")])
+    assert not response0.cached
+
+    variant = "Summarize request 9b2f1c3e-0000-4000-8000-000000000000 received at 2025-02-03T11:22:33Z.\n"
+    response1 = await cached_client.create([system_prompt, UserMessage(content=variant, source="user")])
+    assert response1.cached
+    assert response1.content == responses[0]
+    assert cached_client.stats().normalized_hits == 1
+
+    response2 = await cached_client.create([system_prompt, UserMessage(content="Something else", source="user")])
+    assert not response2.cached
+    assert response2.content == responses[1]
+
+    config = cached_client.dump_component()
+    assert config.config["normalize_messages"] is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_numpy", [True, False])
+async def test_semantic_cache_index(use_numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    from autogen_ext.models.cache import _semantic_cache
+
+    if not use_numpy:
+        monkeypatch.setattr(_semantic_cache, "numpy", None)
+
+    async def embed(text: str) -> List[float]:
+        return [float(value) for value in text.split(",")]
+
+    index = SemanticCacheIndex(embed, similarity_threshold=0.9, max_entries=3)
+    for i, text in enumerate(["1,0,0", "0,1,0", "0,0,1", "1,1,0"]):
+        index.add("scope", await index.embed(text), f"key{i}")
+
+    # The oldest entry was dropped and its row reused.
+    assert await index.nearest("scope", await index.embed("1,0.1,0")) is None
+    assert await index.nearest("scope", await index.embed("0,1,0.1")) == "key1"
+    assert await index.nearest("scope", await index.embed("1,1,0.1")) == "key3"
+    assert await index.nearest("other", await index.embed("1,1,0")) is None
+    # Vectors of another dimension do not match, and replace the scope when added.
+    assert await index.nearest("scope", await index.embed("1,1")) is None
+    index.add("scope", await index.embed("1,1"), "key4")
+    assert await index.nearest("scope", await index.embed("1,1")) == "key4"
+    assert await index.nearest("scope", await index.embed("0,1,0")) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_semantic_tier() -> None:
+    vocabulary = ["weather", "paris", "today", "tokyo", "the", "what", "is", "in", "like"]
+
+    async def embed(text: str) -> List[float]:
+        words = text.lower().replace("?", "").split()
+        return [float(words.count(word)) for word in vocabulary]
+
+    responses, _, system_prompt, replay_client, _ = get_test_data()
+    index = SemanticCacheIndex(embed, similarity_threshold=0.9)
+    cached_client = ChatCompletionCache(replay_client, semantic_index=index)
+
+    response0 = await cached_client.create(
+        [system_prompt, UserMessage(content="What is the weather in Paris today?", source="user")]
+    )
+    assert not response0.cached
+
+    response1 = await cached_client.create(
+        [system_prompt, UserMessage(content="What is the weather like in Paris today?", source="user")]
+    )
+    assert response1.cached
+    assert response1.content == responses[0]
+    assert cached_client.stats().semantic_hits == 1
+
+    # Dissimilar prompts and different output settings are not served from the semantic tier.
+    response2 = await cached_client.create(
+        [system_prompt, UserMessage(content="What is the weather in Tokyo?", source="user")]
+    )
+    assert not response2.cached
+    response3 = await cached_client.create(
+        [system_prompt, UserMessage(content="What is the weather like in Paris today?", source="user")],
+        json_output=True,
+    )
+    assert not response3.cached
+    assert cached_client.stats() == ChatCompletionCacheStats(hits=1, misses=3, coalesced=0, semantic_hits=1)
@@ -1,11 +1,13 @@
+import base64
 import json
 import logging
+from io import BytesIO
 from typing import Any, AsyncGenerator, Dict, List, Mapping, Optional
 
 import httpx
 import pytest
 import pytest_asyncio
-from autogen_core import FunctionCall
+from autogen_core import FunctionCall, Image
 from autogen_core.models import (
     AssistantMessage,
     CreateResult,
@@ -15,9 +17,14 @@
 )
 from autogen_core.tools import FunctionTool, ToolSchema
 from autogen_ext.models.ollama import OllamaChatCompletionClient
-from autogen_ext.models.ollama._ollama_client import OLLAMA_VALID_CREATE_KWARGS_KEYS, convert_tools
+from autogen_ext.models.ollama._ollama_client import (
+    OLLAMA_VALID_CREATE_KWARGS_KEYS,
+    calculate_vision_tokens,
+    convert_tools,
+)
 from httpx import Response
 from ollama import AsyncClient, ChatResponse, Message, Tool
+from PIL import Image as PILImage
 from pydantic import BaseModel
 
 
@@ -883,3 +890,11 @@ async def _mock_chat(*args: Any, **kwargs: Any) -> ChatResponse:
     assert chat_kwargs_captured["options"]["temperature"] == 0.7
     assert chat_kwargs_captured["options"]["top_p"] == 0.9
     assert chat_kwargs_captured["options"]["frequency_penalty"] == 1.2
+
+
+def test_count_image_tokens_does_not_decode(monkeypatch: pytest.MonkeyPatch) -> None:
+    buffer = BytesIO()
+    PILImage.new("RGBA", (1024, 512)).save(buffer, format="PNG")
+    image = Image.from_base64(base64.b64encode(buffer.getvalue()).decode("utf-8"))
+    monkeypatch.setattr(Image, "image", property(lambda self: pytest.fail("The image was decoded.")))
+    assert calculate_vision_tokens(image, detail="auto") == 425
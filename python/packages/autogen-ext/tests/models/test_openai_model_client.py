@@ -1,7 +1,9 @@
 import asyncio
+import base64
 import json
 import logging
 import os
+from io import BytesIO
 from typing import Annotated, Any, AsyncGenerator, Dict, List, Literal, Tuple, TypeVar
 from unittest.mock import MagicMock
 
@@ -23,12 +25,13 @@
 )
 from autogen_core.models._model_client import ModelFamily
 from autogen_core.tools import BaseTool, FunctionTool
-from autogen_ext.models.openai import AzureOpenAIChatCompletionClient, OpenAIChatCompletionClient
+from autogen_ext.models.openai import AzureOpenAIChatCompletionClient, OpenAIChatCompletionClient, _openai_client
 from autogen_ext.models.openai._model_info import resolve_model
 from autogen_ext.models.openai._openai_client import (
     BaseOpenAIChatCompletionClient,
     calculate_vision_tokens,
     convert_tools,
+    count_tokens_openai,
     to_oai_type,
 )
 from autogen_ext.models.openai._transformation import TransformerMap, get_transformer
@@ -60,6 +63,7 @@
 from openai.types.chat.parsed_chat_completion import ParsedChatCompletion, ParsedChatCompletionMessage, ParsedChoice
 from openai.types.chat.parsed_function_tool_call import ParsedFunction, ParsedFunctionToolCall
 from openai.types.completion_usage import CompletionUsage
+from PIL import Image as PILImage
 from pydantic import BaseModel, Field
 
 ResponseFormatT = TypeVar("ResponseFormatT", bound=BaseModel)
@@ -409,6 +413,71 @@ def tool2(test1: int, test2: List[int]) -> str:
     assert remaining_tokens
 
 
+class _WhitespaceEncoding:
+    name = "whitespace"
+
+    def encode(self, text: str) -> List[str]:
+        return text.split()
+
+
+def test_count_tokens_openai_memoizes_messages_and_tools(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_openai_client, "_get_encoding", lambda model: _WhitespaceEncoding())
+    monkeypatch.setattr(_openai_client, "_message_token_cache", _openai_client._TokenCountCache(8))  # pyright: ignore[reportPrivateUsage]
+    monkeypatch.setattr(_openai_client, "_tool_token_cache", _openai_client._TokenCountCache(8))  # pyright: ignore[reportPrivateUsage]
+    count_message_tokens = MagicMock(wraps=_openai_client._count_message_tokens)  # pyright: ignore[reportPrivateUsage]
+    count_tool_tokens = MagicMock(wraps=_openai_client._count_tool_tokens)  # pyright: ignore[reportPrivateUsage]
+    monkeypatch.setattr(_openai_client, "_count_message_tokens", count_message_tokens)
+    monkeypatch.setattr(_openai_client, "_count_tool_tokens", count_tool_tokens)
+
+    def tool1(test: str, test2: str) -> str:
+        return test + test2
+
+    tools = [FunctionTool(tool1, description="example tool 1")]
+    messages: List[LLMMessage] = [
+        SystemMessage(content="You are a helpful assistant."),
+        UserMessage(content="Hello there", source="user"),
+    ]
+    first = count_tokens_openai(messages, "gpt-4o", tools=tools)
+    assert count_message_tokens.call_count == 2
+    assert count_tool_tokens.call_count == 1
+
+    # Growing the conversation only tokenizes the new messages, and messages with the same content are
+    # counted once.
+    messages.append(AssistantMessage(content="Hi! How can I help?", source="assistant"))
+    messages.append(UserMessage(content="Hello there", source="user"))
+    second = count_tokens_openai(messages, "gpt-4o", tools=tools)
+    assert count_message_tokens.call_count == 3
+    assert count_tool_tokens.call_count == 1
+    assert second > first
+    _openai_client._message_token_cache.clear()  # pyright: ignore[reportPrivateUsage]
+    _openai_client._tool_token_cache.clear()  # pyright: ignore[reportPrivateUsage]
+    assert count_tokens_openai(messages, "gpt-4o", tools=tools) == second
+    assert count_message_tokens.call_count == 6
+    assert count_tool_tokens.call_count == 2
+
+    # Different options are cached separately.
+    count_tokens_openai(messages, "gpt-4o", tools=tools, add_name_prefixes=True)
+    assert count_message_tokens.call_count == 9
+
+    # A message whose content was reassigned is counted again.
+    messages[1].content = "Hello there, how are you?"
+    assert count_tokens_openai(messages, "gpt-4o", tools=tools) == second + 3
+    assert count_message_tokens.call_count == 10
+
+    # So is a message whose nested content was mutated in place.
+    multipart = UserMessage(content=["Describe", "this"], source="user")
+    multipart_tokens = count_tokens_openai([multipart], "gpt-4o")
+    assert isinstance(multipart.content, list)
+    multipart.content.append("and that")
+    assert count_tokens_openai([multipart], "gpt-4o") > multipart_tokens
+    assert count_message_tokens.call_count == 12
+
+    # The cache is bounded.
+    for i in range(20):
+        count_tokens_openai([UserMessage(content=f"message {i}", source="user")], "gpt-4o")
+    assert len(_openai_client._message_token_cache._entries) == 8  # pyright: ignore[reportPrivateUsage]
+
+
 @pytest.mark.parametrize(
     "mock_size, expected_num_tokens",
     [
@@ -420,18 +489,23 @@ def tool2(test1: int, test2: List[int]) -> str:
     ],
 )
 def test_openai_count_image_tokens(mock_size: Tuple[int, int], expected_num_tokens: int) -> None:
-    # Step 1: Mock the Image class with only the 'image' attribute
-    mock_image_attr = MagicMock()
-    mock_image_attr.size = mock_size
-
+    # Step 1: Mock the Image class with only the 'size' attribute
     mock_image = MagicMock()
-    mock_image.image = mock_image_attr
+    mock_image.size = mock_size
 
     # Directly call calculate_vision_tokens and check the result
     calculated_tokens = calculate_vision_tokens(mock_image, detail="auto")
     assert calculated_tokens == expected_num_tokens
 
 
+def test_openai_count_image_tokens_does_not_decode(monkeypatch: pytest.MonkeyPatch) -> None:
+    buffer = BytesIO()
+    PILImage.new("RGBA", (1024, 512)).save(buffer, format="PNG")
+    image = Image.from_base64(base64.b64encode(buffer.getvalue()).decode("utf-8"))
+    monkeypatch.setattr(Image, "image", property(lambda self: pytest.fail("The image was decoded.")))
+    assert calculate_vision_tokens(image, detail="auto") == 425
+
+
 def test_convert_tools_accepts_both_func_tool_and_schema() -> None:
     def my_function(arg: str, other: Annotated[int, "int arg"], nonrequired: int = 5) -> MyResult:
         return MyResult(result="test")
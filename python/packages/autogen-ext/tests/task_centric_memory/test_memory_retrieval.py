@@ -0,0 +1,127 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Mapping, Optional, Sequence
+
+import pytest
+from autogen_core import CancellationToken
+from autogen_core.models import CreateResult, LLMMessage, RequestUsage
+from autogen_core.tools import Tool, ToolSchema
+from autogen_ext.experimental.task_centric_memory import MemoryController
+from autogen_ext.experimental.task_centric_memory.utils import PageLogger
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from pydantic import BaseModel
+
+
+class _ValidationClient(ReplayChatCompletionClient):
+    """A client that takes a fixed time to validate an insight, and accepts the insights that mention 'useful'."""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__([])
+        self.delay = delay
+        self.validated_insights: List[str] = []
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        await asyncio.sleep(self.delay)
+        insight = messages[-1].content[-1]
+        assert isinstance(insight, str)
+        self.validated_insights.append(insight)
+        return CreateResult(
+            finish_reason="stop",
+            content="1" if "useful" in insight else "0",
+            usage=RequestUsage(prompt_tokens=0, completion_tokens=0),
+            cached=False,
+        )
+
+
+class _CountingCollection:
+    """Wraps a Chroma collection to count the queries."""
+
+    def __init__(self, collection: Any) -> None:
+        self.collection = collection
+        self.query_texts: List[List[str]] = []
+
+    def query(self, query_texts: List[str], n_results: int) -> Any:
+        self.query_texts.append(query_texts)
+        return self.collection.query(query_texts=query_texts, n_results=n_results)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.collection, name)
+
+
+async def _create_memory_controller(
+    path: Path, client: _ValidationClient, max_concurrent_validations: int
+) -> MemoryController:
+    memory_controller = MemoryController(
+        reset=True,
+        client=client,
+        config={
+            "generalize_task": False,
+            "generate_topics": False,
+            "max_concurrent_validations": max_concurrent_validations,
+            "max_memos_to_retrieve": 10,
+            # Count every match as relevant, whatever its distance.
+            "MemoryBank": {"path": str(path), "relevance_conversion_threshold": 10},
+        },
+        logger=PageLogger(),
+    )
+    for index in range(8):
+        kind = "useful" if index % 2 == 0 else "unrelated"
+        await memory_controller.add_memo(insight=f"A {kind} insight about colors, number {index}.")
+    # A memo with the same insight as another one is validated only once.
+    await memory_controller.add_memo(insight="A useful insight about colors, number 0.")
+    return memory_controller
+
+
+def test_get_relevant_memos_batches_topics(tmp_path: Path) -> None:
+    memory_controller = MemoryController(
+        reset=True,
+        client=_ValidationClient(delay=0),
+        config={"MemoryBank": {"path": str(tmp_path), "relevance_conversion_threshold": 10}},
+        logger=PageLogger(),
+    )
+    memory_bank = memory_controller.memory_bank
+    memory_bank.add_memo("Deep blue is my favorite color", ["favorite color", "blue"])
+    memory_bank.add_memo("Halibut is my favorite food", ["favorite food", "fish"])
+    collection = _CountingCollection(memory_bank.string_map.vec_db)
+    memory_bank.string_map.vec_db = collection  # type: ignore[assignment]
+
+    memos = memory_bank.get_relevant_memos(topics=["favorite color", "what color", "favorite color"])
+    # The distinct topics are looked up with a single query.
+    assert collection.query_texts == [["favorite color", "what color"]]
+    assert [memo.insight for memo in memos][0] == "Deep blue is my favorite color"
+
+
+@pytest.mark.asyncio
+async def test_retrieve_relevant_memos_validation_benchmark(
+    tmp_path: Path, record_property: Callable[[str, object], None]
+) -> None:
+    latencies = {}
+    retrieved = {}
+    for max_concurrent_validations in (1, 8):
+        client = _ValidationClient(delay=0.1)
+        memory_controller = await _create_memory_controller(
+            tmp_path / str(max_concurrent_validations), client, max_concurrent_validations
+        )
+        start = time.perf_counter()
+        memos = await memory_controller.retrieve_relevant_memos(task="What colors do I like?")
+        latencies[max_concurrent_validations] = time.perf_counter() - start
+        retrieved[max_concurrent_validations] = [memo.insight for memo in memos]
+        # Each distinct memo is validated once.
+        assert sorted(client.validated_insights) == sorted(set(client.validated_insights))
+        assert len(client.validated_insights) == 8
+
+    record_property("sequential_validation_latency_ms", round(latencies[1] * 1000, 2))
+    record_property("concurrent_validation_latency_ms", round(latencies[8] * 1000, 2))
+    # The memos and their order do not depend on the concurrency.
+    assert retrieved[1] == retrieved[8]
+    assert sorted(retrieved[8]) == [f"A useful insight about colors, number {index}." for index in (0, 2, 4, 6)]
+    assert latencies[8] < latencies[1] / 2
@@ -1,12 +1,19 @@
 import asyncio
+import json
 import logging
 import os
-from typing import Any, List
+from functools import partial
+from typing import Any, Dict, List, Tuple
+from unittest.mock import AsyncMock, MagicMock
 
+import grpc.aio
 import pytest
 from autogen_core import (
+    JSON_DATA_CONTENT_TYPE,
+    MSGPACK_DATA_CONTENT_TYPE,
     PROTOBUF_DATA_CONTENT_TYPE,
     AgentId,
+    AgentInstantiationContext,
     AgentType,
     DefaultSubscription,
     DefaultTopicId,
@@ -17,10 +24,14 @@
     TypeSubscription,
     default_subscription,
     event,
+    message_handler,
     try_get_known_serializers_for_type,
     type_subscription,
 )
-from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime, GrpcWorkerAgentRuntimeHost
+from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime, GrpcWorkerAgentRuntimeHost, _constants
+from autogen_ext.runtimes.grpc._utils import message_partition
+from autogen_ext.runtimes.grpc._worker_runtime import HostConnection
+from autogen_ext.runtimes.grpc.protos import agent_worker_pb2, agent_worker_pb2_grpc, cloudevent_pb2
 from autogen_test_utils import (
     CascadingAgent,
     CascadingMessageType,
@@ -406,7 +417,7 @@ async def test_disconnected_agent() -> None:
     # to some private properties. This needs to be updated once they are available publicly
 
     def get_current_subscriptions() -> List[Subscription]:
-        return host._servicer._subscription_manager._subscriptions  # type: ignore[reportPrivateUsage]
+        return list(host._servicer._subscription_manager.subscriptions)  # type: ignore[reportPrivateUsage]
 
     async def get_subscribed_recipients() -> List[AgentId]:
         return await host._servicer._subscription_manager.get_subscribed_recipients(DefaultTopicId())  # type: ignore[reportPrivateUsage]
@@ -685,6 +696,324 @@ async def test_instance_factory_messaging() -> None:
     await host.stop()
 
 
+@pytest.mark.grpc
+@pytest.mark.asyncio
+async def test_pooled_host_connection() -> None:
+    host_address = "localhost:50057"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+
+    with pytest.raises(ValueError, match="num_streams"):
+        GrpcWorkerAgentRuntime(host_address=host_address, num_streams=0)
+
+    worker1 = GrpcWorkerAgentRuntime(host_address=host_address, num_streams=4, max_queue_size=2)
+    await worker1.start()
+    worker1.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+    worker1.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+    await LoopbackAgent.register(worker1, "name1", lambda: LoopbackAgent())
+    await worker1.add_subscription(TypeSubscription("default", "name1"))
+
+    worker2 = GrpcWorkerAgentRuntime(host_address=host_address, num_streams=3, max_queue_size=2)
+    await worker2.start()
+    worker2.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+    worker2.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+
+    # Requests to many agents are spread over the streams, and every response finds its way back.
+    responses = await asyncio.gather(
+        *[
+            worker2.send_message(ContentMessage(content=f"Hello {i}!"), recipient=AgentId("name1", f"key{i}"))
+            for i in range(20)
+        ]
+    )
+    assert responses == [ContentMessage(content=f"Hello {i}!") for i in range(20)]
+
+    for _ in range(10):
+        await worker2.publish_message(MessageType(), topic_id=TopicId("default", "default"))
+    await asyncio.sleep(2)
+    agent = await worker1.try_get_underlying_agent_instance(AgentId("name1", "default"), LoopbackAgent)
+    assert agent.num_calls == 10
+
+    await worker1.stop()
+    await worker2.stop()
+    await host.stop()
+
+
+@pytest.mark.grpc
+@pytest.mark.asyncio
+async def test_msgpack_payloads() -> None:
+    pytest.importorskip("msgpack")
+    host_address = "localhost:50059"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+
+    receiver = GrpcWorkerAgentRuntime(host_address=host_address)
+    await receiver.start()
+    receiver.add_message_serializer(try_get_known_serializers_for_type(ContentMessage, include_msgpack=True))
+    receiver.add_message_serializer(try_get_known_serializers_for_type(MessageType, include_msgpack=True))
+    await LoopbackAgent.register(receiver, "name1", lambda: LoopbackAgent())
+    await receiver.add_subscription(TypeSubscription("default", "name1"))
+
+    sender = GrpcWorkerAgentRuntime(host_address=host_address, payload_serialization_format=MSGPACK_DATA_CONTENT_TYPE)
+    await sender.start()
+    sender.add_message_serializer(try_get_known_serializers_for_type(ContentMessage, include_msgpack=True))
+    sender.add_message_serializer(try_get_known_serializers_for_type(MessageType, include_msgpack=True))
+
+    response = await sender.send_message(ContentMessage(content="Hello!"), recipient=AgentId("name1", "default"))
+    assert response == ContentMessage(content="Hello!")
+
+    await sender.publish_message(MessageType(), topic_id=TopicId("default", "default"))
+    await asyncio.sleep(2)
+    agent = await receiver.try_get_underlying_agent_instance(AgentId("name1", "default"), LoopbackAgent)
+    assert agent.num_calls == 2
+    assert agent.received_messages == [ContentMessage(content="Hello!"), MessageType()]
+
+    await sender.stop()
+    await receiver.stop()
+    await host.stop()
+
+
+class PlacementRecordingAgent(RoutedAgent):
+    def __init__(self, worker: str, deliveries: List[Tuple[str, str]]) -> None:
+        super().__init__("An agent that records the worker it runs on.")
+        self._worker = worker
+        self._deliveries = deliveries
+
+    @message_handler
+    async def on_new_message(
+        self, message: MessageType | ContentMessage, ctx: MessageContext
+    ) -> MessageType | ContentMessage:
+        self._deliveries.append((self._worker, self.id.key))
+        return message
+
+
+class OrderRecordingAgent(RoutedAgent):
+    def __init__(self, received: List[str]) -> None:
+        super().__init__("An agent that records the order of the messages it receives.")
+        self._received = received
+
+    @message_handler
+    async def on_new_message(self, message: ContentMessage, ctx: MessageContext) -> ContentMessage:
+        self._received.append(message.content)
+        return message
+
+
+@pytest.mark.grpc
+@pytest.mark.asyncio
+async def test_pooled_host_connection_keeps_per_recipient_order() -> None:
+    host_address = "localhost:50063"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+    received: Dict[str, List[str]] = {f"key{i}": [] for i in range(4)}
+    worker1 = GrpcWorkerAgentRuntime(host_address=host_address, num_streams=4)
+    await worker1.start()
+    worker1.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+    await OrderRecordingAgent.register(
+        worker1, "recorder", lambda: OrderRecordingAgent(received[AgentInstantiationContext.current_agent_id().key])
+    )
+    await worker1.add_subscription(TypeSubscription("default", "recorder"))
+    worker2 = GrpcWorkerAgentRuntime(host_address=host_address, num_streams=4)
+    await worker2.start()
+    worker2.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+
+    # Messages to different agents are spread over the streams, while each agent gets its messages in order.
+    for i in range(50):
+        for key in received:
+            await worker2.publish_message(ContentMessage(content=str(i)), topic_id=TopicId("default", key))
+    await asyncio.sleep(2)
+    assert received == {key: [str(i) for i in range(50)] for key in received}
+
+    await worker1.stop()
+    await worker2.stop()
+    await host.stop()
+
+
+class _FakeStream:
+    def __init__(self, messages: List[agent_worker_pb2.Message]) -> None:
+        self.messages = messages
+        self.reads = 0
+        self.written: List[agent_worker_pb2.Message] = []
+        self.writable = asyncio.Event()
+        self.write_error: Exception | None = None
+        self.cancelled = False
+
+    async def wait_for_connection(self) -> None:
+        pass
+
+    async def read(self) -> agent_worker_pb2.Message:
+        self.reads += 1
+        if not self.messages:
+            await asyncio.Event().wait()
+        return self.messages.pop(0)
+
+    async def write(self, message: agent_worker_pb2.Message) -> None:
+        await self.writable.wait()
+        if self.write_error is not None:
+            raise self.write_error
+        self.written.append(message)
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+@pytest.mark.asyncio
+async def test_host_connection_backpressure(monkeypatch: pytest.MonkeyPatch) -> None:
+    def request(key: str) -> agent_worker_pb2.Message:
+        return agent_worker_pb2.Message(
+            request=agent_worker_pb2.RpcRequest(target=agent_worker_pb2.AgentId(type="agent", key=key))
+        )
+
+    streams = [_FakeStream([request(str(i)) for i in range(10)]), _FakeStream([])]
+    stub = MagicMock()
+    stub.OpenChannel.side_effect = streams
+    monkeypatch.setattr(grpc.aio, "insecure_channel", lambda *args, **kwargs: AsyncMock())
+    monkeypatch.setattr(agent_worker_pb2_grpc, "AgentRpcStub", lambda channel: stub)
+    connection = await HostConnection.from_host_address("fake", num_streams=2, max_queue_size=2)
+    await asyncio.sleep(0.1)
+
+    # Messages are not read from the host while the receive queue is full.
+    assert streams[0].reads == 3
+    assert await connection.recv() == request("0")
+    await asyncio.sleep(0.1)
+    assert streams[0].reads == 4
+
+    # Sending waits while the stream does not accept messages and the send queue is full.
+    key = "a"
+    stream = streams[message_partition(request(key), 2)]
+    for _ in range(3):
+        await asyncio.wait_for(connection.send(request(key)), timeout=1)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(connection.send(request(key)), timeout=0.1)
+    stream.writable.set()
+    await asyncio.wait_for(connection.send(request(key)), timeout=1)
+    await asyncio.sleep(0.1)
+    assert len(stream.written) == 4
+    await connection.close()
+
+
+@pytest.mark.asyncio
+async def test_host_connection_send_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    message = agent_worker_pb2.Message(
+        request=agent_worker_pb2.RpcRequest(target=agent_worker_pb2.AgentId(type="agent", key="a"))
+    )
+    stream = _FakeStream([])
+    stub = MagicMock()
+    stub.OpenChannel.side_effect = [stream]
+    monkeypatch.setattr(grpc.aio, "insecure_channel", lambda *args, **kwargs: AsyncMock())
+    monkeypatch.setattr(agent_worker_pb2_grpc, "AgentRpcStub", lambda channel: stub)
+    connection = await HostConnection.from_host_address("fake", max_queue_size=1)
+
+    # The first message fails to write, the second waits in the queue and the third waits for room.
+    await connection.send(message)
+    await asyncio.sleep(0.1)
+    await connection.send(message)
+    blocked_send = asyncio.create_task(connection.send(message))
+    await asyncio.sleep(0.1)
+    assert not blocked_send.done()
+
+    stream.write_error = RuntimeError("stream broken")
+    stream.writable.set()
+    # The failure closes the stream and fails the waiting and later sends.
+    with pytest.raises(RuntimeError, match="connection to the host failed"):
+        await asyncio.wait_for(blocked_send, timeout=1)
+    with pytest.raises(RuntimeError, match="connection to the host failed"):
+        await connection.send(message)
+    assert stream.cancelled
+    assert stream.written == []
+    await connection.close()
+
+
+@pytest.mark.grpc
+@pytest.mark.asyncio
+async def test_shared_agent_type_placement() -> None:
+    host_address = "localhost:50058"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address, shared_agent_types=True)
+    host.start()
+
+    deliveries: List[Tuple[str, str]] = []
+    workers: List[GrpcWorkerAgentRuntime] = []
+    for name in ["worker1", "worker2", "sender"]:
+        worker = GrpcWorkerAgentRuntime(host_address=host_address)
+        await worker.start()
+        worker.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+        worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+        if name != "sender":
+            await PlacementRecordingAgent.register(worker, "shared", partial(PlacementRecordingAgent, name, deliveries))
+            await worker.add_subscription(TypeSubscription("default", "shared"))
+        workers.append(worker)
+    worker1, worker2, sender = workers
+
+    # Each key is handled by one worker, and the keys are spread over both workers.
+    keys = [f"key{i}" for i in range(40)]
+    for key in keys:
+        await sender.send_message(ContentMessage(content="Hello!"), recipient=AgentId("shared", key))
+    placement = {key: worker for worker, key in deliveries}
+    assert len(deliveries) == len(placement) == len(keys)
+    assert set(placement.values()) == {"worker1", "worker2"}
+
+    # Events follow the same placement and are delivered once.
+    deliveries.clear()
+    for key in keys:
+        await sender.publish_message(MessageType(), topic_id=TopicId("default", key))
+    await asyncio.sleep(2)
+    assert sorted(deliveries) == sorted((worker, key) for key, worker in placement.items())
+
+    loads = host.get_worker_loads()
+    assert len(loads) == 3
+    assert sorted(load.agent_types for load in loads.values()) == [[], ["shared"], ["shared"]]
+    assert sum(load.requests for load in loads.values()) == len(keys)
+    assert sum(load.events for load in loads.values()) == len(keys)
+    assert all(load.pending_requests == 0 for load in loads.values())
+
+    # The keys of a worker that leaves are reassigned to the remaining worker.
+    await worker2.stop()
+    await asyncio.sleep(1)
+    deliveries.clear()
+    for key in keys:
+        await sender.send_message(ContentMessage(content="Hello!"), recipient=AgentId("shared", key))
+    assert {worker for worker, _ in deliveries} == {"worker1"}
+
+    await worker1.stop()
+    await sender.stop()
+    await host.stop()
+
+
+@pytest.mark.grpc
+@pytest.mark.asyncio
+async def test_shared_agent_type_events_filtered_by_agent_id() -> None:
+    host_address = "localhost:50062"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address, shared_agent_types=True)
+    host.start()
+    deliveries: List[Tuple[str, str]] = []
+    worker = GrpcWorkerAgentRuntime(host_address=host_address)
+    await worker.start()
+    worker.add_message_serializer(try_get_known_serializers_for_type(MessageType))
+    await PlacementRecordingAgent.register(worker, "shared", partial(PlacementRecordingAgent, "worker", deliveries))
+    await worker.add_subscription(TypeSubscription("default", "shared"))
+
+    # The host stamps the recipient agent ids on events.
+    await worker.publish_message(MessageType(), topic_id=TopicId("default", "key0"))
+    await asyncio.sleep(1)
+    assert deliveries == [("worker", "key0")]
+
+    # An event is only delivered to the agents it is stamped with, not to every agent of the stamped types.
+    message_type = worker._serialization_registry.type_name(MessageType())  # type: ignore[reportPrivateUsage]
+    data = worker._serialization_registry.serialize(  # type: ignore[reportPrivateUsage]
+        MessageType(), type_name=message_type, data_content_type=JSON_DATA_CONTENT_TYPE
+    )
+    for recipients in (["shared/key1"], ["shared/key0"]):
+        event = cloudevent_pb2.CloudEvent(
+            id="event", source="key0", type="default", spec_version="1.0", binary_data=data
+        )
+        event.attributes[_constants.DATA_CONTENT_TYPE_ATTR].ce_string = JSON_DATA_CONTENT_TYPE
+        event.attributes[_constants.DATA_SCHEMA_ATTR].ce_string = message_type
+        event.attributes[_constants.AGENT_RECIPIENTS_ATTR].ce_string = json.dumps(recipients)
+        await worker._process_event(event)  # type: ignore[reportPrivateUsage]
+    assert deliveries == [("worker", "key0"), ("worker", "key0")]
+
+    await worker.stop()
+    await host.stop()
+
+
 # GrpcWorkerAgentRuntimeHost eats exceptions in the main loop
 # @pytest.mark.grpc
 # @pytest.mark.asyncio